@@ -0,0 +1,28 @@
+"""saved candidates keyset index
+
+Revision ID: 3b8e1f6a9c21
+Revises: f2215fe7d2cc
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8e1f6a9c21'
+down_revision = 'f2215fe7d2cc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves the recruiter saved list: WHERE recruiter_id = ? ORDER BY saved_date DESC, id DESC
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_saved_candidates_recruiter_saved_date "
+        "ON saved_candidates (recruiter_id, saved_date, id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_saved_candidates_recruiter_saved_date")
@@ -0,0 +1,83 @@
+"""job stats rollups
+
+Revision ID: 7c4d2a9e5b10
+Revises: 3b8e1f6a9c21
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c4d2a9e5b10'
+down_revision = '3b8e1f6a9c21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_stats_rollups',
+        sa.Column('job_id', sa.String(), primary_key=True),
+        sa.Column('company', sa.String(), nullable=True),
+        sa.Column('job_status', sa.String(length=20), nullable=True),
+        sa.Column('category', sa.String(), nullable=True),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('applications_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('new_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('screening_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('interview_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('offer_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('hired_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rejected_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('match_score_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('match_score_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    )
+    op.create_index('ix_job_stats_rollups_company_status', 'job_stats_rollups', ['company', 'job_status'])
+
+    # Backfill from the existing rows (same shape as RollupService.rebuild_statement);
+    # the status enum may hold member names or values, hence upper()
+    op.execute("""
+        INSERT INTO job_stats_rollups (
+            job_id, company, job_status, category, location,
+            applications_total, new_count, screening_count, interview_count,
+            offer_count, hired_count, rejected_count, match_score_sum, match_score_count
+        )
+        SELECT
+            COALESCE(jobs.job_id, counts.job_id),
+            jobs.company, jobs.status,
+            COALESCE(NULLIF(jobs.category, ''), 'Uncategorized'),
+            COALESCE(NULLIF(jobs.location_city, ''), NULLIF(jobs.location_province, ''), 'Unknown'),
+            COALESCE(counts.applications_total, 0),
+            COALESCE(counts.new_count, 0),
+            COALESCE(counts.screening_count, 0),
+            COALESCE(counts.interview_count, 0),
+            COALESCE(counts.offer_count, 0),
+            COALESCE(counts.hired_count, 0),
+            COALESCE(counts.rejected_count, 0),
+            COALESCE(counts.match_score_sum, 0),
+            COALESCE(counts.match_score_count, 0)
+        FROM corporate_jobs AS jobs
+        FULL OUTER JOIN (
+            SELECT
+                job_id,
+                count(*) AS applications_total,
+                count(*) FILTER (WHERE upper(status::text) = 'NEW') AS new_count,
+                count(*) FILTER (WHERE upper(status::text) = 'SCREENING') AS screening_count,
+                count(*) FILTER (WHERE upper(status::text) = 'INTERVIEW') AS interview_count,
+                count(*) FILTER (WHERE upper(status::text) = 'OFFER') AS offer_count,
+                count(*) FILTER (WHERE upper(status::text) = 'HIRED') AS hired_count,
+                count(*) FILTER (WHERE upper(status::text) = 'REJECTED') AS rejected_count,
+                sum(match_score) AS match_score_sum,
+                count(match_score) AS match_score_count
+            FROM applications
+            GROUP BY job_id
+        ) AS counts ON counts.job_id = jobs.job_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_stats_rollups_company_status', table_name='job_stats_rollups')
+    op.drop_table('job_stats_rollups')
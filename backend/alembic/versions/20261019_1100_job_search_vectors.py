@@ -0,0 +1,52 @@
+"""job full-text search vectors
+
+Revision ID: 9a1f3c7d2e84
+Revises: 7c4d2a9e5b10
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a1f3c7d2e84'
+down_revision = '7c4d2a9e5b10'
+branch_labels = None
+depends_on = None
+
+
+# Must match SEARCH_VECTOR_SQL in the job models
+SEARCH_VECTORS = {
+    'corporate_jobs': (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(required_skills, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(category, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ),
+    'small_jobs': (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(required_skills, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(work_type, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ),
+}
+
+
+def upgrade() -> None:
+    for table, expression in SEARCH_VECTORS.items():
+        # Generated column: PostgreSQL keeps it in sync on every insert/update
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        )
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+            f"ON {table} USING gin (search_vector)"
+        )
+
+
+def downgrade() -> None:
+    for table in SEARCH_VECTORS:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,35 @@
+"""cv search trigram indexes
+
+Revision ID: 4e6b8d1c3f57
+Revises: 9a1f3c7d2e84
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e6b8d1c3f57'
+down_revision = '9a1f3c7d2e84'
+branch_labels = None
+depends_on = None
+
+
+# Must match SEARCH_COLUMNS in app/models/cv.py
+SEARCH_COLUMNS = ('full_name', 'current_job_title', 'skills_technical', 'skills_soft')
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Serve ILIKE '%q%' and word-similarity (%>) lookups in CV search
+    for column in SEARCH_COLUMNS:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_cvs_{column}_trgm "
+            f"ON cvs USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    for column in SEARCH_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_cvs_{column}_trgm")
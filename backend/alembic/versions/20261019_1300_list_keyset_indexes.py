@@ -0,0 +1,36 @@
+"""list keyset indexes
+
+Revision ID: 2d7a5f0b8c63
+Revises: 4e6b8d1c3f57
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d7a5f0b8c63'
+down_revision = '4e6b8d1c3f57'
+branch_labels = None
+depends_on = None
+
+
+# (index, table, columns) serving ORDER BY <sort key> DESC, <pk> DESC pages
+KEYSET_INDEXES = (
+    ('ix_applications_applied_at_id', 'applications', 'applied_at, id'),
+    ('ix_applications_job_applied_at_id', 'applications', 'job_id, applied_at, id'),
+    ('ix_corporate_jobs_posted_date_job_id', 'corporate_jobs', 'posted_date, job_id'),
+    ('ix_corporate_jobs_company_created_at_job_id', 'corporate_jobs', 'company, created_at, job_id'),
+    ('ix_small_jobs_created_at_job_id', 'small_jobs', 'created_at, job_id'),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in KEYSET_INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def downgrade() -> None:
+    for name, _, _ in KEYSET_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
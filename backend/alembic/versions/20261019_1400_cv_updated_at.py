@@ -0,0 +1,46 @@
+"""cv updated_at change marker
+
+Revision ID: 6f3b9e2a7c15
+Revises: 2d7a5f0b8c63
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f3b9e2a7c15'
+down_revision = '2d7a5f0b8c63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'cvs',
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False)
+    )
+    op.create_index('ix_cvs_updated_at', 'cvs', ['updated_at'])
+
+    # Every UPDATE bumps the marker, whoever issues it (ORM, raw SQL, scripts)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION cvs_touch_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at := now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER cvs_touch_updated_at
+        BEFORE UPDATE ON cvs
+        FOR EACH ROW EXECUTE FUNCTION cvs_touch_updated_at()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS cvs_touch_updated_at ON cvs")
+    op.execute("DROP FUNCTION IF EXISTS cvs_touch_updated_at()")
+    op.drop_index('ix_cvs_updated_at', table_name='cvs')
+    op.drop_column('cvs', 'updated_at')
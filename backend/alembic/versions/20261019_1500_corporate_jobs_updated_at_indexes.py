@@ -0,0 +1,33 @@
+"""corporate jobs updated_at indexes
+
+Revision ID: 8a1e4c7d2f90
+Revises: 6f3b9e2a7c15
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a1e4c7d2f90'
+down_revision = '6f3b9e2a7c15'
+branch_labels = None
+depends_on = None
+
+
+# (index, table, columns) serving max(updated_at) for job list validators
+VERSION_INDEXES = (
+    ('ix_corporate_jobs_company_updated_at', 'corporate_jobs', 'company, updated_at'),
+    ('ix_corporate_jobs_updated_at', 'corporate_jobs', 'updated_at'),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in VERSION_INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def downgrade() -> None:
+    for name, _, _ in VERSION_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
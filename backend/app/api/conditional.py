@@ -0,0 +1,113 @@
+"""
+Conditional Responses - ETag / Last-Modified validators for read routes
+=======================================================================
+Dashboards poll match and job listings that rarely change between polls.
+Routes derive a cheap data version (counts and max timestamps of the rows
+behind the page) and compare it with the client's validators BEFORE the
+heavy query runs:
+
+    @router.get("/things")
+    def list_things(conditional: Conditional = Depends(), ...):
+        count, last_change = ...one aggregate query...
+        conditional.check(company, count, last_change, last_modified=last_change)
+        ...heavy query, only when the client's copy is stale...
+        return body                                   # validators already set
+        return conditional.apply(FastJSONResponse(body))  # routes returning a Response
+
+check() raises 304 Not Modified (no body) when `If-None-Match` matches the
+weak ETag, or, without `If-None-Match`, when `If-Modified-Since` is not
+older than `last_modified`. The ETag covers the route path and its query
+string, so every filter / cursor / page gets its own validator.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, Request, Response
+
+
+# Validators are per user; browsers must revalidate before reusing a copy
+CACHE_CONTROL = 'private, no-cache'
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag from the repr of the version parts"""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == opaque for tag in if_none_match.split(','))
+
+
+def http_date(value: datetime) -> str:
+    """RFC 9110 HTTP-date (naive timestamps are taken as UTC)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """True when If-Modified-Since is at or after last_modified (second precision)"""
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+class Conditional:
+    """
+    FastAPI dependency: compares request validators with a data version
+    and short-circuits with 304 Not Modified.
+    """
+
+    def __init__(self, request: Request, response: Response):
+        self.request = request
+        self.response = response
+        self.headers: Dict[str, str] = {}
+
+    def check(self, *version: Any, last_modified: Optional[datetime] = None):
+        """
+        Set ETag / Last-Modified for this version; raise 304 when the
+        client's copy is current.
+
+        Args:
+            version: Values that change whenever the response body would
+                (row counts, max timestamps, owner ids)
+            last_modified: Newest change behind the response, if known
+        """
+        self.headers = {
+            'ETag': make_etag(self.request.url.path, self.request.url.query, *version),
+            'Cache-Control': CACHE_CONTROL,
+        }
+        if last_modified is not None:
+            self.headers['Last-Modified'] = http_date(last_modified)
+        self.response.headers.update(self.headers)
+
+        if_none_match = self.request.headers.get('if-none-match')
+        if if_none_match is not None:
+            fresh = etag_matches(if_none_match, self.headers['ETag'])
+        else:
+            fresh = not_modified_since(self.request.headers.get('if-modified-since'), last_modified)
+        if fresh:
+            raise HTTPException(status_code=304, headers=self.headers)
+
+    def apply(self, response: Response) -> Response:
+        """Copy the validators onto a Response the route returns itself."""
+        response.headers.update(self.headers)
+        return response
@@ -1,12 +1,16 @@
-from typing import Generator, Union, Any
+from typing import Generator, Union, Any, Callable
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from app.db.session import get_db
+from app.db.session import SessionLocal, get_db
 from app.core.security import decode_access_token
+from app.core.principal_cache import UserSnapshot, attach_user, principal_cache, snapshot_user
 from app.models.user import User
-from dataclasses import dataclass
+from app.services.matching_executor import (
+    ExecutorSaturated, ExecutorTimeout, get_matching_executor
+)
+from dataclasses import dataclass, replace
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
@@ -26,7 +30,18 @@ def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> Union[User, CompanyUser]:
-    """Get current authenticated user (supports both regular users and company accounts)"""
+    """
+    Get current authenticated user (supports both regular users and company accounts)
+    
+    Principals are cached per token (see app/core/principal_cache.py), so
+    repeat requests skip token verification and the account queries.
+    """
+    cached = principal_cache.get(token)
+    if isinstance(cached, UserSnapshot):
+        return attach_user(db, cached)
+    if cached is not None:
+        return replace(cached)
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -63,7 +78,7 @@ def get_current_user(
                     detail="Account is inactive"
                 )
             
-            return CompanyUser(
+            company_user = CompanyUser(
                 id=user_id,
                 email=email,
                 full_name=company_display_name,
@@ -71,6 +86,8 @@ def get_current_user(
                 company_display_name=company_display_name,  # For UI display
                 role="recruiter"
             )
+            principal_cache.put(token, user_id_str, payload.get("exp"), company_user)
+            return replace(company_user)
     except ValueError:
         pass
     
@@ -79,8 +96,52 @@ def get_current_user(
         user_id = int(user_id_str)
         user = db.query(User).filter(User.id == user_id).first()
         if user:
+            principal_cache.put(token, user_id_str, payload.get("exp"), snapshot_user(user))
             return user
     except (ValueError, TypeError):
         pass
     
     raise credentials_exception
+
+
+def with_session(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Call fn(db, *args, **kwargs) with a dedicated session, closed afterwards.
+
+    Work submitted to run_matching must use this instead of the request's
+    session: on a 504 the route returns (and get_db closes its session)
+    while the executor thread is still running, and Sessions are not
+    thread-safe.
+
+        matches = await run_matching(with_session, match_job_with_gates, job_id=job_id)
+    """
+    db = SessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+async def run_matching(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking matching call off the event loop (bounded executor).
+
+    fn runs in another thread: give it its own session via with_session,
+    never the request's `db`.
+
+    Raises 503 (with Retry-After) when the matching queue is full and 504
+    when the call exceeds MATCHING_TIMEOUT_SECONDS.
+    """
+    try:
+        return await get_matching_executor().run(fn, *args, **kwargs)
+    except ExecutorSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Matching is at capacity, please retry shortly",
+            headers={"Retry-After": "5"},
+        )
+    except ExecutorTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Matching took too long, please retry",
+        )
@@ -0,0 +1,106 @@
+"""
+Fast JSON Responses - orjson rendering for large match payloads
+===============================================================
+Match endpoints return hundreds of candidate dicts built by our own
+services. Returning them as plain dicts sends every row through FastAPI's
+response-model validation and jsonable_encoder before stdlib json. Routes
+return a FastJSONResponse instead, which FastAPI sends as-is:
+
+    body = {"job_id": job_id, "matches": compact_rows(matches) if compact else matches}
+    return FastJSONResponse(body)
+
+Serialization time is reported per response in a `Server-Timing` header
+(`serialize;dur=<ms>`) and aggregated in serialization_stats().
+"""
+
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+# Per-row detail dropped by compact mode (match_score and skill lists stay)
+BREAKDOWN_KEYS = frozenset({
+    'breakdown',
+    'scores',
+    'explanation',
+    'match_reason',
+    'skills_score',
+    'experience_score',
+    'location_score',
+    'education_score',
+    'semantic_score',
+    'bm25_score',
+    'exact_overlap',
+})
+
+_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Types orjson does not serialize natively"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+# ============================================================================
+# STATS
+# ============================================================================
+
+_stats_lock = threading.Lock()
+_stats = {'responses': 0, 'bytes': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+
+
+def _record(elapsed_ms: float, size: int):
+    with _stats_lock:
+        _stats['responses'] += 1
+        _stats['bytes'] += size
+        _stats['total_ms'] += elapsed_ms
+        _stats['max_ms'] = max(_stats['max_ms'], elapsed_ms)
+
+
+def serialization_stats() -> Dict[str, float]:
+    """Totals for FastJSONResponse rendering in this process"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['avg_ms'] = round(stats['total_ms'] / stats['responses'], 3) if stats['responses'] else 0.0
+    stats['total_ms'] = round(stats['total_ms'], 3)
+    stats['max_ms'] = round(stats['max_ms'], 3)
+    return stats
+
+
+# ============================================================================
+# RESPONSE
+# ============================================================================
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (no validation, no jsonable_encoder)"""
+
+    def __init__(self, content: Any, *args, **kwargs):
+        self.serialize_ms = 0.0
+        super().__init__(content, *args, **kwargs)
+        self.headers.append('Server-Timing', f'serialize;dur={self.serialize_ms:.3f}')
+
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        body = orjson.dumps(content, default=_default, option=_OPTIONS)
+        self.serialize_ms = (time.perf_counter() - start) * 1000
+        _record(self.serialize_ms, len(body))
+        return body
+
+
+def compact_rows(rows: Iterable[Dict]) -> List[Dict]:
+    """Copies of result rows without per-row breakdown fields"""
+    return [
+        {key: value for key, value in row.items() if key not in BREAKDOWN_KEYS}
+        for row in rows
+    ]
@@ -4,12 +4,15 @@ Handles job application management for recruiters
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from typing import Optional, List
 
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.api.deps import get_current_user
 from app.models.user import User
 from app.models.application import Application
+from app.models.cv import CV
 from app.services.application_service import ApplicationService
 from app.schemas.application import (
     ApplicationCreate, ApplicationUpdate, ApplicationResponse,
@@ -67,11 +70,13 @@ def apply_to_job(
 
 
 @router.get("/applications", response_model=ApplicationListResponse)
-def list_applications(
-    db: Session = Depends(get_db),
+async def list_applications(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="false skips the exact count (total is null)"),
     status: Optional[ApplicationStatus] = None,
     job_id: Optional[str] = None,
     search: Optional[str] = None,
@@ -80,28 +85,28 @@ def list_applications(
     """
     List all applications (recruiter endpoint)
     
-    Returns applications with candidate and job details
+    Returns applications with candidate and job details, newest first.
+    Pass `next_cursor` back as `cursor` for the next page.
     """
-    applications, total = ApplicationService.list_applications_with_details(
+    applications, total, next_cursor = await ApplicationService.list_applications_with_details_async(
         db=db,
         skip=skip,
         limit=limit,
         status=status,
         job_id=job_id,
-        search=search
+        search=search,
+        cursor=cursor,
+        include_total=include_total,
+        min_match_score=min_match_score
     )
     
-    # Filter by match score if provided
-    if min_match_score:
-        applications = [app for app in applications if app.get('match_score', 0) >= min_match_score]
-        total = len(applications)
-    
     return ApplicationListResponse(
         total=total,
         applications=applications,
         page=(skip // limit) + 1,
         page_size=limit,
-        has_more=(skip + limit) < total
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
     )
 
 
@@ -235,12 +240,14 @@ def bulk_update_status(
 
 
 @router.get("/applications/job/{job_id}", response_model=ApplicationListResponse)
-def get_job_applications(
+async def get_job_applications(
     job_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="false skips the exact count (total is null)"),
     status: Optional[ApplicationStatus] = None
 ):
     """
@@ -248,12 +255,14 @@ def get_job_applications(
     
     Returns applications with candidate details
     """
-    applications, total = ApplicationService.list_applications_with_details(
+    applications, total, next_cursor = await ApplicationService.list_applications_with_details_async(
         db=db,
         skip=skip,
         limit=limit,
         status=status,
-        job_id=job_id
+        job_id=job_id,
+        cursor=cursor,
+        include_total=include_total
     )
     
     return ApplicationListResponse(
@@ -261,16 +270,19 @@ def get_job_applications(
         applications=applications,
         page=(skip // limit) + 1,
         page_size=limit,
-        has_more=(skip + limit) < total
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/applications/my-applications", response_model=ApplicationListResponse)
-def get_my_applications(
-    db: Session = Depends(get_db),
+async def get_my_applications(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="false skips the exact count (total is null)"),
     status: Optional[ApplicationStatus] = None
 ):
     """
@@ -278,12 +290,10 @@ def get_my_applications(
     
     Returns all applications submitted by the logged-in candidate
     """
-    from app.services.cv_service import CVService
-    
     # Get user's CV
-    cv = CVService.get_cv_by_email(db, current_user.email)
+    cv_id = (await db.scalars(select(CV.cv_id).where(CV.email == current_user.email))).first()
     
-    if not cv:
+    if not cv_id:
         return ApplicationListResponse(
             total=0,
             applications=[],
@@ -292,21 +302,23 @@ def get_my_applications(
             has_more=False
         )
     
-    applications, total = ApplicationService.list_applications_with_details(
+    # Filter to only this user's applications in SQL (before pagination)
+    my_apps, total, next_cursor = await ApplicationService.list_applications_with_details_async(
         db=db,
         skip=skip,
         limit=limit,
         status=status,
-        job_id=None  # Get all jobs
+        job_id=None,  # Get all jobs
+        cv_id=cv_id,
+        cursor=cursor,
+        include_total=include_total
     )
     
-    # Filter to only this user's applications
-    my_apps = [app for app in applications if app['cv_id'] == cv.cv_id]
-    
     return ApplicationListResponse(
-        total=len(my_apps),
+        total=total,
         applications=my_apps,
         page=(skip // limit) + 1,
         page_size=limit,
-        has_more=len(my_apps) > (skip + limit)
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
     )
@@ -11,6 +11,7 @@ from app.db.session import get_db
 from app.models.user import User
 from app.api.deps import get_current_user
 from app.services.fast_gated_matching_service import FastGatedMatchingService
+from app.services.top_k import TopK
 
 router = APIRouter()
 
@@ -70,8 +71,8 @@ def get_semantic_job_matches(
                 "model_used": "all-MiniLM-L6-v2"
             }
         
-        # Match CV against all jobs (reverse matching)
-        all_matches = []
+        # Match CV against all jobs (reverse matching), keeping the top K
+        top = TopK(top_k)
         
         for job in jobs:
             # Get semantic similarity
@@ -90,7 +91,7 @@ def get_semantic_job_matches(
                 if matched_skills:
                     match_reason += f" | Matched skills: {', '.join(matched_skills[:3])}"
                 
-                all_matches.append({
+                top.push(round(similarity, 3), {
                     "job_id": job.job_id,
                     "title": job.title,
                     "company": job.company,
@@ -105,11 +106,8 @@ def get_semantic_job_matches(
                     "missing_skills": missing_skills[:5]  # Limit to 5
                 })
         
-        # Sort by match score (highest first)
-        all_matches.sort(key=lambda x: x["match_score"], reverse=True)
-        
-        # Limit to top_k
-        top_matches = all_matches[:top_k]
+        # Highest match score first
+        top_matches = top.results()
         
         processing_time = time.time() - start_time
         
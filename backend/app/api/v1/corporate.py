@@ -3,18 +3,25 @@ Corporate Jobs API for Recruiters/Employers
 Handles corporate job management and candidate matching
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from datetime import datetime, date
 import re
 
+from app.api.conditional import Conditional
 from app.db.session import get_db
+from app.db.pagination import keyset_page, page_with_cursor
 from app.api.deps import get_current_user
 from app.models.user import User
 from app.models.corporate_job import CorporateJob
 from app.models.cv import CV
 from app.services.enhanced_matching_service import EnhancedMatchingService
 from app.services.semantic_company_matcher import SemanticCompanyMatcher
+from app.services.top_k import TopK
+from app.services.rollup_service import RollupService
+from app.services.matching_service import invalidate_job_snapshot
+from app.services.stats_service import StatsService, invalidate_company_stats
 from app.schemas.job import CorporateJobCreate, CorporateJobUpdate, CorporateJobResponse
 
 router = APIRouter()
@@ -123,8 +130,11 @@ def create_corporate_job(
     
     try:
         db.add(new_job)
+        RollupService.sync_job(db, new_job)
         db.commit()
         db.refresh(new_job)
+        invalidate_company_stats(company)
+        invalidate_job_snapshot('corp')
         
         return new_job
     except Exception as e:
@@ -179,8 +189,11 @@ def update_corporate_job(
     job.updated_at = datetime.now()
     
     try:
+        RollupService.sync_job(db, job)
         db.commit()
         db.refresh(job)
+        invalidate_company_stats(job.company)
+        invalidate_job_snapshot('corp')
         
         return job
     except Exception as e:
@@ -242,7 +255,10 @@ def update_job_status(
     job.updated_at = datetime.now()
     
     try:
+        RollupService.sync_job(db, job)
         db.commit()
+        invalidate_company_stats(job.company)
+        invalidate_job_snapshot('corp')
         
         return {
             "success": True,
@@ -297,7 +313,10 @@ def delete_corporate_job(
     job.updated_at = datetime.now()
     
     try:
+        RollupService.sync_job(db, job)
         db.commit()
+        invalidate_company_stats(job.company)
+        invalidate_job_snapshot('corp')
         return None  # 204 No Content
     except Exception as e:
         db.rollback()
@@ -321,6 +340,9 @@ def get_corporate_jobs(
     location: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="false leaves total null"),
+    conditional: Conditional = Depends(),
 ):
     """
     Get corporate jobs for employer
@@ -333,6 +355,9 @@ def get_corporate_jobs(
     - status: Job status (draft, published, closed, archived)
     - category: Job category
     - location: City/province
+    
+    Newest first; pass `next_cursor` back as `cursor` for the next page.
+    Responds 304 to If-None-Match while the company's listed jobs are unchanged.
     """
     # Extract company from authenticated user
     user_company = extract_company_from_user(current_user)
@@ -358,11 +383,23 @@ def get_corporate_jobs(
             (CorporateJob.location_province.ilike(f"%{location}%"))
         )
     
-    # Get total count
-    total = query.count()
+    # Version of the listed jobs - 304 before the page query. With the total
+    # the filtered count doubles as version; without it, skip the COUNT
+    if include_total:
+        count, last_change = query.with_entities(
+            func.count(CorporateJob.job_id), func.max(CorporateJob.updated_at)
+        ).one()
+        total = count
+    else:
+        count, last_change = RollupService.jobs_version(db, user_company)
+        total = None
+    conditional.check(user_company, count, last_change, last_modified=last_change)
     
     # Apply pagination and ordering
-    jobs = query.order_by(CorporateJob.created_at.desc()).offset(skip).limit(limit).all()
+    rows = keyset_page(
+        query, limit, CorporateJob.created_at, CorporateJob.job_id, skip=skip, cursor=cursor
+    ).all()
+    jobs, next_cursor = page_with_cursor(rows, limit, lambda job: (job.created_at, job.job_id))
     
     print(f"   📊 Total jobs found: {total}\n")
     
@@ -374,7 +411,8 @@ def get_corporate_jobs(
         "jobs": jobs,
         "page": (skip // limit) + 1,
         "page_size": limit,
-        "has_more": (skip + limit) < total
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor
     }
 
 
@@ -429,14 +467,14 @@ def get_job_matches(
     # Get all CVs
     all_cvs = db.query(CV).all()
     
-    # Score each candidate
-    matches = []
+    # Score each candidate, keeping only the top `limit`
+    top = TopK(limit)
     for cv in all_cvs:
         try:
             result = matching_service.match_cv_to_job(cv, job)
             
             if result['final_score'] >= min_score:
-                matches.append({
+                top.push(result['final_score'], {
                     "cv_id": cv.cv_id,
                     "user_id": cv.user_id,
                     "candidate_name": cv.full_name,
@@ -457,11 +495,8 @@ def get_job_matches(
             # Skip CVs that cause errors
             continue
     
-    # Sort by match score
-    matches.sort(key=lambda x: x['match_score'], reverse=True)
-    
-    # Limit results
-    matches = matches[:limit]
+    # Highest match score first
+    matches = top.results()
     
     return {
         "success": True,
@@ -489,42 +524,22 @@ def get_corporate_stats(
     if not company:
         company = user_company
     
-    # Query jobs (exclude archived)
-    query = db.query(CorporateJob).filter(
+    # Counts by status, category and location in one grouped query (cached briefly)
+    stats = StatsService.corporate_job_stats(db, company)
+    
+    recent_jobs = db.query(CorporateJob).filter(
         CorporateJob.company == company,
         CorporateJob.status != 'archived'
-    )
-    
-    total_jobs = query.count()
-    
-    # Count by status
-    status_counts = {
-        'draft': query.filter(CorporateJob.status == 'draft').count(),
-        'published': query.filter(CorporateJob.status == 'published').count(),
-        'closed': query.filter(CorporateJob.status == 'closed').count(),
-    }
-    
-    # Get jobs by category
-    category_counts = {}
-    jobs = query.all()
-    for job in jobs:
-        category = job.category or "Uncategorized"
-        category_counts[category] = category_counts.get(category, 0) + 1
-    
-    # Get jobs by location
-    location_counts = {}
-    for job in jobs:
-        location = job.location_city or job.location_province or "Unknown"
-        location_counts[location] = location_counts.get(location, 0) + 1
+    ).order_by(CorporateJob.created_at.desc()).limit(5).all()
     
     return {
         "success": True,
         "company": company,
-        "total_jobs": total_jobs,
-        "by_status": status_counts,
-        "by_category": category_counts,
-        "by_location": location_counts,
-        "recent_jobs": jobs[:5] if jobs else []
+        "total_jobs": stats['total_jobs'],
+        "by_status": stats['by_status'],
+        "by_category": stats['by_category'],
+        "by_location": stats['by_location'],
+        "recent_jobs": recent_jobs
     }
 
 
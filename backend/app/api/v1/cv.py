@@ -2,7 +2,7 @@
 CV API Endpoints
 Handles CV creation, retrieval, and updates
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import Optional
 
@@ -138,23 +138,30 @@ def list_cvs(
     province: Optional[str] = None,
     education_level: Optional[str] = None,
     min_experience: Optional[float] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="false skips the exact count (total is null)"),
     db: Session = Depends(get_db)
     # current_user: User = Depends(get_current_user)  # Disabled for recruiter access
 ):
     """
     List CVs with optional filters
     
+    Pass `next_cursor` back as `cursor` for the next page (skip still works
+    for offset paging but gets slower on deep pages).
+    
     Note: In production, this should be restricted to admin users only.
     For now, it's available to authenticated users.
     """
-    cvs, total = CVService.list_cvs(
+    cvs, total, next_cursor = CVService.list_cvs(
         db=db,
         skip=skip,
         limit=limit,
         city=city,
         province=province,
         education_level=education_level,
-        min_experience=min_experience
+        min_experience=min_experience,
+        cursor=cursor,
+        include_total=include_total
     )
     
     # Convert SQLAlchemy models to Pydantic schemas
@@ -165,7 +172,8 @@ def list_cvs(
         cvs=cv_responses,
         page=(skip // limit) + 1 if limit > 0 else 1,
         page_size=limit,
-        has_more=(skip + limit) < total
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
     )
 
 
@@ -174,19 +182,24 @@ def search_cvs(
     query: str,
     skip: int = 0,
     limit: int = 20,
+    estimate_total: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)  # Admin only in production
 ):
     """
     Search CVs by name, skills, or job title
     
+    Typo- and prefix-tolerant, most relevant first. With estimate_total=true
+    `total` is the query planner's estimate (skips the exact count).
+    
     Note: In production, this should be restricted to admin users only.
     """
     cvs, total = CVService.search_cvs(
         db=db,
         query=query,
         skip=skip,
-        limit=limit
+        limit=limit,
+        estimate_total=estimate_total
     )
     
     # Convert SQLAlchemy models to Pydantic schemas
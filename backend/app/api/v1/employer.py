@@ -8,11 +8,14 @@ from typing import Optional, List
 from datetime import datetime
 
 from app.db.session import get_db
+from app.db.pagination import keyset_page, page_with_cursor
 from app.api.deps import get_current_user
 from app.models.user import User
 from app.models.small_job import SmallJob
 from app.models.user_job_interaction import UserJobInteraction
-from app.models.cv import CV
+from app.services.matching_service import invalidate_job_snapshot
+from app.services.stats_service import StatsService
+from app.services.applicant_hydration import ApplicantHydrationService, APPLICANT_PROFILE_COLUMNS
 from app.schemas.job import SmallJobCreate, SmallJobUpdate, SmallJobResponse
 
 router = APIRouter()
@@ -29,13 +32,16 @@ def get_employer_jobs(
     status: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="false skips the exact count (total is null)"),
 ):
     """
     Get all jobs posted by the current employer
     
     Filter options:
     - status: Filter by job status (Open, In Progress, Completed, Cancelled)
-    - skip/limit: Pagination
+    - skip/limit: Pagination (newest first)
+    - cursor: next_cursor of the previous page (replaces skip)
     """
     # Build query for jobs posted by current user
     query = db.query(SmallJob).filter(SmallJob.posted_by == str(current_user.id))
@@ -45,37 +51,28 @@ def get_employer_jobs(
         query = query.filter(SmallJob.status == status)
     
     # Get total count
-    total = query.count()
+    total = query.count() if include_total else None
     
     # Apply pagination and get results
-    jobs = query.order_by(SmallJob.date_posted.desc()).offset(skip).limit(limit).all()
-    
-    # Calculate stats
-    active_count = db.query(SmallJob).filter(
-        SmallJob.posted_by == str(current_user.id),
-        SmallJob.status == "Open"
-    ).count()
-    
-    draft_count = db.query(SmallJob).filter(
-        SmallJob.posted_by == str(current_user.id),
-        SmallJob.status == "Draft"
-    ).count()
+    rows = keyset_page(
+        query, limit, SmallJob.created_at, SmallJob.job_id, skip=skip, cursor=cursor
+    ).all()
+    jobs, next_cursor = page_with_cursor(rows, limit, lambda job: (job.created_at, job.job_id))
     
-    completed_count = db.query(SmallJob).filter(
-        SmallJob.posted_by == str(current_user.id),
-        SmallJob.status == "Completed"
-    ).count()
+    # Calculate stats (one grouped query)
+    stats = StatsService.employer_job_stats(db, str(current_user.id))
     
     return {
         "success": True,
         "total": total,
-        "active_count": active_count,
-        "draft_count": draft_count,
-        "completed_count": completed_count,
+        "active_count": stats['active_jobs'],
+        "draft_count": stats['draft_jobs'],
+        "completed_count": stats['completed_jobs'],
         "jobs": jobs,
         "page": (skip // limit) + 1,
         "page_size": limit,
-        "has_more": (skip + limit) < total
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor
     }
 
 
@@ -137,6 +134,7 @@ def create_employer_job(
     
     db.add(new_job)
     db.commit()
+    invalidate_job_snapshot('small')
     db.refresh(new_job)
     
     return new_job
@@ -172,6 +170,7 @@ def update_employer_job(
         setattr(job, field, value)
     
     db.commit()
+    invalidate_job_snapshot('small')
     db.refresh(job)
     
     return job
@@ -202,6 +201,7 @@ def delete_employer_job(
     
     db.delete(job)
     db.commit()
+    invalidate_job_snapshot('small')
     
     return None
 
@@ -232,6 +232,7 @@ def update_job_status(
     
     job.status = status
     db.commit()
+    invalidate_job_snapshot('small')
     db.refresh(job)
     
     return {
@@ -251,30 +252,8 @@ def get_employer_stats(
     
     Returns overview of all jobs, applications, and activity
     """
-    # Count jobs by status
-    total_jobs = db.query(SmallJob).filter(
-        SmallJob.posted_by == str(current_user.id)
-    ).count()
-    
-    active_jobs = db.query(SmallJob).filter(
-        SmallJob.posted_by == str(current_user.id),
-        SmallJob.status == "Open"
-    ).count()
-    
-    in_progress_jobs = db.query(SmallJob).filter(
-        SmallJob.posted_by == str(current_user.id),
-        SmallJob.status == "In Progress"
-    ).count()
-    
-    completed_jobs = db.query(SmallJob).filter(
-        SmallJob.posted_by == str(current_user.id),
-        SmallJob.status == "Completed"
-    ).count()
-    
-    draft_jobs = db.query(SmallJob).filter(
-        SmallJob.posted_by == str(current_user.id),
-        SmallJob.status == "Draft"
-    ).count()
+    # Count jobs by status (one query)
+    job_counts = StatsService.employer_job_stats(db, str(current_user.id))
     
     # Get recent jobs
     recent_jobs = db.query(SmallJob).filter(
@@ -284,11 +263,11 @@ def get_employer_stats(
     return {
         "success": True,
         "stats": {
-            "total_jobs": total_jobs,
-            "active_jobs": active_jobs,
-            "in_progress_jobs": in_progress_jobs,
-            "completed_jobs": completed_jobs,
-            "draft_jobs": draft_jobs,
+            "total_jobs": job_counts['total_jobs'],
+            "active_jobs": job_counts['active_jobs'],
+            "in_progress_jobs": job_counts['in_progress_jobs'],
+            "completed_jobs": job_counts['completed_jobs'],
+            "draft_jobs": job_counts['draft_jobs'],
             "total_applications": 0,  # TODO: Implement when applications model exists
             "unread_messages": 0,  # TODO: Implement when messages model exists
         },
@@ -371,12 +350,9 @@ def get_job_applicants(
     total = query.count()
     applications = query.order_by(UserJobInteraction.timestamp.desc()).offset(skip).limit(limit).all()
     
-    # Build applicant list with CV details
+    # Build applicant list with CV details (one CV query for the page)
     applicants = []
-    for app in applications:
-        # Get applicant's CV
-        cv = db.query(CV).filter(CV.user_id == app.user_id).first()
-        
+    for app, cv, _ in ApplicantHydrationService.hydrate(db, applications):
         if cv:
             applicant_data = {
                 "application_id": app.event_id,
@@ -472,7 +448,7 @@ def get_applicant_details(
         )
     
     # Get applicant's full CV
-    cv = db.query(CV).filter(CV.user_id == application.user_id).first()
+    cv = ApplicantHydrationService.hydrate_one(db, application, APPLICANT_PROFILE_COLUMNS).cv
     
     if not cv:
         raise HTTPException(
@@ -504,7 +480,7 @@ def get_applicant_details(
                 "level": cv.education_level,
                 "institution": cv.institution,
                 "graduation_year": cv.graduation_year,
-                "field_of_study": cv.field_of_study
+                "field_of_study": cv.major
             },
             "experience": {
                 "current_title": cv.current_job_title,
@@ -520,8 +496,8 @@ def get_applicant_details(
             "resume_quality_score": int(cv.resume_quality_score) if cv.resume_quality_score else 0,
             "availability": cv.availability,
             "salary_expectation": {
-                "min": cv.desired_salary_min,
-                "max": cv.desired_salary_max
+                "min": cv.salary_expectation_min,
+                "max": cv.salary_expectation_max
             }
         },
         "cover_letter": None  # Can be added if stored
@@ -582,7 +558,7 @@ def accept_applicant(
     db.refresh(application)
     
     # Get applicant info for response
-    cv = db.query(CV).filter(CV.user_id == application.user_id).first()
+    cv = ApplicantHydrationService.hydrate_one(db, application).cv
     
     return {
         "success": True,
@@ -646,7 +622,7 @@ def reject_applicant(
     db.refresh(application)
     
     # Get applicant info for response
-    cv = db.query(CV).filter(CV.user_id == application.user_id).first()
+    cv = ApplicantHydrationService.hydrate_one(db, application).cv
     
     return {
         "success": True,
@@ -702,11 +678,9 @@ def get_applicants_summary(
         UserJobInteraction.action.in_(['applied', 'accepted', 'rejected'])
     ).order_by(UserJobInteraction.timestamp.desc()).limit(10).all()
     
+    # One CV query and one job query for all recent applications
     recent_applications = []
-    for app in recent_apps:
-        cv = db.query(CV).filter(CV.user_id == app.user_id).first()
-        job = db.query(SmallJob).filter(SmallJob.id == app.job_id).first()
-        
+    for app, cv, job in ApplicantHydrationService.hydrate(db, recent_apps, include_jobs=True):
         recent_applications.append({
             "application_id": app.event_id,
             "applicant_name": cv.full_name if cv else "Unknown",
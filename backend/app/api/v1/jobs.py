@@ -3,13 +3,17 @@ Jobs API Endpoints
 Handles job listing, search, creation, and management
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
+from app.api.conditional import Conditional
 from app.db.session import get_db
+from app.db.pagination import keyset_page, page_with_cursor
 from app.api.deps import get_current_user
 from app.models.user import User
 from app.services.job_service import JobService
+from app.services.rollup_service import RollupService
 from app.schemas.job import (
     CorporateJobCreate, CorporateJobUpdate, CorporateJobResponse, CorporateJobListResponse,
     SmallJobCreate, SmallJobUpdate, SmallJobResponse, SmallJobListResponse,
@@ -120,7 +124,8 @@ def search_jobs(
     Advanced job search with filters
     
     Search across both corporate and small jobs with multiple filter options:
-    - Query text (searches title, description, skills)
+    - Query text (ranked full-text search over title, skills, category and
+      description; search_mode="ilike" for substring matching)
     - Categories
     - Locations
     - Salary range
@@ -137,6 +142,7 @@ def search_jobs(
         "small_job_matches": results['small_count'],
         "corporate_jobs": results['corporate_jobs'],
         "small_jobs": results['small_jobs'],
+        "ranked": results.get('ranked'),
         "page": search_request.page,
         "page_size": search_request.page_size,
         "has_more": results['total_count'] > (search_request.page * search_request.page_size)
@@ -160,10 +166,17 @@ def list_corporate_jobs(
     min_salary: Optional[float] = None,
     max_salary: Optional[float] = None,
     employment_type: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="false leaves total null"),
+    conditional: Conditional = Depends(),
 ):
     """
     List corporate jobs with filters
     
+    Newest first. Pass `next_cursor` back as `cursor` for the next page
+    (skip still works for offset paging). Responds 304 to If-None-Match
+    when no matching job was added, edited or removed.
+    
     Filter options:
     - company: Company name (exact match) - auto-detected from user if not provided
     - category: Job category/industry
@@ -202,8 +215,22 @@ def list_corporate_jobs(
     if employment_type:
         query = query.filter(CorporateJob.employment_type == employment_type)
     
-    total = query.count()
-    jobs = query.order_by(CorporateJob.posted_date.desc()).offset(skip).limit(limit).all()
+    # Version of the listed jobs - 304 before the page query. With the total
+    # the filtered count doubles as version; without it, skip the COUNT
+    if include_total:
+        count, last_change = query.with_entities(
+            func.count(CorporateJob.job_id), func.max(CorporateJob.updated_at)
+        ).one()
+        total = count
+    else:
+        count, last_change = RollupService.jobs_version(db, company)
+        total = None
+    conditional.check(company, count, last_change, last_modified=last_change)
+    
+    rows = keyset_page(
+        query, limit, CorporateJob.posted_date, CorporateJob.job_id, skip=skip, cursor=cursor
+    ).all()
+    jobs, next_cursor = page_with_cursor(rows, limit, lambda job: (job.posted_date, job.job_id))
     
     # Normalize collar_type and employment_type for schema validation
     employment_type_mapping = {
@@ -229,7 +256,8 @@ def list_corporate_jobs(
         jobs=job_responses,
         page=(skip // limit) + 1,
         page_size=limit,
-        has_more=(skip + limit) < total
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
     )
 
 
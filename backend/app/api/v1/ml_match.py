@@ -24,7 +24,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 from app.services.ml_matching_service import MLMatchingService
 from app.schemas.matching import MatchResponse, JobMatch
-from app.db.session import get_db
+from app.api.deps import run_matching, with_session
 
 # Create router
 router = APIRouter(prefix="/ml/match", tags=["ML Matching"])
@@ -94,8 +94,7 @@ async def get_ml_predictions(
         description="Filter by job type: 'corporate', 'small', or None for both",
         regex="^(corporate|small)$"
     ),
-    top_n: int = Query(20, ge=1, le=100, description="Number of matches to return"),
-    db = Depends(get_db)
+    top_n: int = Query(20, ge=1, le=100, description="Number of matches to return")
 ):
     """
     Get job matches ranked purely by ML model predictions.
@@ -128,11 +127,12 @@ async def get_ml_predictions(
     ```
     """
     try:
-        # Get ML service with database connection
-        ml_service = MLMatchingService(db=db)
+        # Get ML-ranked matches (model load + ranking run off the event loop)
+        def rank(session):
+            ml_service = MLMatchingService(db=session)
+            return ml_service, ml_service.get_ml_ranked_matches(cv_id, job_type, top_n)
         
-        # Get ML-ranked matches
-        matches = ml_service.get_ml_ranked_matches(cv_id, job_type, top_n)
+        ml_service, matches = await run_matching(with_session, rank)
         
         if not matches:
             raise HTTPException(
@@ -196,8 +196,7 @@ async def get_hybrid_matches(
         ge=0.0,
         le=1.0,
         description="Weight for rule-based score (default: 0.4)"
-    ),
-    db = Depends(get_db)
+    )
 ):
     """
     Get job matches ranked by hybrid scoring (DEMO MODE ENABLED).
@@ -265,13 +264,14 @@ async def get_hybrid_matches(
                 detail="ml_weight and rule_weight must sum to 1.0"
             )
         
-        # Get ML service with database connection
-        ml_service = MLMatchingService(db=db)
+        # Get hybrid-ranked matches (model load + ranking run off the event loop)
+        def rank(session):
+            ml_service = MLMatchingService(db=session)
+            return ml_service, ml_service.get_hybrid_ranked_matches(
+                cv_id, job_type, top_n, ml_weight, rule_weight
+            )
         
-        # Get hybrid-ranked matches
-        matches = ml_service.get_hybrid_ranked_matches(
-            cv_id, job_type, top_n, ml_weight, rule_weight
-        )
+        ml_service, matches = await run_matching(with_session, rank)
         
         if not matches:
             raise HTTPException(
@@ -316,7 +316,7 @@ async def get_hybrid_matches(
     summary="Get ML model information",
     description="Returns metadata about the loaded ML model"
 )
-async def get_model_info(db = Depends(get_db)):
+async def get_model_info():
     """
     Get information about the currently loaded ML model.
     
@@ -340,7 +340,7 @@ async def get_model_info(db = Depends(get_db)):
     ```
     """
     try:
-        ml_service = MLMatchingService(db=db)
+        ml_service = await run_matching(with_session, MLMatchingService)
         info = ml_service.get_model_info()
         
         if info['model_loaded']:
@@ -359,6 +359,8 @@ async def get_model_info(db = Depends(get_db)):
             message=message
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting model info: {str(e)}")
 
@@ -514,14 +516,14 @@ def _run_training_pipeline(force: bool = False):
     summary="ML service health check",
     description="Check if ML service is operational"
 )
-async def ml_health_check(db = Depends(get_db)):
+async def ml_health_check():
     """
     Health check for ML matching service.
     
     Returns service status and model information.
     """
     try:
-        ml_service = MLMatchingService(db=db)
+        ml_service = await run_matching(with_session, MLMatchingService)
         info = ml_service.get_model_info()
         
         return {
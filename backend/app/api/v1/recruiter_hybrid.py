@@ -9,7 +9,8 @@ from typing import List, Dict, Any, Union
 import time
 
 from app.db.session import get_db
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, run_matching, with_session
+from app.api.responses import FastJSONResponse, compact_rows
 from app.models.user import User
 from app.services.hybrid_matching_service import HybridMatchingService
 
@@ -22,7 +23,7 @@ async def get_hybrid_matches(
     min_score: float = Query(default=0.0, ge=0.0, le=1.0, description="Minimum hybrid score (0-1)"),
     top_k: int = Query(default=100, ge=1, le=500, description="Maximum number of results"),
     apply_transformation: bool = Query(default=True, description="Apply score transformation"),
-    db: Session = Depends(get_db),
+    compact: bool = Query(default=False, description="Omit per-candidate score breakdowns"),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -39,23 +40,23 @@ async def get_hybrid_matches(
     try:
         start_time = time.time()
         
-        # Initialize the hybrid matching service
-        service = HybridMatchingService(db)
+        # Get matches (off the event loop, with the worker thread's own session)
+        def match(session):
+            return HybridMatchingService(session).match_candidates_hybrid(
+                job_id=job_id,
+                min_score=min_score,
+                top_k=top_k,
+                apply_transformation=apply_transformation
+            )
         
-        # Get matches
-        matches = await service.match_candidates_hybrid(
-            job_id=job_id,
-            min_score=min_score,
-            top_k=top_k,
-            apply_transformation=apply_transformation
-        )
+        matches = await run_matching(with_session, match)
         
         processing_time = time.time() - start_time
         
-        return {
+        return FastJSONResponse({
             "job_id": job_id,
             "total_matches": len(matches),
-            "matches": matches,
+            "matches": compact_rows(matches) if compact else matches,
             "processing_time": round(processing_time, 2),
             "method": "hybrid_matching",
             "weights": {
@@ -64,8 +65,10 @@ async def get_hybrid_matches(
             },
             "model": "all-MiniLM-L6-v2 + BM25",
             "transformation_applied": apply_transformation
-        }
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         raise HTTPException(
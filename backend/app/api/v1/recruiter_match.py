@@ -11,6 +11,7 @@ from typing import List, Optional
 from app.db.session import get_db
 from app.api.deps import get_current_user
 from app.models.user import User
+from app.services.top_k import TopK
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -94,7 +95,7 @@ async def get_job_candidates(
         matching_service = EnhancedMatchingService(db)
         
         # Match each CV against this job
-        candidate_matches = []
+        top = TopK(limit)
         
         for cv in all_cvs:
             try:
@@ -125,7 +126,7 @@ async def get_job_candidates(
                     if 'missing_skills' in job_match:
                         missing_skills = job_match['missing_skills']
                     
-                    candidate_matches.append({
+                    top.push(job_match['final_score'], {
                         'cv_id': cv.cv_id,
                         'full_name': cv.full_name,
                         'current_job_title': cv.current_job_title or 'N/A',
@@ -145,11 +146,8 @@ async def get_job_candidates(
                 print(f"Error matching CV {cv.cv_id}: {str(e)}")
                 continue
         
-        # Sort by match score (highest first)
-        candidate_matches.sort(key=lambda x: x['match_score'], reverse=True)
-        
-        # Limit results
-        candidate_matches = candidate_matches[:limit]
+        # Highest match score first
+        candidate_matches = top.results()
         
         print(f"Found {len(candidate_matches)} matching candidates")
         
@@ -1,14 +1,18 @@
 """
 FAST recruiter matching endpoint using pre-computed matches
 Sub-100ms response time by reading from cache table
+
+Pure reads, so these routes use the async session and never block the event loop
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import List, Optional
 import json
 
-from app.db.session import get_db
+from app.db.session import get_async_db
+from app.api.conditional import Conditional
+from app.api.responses import FastJSONResponse, compact_rows
 from app.api.v1.auth import get_current_user
 
 router = APIRouter()
@@ -19,7 +23,9 @@ async def get_cached_candidates_for_job(
     job_id: str,
     min_score: float = Query(default=0.0, ge=0.0, le=1.0),
     limit: int = Query(default=50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    compact: bool = Query(default=False, description="Omit per-candidate score breakdowns"),
+    conditional: Conditional = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -28,6 +34,9 @@ async def get_cached_candidates_for_job(
     Uses cached matches from job_candidate_matches table
     No real-time computation needed!
     
+    Sends ETag / Last-Modified derived from the job, its cached matches and
+    the matched CVs; repeat requests with If-None-Match get 304 without the candidate query.
+    
     Args:
         job_id: The job to get candidates for
         min_score: Minimum match score (0.0 to 1.0)
@@ -37,12 +46,20 @@ async def get_cached_candidates_for_job(
         List of matched candidates with scores
     """
     try:
-        # Verify job belongs to user's company
-        job = db.execute(text("""
-            SELECT job_id, job_title, company, company_id
-            FROM corporate_jobs
-            WHERE job_id = :job_id
-        """), {"job_id": job_id}).fetchone()
+        # Verify job belongs to user's company (+ version of its cached matches)
+        job = (await db.execute(text("""
+            SELECT j.job_id, j.job_title, j.company, j.company_id, j.updated_at,
+                   v.match_count, v.computed_at, v.cv_updated_at
+            FROM corporate_jobs j
+            CROSS JOIN LATERAL (
+                SELECT COUNT(*) AS match_count, MAX(m.computed_at) AS computed_at,
+                       MAX(c.updated_at) AS cv_updated_at
+                FROM job_candidate_matches m
+                LEFT JOIN cvs c ON c.cv_id = m.cv_id
+                WHERE m.job_id = j.job_id
+            ) v
+            WHERE j.job_id = :job_id
+        """), {"job_id": job_id})).fetchone()
         
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
@@ -55,8 +72,13 @@ async def get_cached_candidates_for_job(
                 detail="You can only view candidates for your company's jobs"
             )
         
+        # 304 when the job, its cached matches and the matched CVs (name,
+        # contact, title are embedded) are unchanged since the client's copy
+        changes = [stamp for stamp in (job[4], job[6], job[7]) if stamp is not None]
+        conditional.check(job[4], job[5], job[6], job[7], last_modified=max(changes) if changes else None)
+        
         # Get pre-computed matches from cache
-        matches = db.execute(text("""
+        matches = (await db.execute(text("""
             SELECT 
                 m.cv_id,
                 m.match_score,
@@ -87,7 +109,7 @@ async def get_cached_candidates_for_job(
             "job_id": job_id,
             "min_score": min_score,
             "limit": limit
-        }).fetchall()
+        })).fetchall()
         
         # Format results
         candidates = []
@@ -117,16 +139,16 @@ async def get_cached_candidates_for_job(
                 }
             })
         
-        return {
+        return conditional.apply(FastJSONResponse({
             "job_id": job_id,
             "job_title": job[1],
             "company": job[2],
             "total_matches": len(candidates),
             "min_score": min_score,
-            "candidates": candidates,
+            "candidates": compact_rows(candidates) if compact else candidates,
             "cached": True,
             "response_time": "<100ms"
-        }
+        }))
         
     except HTTPException:
         raise
@@ -137,7 +159,7 @@ async def get_cached_candidates_for_job(
 @router.get("/recruiter/job/{job_id}/candidates/stats")
 async def get_job_candidate_stats(
     job_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -150,11 +172,11 @@ async def get_job_candidate_stats(
     """
     try:
         # Verify job exists and belongs to user
-        job = db.execute(text("""
+        job = (await db.execute(text("""
             SELECT job_id, job_title, company, company_id
             FROM corporate_jobs
             WHERE job_id = :job_id
-        """), {"job_id": job_id}).fetchone()
+        """), {"job_id": job_id})).fetchone()
         
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
@@ -164,7 +186,7 @@ async def get_job_candidate_stats(
             raise HTTPException(status_code=403, detail="Access denied")
         
         # Get stats
-        stats = db.execute(text("""
+        stats = (await db.execute(text("""
             SELECT 
                 COUNT(*) as total,
                 COUNT(CASE WHEN match_score >= 0.7 THEN 1 END) as excellent,
@@ -176,7 +198,7 @@ async def get_job_candidate_stats(
                 MAX(computed_at) as last_updated
             FROM job_candidate_matches
             WHERE job_id = :job_id
-        """), {"job_id": job_id}).fetchone()
+        """), {"job_id": job_id})).fetchone()
         
         return {
             "job_id": job_id,
@@ -16,10 +16,12 @@ from sqlalchemy import text
 from typing import List, Dict, Optional
 import time
 
+from app.api.responses import FastJSONResponse, compact_rows
 from app.db.session import get_db
 from app.models.corporate_job import CorporateJob
 from app.models.cv import CV
 from app.services.enhanced_matching_service import EnhancedMatchingService
+from app.services.single_flight import match_flights
 
 router = APIRouter()
 
@@ -48,6 +50,7 @@ def get_matched_candidates(
     db: Session = Depends(get_db),
     limit: int = Query(default=20, ge=1, le=100),
     min_score: float = Query(default=0.0, ge=0.0, le=1.0),
+    compact: bool = Query(default=False, description="Omit per-candidate score breakdowns"),
 ):
     """
     Get top matched candidates for a specific job (FAST VERSION)
@@ -107,7 +110,11 @@ def get_matched_candidates(
         print(f"   📍 Filtering by province: {job.location_province}")
     
     # Get matches using the new match_job method
-    matches = matching_service.match_job(
+    # (concurrent requests for the same job share one run)
+    flight_key = ('enhanced', job_id, EnhancedMatchingService.ENGINE_VERSION, job.location_province, 500)
+    matches = match_flights.do(
+        flight_key,
+        matching_service.match_job,
         job_id=job_id,
         job_type='corporate',
         filters=filters,
@@ -156,14 +163,14 @@ def get_matched_candidates(
     print(f"   Matches found: {len(matched_candidates)}")
     print(f"   Time: {elapsed:.2f}s")
     
-    return {
+    return FastJSONResponse({
         "job_id": job.job_id,
         "job_title": job.title,
         "company": job.company,
         "total_candidates": len(matched_candidates),
-        "matched_candidates": matched_candidates,
+        "matched_candidates": compact_rows(matched_candidates) if compact else matched_candidates,
         "processing_time_seconds": round(elapsed, 2),
-    }
+    })
 
 
 @router.get("/job/{job_id}/candidates/stats", response_model=Dict)
@@ -6,9 +6,10 @@ Uses new GatedMatchingService with hard gates
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.session import get_db
-from app.api.deps import get_current_user
+from typing import Dict, List, Optional, Tuple
+from app.api.deps import get_current_user, run_matching, with_session
+from app.api.responses import FastJSONResponse, compact_rows
+from app.services.single_flight import match_flights
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -26,7 +27,7 @@ class CandidateMatch(BaseModel):
     match_score: float  # Percentage (0-100)
     matched_skills: List[str]
     missing_skills: List[str]
-    explanation: str
+    explanation: Optional[str] = None  # Omitted in compact mode
 
 
 class JobMatchResponse(BaseModel):
@@ -38,6 +39,22 @@ class JobMatchResponse(BaseModel):
     matched_candidates: List[CandidateMatch]
 
 
+def _job_matches(session: Session, job_id: str, min_score: float, limit: int) -> Optional[Tuple[str, str, List[Dict]]]:
+    """(job title, company, gated matches), or None if the job does not exist"""
+    from app.models.corporate_job import CorporateJob
+    from app.services.gated_matching_service import match_job_with_gates
+    
+    job = session.query(CorporateJob.title, CorporateJob.company).filter(CorporateJob.job_id == job_id).first()
+    if not job:
+        return None
+    
+    print(f"🔍 Matching candidates for job: {job.title}")
+    print(f"   Min score threshold: {min_score * 100}%")
+    
+    matches = match_job_with_gates(session, job_id=job_id, min_score=min_score, limit=limit)
+    return job.title, job.company, matches
+
+
 @router.get(
     "/job/{job_id}/candidates",
     response_model=JobMatchResponse,
@@ -47,7 +64,7 @@ async def get_job_candidates(
     job_id: str,
     limit: int = Query(default=20, ge=1, le=100),
     min_score: float = Query(default=0.45, ge=0.0, le=1.0, description="Minimum match score (0-1)"),
-    db: Session = Depends(get_db),
+    compact: bool = Query(default=False, description="Omit per-candidate explanations"),
     current_user = Depends(get_current_user)
 ):
     """
@@ -64,54 +81,56 @@ async def get_job_candidates(
     - Quality: Only relevant candidates
     """
     try:
-        from app.models.corporate_job import CorporateJob
-        from app.services.gated_matching_service import match_job_with_gates
-        
-        # Get job details
-        job = db.query(CorporateJob).filter(CorporateJob.job_id == job_id).first()
-        
-        if not job:
-            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
-        
-        print(f"🔍 Matching candidates for job: {job.title}")
-        print(f"   Min score threshold: {min_score * 100}%")
+        from app.services.gated_matching_service import GatedMatchingService
         
-        # Use gated matching service
-        matches = match_job_with_gates(
-            db=db,
+        # Job lookup and gated matching run off the event loop on their own
+        # session; concurrent requests for the same job share one run
+        flight_key = ('gated', job_id, GatedMatchingService.ENGINE_VERSION, min_score, limit)
+        result = await match_flights.do_async(
+            flight_key,
+            run_matching,
+            with_session,
+            _job_matches,
             job_id=job_id,
             min_score=min_score,
             limit=limit
         )
         
+        if result is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        job_title, company, matches = result
+        
         print(f"✅ Found {len(matches)} candidates passing gates")
         
-        # Convert to response model
+        # Shape rows as CandidateMatch (trusted service output, so no
+        # per-row model validation; JobMatchResponse documents the schema)
         candidates = [
-            CandidateMatch(
-                cv_id=m['cv_id'],
-                full_name=m['full_name'],
-                current_job_title=m['current_job_title'],
-                total_years_experience=m['total_years_experience'],
-                city=m['city'],
-                email=m['email'],
-                phone=m['phone'] or '',
-                match_score=m['match_score'],
-                matched_skills=m['matched_skills'],
-                missing_skills=m['missing_skills'],
-                explanation=m['explanation']
-            )
+            {
+                'cv_id': m['cv_id'],
+                'full_name': m['full_name'],
+                'current_job_title': m['current_job_title'],
+                'total_years_experience': m['total_years_experience'],
+                'city': m['city'],
+                'email': m['email'],
+                'phone': m['phone'] or '',
+                'match_score': m['match_score'],
+                'matched_skills': m['matched_skills'],
+                'missing_skills': m['missing_skills'],
+                'explanation': m['explanation']
+            }
             for m in matches
         ]
         
-        return JobMatchResponse(
-            job_id=job_id,
-            job_title=job.title,
-            company=job.company if hasattr(job, 'company') else 'N/A',
-            total_candidates=len(candidates),
-            matched_candidates=candidates
-        )
+        return FastJSONResponse({
+            'job_id': job_id,
+            'job_title': job_title,
+            'company': company or 'N/A',
+            'total_candidates': len(candidates),
+            'matched_candidates': compact_rows(candidates) if compact else candidates
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Error matching candidates: {str(e)}")
         import traceback
@@ -122,27 +141,15 @@ async def get_job_candidates(
         )
 
 
-@router.get(
-    "/job/{job_id}/candidates/debug",
-    summary="Debug endpoint - shows gating stats"
-)
-async def debug_job_matching(
-    job_id: str,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
-):
-    """
-    Debug endpoint to see how many candidates pass each gate.
-    
-    Useful for understanding why certain candidates are excluded.
-    """
+def _gate_stats(db: Session, job_id: str) -> Optional[Dict]:
+    """Per-gate pass counts for a job, or None if the job does not exist"""
     from app.models.corporate_job import CorporateJob
     from app.models.cv import CV
     from app.services.gated_matching_service import GatedMatchingService
     
     job = db.query(CorporateJob).filter(CorporateJob.job_id == job_id).first()
     if not job:
-        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        return None
     
     service = GatedMatchingService(db)
     
@@ -188,3 +195,23 @@ async def debug_job_matching(
             "gate_2": "Score < 45% → excluded"
         }
     }
+
+
+@router.get(
+    "/job/{job_id}/candidates/debug",
+    summary="Debug endpoint - shows gating stats"
+)
+async def debug_job_matching(
+    job_id: str,
+    current_user = Depends(get_current_user)
+):
+    """
+    Debug endpoint to see how many candidates pass each gate.
+    
+    Useful for understanding why certain candidates are excluded.
+    """
+    # Scans every CV: run it off the event loop on its own session
+    stats = await run_matching(with_session, _gate_stats, job_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return stats
@@ -20,10 +20,12 @@ import time
 from datetime import datetime, timedelta
 from collections import OrderedDict
 
+from app.api.responses import FastJSONResponse, compact_rows, serialization_stats
 from app.db.session import get_db
 from app.models.corporate_job import CorporateJob
 from app.models.cv import CV
 from app.services.enhanced_matching_service import EnhancedMatchingService
+from app.services.single_flight import match_flights
 
 router = APIRouter()
 
@@ -93,10 +95,19 @@ def health_check():
     return {
         "status": "healthy",
         "service": "recruiter-matching-optimized",
-        "cache_stats": match_cache.stats()
+        "cache_stats": match_cache.stats(),
+        "in_flight_stats": match_flights.stats(),
+        "serialization_stats": serialization_stats()
     }
 
 
+def _match_response(result: Dict, compact: bool) -> FastJSONResponse:
+    """Render a (possibly cached) result; compact mode copies, never mutates it"""
+    if compact:
+        result = {**result, "matched_candidates": compact_rows(result["matched_candidates"])}
+    return FastJSONResponse(result)
+
+
 @router.get("/job/{job_id}/candidates", response_model=Dict)
 def get_matched_candidates_optimized(
     job_id: str,
@@ -104,6 +115,7 @@ def get_matched_candidates_optimized(
     limit: int = Query(default=20, ge=1, le=100),
     min_score: float = Query(default=0.0, ge=0.0, le=1.0),
     use_cache: bool = Query(default=True),
+    compact: bool = Query(default=False, description="Omit per-candidate score breakdowns"),
 ):
     """
     OPTIMIZED: Get top matched candidates with caching
@@ -116,6 +128,18 @@ def get_matched_candidates_optimized(
     
     Expected: 2-3 seconds (cached: <100ms)
     """
+    result = match_candidates_optimized(job_id, db, limit, min_score, use_cache)
+    return _match_response(result, compact)
+
+
+def match_candidates_optimized(
+    job_id: str,
+    db: Session,
+    limit: int,
+    min_score: float,
+    use_cache: bool
+) -> Dict:
+    """Cached, early-terminating candidate matching behind the optimized routes"""
     start_time = time.time()
     
     # Generate cache key
@@ -169,8 +193,11 @@ def get_matched_candidates_optimized(
     if job.location_province:
         filters['province'] = job.location_province
     
-    # Get matches
-    matches = matching_service.match_job(
+    # Get matches (concurrent requests for the same job share one run)
+    flight_key = ('enhanced', job_id, EnhancedMatchingService.ENGINE_VERSION, job.location_province, 100)
+    matches = match_flights.do(
+        flight_key,
+        matching_service.match_job,
         job_id=job_id,
         job_type='corporate',
         filters=filters,
@@ -258,6 +285,7 @@ def get_matched_candidates_optimized(
 def get_matched_candidates_quick(
     job_id: str,
     db: Session = Depends(get_db),
+    compact: bool = Query(default=False, description="Omit per-candidate score breakdowns"),
 ):
     """
     ULTRA-FAST: Get top 10 matches only (for quick preview)
@@ -269,13 +297,14 @@ def get_matched_candidates_quick(
     
     Expected: <1 second
     """
-    return get_matched_candidates_optimized(
+    result = match_candidates_optimized(
         job_id=job_id,
         db=db,
         limit=10,
         min_score=0.0,
         use_cache=True
     )
+    return _match_response(result, compact)
 
 
 @router.post("/cache/clear")
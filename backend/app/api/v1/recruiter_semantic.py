@@ -12,7 +12,10 @@ import numpy as np
 
 from app.db.session import get_db
 from app.api.deps import get_current_user
+from app.api.responses import FastJSONResponse, compact_rows
 from app.models.user import User
+from app.services.cv_loader import load_cvs_by_ids
+from app.services.top_k import TopK
 
 router = APIRouter()
 
@@ -92,37 +95,20 @@ class FastSemanticMatchingService:
         return cv_embeddings
     
     def get_cv_details(self, db: Session, cv_ids: List[str]) -> Dict[str, Dict[str, Any]]:
-        """Get CV details for matched candidates"""
-        if not cv_ids:
-            return {}
-        
-        placeholders = ','.join([f"'{cv_id}'" for cv_id in cv_ids])
-        
-        sql = text(f"""
-        SELECT 
-            cv_id, full_name, email, phone,
-            current_job_title, total_years_experience,
-            city, province, education_level,
-            skills_technical, skills_soft
-        FROM cvs
-        WHERE cv_id IN ({placeholders});
-        """)
-        
-        results = db.execute(sql)
-        
+        """Get CV details for matched candidates (one bound-array query)"""
         cv_details = {}
-        for row in results:
-            cv_details[row[0]] = {
-                "cv_id": row[0],
-                "full_name": row[1],
-                "email": row[2],
-                "phone": row[3],
-                "current_position": row[4],
-                "years_of_experience": row[5],
-                "location": f"{row[6]}, {row[7]}" if row[6] and row[7] else (row[6] or row[7] or "Unknown"),
-                "education": row[8],
-                "skills_technical": row[9],
-                "skills_soft": row[10]
+        for cv_id, row in load_cvs_by_ids(db, cv_ids).items():
+            cv_details[cv_id] = {
+                "cv_id": cv_id,
+                "full_name": row.full_name,
+                "email": row.email,
+                "phone": row.phone,
+                "current_position": row.current_job_title,
+                "years_of_experience": row.total_years_experience,
+                "location": f"{row.city}, {row.province}" if row.city and row.province else (row.city or row.province or "Unknown"),
+                "education": row.education_level,
+                "skills_technical": row.skills_technical,
+                "skills_soft": row.skills_soft
             }
         
         return cv_details
@@ -148,8 +134,8 @@ class FastSemanticMatchingService:
         # 2. Get all CV embeddings (deduplicated)
         cv_embeddings = self.get_all_cv_embeddings(db)
         
-        # 3. Compute similarities
-        similarities = []
+        # 3. Compute similarities (bounded top-K)
+        top = TopK(top_k)
         
         for cv_data in cv_embeddings:
             cv_id = cv_data["cv_id"]
@@ -170,18 +156,15 @@ class FastSemanticMatchingService:
             # Find matched skills (for display only)
             matched_skills = [s for s in cv_skills if s in job_skills]
             
-            similarities.append({
+            top.push(sim_score, {
                 "cv_id": cv_id,
                 "similarity_score": sim_score,
                 "matched_skills": matched_skills,
                 "total_cv_skills": len(cv_skills)
             })
         
-        # 4. Sort by similarity score
-        similarities.sort(key=lambda x: x["similarity_score"], reverse=True)
-        
-        # 5. Take top K
-        top_matches = similarities[:top_k]
+        # 4-5. Top K by similarity score
+        top_matches = top.results()
         
         # 6. Get CV details
         cv_ids = [m["cv_id"] for m in top_matches]
@@ -232,6 +215,7 @@ async def get_semantic_matches(
     job_id: str,
     min_score: float = Query(default=0.0, ge=0.0, le=1.0, description="Minimum similarity score (0-1)"),
     top_k: int = Query(default=100, ge=1, le=500, description="Maximum number of results"),
+    compact: bool = Query(default=False, description="Omit per-candidate match reasons"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -258,14 +242,14 @@ async def get_semantic_matches(
         
         processing_time = time.time() - start_time
         
-        return {
+        return FastJSONResponse({
             "job_id": job_id,
             "total_matches": len(matches),
-            "matches": matches,
+            "matches": compact_rows(matches) if compact else matches,
             "processing_time": round(processing_time, 2),
             "method": "semantic_matching",
             "model": "all-MiniLM-L6-v2"
-        }
+        })
         
     except Exception as e:
         raise HTTPException(
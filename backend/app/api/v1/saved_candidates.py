@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, select
 from typing import List, Optional
 from datetime import datetime
 import json
 
-from app.db.session import get_db
+from app.api.conditional import Conditional
+from app.db.session import get_db, get_async_db
 from app.api.deps import get_current_user
 from app.models.saved_candidate import SavedCandidate
 from app.models.cv import CV
+from app.db.pagination import keyset_after, page_with_cursor
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/saved-candidates", tags=["saved_candidates"])
@@ -29,6 +32,21 @@ class SaveCandidateResponse(BaseModel):
     saved_candidate_id: Optional[int] = None
 
 
+# CV columns returned with each saved candidate (cv_id comes from SavedCandidate)
+SAVED_CV_COLUMNS = (
+    CV.full_name,
+    CV.email,
+    CV.phone,
+    CV.current_job_title,
+    CV.city,
+    CV.province,
+    CV.total_years_experience,
+    CV.skills_technical,
+    CV.skills_soft,
+    CV.education_level,
+)
+
+
 class UpdateStageRequest(BaseModel):
     stage: str  # saved, invited, screening, interview, offer, hired, rejected
 
@@ -115,54 +133,88 @@ async def list_saved_candidates(
     current_user = Depends(get_current_user),
     stage: Optional[str] = None,
     limit: int = Query(default=100, le=500),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    conditional: Conditional = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all saved candidates for a recruiter"""
+    """
+    Get saved candidates for a recruiter, newest first.
+    
+    One joined query per page; pass `next_cursor` back as `cursor` for the
+    next page (keyset on saved_date, id). Responds 304 to If-None-Match
+    until a candidate is saved, updated or removed, or a saved CV is edited.
+    """
     
     recruiter_id = str(current_user.id)
     
-    query = db.query(SavedCandidate).filter(
+    # Saved rows plus the embedded CV fields (edits bump cvs.updated_at)
+    version = select(
+        func.count(SavedCandidate.id), func.max(SavedCandidate.last_updated), func.max(CV.updated_at)
+    ).outerjoin(
+        CV, CV.cv_id == SavedCandidate.cv_id
+    ).where(
+        SavedCandidate.recruiter_id == recruiter_id
+    )
+    if stage:
+        version = version.where(SavedCandidate.stage == stage)
+    count, last_saved, last_cv_change = (await db.execute(version)).one()
+    changes = [stamp for stamp in (last_saved, last_cv_change) if stamp is not None]
+    last_change = max(changes) if changes else None
+    conditional.check(recruiter_id, count, last_saved, last_cv_change, last_modified=last_change)
+    
+    query = select(SavedCandidate, *SAVED_CV_COLUMNS).join(
+        CV, CV.cv_id == SavedCandidate.cv_id
+    ).where(
         SavedCandidate.recruiter_id == recruiter_id
     )
     
     if stage:
-        query = query.filter(SavedCandidate.stage == stage)
+        query = query.where(SavedCandidate.stage == stage)
+    
+    after = keyset_after(cursor, SavedCandidate.saved_date, SavedCandidate.id)
+    if after is not None:
+        query = query.where(after)
     
-    saved_candidates = query.order_by(SavedCandidate.saved_date.desc()).limit(limit).all()
+    rows = (await db.execute(
+        query.order_by(SavedCandidate.saved_date.desc(), SavedCandidate.id.desc()).limit(limit + 1)
+    )).all()
+    rows, next_cursor = page_with_cursor(
+        rows, limit, lambda row: (row.SavedCandidate.saved_date, row.SavedCandidate.id)
+    )
     
-    # Fetch CV details for each saved candidate
     result = []
-    for saved in saved_candidates:
-        cv = db.query(CV).filter(CV.cv_id == saved.cv_id).first()
-        if cv:
-            result.append({
-                "saved_id": saved.id,
-                "cv_id": saved.cv_id,
-                "full_name": cv.full_name,
-                "email": cv.email,
-                "phone": cv.phone,
-                "current_job_title": cv.current_job_title,
-                "city": cv.city,
-                "province": cv.province,
-                "total_years_experience": cv.total_years_experience,
-                "skills_technical": cv.skills_technical,
-                "skills_soft": cv.skills_soft,
-                "education_level": cv.education_level,
-                "match_score": saved.match_score,
-                "stage": saved.stage,
-                "saved_date": saved.saved_date.isoformat() if saved.saved_date else None,
-                "linked_job": saved.job_id,
-                "company_name": saved.company_name,
-                "tags": json.loads(saved.tags) if saved.tags else [],
-                "notes_count": saved.notes_count,
-                "last_contact": saved.last_contact.isoformat() if saved.last_contact else None,
-                "contact_count": saved.contact_count
-            })
+    for row in rows:
+        saved = row.SavedCandidate
+        result.append({
+            "saved_id": saved.id,
+            "cv_id": saved.cv_id,
+            "full_name": row.full_name,
+            "email": row.email,
+            "phone": row.phone,
+            "current_job_title": row.current_job_title,
+            "city": row.city,
+            "province": row.province,
+            "total_years_experience": row.total_years_experience,
+            "skills_technical": row.skills_technical,
+            "skills_soft": row.skills_soft,
+            "education_level": row.education_level,
+            "match_score": saved.match_score,
+            "stage": saved.stage,
+            "saved_date": saved.saved_date.isoformat() if saved.saved_date else None,
+            "linked_job": saved.job_id,
+            "company_name": saved.company_name,
+            "tags": json.loads(saved.tags) if saved.tags else [],
+            "notes_count": saved.notes_count,
+            "last_contact": saved.last_contact.isoformat() if saved.last_contact else None,
+            "contact_count": saved.contact_count
+        })
     
     return {
         "success": True,
         "count": len(result),
-        "candidates": result
+        "candidates": result,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor
     }
 
 
@@ -203,18 +255,18 @@ async def update_candidate_stage(
 async def check_if_saved(
     cv_id: str,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Check if a candidate is saved"""
     
     recruiter_id = str(current_user.id)
     
-    saved_candidate = db.query(SavedCandidate).filter(
+    saved_candidate = (await db.scalars(select(SavedCandidate).where(
         and_(
             SavedCandidate.cv_id == cv_id,
             SavedCandidate.recruiter_id == recruiter_id
         )
-    ).first()
+    ))).first()
     
     return {
         "is_saved": saved_candidate is not None,
@@ -0,0 +1,129 @@
+"""
+Principal Cache - Verified bearer tokens -> authenticated principal
+===================================================================
+get_current_user used to verify the JWT and query corp_users (then users)
+on every request, and recruiter pages fire many requests with the same
+token. Principals are cached per verified token, i.e. per (sub, exp), for
+AUTH_CACHE_TTL_SECONDS and never past the token's own expiry:
+
+    principal = principal_cache.get(token)
+    if principal is None:
+        ...verify token, load account...
+        principal_cache.put(token, sub, exp, principal)
+
+Entries are immutable snapshots: CompanyUser instances, or a UserSnapshot
+with the column values of a User (attach_user() turns it back into a
+session-bound User without a query).
+
+ORM updates/deletes of User and CorpUser (deactivation, company_name
+edits) invalidate that account automatically; call
+invalidate_principal(user_id) after editing an account outside the ORM
+(raw SQL, Query.update).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.models.corp_user import CorpUser
+from app.models.user import User
+
+
+class UserSnapshot(NamedTuple):
+    """Column values of a User row"""
+    values: Dict[str, Any]
+
+
+class _Entry(NamedTuple):
+    sub: str
+    expires_at: float
+    principal: Any
+
+
+def snapshot_user(user: User) -> UserSnapshot:
+    return UserSnapshot({attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+
+
+def attach_user(db: Session, snapshot: UserSnapshot) -> User:
+    """A User bound to `db` built from a snapshot (no SELECT)."""
+    user = User(**snapshot.values)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+class PrincipalCache:
+    """Thread-safe TTL + LRU map of token -> principal, invalidated per subject"""
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tokens_by_sub: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[Any]:
+        if settings.AUTH_CACHE_TTL_SECONDS <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                self._drop(token)
+                return None
+            self._entries.move_to_end(token)
+            return entry.principal
+
+    def put(self, token: str, sub: str, exp: Optional[float], principal: Any):
+        if settings.AUTH_CACHE_TTL_SECONDS <= 0:
+            return
+        expires_at = time.time() + settings.AUTH_CACHE_TTL_SECONDS
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        with self._lock:
+            self._drop(token)
+            self._entries[token] = _Entry(sub, expires_at, principal)
+            self._tokens_by_sub.setdefault(sub, set()).add(token)
+            while len(self._entries) > settings.AUTH_CACHE_MAX_ENTRIES:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, sub: Optional[str] = None):
+        """Forget cached principals for one subject (None = everyone)."""
+        with self._lock:
+            if sub is None:
+                self._entries.clear()
+                self._tokens_by_sub.clear()
+                return
+            for token in self._tokens_by_sub.pop(str(sub), set()):
+                self._entries.pop(token, None)
+
+    def _drop(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is not None:
+            tokens = self._tokens_by_sub.get(entry.sub)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens_by_sub[entry.sub]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+principal_cache = PrincipalCache()
+
+
+def invalidate_principal(user_id: Optional[Any] = None):
+    """Drop cached principals of an account (None = all accounts)."""
+    principal_cache.invalidate(None if user_id is None else str(user_id))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+@event.listens_for(CorpUser, "after_update")
+@event.listens_for(CorpUser, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    invalidate_principal(target.id)
@@ -0,0 +1,159 @@
+"""
+Keyset Pagination - Opaque cursors over (sort key, primary key)
+===============================================================
+OFFSET pagination makes the database scan and discard every skipped row.
+Keyset pagination instead remembers the last row of the page and asks for
+rows strictly after it:
+
+    query = query.where(keyset_after(cursor, SavedCandidate.saved_date, SavedCandidate.id))
+    rows = db.execute(query.order_by(SavedCandidate.saved_date.desc(),
+                                     SavedCandidate.id.desc()).limit(limit + 1)).all()
+    rows, next_cursor = page_with_cursor(rows, limit, lambda r: (r.saved_date, r.id))
+
+`keyset_page` wraps the first two steps for list endpoints that still accept
+`skip` from older clients. Cursors are URL-safe base64 JSON; clients pass
+them back unchanged.
+
+For large filtered lists `estimated_count` returns the planner's row
+estimate instead of running an exact COUNT(*).
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for the key values of the last row on a page."""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Key values from a cursor; raises 400 for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list):
+            raise ValueError("cursor must encode a list")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {e}"
+        )
+
+
+def keyset_after(cursor: Optional[str], *columns, descending: bool = True) -> Optional[ColumnElement]:
+    """
+    WHERE clause selecting rows after the cursor in (columns...) order.
+
+    Uses a row-value comparison, which PostgreSQL serves from a composite
+    index on the same columns. Expects (sort key, primary key) with
+    PostgreSQL's default NULL placement (first in DESC, last in ASC).
+
+    Returns None when there is no cursor (first page).
+    """
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    if len(values) != len(columns):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor: wrong number of keys"
+        )
+
+    if values[0] is None:
+        # NULL sort keys come first (DESC) or last (ASC); continue by pk among
+        # them, then (DESC only) move on to every non-NULL key
+        sort_column, pk_column, pk_value = columns[0], columns[-1], values[-1]
+        within_nulls = and_(sort_column.is_(None), pk_column < pk_value if descending else pk_column > pk_value)
+        return or_(within_nulls, sort_column.isnot(None)) if descending else within_nulls
+
+    if descending:
+        return tuple_(*columns) < tuple_(*values)
+    # ASC: NULL sort keys come after every non-NULL key
+    return or_(tuple_(*columns) > tuple_(*values), columns[0].is_(None))
+
+
+def keyset_page(
+    query,
+    limit: int,
+    *columns,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    descending: bool = True
+):
+    """
+    Order a Query/Select by (columns...) and fetch one page plus a look-ahead row.
+
+    With a cursor the page continues after it and `skip` is ignored; without
+    one `skip` is applied as OFFSET so offset-paging clients keep working.
+    Pass the fetched rows through page_with_cursor.
+    """
+    after = keyset_after(cursor, *columns, descending=descending)
+    if after is not None:
+        query = query.filter(after)
+    elif skip:
+        query = query.offset(skip)
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    return query.order_by(*ordering).limit(limit + 1)
+
+
+def page_with_cursor(
+    rows: Sequence[Any],
+    limit: int,
+    key: Callable[[Any], Tuple]
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim a `limit + 1` fetch to one page.
+
+    Returns:
+        (rows on this page, cursor for the next page or None on the last page)
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
+
+
+def estimated_count(db: Session, statement) -> int:
+    """
+    Planner row estimate for a SELECT, read from EXPLAIN without running it.
+
+    Approximate by design (depends on ANALYZE statistics); use where an
+    exact COUNT(*) would cost a second pass over every matching row.
+    """
+    connection = db.connection()
+    compiled = statement.compile(
+        dialect=connection.dialect,
+        compile_kwargs={"render_postcompile": True}
+    )
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
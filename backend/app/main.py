@@ -1,6 +1,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.db.session import SessionLocal, dispose_async_engine
+from app.services.cv_snapshot import build_cv_snapshot
 from app.api.v1 import (
     auth, jobs, match, cv, candidate, employer, application, 
     ml_match, corporate, recruiter_match_fast, recruiter_match_optimized, 
@@ -23,6 +25,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def preload_cv_snapshot():
+    """Build the shared CV snapshot before the first matching request"""
+    if not settings.CV_SNAPSHOT_PRELOAD:
+        return
+    db = SessionLocal()
+    try:
+        build_cv_snapshot(db)
+    except Exception as e:
+        # Matchers build it lazily on first use instead
+        print(f"⚠️  CV snapshot preload failed: {e}")
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+async def close_async_pool():
+    """Release pooled async database connections"""
+    await dispose_async_engine()
+
 # Health check
 @app.get("/")
 def root():
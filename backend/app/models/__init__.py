@@ -10,6 +10,8 @@ from app.models.industry_transition import IndustryTransition
 from app.models.user_job_interaction import UserJobInteraction
 from app.models.match_feedback import MatchFeedback
 from app.models.user import User
+from app.models.corp_user import CorpUser
+from app.models.job_stats_rollup import JobStatsRollup
 
 __all__ = [
     "CV",
@@ -21,4 +23,6 @@ __all__ = [
     "UserJobInteraction",
     "MatchFeedback",
     "User",
+    "CorpUser",
+    "JobStatsRollup",
 ]
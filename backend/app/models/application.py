@@ -1,7 +1,7 @@
 """
 Application Model - Job applications from candidates
 """
-from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -48,5 +48,11 @@ class Application(Base):
     rating = Column(Integer)  # 1-5 stars
     tags = Column(JSONB)  # Custom tags for organization
     
+    __table_args__ = (
+        # Keyset pagination: newest first, overall and per job
+        Index('ix_applications_applied_at_id', 'applied_at', 'id'),
+        Index('ix_applications_job_applied_at_id', 'job_id', 'applied_at', 'id'),
+    )
+    
     def __repr__(self):
         return f"<Application(id={self.id}, cv_id={self.cv_id}, job_id={self.job_id}, status={self.status})>"
@@ -3,7 +3,7 @@ Corporate User Model - Separate from job seekers
 """
 from sqlalchemy import Boolean, Column, Integer, String, DateTime
 from sqlalchemy.sql import func
-from app.database import Base
+from app.db.session import Base
 
 
 class CorpUser(Base):
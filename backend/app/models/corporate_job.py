@@ -1,12 +1,22 @@
 """
 Corporate Job Model - Traditional employment opportunities
 """
-from sqlalchemy import Column, String, Integer, Float, Date, Text, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, String, Integer, Float, Date, Text, DateTime, ForeignKey, Computed, Index
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from datetime import datetime
 from app.db.session import Base
 
 
+# Weighted full-text document: title > skills/category > description
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(required_skills, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(category, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
 class CorporateJob(Base):
     __tablename__ = "corporate_jobs"
     
@@ -56,6 +66,19 @@ class CorporateJob(Base):
     company_size = Column(String)
     industry_sector = Column(String, index=True)
     
+    # Full-text search (generated by PostgreSQL, not loaded with the row)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+    
+    __table_args__ = (
+        Index('ix_corporate_jobs_search_vector', 'search_vector', postgresql_using='gin'),
+        # Keyset pagination of job lists
+        Index('ix_corporate_jobs_posted_date_job_id', 'posted_date', 'job_id'),
+        Index('ix_corporate_jobs_company_created_at_job_id', 'company', 'created_at', 'job_id'),
+        # Newest change per company / overall (job list validators)
+        Index('ix_corporate_jobs_company_updated_at', 'company', 'updated_at'),
+        Index('ix_corporate_jobs_updated_at', 'updated_at'),
+    )
+    
     def __repr__(self):
         return f"<CorporateJob(job_id={self.job_id}, title={self.title}, status={self.status})>"
     
@@ -1,11 +1,16 @@
 """
 CV Model - Candidate resumes/profiles
 """
-from sqlalchemy import Column, String, Integer, Float, Date, Text, ARRAY, JSON
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, Text, ARRAY, JSON, Index
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
 from app.db.session import Base
 
 
+# Columns searched by recruiter CV search (pg_trgm GIN indexed)
+SEARCH_COLUMNS = ('full_name', 'current_job_title', 'skills_technical', 'skills_soft')
+
+
 class CV(Base):
     __tablename__ = "cvs"
     
@@ -54,5 +59,17 @@ class CV(Base):
     # Quality score
     resume_quality_score = Column(Float)
     
+    # Change marker for the matchers' CV snapshot (also bumped by a
+    # BEFORE UPDATE trigger, so raw SQL and scripts are picked up)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    __table_args__ = (
+        *(
+            Index(f'ix_cvs_{column}_trgm', column, postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+            for column in SEARCH_COLUMNS
+        ),
+        Index('ix_cvs_updated_at', 'updated_at'),
+    )
+    
     def __repr__(self):
         return f"<CV(cv_id={self.cv_id}, name={self.full_name})>"
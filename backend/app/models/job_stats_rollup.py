@@ -0,0 +1,48 @@
+"""
+Job Stats Rollup Model - Pre-aggregated dashboard counters per job
+Maintained incrementally by the job and application write paths
+"""
+from sqlalchemy import Column, String, Integer, Float, DateTime, Index
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class JobStatsRollup(Base):
+    """
+    One row per job with application funnel counters.
+    
+    Corporate job attributes (company, status, category, location) are copied
+    in so company dashboards can be answered from this table alone. Rows for
+    jobs that are not corporate jobs only carry application counters.
+    """
+    __tablename__ = "job_stats_rollups"
+    
+    job_id = Column(String, primary_key=True)
+    
+    # Corporate job attributes (NULL for other job types / deleted jobs)
+    company = Column(String)
+    job_status = Column(String(20))
+    category = Column(String)  # Dashboard label ("Uncategorized" when empty)
+    location = Column(String)  # Dashboard label (city, else province, else "Unknown")
+    
+    # Application funnel
+    applications_total = Column(Integer, nullable=False, default=0)
+    new_count = Column(Integer, nullable=False, default=0)
+    screening_count = Column(Integer, nullable=False, default=0)
+    interview_count = Column(Integer, nullable=False, default=0)
+    offer_count = Column(Integer, nullable=False, default=0)
+    hired_count = Column(Integer, nullable=False, default=0)
+    rejected_count = Column(Integer, nullable=False, default=0)
+    
+    # Average match score = match_score_sum / match_score_count
+    match_score_sum = Column(Float, nullable=False, default=0.0)
+    match_score_count = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        Index('ix_job_stats_rollups_company_status', 'company', 'job_status'),
+    )
+    
+    def __repr__(self):
+        return f"<JobStatsRollup(job_id={self.job_id}, company={self.company}, applications={self.applications_total})>"
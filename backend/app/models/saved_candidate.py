@@ -1,9 +1,13 @@
-from sqlalchemy import Column, String, DateTime, Integer, Float, Text
+from sqlalchemy import Column, String, DateTime, Integer, Float, Text, Index
 from sqlalchemy.sql import func
 from app.db.session import Base
 
 class SavedCandidate(Base):
     __tablename__ = "saved_candidates"
+    __table_args__ = (
+        # Recruiter list: newest first, keyset on (saved_date, id)
+        Index("ix_saved_candidates_recruiter_saved_date", "recruiter_id", "saved_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     cv_id = Column(String, index=True, nullable=False)
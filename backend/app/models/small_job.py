@@ -2,10 +2,21 @@
 Small Job Model - Gig economy/task-based work
 Updated to match ACTUAL database schema
 """
-from sqlalchemy import Column, String, Text, Numeric, Date, DateTime
+from sqlalchemy import Column, String, Text, Numeric, Date, DateTime, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from app.db.session import Base
 
 
+# Weighted full-text document: title > skills/work type > description
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(required_skills, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(work_type, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
 class SmallJob(Base):
     __tablename__ = "small_jobs"
     
@@ -40,5 +51,14 @@ class SmallJob(Base):
     # Embeddings
     embedding_text = Column(Text)
     
+    # Full-text search (generated by PostgreSQL, not loaded with the row)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+    
+    __table_args__ = (
+        Index('ix_small_jobs_search_vector', 'search_vector', postgresql_using='gin'),
+        # Keyset pagination of job lists
+        Index('ix_small_jobs_created_at_job_id', 'created_at', 'job_id'),
+    )
+    
     def __repr__(self):
         return f"<SmallJob(job_id={self.job_id}, title={self.title})>"
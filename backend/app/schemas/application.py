@@ -72,11 +72,12 @@ class ApplicationResponse(BaseModel):
 
 class ApplicationListResponse(BaseModel):
     """List of applications"""
-    total: int
+    total: Optional[int]  # None when the client skipped the count
     applications: List[ApplicationResponse]
     page: int
     page_size: int
     has_more: bool
+    next_cursor: Optional[str] = None
     
     class Config:
         from_attributes = True
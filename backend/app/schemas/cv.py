@@ -185,11 +185,12 @@ class CVResponse(CVBase):
 
 class CVListResponse(BaseModel):
     """Response schema for listing CVs"""
-    total: int = Field(..., description="Total number of CVs")
+    total: Optional[int] = Field(..., description="Total number of CVs (null when not requested)")
     cvs: List[CVResponse] = Field(..., description="List of CVs")
     page: int = Field(1, description="Current page number")
     page_size: int = Field(20, description="Number of items per page")
     has_more: bool = Field(False, description="More results available")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page")
 
 
 class WorkExperience(BaseModel):
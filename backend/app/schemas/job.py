@@ -2,7 +2,7 @@
 Pydantic schemas for Job models (Corporate and Small Jobs)
 """
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import date, datetime
 from enum import Enum
 
@@ -166,11 +166,12 @@ class CorporateJobResponse(CorporateJobBase):
 
 class CorporateJobListResponse(BaseModel):
     """Response schema for listing corporate jobs"""
-    total: int = Field(..., description="Total number of jobs")
+    total: Optional[int] = Field(..., description="Total number of jobs (null when not requested)")
     jobs: List[CorporateJobResponse] = Field(..., description="List of jobs")
     page: int = Field(1, description="Current page number")
     page_size: int = Field(20, description="Number of items per page")
     has_more: bool = Field(False, description="More results available")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page")
 
 
 # ============================================================================
@@ -289,6 +290,9 @@ class SmallJobListResponse(BaseModel):
 class JobSearchRequest(BaseModel):
     """Request schema for searching jobs"""
     query: Optional[str] = Field(None, description="Search query")
+    search_mode: Literal["fulltext", "ilike"] = Field(
+        "fulltext", description="fulltext: ranked PostgreSQL text search; ilike: substring match"
+    )
     categories: Optional[List[str]] = Field(None, description="Filter by categories")
     locations: Optional[List[str]] = Field(None, description="Filter by locations")
     min_salary: Optional[float] = Field(None, ge=0, description="Minimum salary")
@@ -303,6 +307,7 @@ class JobSearchRequest(BaseModel):
         schema_extra = {
             "example": {
                 "query": "software developer",
+                "search_mode": "fulltext",
                 "categories": ["Information Technology"],
                 "locations": ["Lusaka", "Copperbelt"],
                 "min_salary": 10000,
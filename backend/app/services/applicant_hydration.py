@@ -0,0 +1,134 @@
+"""
+Applicant Hydration - Batch CV/job lookups for employer applicant views
+========================================================================
+Employer routes list application events (UserJobInteraction rows) and need
+the applicant's CV and the job for each. Looking those up per application
+costs two queries per row; this service collects the ids and loads CVs and
+jobs with one query each, then joins them in memory:
+
+    hydrated = ApplicantHydrationService.hydrate(db, applications, include_jobs=True)
+    for application, cv, job in hydrated:
+        ...
+
+Applications are written by candidate.apply_to_job with
+`user_id = str(users.id)`, so applicants are resolved to CVs through their
+account email (users.email -> cvs.email) in one bulk query.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import Integer, String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.models.cv import CV
+from app.models.small_job import SmallJob
+from app.models.user import User
+from app.models.user_job_interaction import UserJobInteraction
+from app.services.cv_loader import DETAIL_COLUMNS
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# CV columns for applicant lists and accept/reject responses
+APPLICANT_COLUMNS = DETAIL_COLUMNS + (CV.resume_quality_score,)
+
+# CV columns for the full applicant profile
+APPLICANT_PROFILE_COLUMNS = APPLICANT_COLUMNS + (
+    CV.institution,
+    CV.graduation_year,
+    CV.major,
+    CV.languages,
+    CV.certifications,
+    CV.availability,
+    CV.salary_expectation_min,
+    CV.salary_expectation_max,
+    CV.work_experience_json,
+)
+
+# Job columns shown next to an application
+JOB_COLUMNS = (
+    SmallJob.job_id,
+    SmallJob.title,
+)
+
+_JOBS_BY_IDS = select(*JOB_COLUMNS).where(
+    SmallJob.job_id == any_(bindparam('job_ids', type_=ARRAY(String)))
+)
+
+
+class HydratedApplication(NamedTuple):
+    """An application event with its applicant CV and job (None if missing)."""
+    application: UserJobInteraction
+    cv: Optional[Row]
+    job: Optional[Row]
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+class ApplicantHydrationService:
+    """Batch loader for the CVs and jobs behind employer applications"""
+
+    @staticmethod
+    def load_jobs(db: Session, job_ids: Sequence[str]) -> Dict[str, Row]:
+        """Small jobs by id in one query (job_id -> row)."""
+        job_ids = list(dict.fromkeys(job_id for job_id in job_ids if job_id))
+        if not job_ids:
+            return {}
+        return {row.job_id: row for row in db.execute(_JOBS_BY_IDS, {'job_ids': job_ids})}
+
+    @staticmethod
+    def load_applicant_cvs(db: Session, user_ids: Sequence[str], cv_columns: Sequence) -> Dict[str, Row]:
+        """
+        CVs of applicant accounts in one query (application user_id -> row),
+        joined on users.email = cvs.email. Ids that are not user ids, and
+        users without a CV, are left out.
+        """
+        ids = list(dict.fromkeys(int(user_id) for user_id in user_ids if user_id and user_id.isdigit()))
+        if not ids:
+            return {}
+        statement = select(User.id.label('applicant_id'), *cv_columns).join(
+            CV, CV.email == User.email
+        ).where(User.id == any_(bindparam('user_ids', type_=ARRAY(Integer))))
+        return {str(row.applicant_id): row for row in db.execute(statement, {'user_ids': ids})}
+
+    @staticmethod
+    def hydrate(
+        db: Session,
+        applications: Sequence[UserJobInteraction],
+        cv_columns: Sequence = APPLICANT_COLUMNS,
+        include_jobs: bool = False
+    ) -> List[HydratedApplication]:
+        """
+        Attach CVs (and optionally jobs) to applications.
+
+        Args:
+            db: Database session
+            applications: Application events, in display order
+            cv_columns: CV columns to load
+            include_jobs: Also load each application's job
+
+        Returns:
+            HydratedApplication per application, same order
+        """
+        cvs = ApplicantHydrationService.load_applicant_cvs(db, [app.user_id for app in applications], cv_columns)
+        jobs = ApplicantHydrationService.load_jobs(db, [app.job_id for app in applications]) if include_jobs else {}
+
+        return [
+            HydratedApplication(app, cvs.get(app.user_id), jobs.get(app.job_id))
+            for app in applications
+        ]
+
+    @staticmethod
+    def hydrate_one(
+        db: Session,
+        application: UserJobInteraction,
+        cv_columns: Sequence = APPLICANT_COLUMNS
+    ) -> HydratedApplication:
+        """hydrate() for a single application (no job lookup)."""
+        return ApplicantHydrationService.hydrate(db, [application], cv_columns)[0]
@@ -2,15 +2,19 @@
 Application Service - Business logic for job applications
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, func, and_, select
 from typing import Optional, List, Tuple
 from datetime import datetime
 
+from app.db.pagination import keyset_page, page_with_cursor
 from app.models.application import Application, ApplicationStatus
 from app.models.cv import CV
 from app.models.corporate_job import CorporateJob
 from app.models.small_job import SmallJob
 from app.schemas.application import ApplicationCreate, ApplicationUpdate, ApplicationStats
+from app.services.rollup_service import RollupService
+from app.services.stats_service import StatsService
 
 
 class ApplicationService:
@@ -34,6 +38,9 @@ class ApplicationService:
         )
         
         db.add(application)
+        RollupService.apply_application_change(
+            db, application.job_id, new=(application.status, application.match_score)
+        )
         db.commit()
         db.refresh(application)
         
@@ -87,6 +94,8 @@ class ApplicationService:
         if not application:
             return None
         
+        old_state = (application.status, application.match_score)
+        
         # Update fields
         update_dict = application_data.dict(exclude_unset=True)
         for key, value in update_dict.items():
@@ -94,6 +103,10 @@ class ApplicationService:
         
         application.updated_at = datetime.utcnow()
         
+        RollupService.apply_application_change(
+            db, application.job_id,
+            old=old_state, new=(application.status, application.match_score)
+        )
         db.commit()
         db.refresh(application)
         
@@ -108,6 +121,9 @@ class ApplicationService:
             return False
         
         db.delete(application)
+        RollupService.apply_application_change(
+            db, application.job_id, old=(application.status, application.match_score)
+        )
         db.commit()
         
         return True
@@ -142,16 +158,22 @@ class ApplicationService:
         return result
     
     @staticmethod
-    def list_applications_with_details(
-        db: Session,
+    def _details_statements(
         skip: int = 0,
         limit: int = 50,
         status: Optional[ApplicationStatus] = None,
         job_id: Optional[str] = None,
-        search: Optional[str] = None
-    ) -> Tuple[List[dict], int]:
-        """List applications with candidate and job details"""
-        query = db.query(Application, CV, CorporateJob).outerjoin(
+        search: Optional[str] = None,
+        cv_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        min_match_score: Optional[float] = None
+    ) -> Tuple[Select, Select]:
+        """
+        (page, count) statements for applications joined to CV and job.
+        
+        The page is newest first and fetches limit + 1 rows (see page_with_cursor).
+        """
+        query = select(Application, CV, CorporateJob).outerjoin(
             CV, Application.cv_id == CV.cv_id
         ).outerjoin(
             CorporateJob, and_(
@@ -162,24 +184,38 @@ class ApplicationService:
         
         # Apply filters
         if status:
-            query = query.filter(Application.status == status)
+            query = query.where(Application.status == status)
         if job_id:
-            query = query.filter(Application.job_id == job_id)
+            query = query.where(Application.job_id == job_id)
+        if cv_id:
+            query = query.where(Application.cv_id == cv_id)
+        if min_match_score:
+            query = query.where(Application.match_score >= min_match_score)
         if search:
             search_term = f"%{search}%"
-            query = query.filter(
+            query = query.where(
                 (CV.full_name.ilike(search_term)) |
                 (CV.email.ilike(search_term)) |
                 (CorporateJob.title.ilike(search_term))
             )
         
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        results = query.order_by(Application.applied_at.desc()).offset(skip).limit(limit).all()
-        
-        # Format results
+        count_query = query.with_only_columns(func.count(Application.id))
+        page_query = keyset_page(
+            query, limit, Application.applied_at, Application.id, skip=skip, cursor=cursor
+        )
+        return page_query, count_query
+    
+    @staticmethod
+    def _page_with_details(results, limit: int) -> Tuple[List[dict], Optional[str]]:
+        """Trim a details page fetch and flatten it (rows, next cursor)"""
+        results, next_cursor = page_with_cursor(
+            results, limit, lambda row: (row.Application.applied_at, row.Application.id)
+        )
+        return ApplicationService._format_with_details(results), next_cursor
+    
+    @staticmethod
+    def _format_with_details(results) -> List[dict]:
+        """Flatten (application, cv, job) rows into response dicts"""
         applications = []
         for app, cv, job in results:
             applications.append({
@@ -191,49 +227,63 @@ class ApplicationService:
                 'job_title': job.title if job else None,
                 'company': job.company if job else None
             })
-        
-        return applications, total
+        return applications
     
     @staticmethod
-    def get_application_stats(db: Session, job_id: Optional[str] = None) -> ApplicationStats:
-        """Get application statistics"""
-        query = db.query(Application)
-        
-        if job_id:
-            query = query.filter(Application.job_id == job_id)
-        
-        total = query.count()
-        new = query.filter(Application.status == ApplicationStatus.NEW).count()
-        screening = query.filter(Application.status == ApplicationStatus.SCREENING).count()
-        interview = query.filter(Application.status == ApplicationStatus.INTERVIEW).count()
-        offer = query.filter(Application.status == ApplicationStatus.OFFER).count()
-        hired = query.filter(Application.status == ApplicationStatus.HIRED).count()
-        rejected = query.filter(Application.status == ApplicationStatus.REJECTED).count()
-        
-        # Calculate average match score
-        avg_score = db.query(func.avg(Application.match_score)).filter(
-            Application.match_score.isnot(None)
-        ).scalar()
-        
-        if job_id:
-            query_with_job = query.filter(Application.job_id == job_id)
-            avg_score = db.query(func.avg(Application.match_score)).filter(
-                and_(
-                    Application.job_id == job_id,
-                    Application.match_score.isnot(None)
-                )
-            ).scalar()
+    def list_applications_with_details(
+        db: Session,
+        skip: int = 0,
+        limit: int = 50,
+        status: Optional[ApplicationStatus] = None,
+        job_id: Optional[str] = None,
+        search: Optional[str] = None,
+        cv_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        min_match_score: Optional[float] = None
+    ) -> Tuple[List[dict], Optional[int], Optional[str]]:
+        """
+        List applications with candidate and job details
         
-        return ApplicationStats(
-            total=total,
-            new=new,
-            screening=screening,
-            interview=interview,
-            offer=offer,
-            hired=hired,
-            rejected=rejected,
-            avg_match_score=float(avg_score) if avg_score else None
+        Returns:
+            (applications, total or None when include_total is False, next page cursor)
+        """
+        page_query, count_query = ApplicationService._details_statements(
+            skip, limit, status, job_id, search, cv_id, cursor, min_match_score
+        )
+        total = db.execute(count_query).scalar() if include_total else None
+        applications, next_cursor = ApplicationService._page_with_details(
+            db.execute(page_query).all(), limit
         )
+        return applications, total, next_cursor
+    
+    @staticmethod
+    async def list_applications_with_details_async(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 50,
+        status: Optional[ApplicationStatus] = None,
+        job_id: Optional[str] = None,
+        search: Optional[str] = None,
+        cv_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        min_match_score: Optional[float] = None
+    ) -> Tuple[List[dict], Optional[int], Optional[str]]:
+        """Async variant of list_applications_with_details (same query)"""
+        page_query, count_query = ApplicationService._details_statements(
+            skip, limit, status, job_id, search, cv_id, cursor, min_match_score
+        )
+        total = (await db.execute(count_query)).scalar() if include_total else None
+        applications, next_cursor = ApplicationService._page_with_details(
+            (await db.execute(page_query)).all(), limit
+        )
+        return applications, total, next_cursor
+    
+    @staticmethod
+    def get_application_stats(db: Session, job_id: Optional[str] = None) -> ApplicationStats:
+        """Get application statistics (one aggregate query)"""
+        return StatsService.application_stats(db, job_id)
     
     @staticmethod
     def bulk_update_status(
@@ -242,6 +292,14 @@ class ApplicationService:
         new_status: ApplicationStatus
     ) -> int:
         """Bulk update application status"""
+        # Current (job, status) counts so the rollups can move them
+        moved = db.query(
+            Application.job_id, Application.status, func.count()
+        ).filter(
+            Application.id.in_(application_ids),
+            Application.status != new_status
+        ).group_by(Application.job_id, Application.status).all()
+        
         updated = db.query(Application).filter(
             Application.id.in_(application_ids)
         ).update(
@@ -252,6 +310,7 @@ class ApplicationService:
             synchronize_session=False
         )
         
+        RollupService.apply_bulk_status_change(db, moved, new_status)
         db.commit()
         
         return updated
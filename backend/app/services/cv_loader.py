@@ -0,0 +1,138 @@
+"""
+CV Loader - Column-projected CV streaming for matchers
+=======================================================
+Matchers only read a handful of CV columns, but `db.query(CV).all()` hydrates
+every column (including the work_experience/projects/references JSONB blobs)
+into identity-mapped ORM objects.
+
+This loader selects only the matching-relevant columns as lightweight rows
+(attribute access like `cv.city` still works) and streams them with
+`yield_per`, which also enables a server-side cursor on PostgreSQL.
+
+`load_cvs_by_ids` fetches detail rows for a list of ids (top-K results,
+saved candidates) with one `cv_id = ANY(:cv_ids)` statement: the SQL text
+is the same for every list, so statement caches and prepared statements
+are reused, and ids are always bound, never formatted into the SQL.
+"""
+
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.models.cv import CV
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Columns read by the matching services (no JSONB blobs)
+MATCHING_COLUMNS = (
+    CV.cv_id,
+    CV.full_name,
+    CV.email,
+    CV.phone,
+    CV.city,
+    CV.province,
+    CV.education_level,
+    CV.total_years_experience,
+    CV.current_job_title,
+    CV.salary_expectation_min,
+    CV.salary_expectation_max,
+    CV.skills_technical,
+    CV.skills_soft,
+)
+
+# Rows fetched per round trip while streaming
+CV_STREAM_BATCH_SIZE = 1000
+
+# Columns shown for a candidate in match results and recruiter lists
+DETAIL_COLUMNS = (
+    CV.cv_id,
+    CV.full_name,
+    CV.email,
+    CV.phone,
+    CV.current_job_title,
+    CV.total_years_experience,
+    CV.city,
+    CV.province,
+    CV.education_level,
+    CV.skills_technical,
+    CV.skills_soft,
+)
+
+
+# ============================================================================
+# LOADERS
+# ============================================================================
+
+def iter_matching_cvs(
+    db: Session,
+    criteria: Optional[Sequence] = None,
+    batch_size: int = CV_STREAM_BATCH_SIZE
+) -> Iterator[Row]:
+    """
+    Stream CVs as projected rows.
+
+    Args:
+        db: Database session
+        criteria: Optional SQLAlchemy filter expressions (e.g. CV.city.ilike(...))
+        batch_size: Rows per fetch
+
+    Yields:
+        Rows exposing the MATCHING_COLUMNS as attributes
+    """
+    query = db.query(*MATCHING_COLUMNS)
+    if criteria:
+        query = query.filter(*criteria)
+    return query.yield_per(batch_size)
+
+
+# ============================================================================
+# BULK DETAIL LOADER
+# ============================================================================
+
+_by_ids_statements: Dict[Tuple, Select] = {}
+
+
+def _by_ids_statement(columns: Sequence) -> Select:
+    """One reusable `WHERE cv_id = ANY(:cv_ids)` statement per column set."""
+    key = tuple(columns)
+    statement = _by_ids_statements.get(key)
+    if statement is None:
+        statement = select(*columns).where(
+            CV.cv_id == any_(bindparam('cv_ids', type_=ARRAY(String)))
+        )
+        _by_ids_statements[key] = statement
+    return statement
+
+
+def _in_request_order(rows: Iterable[Row], cv_ids: Sequence[str]) -> Dict[str, Row]:
+    by_id = {row.cv_id: row for row in rows}
+    return {cv_id: by_id[cv_id] for cv_id in cv_ids if cv_id in by_id}
+
+
+def load_cvs_by_ids(
+    db: Session,
+    cv_ids: Sequence[str],
+    columns: Sequence = DETAIL_COLUMNS
+) -> Dict[str, Row]:
+    """
+    Load CV rows for a list of ids in one query.
+
+    Args:
+        db: Database session
+        cv_ids: Ids to load (duplicates allowed)
+        columns: Columns to select (must include CV.cv_id)
+
+    Returns:
+        cv_id -> row, in the order of cv_ids (unknown ids are skipped)
+    """
+    cv_ids = list(dict.fromkeys(cv_ids))
+    if not cv_ids:
+        return {}
+    rows = db.execute(_by_ids_statement(columns), {'cv_ids': cv_ids})
+    return _in_request_order(rows, cv_ids)
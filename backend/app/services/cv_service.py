@@ -3,12 +3,16 @@ CV Service - Business logic for CV operations
 """
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, or_, select
 from typing import Optional, List
 from datetime import datetime
 import uuid
 
-from app.models.cv import CV
+from app.core.config import settings
+from app.db.pagination import estimated_count, keyset_page, page_with_cursor
+from app.models.cv import CV, SEARCH_COLUMNS
 from app.schemas.cv import CVCreate, CVUpdate, CVResponse
+from app.services.cv_snapshot import mark_cvs_changed
 
 
 class CVService:
@@ -87,6 +91,7 @@ class CVService:
             db.add(db_cv)
             db.commit()
             db.refresh(db_cv)
+            mark_cvs_changed(db_cv.cv_id)
             return db_cv
         except IntegrityError:
             db.rollback()
@@ -124,6 +129,7 @@ class CVService:
         try:
             db.commit()
             db.refresh(db_cv)
+            mark_cvs_changed(cv_id)
             return db_cv
         except IntegrityError:
             db.rollback()
@@ -147,6 +153,7 @@ class CVService:
         
         db.delete(db_cv)
         db.commit()
+        mark_cvs_changed(cv_id)
         return True
     
     @staticmethod
@@ -158,21 +165,25 @@ class CVService:
         province: Optional[str] = None,
         education_level: Optional[str] = None,
         min_experience: Optional[float] = None,
-    ) -> tuple[List[CV], int]:
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[List[CV], Optional[int], Optional[str]]:
         """
-        List CVs with optional filters
+        List CVs with optional filters, ordered by cv_id
         
         Args:
             db: Database session
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when a cursor is given)
             limit: Maximum number of records to return
             city: Filter by city
             province: Filter by province
             education_level: Filter by education level
             min_experience: Minimum years of experience
+            cursor: next_cursor of the previous page
+            include_total: Run the exact count (None otherwise)
             
         Returns:
-            Tuple of (list of CVs, total count)
+            Tuple of (list of CVs, total count or None, next page cursor or None)
         """
         query = db.query(CV)
         
@@ -187,42 +198,69 @@ class CVService:
             query = query.filter(CV.total_years_experience >= min_experience)
         
         # Get total count
-        total = query.count()
+        total = query.count() if include_total else None
         
         # Apply pagination
-        cvs = query.offset(skip).limit(limit).all()
+        rows = keyset_page(query, limit, CV.cv_id, skip=skip, cursor=cursor, descending=False).all()
+        cvs, next_cursor = page_with_cursor(rows, limit, lambda cv: (cv.cv_id,))
         
-        return cvs, total
+        return cvs, total, next_cursor
     
     @staticmethod
     def search_cvs(
         db: Session,
         query: str,
         skip: int = 0,
-        limit: int = 20
+        limit: int = 20,
+        estimate_total: bool = False
     ) -> tuple[List[CV], int]:
         """
         Search CVs by name, skills, or job title
         
+        Matches substrings (ILIKE) and near-misses/prefixes (pg_trgm word
+        similarity, e.g. "pyhton dev" finds "Python Developer"); both are
+        served by the trigram GIN indexes on the searched columns. Results
+        are ordered by best word similarity across the columns.
+        
         Args:
             db: Database session
             query: Search query string
             skip: Number of records to skip
             limit: Maximum number of records to return
+            estimate_total: Return the planner's estimate instead of an exact count
             
         Returns:
             Tuple of (list of CVs, total count)
         """
-        search_filter = (
-            CV.full_name.ilike(f"%{query}%") |
-            CV.current_job_title.ilike(f"%{query}%") |
-            CV.skills_technical.ilike(f"%{query}%") |
-            CV.skills_soft.ilike(f"%{query}%")
+        query = query.strip()
+        columns = [getattr(CV, column) for column in SEARCH_COLUMNS]
+        
+        # `column %> query` (word_similarity(query, column) above the threshold;
+        # the indexable, column-first form of `query <% column`) reads its
+        # threshold from the session setting, so set it for this transaction
+        db.execute(
+            select(func.set_config(
+                'pg_trgm.word_similarity_threshold', str(settings.CV_SEARCH_MIN_SIMILARITY), True
+            ))
         )
         
-        query_obj = db.query(CV).filter(search_filter)
-        total = query_obj.count()
-        cvs = query_obj.offset(skip).limit(limit).all()
+        search_filter = or_(
+            *(column.ilike(f"%{query}%") for column in columns),
+            *(column.op('%>')(query) for column in columns)
+        )
+        relevance = func.greatest(*(func.word_similarity(query, column) for column in columns))
+        
+        matches = select(CV).where(search_filter)
+        if estimate_total:
+            total = estimated_count(db, matches)
+        else:
+            total = db.execute(
+                matches.with_only_columns(func.count()).order_by(None)
+            ).scalar()
+        
+        cvs = db.execute(
+            matches.order_by(relevance.desc(), CV.cv_id).offset(skip).limit(limit)
+        ).scalars().all()
         
         return cvs, total
     
@@ -0,0 +1,393 @@
+"""
+CV Snapshot - Struct-of-arrays view of all CVs for matching
+============================================================
+Every matcher walks the whole CV table for every job, re-reading the same
+rows and re-normalizing the same skill strings. The snapshot does that work
+once and keeps the result in memory as parallel NumPy arrays:
+
+    experience          float64  (NULL -> 0, like `cv.total_years_experience or 0`)
+    salary_min/max      float64  (NULL -> NaN)
+    city_id/province_id int32    codes into *_vocab (lower/stripped, -1 = missing)
+    education_id        int32    code into education_vocab (lowercased, -1 = missing)
+    skill_indptr        int64    CSR row pointers into skill_ids
+    skill_ids           int32    normalized skill codes into skill_vocab
+    cluster_indptr      int64    CSR row pointers into cluster_ids
+    cluster_ids         int32    skill cluster codes into cluster_vocab
+    title_id            int32    current_job_title code into title_vocab (-1 = missing)
+
+so experience/location/education scoring becomes array arithmetic, skill
+gating becomes a lookup over the CSR arrays, and worker processes get
+everything they score on through shared memory (see parallel_scoring).
+
+The snapshot is built at startup, shared read-only across requests and
+refreshed copy-on-write by a background thread, never on the request path:
+CVs whose `updated_at` moved past the snapshot's marker are reloaded by id
+(a trigger bumps it for every UPDATE, from any process), CVService marks
+its own writes for a prompt refresh, and deletes are found when the row
+count disagrees. Unchanged rows keep their normalized skills.
+
+Usage:
+    snapshot = get_cv_snapshot(db)
+    years = snapshot.experience[snapshot.row_of['cv_123']]
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.cv import CV
+from app.services.cv_loader import iter_matching_cvs
+from app.services.skill_normalizer import SkillNormalizer
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Code used for a missing city/province/education value
+MISSING_CODE = -1
+
+# Raw columns kept as object arrays for building responses
+DISPLAY_COLUMNS = (
+    'full_name',
+    'email',
+    'phone',
+    'city',
+    'province',
+    'education_level',
+    'total_years_experience',
+    'current_job_title',
+)
+
+
+# (projected row, normalized skills, skill cluster names) per CV
+CVRecord = Tuple[Row, Tuple[str, ...], Tuple[str, ...]]
+
+
+def _location_key(value: Optional[str]) -> Optional[str]:
+    """Key used by the location scorers (`value.lower().strip()`)."""
+    return value.lower().strip() if value else None
+
+
+def _education_key(value: Optional[str]) -> Optional[str]:
+    """Key used by the education scorer (`value.lower()`)."""
+    return value.lower() if value else None
+
+
+def _encode(values: Iterable[Optional[str]], vocab: List[str], index: Dict[str, int]) -> np.ndarray:
+    """Encode keys into int32 codes, extending the vocabulary in place."""
+    codes = []
+    for value in values:
+        if value is None:
+            codes.append(MISSING_CODE)
+            continue
+        code = index.get(value)
+        if code is None:
+            code = len(vocab)
+            index[value] = code
+            vocab.append(value)
+        codes.append(code)
+    return np.array(codes, dtype=np.int32)
+
+
+def _pack(lists: Sequence[Sequence[str]], vocab: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR-pack lists of strings: (row pointers, codes into vocab)."""
+    indptr = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum(np.array([len(values) for values in lists], dtype=np.int64), out=indptr[1:])
+    return indptr, _encode((value for values in lists for value in values), vocab, {})
+
+
+def _unpack(indptr: np.ndarray, ids: np.ndarray, vocab: List[str], i: int) -> List[str]:
+    """Row i of a CSR-packed string column."""
+    return [vocab[code] for code in ids[indptr[i]:indptr[i + 1]]]
+
+
+# ============================================================================
+# SNAPSHOT
+# ============================================================================
+
+class CVSnapshot:
+    """
+    Immutable struct-of-arrays view of the CV table.
+
+    Row i of every array describes the CV `cv_ids[i]`; `rows[i]` is the
+    projected database row (attribute access like `row.city` works).
+    Never mutate a published snapshot: refresh builds a new one.
+    """
+
+    def __init__(self, records: Dict[str, CVRecord]):
+        """
+        Args:
+            records: cv_id -> (projected row, normalized skills, skill clusters), in row order
+        """
+        self.records = records
+        self.rows: List[Row] = [row for row, _, _ in records.values()]
+        self.cv_ids = np.array(list(records.keys()), dtype=object)
+        self.row_of: Dict[str, int] = {cv_id: i for i, cv_id in enumerate(records)}
+        self.built_at = time.time()
+
+        rows = self.rows
+
+        # Numeric columns
+        self.experience = np.array(
+            [row.total_years_experience or 0 for row in rows], dtype=np.float64
+        )
+        self.salary_min = np.array(
+            [np.nan if row.salary_expectation_min is None else row.salary_expectation_min for row in rows],
+            dtype=np.float64
+        )
+        self.salary_max = np.array(
+            [np.nan if row.salary_expectation_max is None else row.salary_expectation_max for row in rows],
+            dtype=np.float64
+        )
+
+        # Categorical columns
+        self.city_vocab: List[str] = []
+        self.province_vocab: List[str] = []
+        self.education_vocab: List[str] = []
+        self.city_id = _encode((_location_key(row.city) for row in rows), self.city_vocab, {})
+        self.province_id = _encode((_location_key(row.province) for row in rows), self.province_vocab, {})
+        self.education_id = _encode((_education_key(row.education_level) for row in rows), self.education_vocab, {})
+
+        # Raw display columns
+        for column in DISPLAY_COLUMNS:
+            values = np.empty(len(rows), dtype=object)
+            values[:] = [getattr(row, column) for row in rows]
+            setattr(self, column, values)
+
+        # Raw job titles (category confidence)
+        self.title_vocab: List[str] = []
+        self.title_id = _encode((row.current_job_title or None for row in rows), self.title_vocab, {})
+
+        # CSR-packed normalized skills and their clusters
+        self.skill_vocab: List[str] = []
+        self.cluster_vocab: List[str] = []
+        self.skill_indptr, self.skill_ids = _pack(
+            [skills for _, skills, _ in records.values()], self.skill_vocab
+        )
+        self.cluster_indptr, self.cluster_ids = _pack(
+            [clusters for _, _, clusters in records.values()], self.cluster_vocab
+        )
+
+        # Case-insensitive skill codes (vocab code -> lowercase code)
+        self.skill_key_vocab: Dict[str, int] = {}
+        self.skill_key_of_id = np.array(
+            [self.skill_key_vocab.setdefault(skill.lower(), len(self.skill_key_vocab))
+             for skill in self.skill_vocab],
+            dtype=np.int32
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def skills(self, i: int) -> List[str]:
+        """Normalized skills of row i."""
+        return _unpack(self.skill_indptr, self.skill_ids, self.skill_vocab, i)
+
+    def clusters(self, i: int) -> List[str]:
+        """Skill cluster names of row i (first-seen order)."""
+        return _unpack(self.cluster_indptr, self.cluster_ids, self.cluster_vocab, i)
+
+    def title(self, i: int) -> Optional[str]:
+        """current_job_title of row i."""
+        code = self.title_id[i]
+        return None if code == MISSING_CODE else self.title_vocab[code]
+
+    def match_rows(self, column: str, pattern: str) -> np.ndarray:
+        """
+        Boolean mask of rows whose raw column contains pattern
+        (case-insensitive, like `ilike('%pattern%')`).
+        """
+        needle = pattern.lower()
+        return np.array(
+            [bool(value) and needle in value.lower() for value in getattr(self, column)],
+            dtype=bool
+        )
+
+
+# ============================================================================
+# BUILD / REFRESH
+# ============================================================================
+
+_snapshot: Optional[CVSnapshot] = None
+# Refresh bookkeeping lives beside the published reference, never on it
+_checked_at = 0.0  # Last time a build/refresh found _snapshot current
+_changed_through: Optional[datetime] = None  # Newest cvs.updated_at reflected in _snapshot
+_snapshot_lock = threading.Lock()
+_refresh_lock = threading.Lock()  # One build/refresh at a time
+_refresh_thread: Optional[threading.Thread] = None
+_dirty_cv_ids = set()
+
+
+def _cv_skills(row: Row, skill_normalizer: SkillNormalizer) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Normalized skills and skill cluster names for one CV (same rules as the
+    matchers' _extract_cv_skills / _extract_cv_features).
+    """
+    skills = []
+    if row.skills_technical:
+        skills.extend([s.strip() for s in row.skills_technical.split(',')])
+    if row.skills_soft:
+        skills.extend([s.strip() for s in row.skills_soft.split(',')])
+
+    if skills:
+        skill_data = skill_normalizer.normalize_skill_list(skills)
+        return tuple(skill_data['normalized']), tuple(skill_data['clusters'])
+    return (), ()
+
+
+def _load_records(db: Session, criteria: Optional[Sequence] = None) -> Dict[str, CVRecord]:
+    skill_normalizer = SkillNormalizer()
+    return {
+        row.cv_id: (row, *_cv_skills(row, skill_normalizer))
+        for row in iter_matching_cvs(db, criteria)
+    }
+
+
+def _latest_change(db: Session) -> Optional[datetime]:
+    return db.query(func.max(CV.updated_at)).scalar()
+
+
+def _publish(snapshot: CVSnapshot, reloaded_ids: Iterable[str], changed_through: Optional[datetime]):
+    """Swap in snapshot; marks that arrived during the reload stay queued."""
+    global _snapshot, _checked_at, _changed_through
+    with _snapshot_lock:
+        _snapshot = snapshot
+        _checked_at = time.time()
+        _changed_through = changed_through
+        _dirty_cv_ids.difference_update(reloaded_ids)
+
+
+def build_cv_snapshot(db: Session) -> CVSnapshot:
+    """Build a snapshot of the full CV table and publish it."""
+    with _refresh_lock:
+        start = time.time()
+        with _snapshot_lock:
+            pending = set(_dirty_cv_ids)
+
+        # Marker first: anything written during the load is re-read next refresh
+        changed_through = _latest_change(db)
+        snapshot = CVSnapshot(_load_records(db))
+        _publish(snapshot, pending, changed_through)
+
+    print(f"✅ CV snapshot built: {len(snapshot)} CVs, "
+          f"{len(snapshot.skill_vocab)} skills in {time.time() - start:.2f}s")
+    return snapshot
+
+
+def refresh_cv_snapshot(db: Session, cv_ids: Optional[Iterable[str]] = None) -> CVSnapshot:
+    """
+    Refresh the published snapshot copy-on-write.
+
+    Args:
+        db: Database session
+        cv_ids: CVs to reload (plus every CV marked changed in this
+            process); None also reloads CVs whose updated_at moved past
+            the snapshot's marker (edits from any process, raw SQL,
+            scripts) and drops/adds CVs when the row count disagrees
+
+    Returns:
+        The published snapshot (the same object when nothing moved)
+    """
+    if _snapshot is None:
+        return build_cv_snapshot(db)
+
+    with _refresh_lock:
+        current = _snapshot
+        with _snapshot_lock:
+            reload_ids = set(_dirty_cv_ids)
+        dirty_ids = set(reload_ids)
+        if cv_ids is not None:
+            reload_ids |= set(cv_ids)
+
+        records = dict(current.records)
+        changed_through = _changed_through
+        membership_changed = False
+        if cv_ids is None:
+            latest = _latest_change(db)
+            changed = db.query(CV.cv_id)
+            if changed_through is not None:
+                # Overlap covers transactions that committed after the last check
+                since = changed_through - timedelta(seconds=settings.CV_SNAPSHOT_CHANGE_LAG_SECONDS)
+                changed = changed.filter(CV.updated_at > since)
+            reload_ids |= {cv_id for (cv_id,) in changed}
+            changed_through = latest or changed_through
+
+        if reload_ids:
+            fresh = _load_records(db, [CV.cv_id.in_(list(reload_ids))])
+            for cv_id in reload_ids - set(fresh):
+                membership_changed |= records.pop(cv_id, None) is not None
+            records.update(fresh)
+
+        # Deletes (and inserts carrying an old updated_at) leave no marker
+        if cv_ids is None and db.query(func.count(CV.cv_id)).scalar() != len(records):
+            live_ids = {cv_id for (cv_id,) in db.query(CV.cv_id)}
+            for cv_id in set(records) - live_ids:
+                del records[cv_id]
+                membership_changed = True
+            new_ids = live_ids - set(records)
+            if new_ids:
+                records.update(_load_records(db, [CV.cv_id.in_(list(new_ids))]))
+                membership_changed = True
+
+        if not reload_ids and not membership_changed:
+            _publish(current, dirty_ids, changed_through)
+            return current
+
+        snapshot = CVSnapshot(records)
+        _publish(snapshot, dirty_ids, changed_through)
+        return snapshot
+
+
+def _refresh_in_background(full: bool):
+    db = SessionLocal()
+    try:
+        refresh_cv_snapshot(db, None if full else ())
+    except Exception as e:
+        # Dirty ids stay queued; the next access schedules another attempt
+        print(f"⚠️  CV snapshot refresh failed: {e}")
+    finally:
+        db.close()
+
+
+def _schedule_refresh(full: bool):
+    """Start a background refresh unless one is already running."""
+    global _refresh_thread
+    with _snapshot_lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return
+        _refresh_thread = threading.Thread(
+            target=_refresh_in_background, args=(full,), name="cv-snapshot-refresh", daemon=True
+        )
+        _refresh_thread.start()
+
+
+def mark_cvs_changed(*cv_ids: str):
+    """Queue CVs for reload by the next refresh (no DB work here)."""
+    with _snapshot_lock:
+        _dirty_cv_ids.update(cv_ids)
+
+
+def get_cv_snapshot(db: Session) -> CVSnapshot:
+    """
+    Current snapshot. Only the very first call builds it on the request
+    path; afterwards marked CVs, or a check older than
+    CV_SNAPSHOT_MAX_AGE_SECONDS, schedule a background refresh and the
+    request is served from the published snapshot meanwhile.
+    """
+    snapshot = _snapshot
+    if snapshot is None:
+        return build_cv_snapshot(db)
+
+    stale = time.time() - _checked_at > settings.CV_SNAPSHOT_MAX_AGE_SECONDS
+    if stale or _dirty_cv_ids:
+        _schedule_refresh(full=stale)
+    return snapshot
@@ -11,6 +11,7 @@ from typing import List, Dict, Optional, Tuple, Set
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_, func
 import pandas as pd
+import numpy as np
 from datetime import datetime, date
 import re
 
@@ -22,6 +23,9 @@ from app.services.skill_normalizer import SkillNormalizer
 from app.services.category_confidence import CategoryConfidenceScorer
 from app.services.skill_rarity_calculator import SkillRarityCalculator
 from app.services.enhanced_skill_matcher import EnhancedSkillMatcher
+from app.services.cv_snapshot import CVSnapshot, get_cv_snapshot
+from app.services.top_k import TopK
+from app.services.parallel_scoring import score_in_shards
 
 
 # ============================================================================
@@ -45,6 +49,26 @@ EXPERIENCE_RANGES = {
     'executive': (15, 100),
 }
 
+# City -> province for same-region location credit (simplified)
+PROVINCE_MAPPING = {
+    'lusaka': 'lusaka',
+    'kitwe': 'copperbelt',
+    'ndola': 'copperbelt',
+    'livingstone': 'southern',
+    'chipata': 'eastern',
+    'solwezi': 'northwestern',
+}
+
+# Ordinal education levels
+EDUCATION_LEVELS = {
+    'grade 12': 1,
+    'certificate': 2,
+    'diploma': 3,
+    'bachelor': 4,
+    'masters': 5,
+    'phd': 6,
+}
+
 
 # ============================================================================
 # ENHANCED MATCHING SERVICE
@@ -58,7 +82,16 @@ class EnhancedMatchingService:
     - Phase 3: Skill rarity weighting (TF-IDF)
     """
     
-    def __init__(self, db: Session):
+    # Bump when scoring changes (part of request-coalescing and cache keys)
+    ENGINE_VERSION = "enhanced-3"
+    
+    def __init__(self, db: Optional[Session], skill_weights: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            db: Database session (None for scoring-only instances in worker processes)
+            skill_weights: Rarity weights computed elsewhere; skips the cache
+                file and the database
+        """
         self.db = db
         self.keyword_extractor = KeywordExtractor()
         self.skill_normalizer = SkillNormalizer()
@@ -68,6 +101,11 @@ class EnhancedMatchingService:
         self.skill_matcher = EnhancedSkillMatcher(skill_normalizer=self.skill_normalizer)
         print("✅ EnhancedSkillMatcher initialized with semantic matching")
         
+        if skill_weights is not None:
+            self.skill_rarity = SkillRarityCalculator(cache_file=None)
+            self.skill_rarity.skill_weights = skill_weights
+            return
+        
         # Initialize skill rarity calculator with cache file path
         self.skill_rarity = SkillRarityCalculator(cache_file="datasets/skill_rarity_cache.json")
         
@@ -104,46 +142,68 @@ class EnhancedMatchingService:
         if not job:
             raise ValueError(f"Job {job_id} not found")
         
-        # Get CVs
-        cvs_query = self.db.query(CV)
+        # Shared in-memory CV snapshot (struct-of-arrays)
+        snapshot = get_cv_snapshot(self.db)
+        selected = np.ones(len(snapshot), dtype=bool)
         
         # Apply location filter if specified
         if filters and 'location' in filters:
-            location = filters['location']
-            cvs_query = cvs_query.filter(CV.city.ilike(f"%{location}%"))
+            selected = snapshot.match_rows('city', filters['location'])
         elif filters and 'province' in filters:
-            province = filters['province']
-            cvs_query = cvs_query.filter(CV.province.ilike(f"%{province}%"))
-        
-        cvs = cvs_query.all()
+            selected = snapshot.match_rows('province', filters['province'])
         
         # Extract job features
         job_features = self._extract_job_features(job, job_type)
         
-        # Match each CV
+        # Experience, location and education for every CV at once
+        experience_scores = self._compute_experience_scores(
+            snapshot.experience,
+            job_features['experience_required']
+        )
+        location_scores = self._compute_location_scores(snapshot, job_features['location'])
+        education_scores = self._compute_education_scores(snapshot, job_features['education_required'])
+        
+        # Phase 1: numeric scoring for every CV (in parallel for large pools);
+        # workers read skills, clusters and titles from the shared snapshot
+        selected_rows = np.flatnonzero(selected)
+        row_data = np.column_stack([
+            selected_rows,
+            experience_scores[selected_rows],
+            location_scores[selected_rows],
+            education_scores[selected_rows],
+        ])
+        scored, _ = score_in_shards(
+            _score_enhanced_rows,
+            n_rows=len(row_data),
+            payload={
+                'job_features': job_features,
+                'skill_weights': self.skill_rarity.skill_weights,
+            },
+            limit=limit,
+            snapshot=snapshot,
+            row_data=row_data,
+            local_service=self
+        )
+        
+        # Phase 2: explanations and CV details for the top-K only
         matches = []
-        for cv in cvs:
-            cv_features = self._extract_cv_features(cv)
-            
-            # Compute enhanced match score
-            match_result = self._compute_enhanced_match(cv_features, job_features)
+        for _, _, (i, cv_features, result) in scored:
+            cv_features['cv_id'] = snapshot.cv_ids[i]
+            match_result = self._materialize_enhanced_match(cv_features, job_features, result)
             
             # Add CV details
             match_result.update({
-                'full_name': cv.full_name,
-                'current_job_title': cv.current_job_title or 'N/A',
-                'total_years_experience': cv.total_years_experience or 0,
-                'city': cv.city or 'N/A',
-                'email': cv.email,
-                'phone': cv.phone,
+                'full_name': snapshot.full_name[i],
+                'current_job_title': snapshot.current_job_title[i] or 'N/A',
+                'total_years_experience': snapshot.total_years_experience[i] or 0,
+                'city': snapshot.city[i] or 'N/A',
+                'email': snapshot.email[i],
+                'phone': snapshot.phone[i],
             })
             
             matches.append(match_result)
         
-        # Sort by final score
-        matches.sort(key=lambda x: x['final_score'], reverse=True)
-        
-        return matches[:limit]
+        return matches
     
     def match_candidate(
         self,
@@ -184,13 +244,19 @@ class EnhancedMatchingService:
         # Extract CV features
         cv_features = self._extract_cv_features(cv)
         
-        # Match each job
-        matches = []
+        # Phase 1: numeric scoring for every job, streamed into a top-K
+        top = TopK(limit)
         for job in jobs:
             job_features = self._extract_job_features(job, job_type)
             
             # Compute enhanced match score
-            match_result = self._compute_enhanced_match(cv_features, job_features)
+            result = self._score_enhanced_match(cv_features, job_features)
+            top.push(result['final_score'], (job, job_features, result))
+        
+        # Phase 2: explanations and job details for the top-K only
+        matches = []
+        for job, job_features, result in top.results():
+            match_result = self._materialize_enhanced_match(cv_features, job_features, result)
             
             # Add job details
             match_result.update({
@@ -205,10 +271,7 @@ class EnhancedMatchingService:
             
             matches.append(match_result)
         
-        # Sort by final score
-        matches.sort(key=lambda x: x['final_score'], reverse=True)
-        
-        return matches[:limit]
+        return matches
     
     def _extract_cv_features(self, cv: CV) -> Dict:
         """Extract and enhance CV features using Phase 1-3"""
@@ -307,7 +370,12 @@ class EnhancedMatchingService:
             'salary_max': getattr(job, 'salary_max_zmw', 0),
         }
     
-    def _compute_enhanced_match(self, cv_features: Dict, job_features: Dict) -> Dict:
+    def _compute_enhanced_match(
+        self,
+        cv_features: Dict,
+        job_features: Dict,
+        component_scores: Optional[Dict[str, float]] = None
+    ) -> Dict:
         """
         Compute enhanced match score using all three phases:
         1. Skills score with rarity weighting (Phase 3)
@@ -315,7 +383,68 @@ class EnhancedMatchingService:
         3. Location match
         4. Education match
         5. Category confidence and irrelevance penalty (Phase 2)
+        
+        component_scores may carry experience/location/education scores
+        already computed over the CV snapshot.
+        """
+        scored = self._score_enhanced_match(cv_features, job_features, component_scores)
+        return self._materialize_enhanced_match(cv_features, job_features, scored)
+    
+    def _snapshot_cv_features(self, snapshot, i: int) -> Dict:
+        """
+        Scoring features of snapshot row i (skills and clusters were
+        normalized when the snapshot was built). cv_id is filled in by the
+        caller for the rows it returns.
+        """
+        normalized_skills = snapshot.skills(i)
+        category_confidence = self.category_scorer.score_cv(
+            job_title=snapshot.title(i) or "General Worker",
+            skills=normalized_skills,
+            skill_clusters=snapshot.clusters(i)
+        )
+        return {
+            'normalized_skills': normalized_skills,
+            'category_confidence': category_confidence,
+        }
+    
+    def _score_rows(self, snapshot, rows: np.ndarray, job_features: Dict, offset: int, limit: int) -> Tuple:
+        """
+        Numeric pass over (snapshot row, experience, location, education)
+        rows, keeping the top `limit` by final score.
+        
+        Args:
+            snapshot: CVSnapshot or its shared-memory view
+            rows: (n, 4) array; column 0 is the snapshot row index
+        
+        Returns:
+            ([(final_score, position, (row index, cv_features, scored)), ...], {})
+        """
+        top = TopK(limit)
+        for position, (i, experience, location, education) in enumerate(rows, offset):
+            i = int(i)
+            cv_features = self._snapshot_cv_features(snapshot, i)
+            
+            # Compute enhanced match score
+            result = self._score_enhanced_match(cv_features, job_features, {
+                'experience': float(experience),
+                'location': float(location),
+                'education': float(education),
+            })
+            top.push(result['final_score'], (result['final_score'], position, (i, cv_features, result)))
+        return top.results(), {}
+    
+    def _score_enhanced_match(
+        self,
+        cv_features: Dict,
+        job_features: Dict,
+        component_scores: Optional[Dict[str, float]] = None
+    ) -> Dict:
+        """
+        Numeric scoring pass: component scores, penalty and final score only.
+        Ranking uses scored['final_score']; strings are built later by
+        _materialize_enhanced_match for the matches actually returned.
         """
+        component_scores = component_scores or {}
         
         # ========================================================================
         # PHASE 3: SKILL RARITY WEIGHTING (TF-IDF)
@@ -334,28 +463,34 @@ class EnhancedMatchingService:
         # EXPERIENCE SCORING
         # ========================================================================
         
-        experience_score = self._compute_experience_score(
-            cv_features['experience_years'],
-            job_features['experience_required']
-        )
+        experience_score = component_scores.get('experience')
+        if experience_score is None:
+            experience_score = self._compute_experience_score(
+                cv_features['experience_years'],
+                job_features['experience_required']
+            )
         
         # ========================================================================
         # LOCATION SCORING
         # ========================================================================
         
-        location_score = self._compute_location_score(
-            cv_features['location'],
-            job_features['location']
-        )
+        location_score = component_scores.get('location')
+        if location_score is None:
+            location_score = self._compute_location_score(
+                cv_features['location'],
+                job_features['location']
+            )
         
         # ========================================================================
         # EDUCATION SCORING
         # ========================================================================
         
-        education_score = self._compute_education_score(
-            cv_features['education_level'],
-            job_features['education_required']
-        )
+        education_score = component_scores.get('education')
+        if education_score is None:
+            education_score = self._compute_education_score(
+                cv_features['education_level'],
+                job_features['education_required']
+            )
         
         # ========================================================================
         # COMBINE SCORES WITH WEIGHTS
@@ -380,6 +515,30 @@ class EnhancedMatchingService:
         # Apply penalty
         final_score = raw_score * penalty_result['penalty_multiplier']
         
+        return {
+            'final_score': round(final_score * 100, 1),
+            'raw_score': raw_score,
+            'skills_score': skills_score,
+            'experience_score': experience_score,
+            'location_score': location_score,
+            'education_score': education_score,
+            'penalty_result': penalty_result,
+            'matched_skills': matched_skills,
+            'missing_skills': missing_skills,
+        }
+    
+    def _materialize_enhanced_match(self, cv_features: Dict, job_features: Dict, scored: Dict) -> Dict:
+        """Build the full match result (breakdown, categories, explanation)."""
+        final_score = scored['final_score']
+        raw_score = scored['raw_score']
+        skills_score = scored['skills_score']
+        experience_score = scored['experience_score']
+        location_score = scored['location_score']
+        education_score = scored['education_score']
+        penalty_result = scored['penalty_result']
+        matched_skills = scored['matched_skills']
+        missing_skills = scored['missing_skills']
+        
         # ========================================================================
         # RETURN COMPREHENSIVE RESULTS
         # ========================================================================
@@ -389,7 +548,7 @@ class EnhancedMatchingService:
             'job_id': job_features['job_id'],
             
             # Final scores
-            'final_score': round(final_score * 100, 1),
+            'final_score': final_score,
             'raw_score': round(raw_score * 100, 1),
             
             # Component scores (before weighting)
@@ -516,17 +675,8 @@ class EnhancedMatchingService:
             return 1.0
         
         # Same province (simplified)
-        province_mapping = {
-            'lusaka': 'lusaka',
-            'kitwe': 'copperbelt',
-            'ndola': 'copperbelt',
-            'livingstone': 'southern',
-            'chipata': 'eastern',
-            'solwezi': 'northwestern',
-        }
-        
-        cv_province = province_mapping.get(cv_loc, cv_loc)
-        job_province = province_mapping.get(job_loc, job_loc)
+        cv_province = PROVINCE_MAPPING.get(cv_loc, cv_loc)
+        job_province = PROVINCE_MAPPING.get(job_loc, job_loc)
         
         if cv_province == job_province:
             return 0.7
@@ -542,17 +692,8 @@ class EnhancedMatchingService:
         if not cv_education:
             return 0.5
         
-        education_levels = {
-            'grade 12': 1,
-            'certificate': 2,
-            'diploma': 3,
-            'bachelor': 4,
-            'masters': 5,
-            'phd': 6,
-        }
-        
-        cv_level = education_levels.get(cv_education.lower(), 0)
-        required_level = education_levels.get(required_education.lower(), 0)
+        cv_level = EDUCATION_LEVELS.get(cv_education.lower(), 0)
+        required_level = EDUCATION_LEVELS.get(required_education.lower(), 0)
         
         if cv_level >= required_level:
             return 1.0
@@ -561,6 +702,46 @@ class EnhancedMatchingService:
         else:
             return 0.4
     
+    # ========================================================================
+    # VECTORIZED SCORING (CV SNAPSHOT)
+    # ========================================================================
+    
+    def _compute_experience_scores(self, cv_years: np.ndarray, required_years: int) -> np.ndarray:
+        """Vectorized _compute_experience_score over the snapshot"""
+        if required_years == 0:
+            return np.ones(len(cv_years))
+        
+        overage = cv_years - required_years
+        shortage = required_years - cv_years
+        return np.select(
+            [overage >= 0, shortage <= 1, shortage <= 2],
+            [np.select([overage <= 2, overage <= 5], [1.0, 0.9], default=0.8), 0.9, 0.7],
+            default=0.5
+        )
+    
+    def _compute_location_scores(self, snapshot: CVSnapshot, job_location: str) -> np.ndarray:
+        """Vectorized _compute_location_score: score each city once, then gather"""
+        if not job_location:
+            return np.full(len(snapshot), 0.5)
+        
+        # Vocab keys are already lowered/stripped; a blank key came from a
+        # whitespace-only city, which the scalar scorer treats as present.
+        # Trailing entry is picked up by MISSING_CODE (-1)
+        by_city = np.array(
+            [self._compute_location_score(city or ' ', job_location) for city in snapshot.city_vocab] + [0.5]
+        )
+        return by_city[snapshot.city_id]
+    
+    def _compute_education_scores(self, snapshot: CVSnapshot, required_education: str) -> np.ndarray:
+        """Vectorized _compute_education_score: score each level once, then gather"""
+        if not required_education:
+            return np.ones(len(snapshot))
+        
+        by_level = np.array(
+            [self._compute_education_score(level, required_education) for level in snapshot.education_vocab] + [0.5]
+        )
+        return by_level[snapshot.education_id]
+    
     def _generate_explanation(
         self,
         skills_score: float,
@@ -629,6 +810,27 @@ class EnhancedMatchingService:
         return query
 
 
+# ============================================================================
+# PARALLEL SCORING TASK
+# ============================================================================
+
+_worker_service: Optional[EnhancedMatchingService] = None
+
+
+def _score_enhanced_rows(snapshot, start, stop, rows, payload, limit, service=None):
+    """
+    Shard task for score_in_shards. Workers build one DB-free scorer each
+    and take the rarity weights from the payload.
+    """
+    global _worker_service
+    if service is None:
+        if _worker_service is None:
+            _worker_service = EnhancedMatchingService(db=None, skill_weights=payload['skill_weights'])
+        service = _worker_service
+        service.skill_rarity.skill_weights = payload['skill_weights']
+    return service._score_rows(snapshot, rows, payload['job_features'], start, limit)
+
+
 # ============================================================================
 # STANDALONE FUNCTIONS FOR TESTING
 # ============================================================================
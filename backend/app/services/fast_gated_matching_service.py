@@ -1,9 +1,12 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 from sqlalchemy.orm import Session
 import time
+import numpy as np
 from app.models.cv import CV
 from app.models.corporate_job import CorporateJob
 from app.services.skill_normalizer import SkillNormalizer
+from app.services.cv_snapshot import CVSnapshot, get_cv_snapshot
+from app.services.top_k import top_k_indices
 
 
 # ============================================================================
@@ -58,62 +61,61 @@ class FastGatedMatchingService:
         # Convert to set for fast lookup
         job_skills_set = set(s.lower() for s in job_skills)
         
-        # Get all CVs
+        # Shared in-memory CV snapshot (struct-of-arrays)
         t2 = time.time()
-        cvs = self.db.query(CV).all()
-        total_cvs = len(cvs)
-        print(f"⏱️  Database query: {(time.time() - t2):.2f}s")
-        print(f"\n📊 Processing {total_cvs} CVs...")
+        snapshot = get_cv_snapshot(self.db)
+        processed = len(snapshot)
+        print(f"⏱️  CV snapshot: {(time.time() - t2):.2f}s")
+        print(f"\n📊 Processing {processed} CVs...")
         
+        # GATE 1: Fast exact matching over the CSR skill arrays
+        matched_count = self._count_matched_skills(snapshot, job_skills_set)
+        
+        # Compute scores for every CV at once
+        skill_scores = matched_count / len(job_skills)
+        experience_scores = self._compute_experience_scores(
+            snapshot.experience,
+            getattr(job, 'min_experience_years', 0)
+        )
+        location_scores = self._compute_location_scores(
+            snapshot,
+            getattr(job, 'location_city', '')
+        )
+        scores = (
+            skill_scores * WEIGHTS['skills'] +
+            experience_scores * WEIGHTS['experience'] +
+            location_scores * WEIGHTS['location']
+        )
+        
+        # GATE 2: Score threshold
+        has_skills = matched_count > 0
+        passed = has_skills & (scores >= min_score)
+        gated_out_no_skills = int((~has_skills).sum())
+        gated_out_low_score = int((has_skills & ~passed).sum())
+        
+        # Top-K survivors by rounded score (ties keep CV order)
+        survivors = np.flatnonzero(passed)
+        match_scores = np.array([round(float(scores[i]) * 100, 1) for i in survivors])
+        top = survivors[top_k_indices(match_scores, limit)]
+        
+        # Build results and explanations for the top-K only
         matches = []
-        processed = 0
-        gated_out_no_skills = 0
-        gated_out_low_score = 0
-        
-        for cv in cvs:
-            processed += 1
-            if processed % 100 == 0:
-                elapsed = time.time() - start_time
-                rate = processed / elapsed
-                eta = (total_cvs - processed) / rate if rate > 0 else 0
-                print(f"   Progress: {processed}/{total_cvs} CVs ({len(matches)} matches) | {rate:.1f} CVs/sec | ETA: {eta:.1f}s")
-            
-            # Extract CV skills
-            cv_skills = self._extract_cv_skills(cv)
-            
-            # GATE 1: Fast exact matching
-            cv_skills_set = set(s.lower() for s in cv_skills)
+        for i in top:
+            match_score = round(float(scores[i]) * 100, 1)
+            cv_skills_set = set(s.lower() for s in snapshot.skills(i))
             matched_skills = list(job_skills_set.intersection(cv_skills_set))
-            
-            if len(matched_skills) == 0:
-                gated_out_no_skills += 1
-                continue
-            
             missing_skills = list(job_skills_set - cv_skills_set)
+            score = float(scores[i])
             
-            # Compute score
-            score = self._compute_gated_score(
-                cv=cv,
-                job=job,
-                matched_count=len(matched_skills),
-                total_required=len(job_skills)
-            )
-            
-            # GATE 2: Score threshold
-            if score < min_score:
-                gated_out_low_score += 1
-                continue
-            
-            # Add to results
             matches.append({
-                'cv_id': cv.cv_id,
-                'full_name': cv.full_name,
-                'current_job_title': cv.current_job_title or 'N/A',
-                'total_years_experience': cv.total_years_experience or 0,
-                'city': cv.city or 'N/A',
-                'email': cv.email,
-                'phone': cv.phone,
-                'match_score': round(score * 100, 1),
+                'cv_id': snapshot.cv_ids[i],
+                'full_name': snapshot.full_name[i],
+                'current_job_title': snapshot.current_job_title[i] or 'N/A',
+                'total_years_experience': snapshot.total_years_experience[i] or 0,
+                'city': snapshot.city[i] or 'N/A',
+                'email': snapshot.email[i],
+                'phone': snapshot.phone[i],
+                'match_score': match_score,
                 'matched_skills': matched_skills[:10],  # Top 10
                 'missing_skills': missing_skills[:10],
                 'explanation': self._generate_explanation(score, len(matched_skills), len(job_skills))
@@ -122,16 +124,13 @@ class FastGatedMatchingService:
         # Print summary
         total_time = time.time() - start_time
         print(f"\n📈 Matching Summary:")
-        print(f"   Total CVs processed: {total_cvs}")
+        print(f"   Total CVs processed: {processed}")
         print(f"   Gated out (no skills): {gated_out_no_skills}")
         print(f"   Gated out (low score): {gated_out_low_score}")
-        print(f"   Final matches: {len(matches)}")
-        print(f"   Total time: {total_time:.2f}s ({total_cvs/total_time:.1f} CVs/sec)")
+        print(f"   Final matches: {len(survivors)}")
+        print(f"   Total time: {total_time:.2f}s ({processed/max(total_time, 1e-9):.1f} CVs/sec)")
         
-        # Sort by score
-        matches.sort(key=lambda x: x['match_score'], reverse=True)
-        
-        return matches[:limit]
+        return matches
     
     def _extract_job_skills(self, job) -> List[str]:
         """Extract and normalize job skills"""
@@ -163,6 +162,20 @@ class FastGatedMatchingService:
         
         return []
     
+    def _count_matched_skills(self, snapshot: CVSnapshot, job_skills_set: Set[str]) -> np.ndarray:
+        """Distinct job skills (case-insensitive) found in each CV"""
+        job_keys = [snapshot.skill_key_vocab[s] for s in job_skills_set if s in snapshot.skill_key_vocab]
+        if not job_keys or len(snapshot.skill_ids) == 0:
+            return np.zeros(len(snapshot), dtype=np.int64)
+        
+        entry_keys = snapshot.skill_key_of_id[snapshot.skill_ids]
+        hits = np.isin(entry_keys, job_keys)
+        entry_rows = np.repeat(np.arange(len(snapshot)), np.diff(snapshot.skill_indptr))
+        
+        # A CV listing the same skill twice still counts it once
+        pairs = np.unique(entry_rows[hits].astype(np.int64) * len(snapshot.skill_key_vocab) + entry_keys[hits])
+        return np.bincount(pairs // len(snapshot.skill_key_vocab), minlength=len(snapshot))
+    
     def _compute_gated_score(
         self,
         cv: CV,
@@ -211,6 +224,28 @@ class FastGatedMatchingService:
             else:
                 return 0.5
     
+    def _compute_experience_scores(self, cv_years: np.ndarray, required_years: int) -> np.ndarray:
+        """Vectorized _compute_experience_score over the snapshot"""
+        if required_years == 0:
+            return np.ones(len(cv_years))
+        
+        shortage = required_years - cv_years
+        return np.select(
+            [cv_years >= required_years, shortage <= 1, shortage <= 2],
+            [1.0, 0.9, 0.7],
+            default=0.5
+        )
+    
+    def _compute_location_scores(self, snapshot: CVSnapshot, job_location: str) -> np.ndarray:
+        """Vectorized _compute_location_score: score each city once, then gather"""
+        if not job_location:
+            return np.full(len(snapshot), 0.5)
+        
+        job_loc = job_location.lower().strip()
+        # Trailing entry is picked up by MISSING_CODE (-1)
+        by_city = np.array([1.0 if city == job_loc else 0.3 for city in snapshot.city_vocab] + [0.5])
+        return by_city[snapshot.city_id]
+    
     def _compute_location_score(self, cv_location: str, job_location: str) -> float:
         """Simple location matching"""
         if not cv_location or not job_location:
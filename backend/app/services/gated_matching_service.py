@@ -11,10 +11,14 @@ Implements ChatGPT's recommendations:
 from typing import List, Dict, Optional
 from sqlalchemy.orm import Session
 import time
+import numpy as np
 from app.models.cv import CV
 from app.models.corporate_job import CorporateJob
 from app.models.small_job import SmallJob
 from app.services.skill_normalizer import SkillNormalizer
+from app.services.cv_snapshot import CVSnapshot, get_cv_snapshot
+from app.services.top_k import TopK
+from app.services.parallel_scoring import score_in_shards
 from app.services.enhanced_skill_matcher import EnhancedSkillMatcher
 
 
@@ -43,6 +47,9 @@ class GatedMatchingService:
     Sprint A implementation.
     """
     
+    # Bump when scoring changes (part of request-coalescing and cache keys)
+    ENGINE_VERSION = "gated-1"
+    
     def __init__(self, db: Session):
         self.db = db
         self.skill_normalizer = SkillNormalizer()
@@ -81,27 +88,98 @@ class GatedMatchingService:
         if not job_skills:
             return []
         
-        # Get all CVs (TODO: add category filter in Sprint B)
+        # Shared in-memory CV snapshot (struct-of-arrays)
+        # TODO: add category filter in Sprint B
         t2 = time.time()
-        cvs = self.db.query(CV).all()
-        total_cvs = len(cvs)
-        print(f"⏱️  Database query: {(time.time() - t2):.2f}s")
+        snapshot = get_cv_snapshot(self.db)
+        total_cvs = len(snapshot)
+        print(f"⏱️  CV snapshot: {(time.time() - t2):.2f}s")
         print(f"\n📊 Processing {total_cvs} CVs...")
         
-        matches = []
-        processed = 0
+        # Experience and location scores for every CV at once
+        experience_scores = self._compute_experience_scores(
+            snapshot.experience,
+            getattr(job, 'min_experience_years', 0)
+        )
+        location_scores = self._compute_location_scores(
+            snapshot,
+            getattr(job, 'location_city', '')
+        )
+        
+        # Score shards of the pool (in parallel for large pools)
+        scored, stats = score_in_shards(
+            _score_gated_rows,
+            n_rows=total_cvs,
+            payload={'job_skills': job_skills, 'min_score': min_score},
+            limit=limit,
+            snapshot=snapshot,
+            row_data=np.column_stack([experience_scores, location_scores]),
+            local_service=self
+        )
+        processed = total_cvs
+        
+        # Print summary
+        total_time = time.time() - start_time
+        print(f"\n📈 Matching Summary:")
+        print(f"   Total CVs processed: {processed}")
+        print(f"   Gated out (no skills): {stats.get('gated_out_no_skills', 0)}")
+        print(f"   Gated out (low score): {stats.get('gated_out_low_score', 0)}")
+        print(f"   Final matches: {stats.get('passed', 0)}")
+        print(f"   Total time: {total_time:.2f}s ({processed/total_time:.1f} CVs/sec)")
+        
+        # Materialize results and explanations for the top-K only (highest first)
+        return [
+            {
+                'cv_id': snapshot.cv_ids[i],
+                'full_name': snapshot.full_name[i],
+                'current_job_title': snapshot.current_job_title[i] or 'N/A',
+                'total_years_experience': snapshot.total_years_experience[i] or 0,
+                'city': snapshot.city[i] or 'N/A',
+                'email': snapshot.email[i],
+                'phone': snapshot.phone[i],
+                'match_score': match_score,  # Percentage
+                'matched_skills': matched_skills,
+                'missing_skills': missing_skills,
+                'explanation': self._generate_explanation(score, matched_skills, missing_skills)
+            }
+            for match_score, i, (score, matched_skills, missing_skills) in scored
+        ]
+    
+    def _score_rows(
+        self,
+        snapshot,
+        start: int,
+        stop: int,
+        component_scores: np.ndarray,
+        job_skills: List[str],
+        min_score: float,
+        limit: int
+    ) -> tuple:
+        """
+        Score snapshot rows [start, stop) and keep the top `limit`.
+        
+        Args:
+            snapshot: CVSnapshot or its shared-memory view
+            component_scores: (stop - start, 2) experience/location scores
+            
+        Returns:
+            ([(match_score, row, (score, matched, missing)), ...], counters)
+        """
+        top = TopK(limit)
+        total = stop - start
         gated_out_no_skills = 0
         gated_out_low_score = 0
+        start_time = time.time()
         
-        for cv in cvs:
-            processed += 1
+        for offset, i in enumerate(range(start, stop)):
+            processed = offset + 1
             if processed % 100 == 0:
                 elapsed = time.time() - start_time
                 rate = processed / elapsed
-                eta = (total_cvs - processed) / rate
-                print(f"   Progress: {processed}/{total_cvs} CVs ({len(matches)} matches) | {rate:.1f} CVs/sec | ETA: {eta:.1f}s")
-            # Extract CV skills
-            cv_skills = self._extract_cv_skills(cv)
+                eta = (total - processed) / rate
+                print(f"   Progress: {processed}/{total} CVs ({top.seen} matches) | {rate:.1f} CVs/sec | ETA: {eta:.1f}s")
+            # CV skills are normalized once when the snapshot is built
+            cv_skills = snapshot.skills(i)
             
             # GATE 1: HARD GATE - 0 skills matched → exclude
             t_skill_match = time.time()
@@ -114,12 +192,14 @@ class GatedMatchingService:
             
             # Compute match score
             score = self._compute_gated_score(
-                cv=cv,
-                job=job,
+                cv=None,
+                job=None,
                 cv_skills=cv_skills,
                 job_skills=job_skills,
                 matched_skills=matched_skills,
-                missing_skills=missing_skills
+                missing_skills=missing_skills,
+                experience_score=float(component_scores[offset, 0]),
+                location_score=float(component_scores[offset, 1])
             )
             
             # GATE 2: Score threshold
@@ -127,34 +207,15 @@ class GatedMatchingService:
                 gated_out_low_score += 1
                 continue  # Skip low-scoring matches
             
-            # Add to results
-            matches.append({
-                'cv_id': cv.cv_id,
-                'full_name': cv.full_name,
-                'current_job_title': cv.current_job_title or 'N/A',
-                'total_years_experience': cv.total_years_experience or 0,
-                'city': cv.city or 'N/A',
-                'email': cv.email,
-                'phone': cv.phone,
-                'match_score': round(score * 100, 1),  # Convert to percentage
-                'matched_skills': matched_skills,
-                'missing_skills': missing_skills,
-                'explanation': self._generate_explanation(score, matched_skills, missing_skills)
-            })
+            # Keep the numbers; the result dict is built for the top-K only
+            match_score = round(score * 100, 1)
+            top.push(match_score, (match_score, i, (score, matched_skills, missing_skills)))
         
-        # Print summary
-        total_time = time.time() - start_time
-        print(f"\n📈 Matching Summary:")
-        print(f"   Total CVs processed: {total_cvs}")
-        print(f"   Gated out (no skills): {gated_out_no_skills}")
-        print(f"   Gated out (low score): {gated_out_low_score}")
-        print(f"   Final matches: {len(matches)}")
-        print(f"   Total time: {total_time:.2f}s ({total_cvs/total_time:.1f} CVs/sec)")
-        
-        # Sort by score (highest first)
-        matches.sort(key=lambda x: x['match_score'], reverse=True)
-        
-        return matches[:limit]
+        return top.results(), {
+            'gated_out_no_skills': gated_out_no_skills,
+            'gated_out_low_score': gated_out_low_score,
+            'passed': top.seen,
+        }
     
     def _extract_job_skills(self, job) -> List[str]:
         """Extract and normalize job skills"""
@@ -221,27 +282,33 @@ class GatedMatchingService:
         cv_skills: List[str],
         job_skills: List[str],
         matched_skills: List[str],
-        missing_skills: List[str]
+        missing_skills: List[str],
+        experience_score: Optional[float] = None,
+        location_score: Optional[float] = None
     ) -> float:
         """
         Compute match score with transparent logic.
         
         NO BASE PADDING - score is earned through actual matches.
+        Experience/location scores precomputed over the snapshot can be
+        passed in; otherwise they are computed from the CV.
         """
         # Skill similarity (primary signal - 80%)
         skill_score = len(matched_skills) / len(job_skills) if job_skills else 0.0
         
         # Experience match (secondary - 15%)
-        experience_score = self._compute_experience_score(
-            cv.total_years_experience or 0,
-            getattr(job, 'min_experience_years', 0)
-        )
+        if experience_score is None:
+            experience_score = self._compute_experience_score(
+                cv.total_years_experience or 0,
+                getattr(job, 'min_experience_years', 0)
+            )
         
         # Location bonus (minor - 5%)
-        location_score = self._compute_location_score(
-            cv.city or '',
-            getattr(job, 'location_city', '')
-        )
+        if location_score is None:
+            location_score = self._compute_location_score(
+                cv.city or '',
+                getattr(job, 'location_city', '')
+            )
         
         # Weighted sum (NO PADDING!)
         final_score = (
@@ -270,6 +337,28 @@ class GatedMatchingService:
             else:
                 return 0.5
     
+    def _compute_experience_scores(self, cv_years: np.ndarray, required_years: int) -> np.ndarray:
+        """Vectorized _compute_experience_score over the snapshot"""
+        if required_years == 0:
+            return np.ones(len(cv_years))
+        
+        shortage = required_years - cv_years
+        return np.select(
+            [cv_years >= required_years, shortage <= 1, shortage <= 2],
+            [1.0, 0.9, 0.7],
+            default=0.5
+        )
+    
+    def _compute_location_scores(self, snapshot: CVSnapshot, job_location: str) -> np.ndarray:
+        """Vectorized _compute_location_score: score each city once, then gather"""
+        if not job_location:
+            return np.full(len(snapshot), 0.5)
+        
+        job_loc = job_location.lower().strip()
+        # Trailing entry is picked up by MISSING_CODE (-1)
+        by_city = np.array([1.0 if city == job_loc else 0.3 for city in snapshot.city_vocab] + [0.5])
+        return by_city[snapshot.city_id]
+    
     def _compute_location_score(self, cv_location: str, job_location: str) -> float:
         """Simple location matching"""
         if not cv_location or not job_location:
@@ -312,6 +401,25 @@ class GatedMatchingService:
         return " | ".join(parts)
 
 
+# ============================================================================
+# PARALLEL SCORING TASK
+# ============================================================================
+
+_worker_service: Optional[GatedMatchingService] = None
+
+
+def _score_gated_rows(snapshot, start, stop, rows, payload, limit, service=None):
+    """Shard task for score_in_shards (workers build one scoring service each)."""
+    global _worker_service
+    if service is None:
+        if _worker_service is None:
+            _worker_service = GatedMatchingService(db=None)
+        service = _worker_service
+    return service._score_rows(
+        snapshot, start, stop, rows, payload['job_skills'], payload['min_score'], limit
+    )
+
+
 # ============================================================================
 # CONVENIENCE FUNCTION
 # ============================================================================
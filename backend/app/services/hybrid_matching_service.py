@@ -17,6 +17,9 @@ import json
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.services.top_k import TopK
+from app.services.parallel_scoring import score_in_shards
+
 
 class HybridMatchingService:
     """
@@ -128,6 +131,27 @@ class HybridMatchingService:
         
         return normalized
     
+    def compute_bm25_scores(self, job_skills: List[str]) -> Dict[str, float]:
+        """
+        BM25 scores (0-1 normalized) for every CV with a single get_scores call.
+        
+        compute_bm25_score runs get_scores over the whole corpus for each CV;
+        use this when scoring the full pool.
+        """
+        if not self.bm25:
+            return {}
+        
+        query_skills = [s.strip().lower() for s in job_skills]
+        scores = self.bm25.get_scores(query_skills)
+        max_possible = len(query_skills) * 2.0  # Rough heuristic
+        
+        normalized = {}
+        for cv_id, raw_score in zip(self.cv_ids, scores):
+            # First occurrence wins, like list.index in compute_bm25_score
+            if cv_id not in normalized:
+                normalized[cv_id] = min(raw_score / max_possible, 1.0)
+        return normalized
+    
     def compute_skill_overlap_score(self, job_skills: List[str], cv_skills: List[str]) -> Dict:
         """
         Compute exact skill overlap with rarity weighting
@@ -166,13 +190,24 @@ class HybridMatchingService:
             'missing_skills': [s for s in job_skills if s.lower() not in matched_skills]
         }
     
+    def compute_semantic_score(self, job_id: str, cv_id: str) -> float:
+        """SBERT cosine similarity from cached embeddings (0.0 if missing)"""
+        job_embedding = self.embedding_service.get_job_embedding(job_id)
+        cv_embedding = self.embedding_service.get_cv_embedding(cv_id)
+        
+        if job_embedding and cv_embedding:
+            return self.embedding_service.cosine_similarity(job_embedding, cv_embedding)
+        return 0.0
+    
     def compute_hybrid_score(
         self,
         job_id: str,
         cv_id: str,
         job_skills: List[str],
         cv_skills: List[str],
-        weights: Dict[str, float] = None
+        weights: Dict[str, float] = None,
+        semantic_score: float = None,
+        bm25_score: float = None
     ) -> Tuple[float, Dict]:
         """
         Compute hybrid score combining multiple signals
@@ -183,6 +218,8 @@ class HybridMatchingService:
             job_skills: List of job skills
             cv_skills: List of CV skills
             weights: Dictionary of component weights
+            semantic_score: Precomputed SBERT similarity (skips the lookup)
+            bm25_score: Precomputed BM25 score (see compute_bm25_scores)
             
         Returns:
             (hybrid_score, breakdown_dict)
@@ -197,16 +234,12 @@ class HybridMatchingService:
             }
         
         # 1. Semantic similarity (SBERT)
-        job_embedding = self.embedding_service.get_job_embedding(job_id)
-        cv_embedding = self.embedding_service.get_cv_embedding(cv_id)
-        
-        if job_embedding and cv_embedding:
-            semantic_score = self.embedding_service.cosine_similarity(job_embedding, cv_embedding)
-        else:
-            semantic_score = 0.0
+        if semantic_score is None:
+            semantic_score = self.compute_semantic_score(job_id, cv_id)
         
         # 2. BM25 keyword score
-        bm25_score = self.compute_bm25_score(job_skills, cv_id)
+        if bm25_score is None:
+            bm25_score = self.compute_bm25_score(job_skills, cv_id)
         
         # 3. Skill overlap analysis
         overlap_data = self.compute_skill_overlap_score(job_skills, cv_skills)
@@ -287,44 +320,105 @@ class HybridMatchingService:
         """)
         cvs = self.db.execute(cv_query).fetchall()
         
-        # Score each CV
-        results = []
-        for cv in cvs:
+        # BM25 for every CV in one pass; embeddings are looked up here because
+        # the embedding service holds a DB session
+        bm25_scores = self.compute_bm25_scores(job_skills)
+        row_data = [
+            (
+                tuple(cv),
+                self.compute_semantic_score(job_id, cv.cv_id),
+                bm25_scores.get(cv.cv_id, 0.0)
+            )
+            for cv in cvs
+        ]
+        
+        # Overlap, weighting and top-K per shard (in parallel for large pools)
+        scored, _ = score_in_shards(
+            _score_hybrid_rows,
+            n_rows=len(row_data),
+            payload={
+                'job_id': job_id,
+                'job_skills': job_skills,
+                'weights': weights,
+                'min_score': min_score,
+                'skill_rarity_weights': self.skill_rarity_weights,
+            },
+            limit=top_k,
+            row_data=row_data,
+            local_service=self
+        )
+        
+        # Highest hybrid score first
+        return [result for _, _, result in scored]
+    
+    def _score_rows(
+        self,
+        rows: List[Tuple],
+        job_id: str,
+        job_skills: List[str],
+        weights: Dict[str, float],
+        min_score: float,
+        offset: int,
+        limit: int
+    ) -> Tuple[List, Dict]:
+        """
+        Score (cv columns, semantic score, bm25 score) rows, keeping the top `limit`.
+        
+        Returns:
+            ([(hybrid_score, position, result), ...], {})
+        """
+        top = TopK(limit)
+        for position, (cv_columns, semantic_score, bm25_score) in enumerate(rows, offset):
+            cv_id, full_name, skills_technical, skills_soft, years, city, education = cv_columns
+            
             cv_skills = []
-            if cv.skills_technical:
-                cv_skills.extend([s.strip() for s in cv.skills_technical.split(',')])
-            if cv.skills_soft:
-                cv_skills.extend([s.strip() for s in cv.skills_soft.split(',')])
+            if skills_technical:
+                cv_skills.extend([s.strip() for s in skills_technical.split(',')])
+            if skills_soft:
+                cv_skills.extend([s.strip() for s in skills_soft.split(',')])
             
             # Compute hybrid score
             hybrid_score, breakdown = self.compute_hybrid_score(
                 job_id=job_id,
-                cv_id=cv.cv_id,
+                cv_id=cv_id,
                 job_skills=job_skills,
                 cv_skills=cv_skills,
-                weights=weights
+                weights=weights,
+                semantic_score=semantic_score,
+                bm25_score=bm25_score
             )
             
             # Filter by min_score
             if hybrid_score < min_score:
                 continue
             
-            results.append({
-                'cv_id': cv.cv_id,
-                'full_name': cv.full_name,
+            top.push(hybrid_score, (hybrid_score, position, {
+                'cv_id': cv_id,
+                'full_name': full_name,
                 'match_score': hybrid_score,
                 'semantic_score': breakdown['semantic_score'],
                 'bm25_score': breakdown['bm25_score'],
                 'exact_overlap': breakdown['exact_overlap'],
                 'matched_skills': breakdown['matched_skills'],
                 'missing_skills': breakdown['missing_skills'],
-                'years_experience': cv.total_years_experience or 0,
-                'location': cv.city,
-                'education': cv.education_level,
+                'years_experience': years or 0,
+                'location': city,
+                'education': education,
                 'breakdown': breakdown
-            })
-        
-        # Sort by hybrid score
-        results.sort(key=lambda x: x['match_score'], reverse=True)
-        
-        return results[:top_k]
+            }))
+        return top.results(), {}
+
+
+# ============================================================================
+# PARALLEL SCORING TASK
+# ============================================================================
+
+def _score_hybrid_rows(snapshot, start, stop, rows, payload, limit, service=None):
+    """Shard task for score_in_shards (workers only need the rarity weights)."""
+    if service is None:
+        service = HybridMatchingService(db=None, embedding_service=None)
+        service.skill_rarity_weights = payload['skill_rarity_weights']
+    return service._score_rows(
+        rows, payload['job_id'], payload['job_skills'], payload['weights'],
+        payload['min_score'], start, limit
+    )
@@ -2,7 +2,7 @@
 Job Service - Business logic for job operations (Corporate and Small Jobs)
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import Date, cast, false, func, literal, or_, and_, select, union_all
 from typing import Optional, List, Union
 from datetime import datetime, date
 import uuid
@@ -14,6 +14,13 @@ from app.schemas.job import (
     SmallJobCreate, SmallJobUpdate, SmallJobResponse,
     JobSearchRequest
 )
+from app.db.pagination import keyset_page, page_with_cursor
+from app.services.matching_service import invalidate_job_snapshot
+from app.services.rollup_service import RollupService
+
+
+# Text search configuration of the generated search_vector columns
+SEARCH_CONFIG = 'english'
 
 
 class JobService:
@@ -62,7 +69,9 @@ class JobService:
         )
         
         db.add(db_job)
+        RollupService.sync_job(db, db_job)
         db.commit()
+        invalidate_job_snapshot('corp')
         db.refresh(db_job)
         return db_job
     
@@ -88,7 +97,9 @@ class JobService:
         for field, value in update_data.items():
             setattr(db_job, field, value)
         
+        RollupService.sync_job(db, db_job)
         db.commit()
+        invalidate_job_snapshot('corp')
         db.refresh(db_job)
         return db_job
     
@@ -100,7 +111,9 @@ class JobService:
             return False
         
         db.delete(db_job)
+        RollupService.detach_job(db, job_id)
         db.commit()
+        invalidate_job_snapshot('corp')
         return True
     
     @staticmethod
@@ -114,8 +127,15 @@ class JobService:
         min_salary: Optional[float] = None,
         max_salary: Optional[float] = None,
         employment_type: Optional[str] = None,
-    ) -> tuple[List[CorporateJob], int]:
-        """List corporate jobs with filters"""
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[List[CorporateJob], Optional[int], Optional[str]]:
+        """
+        List corporate jobs with filters, newest first
+        
+        Returns:
+            (jobs, total or None when include_total is False, next page cursor)
+        """
         query = db.query(CorporateJob)
         
         # Apply filters
@@ -133,12 +153,15 @@ class JobService:
             query = query.filter(CorporateJob.employment_type == employment_type)
         
         # Get total count
-        total = query.count()
+        total = query.count() if include_total else None
         
         # Apply pagination and sort by posted date (newest first)
-        jobs = query.order_by(CorporateJob.posted_date.desc()).offset(skip).limit(limit).all()
+        rows = keyset_page(
+            query, limit, CorporateJob.posted_date, CorporateJob.job_id, skip=skip, cursor=cursor
+        ).all()
+        jobs, next_cursor = page_with_cursor(rows, limit, lambda job: (job.posted_date, job.job_id))
         
-        return jobs, total
+        return jobs, total, next_cursor
     
     # ========================================================================
     # SMALL JOBS
@@ -171,6 +194,7 @@ class JobService:
         
         db.add(db_job)
         db.commit()
+        invalidate_job_snapshot('small')
         db.refresh(db_job)
         return db_job
     
@@ -197,6 +221,7 @@ class JobService:
             setattr(db_job, field, value)
         
         db.commit()
+        invalidate_job_snapshot('small')
         db.refresh(db_job)
         return db_job
     
@@ -209,6 +234,7 @@ class JobService:
         
         db.delete(db_job)
         db.commit()
+        invalidate_job_snapshot('small')
         return True
     
     @staticmethod
@@ -249,6 +275,156 @@ class JobService:
     # COMBINED OPERATIONS
     # ========================================================================
     
+    @staticmethod
+    def _corporate_search_filters(search_request: JobSearchRequest) -> list:
+        """Non-text corporate job filters of a search request"""
+        filters = []
+        
+        if search_request.categories:
+            filters.append(CorporateJob.category.in_(search_request.categories))
+        
+        if search_request.locations:
+            filters.append(
+                or_(
+                    CorporateJob.location_city.in_(search_request.locations),
+                    CorporateJob.location_province.in_(search_request.locations)
+                )
+            )
+        
+        if search_request.min_salary:
+            filters.append(CorporateJob.salary_min_zmw >= search_request.min_salary)
+        
+        if search_request.max_salary:
+            filters.append(CorporateJob.salary_max_zmw <= search_request.max_salary)
+        
+        if search_request.employment_types:
+            filters.append(CorporateJob.employment_type.in_(search_request.employment_types))
+        
+        if search_request.experience_min is not None:
+            filters.append(CorporateJob.required_experience_years >= search_request.experience_min)
+        
+        if search_request.experience_max is not None:
+            filters.append(CorporateJob.required_experience_years <= search_request.experience_max)
+        
+        return filters
+    
+    @staticmethod
+    def _ranked_matches(search_request: JobSearchRequest):
+        """
+        Full-text matches across corporate and small jobs, as a subquery.
+        
+        Both tables are matched through their GIN-indexed search_vector and
+        ranked with ts_rank; UNION ALL merges them so relevance (not job
+        type) decides the order.
+        
+        Columns: job_type, job_id, rank, posted
+        """
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, search_request.query)
+        
+        corporate = select(
+            literal('corporate').label('job_type'),
+            CorporateJob.job_id,
+            func.ts_rank(CorporateJob.search_vector, tsquery).label('rank'),
+            CorporateJob.posted_date.label('posted')
+        ).where(
+            CorporateJob.search_vector.op('@@')(tsquery),
+            *JobService._corporate_search_filters(search_request)
+        )
+        
+        branches = [corporate]
+        # Small jobs have no category/salary-range/experience columns, so
+        # those filters exclude them instead of being ignored
+        if not (search_request.categories or search_request.min_salary or search_request.max_salary
+                or search_request.employment_types or search_request.experience_min is not None
+                or search_request.experience_max is not None):
+            small = select(
+                literal('small').label('job_type'),
+                SmallJob.job_id,
+                func.ts_rank(SmallJob.search_vector, tsquery).label('rank'),
+                cast(SmallJob.created_at, Date).label('posted')
+            ).where(SmallJob.search_vector.op('@@')(tsquery))
+            if search_request.locations:
+                small = small.where(SmallJob.location_city.in_(search_request.locations))
+            branches.append(small)
+        
+        return union_all(*branches).subquery('matches')
+    
+    @staticmethod
+    def ranked_search_statement(search_request: JobSearchRequest):
+        """
+        One ranked page across corporate and small jobs.
+        
+        Window counts return the totals with the page.
+        
+        Rows: job_type, job_id, rank, total, corporate_total
+        """
+        matches = JobService._ranked_matches(search_request)
+        skip = (search_request.page - 1) * search_request.page_size
+        
+        return select(
+            matches.c.job_type,
+            matches.c.job_id,
+            matches.c.rank,
+            func.count().over().label('total'),
+            func.count().filter(matches.c.job_type == 'corporate').over().label('corporate_total')
+        ).order_by(
+            matches.c.rank.desc(),
+            matches.c.posted.desc().nulls_last(),
+            matches.c.job_id
+        ).offset(skip).limit(search_request.page_size)
+    
+    @staticmethod
+    def ranked_count_statement(search_request: JobSearchRequest):
+        """
+        Totals for a full-text search, without fetching a page.
+        
+        Row: total, corporate_total
+        """
+        matches = JobService._ranked_matches(search_request)
+        return select(
+            func.count().label('total'),
+            func.count().filter(matches.c.job_type == 'corporate').label('corporate_total')
+        ).select_from(matches)
+    
+    @staticmethod
+    def _fulltext_search(db: Session, search_request: JobSearchRequest) -> dict:
+        """Ranked full-text search: one ranked query plus one id lookup per job type"""
+        rows = db.execute(JobService.ranked_search_statement(search_request)).all()
+        
+        ids = {'corporate': [], 'small': []}
+        for row in rows:
+            ids[row.job_type].append(row.job_id)
+        
+        corporate = {
+            job.job_id: job
+            for job in db.query(CorporateJob).filter(CorporateJob.job_id.in_(ids['corporate']))
+        } if ids['corporate'] else {}
+        small = {
+            job.job_id: job
+            for job in db.query(SmallJob).filter(SmallJob.job_id.in_(ids['small']))
+        } if ids['small'] else {}
+        
+        # Totals ride on every row; a page past the end has none to read
+        # them from, so count the matches separately
+        if rows:
+            total, corporate_total = rows[0].total, rows[0].corporate_total
+        elif search_request.page > 1:
+            total, corporate_total = db.execute(JobService.ranked_count_statement(search_request)).one()
+        else:
+            total = corporate_total = 0
+        
+        return {
+            'corporate_jobs': [corporate[job_id] for job_id in ids['corporate'] if job_id in corporate],
+            'small_jobs': [small[job_id] for job_id in ids['small'] if job_id in small],
+            'ranked': [
+                {'job_type': row.job_type, 'job_id': row.job_id, 'rank': float(row.rank)}
+                for row in rows
+            ],
+            'total_count': total,
+            'corporate_count': corporate_total,
+            'small_count': total - corporate_total
+        }
+    
     @staticmethod
     def search_all_jobs(
         db: Session,
@@ -257,9 +433,16 @@ class JobService:
         """
         Search both corporate and small jobs with filters
         
+        Text queries use ranked full-text search unless search_mode is
+        'ilike' (substring match, newest first).
+        
         Returns:
             Dict with 'corporate_jobs', 'small_jobs', and 'total_count'
+            ('ranked' also lists the combined relevance order in fulltext mode)
         """
+        if search_request.query and search_request.search_mode == 'fulltext':
+            return JobService._fulltext_search(db, search_request)
+        
         results = {
             'corporate_jobs': [],
             'small_jobs': [],
@@ -282,35 +465,7 @@ class JobService:
                 )
             )
         
-        if search_request.categories:
-            corp_query = corp_query.filter(CorporateJob.category.in_(search_request.categories))
-        
-        if search_request.locations:
-            corp_query = corp_query.filter(
-                or_(
-                    CorporateJob.location_city.in_(search_request.locations),
-                    CorporateJob.location_province.in_(search_request.locations)
-                )
-            )
-        
-        if search_request.min_salary:
-            corp_query = corp_query.filter(CorporateJob.salary_min_zmw >= search_request.min_salary)
-        
-        if search_request.max_salary:
-            corp_query = corp_query.filter(CorporateJob.salary_max_zmw <= search_request.max_salary)
-        
-        if search_request.employment_types:
-            corp_query = corp_query.filter(CorporateJob.employment_type.in_(search_request.employment_types))
-        
-        if search_request.experience_min is not None:
-            corp_query = corp_query.filter(
-                CorporateJob.required_experience_years >= search_request.experience_min
-            )
-        
-        if search_request.experience_max is not None:
-            corp_query = corp_query.filter(
-                CorporateJob.required_experience_years <= search_request.experience_max
-            )
+        corp_query = corp_query.filter(*JobService._corporate_search_filters(search_request))
         
         results['corporate_count'] = corp_query.count()
         
@@ -323,15 +478,16 @@ class JobService:
                 or_(
                     SmallJob.title.ilike(search_term),
                     SmallJob.description.ilike(search_term),
-                    SmallJob.category.ilike(search_term)
+                    SmallJob.required_skills.ilike(search_term)
                 )
             )
         
         if search_request.categories:
-            small_query = small_query.filter(SmallJob.category.in_(search_request.categories))
+            # Small jobs are not categorised
+            small_query = small_query.filter(false())
         
         if search_request.locations:
-            small_query = small_query.filter(SmallJob.province.in_(search_request.locations))
+            small_query = small_query.filter(SmallJob.location_city.in_(search_request.locations))
         
         results['small_count'] = small_query.count()
         results['total_count'] = results['corporate_count'] + results['small_count']
@@ -347,7 +503,7 @@ class JobService:
         remaining = search_request.page_size - len(results['corporate_jobs'])
         if remaining > 0:
             results['small_jobs'] = small_query.order_by(
-                SmallJob.date_posted.desc()
+                SmallJob.created_at.desc()
             ).offset(max(0, skip - results['corporate_count'])).limit(remaining).all()
         
         return results
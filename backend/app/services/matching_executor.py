@@ -0,0 +1,119 @@
+"""
+Matching Executor - Bounded thread pool for CPU-bound matching calls
+=====================================================================
+Several async endpoints run matching directly on the event loop, which
+stalls every other request on the worker. This executor moves the call
+onto a small thread pool and bounds the backlog:
+
+    executor = get_matching_executor()
+    matches = await executor.run(service.match_job, job_id, limit=20)
+
+- At most MATCHING_EXECUTOR_THREADS calls run at once.
+- At most MATCHING_QUEUE_DEPTH more wait; beyond that run() raises
+  ExecutorSaturated immediately instead of queueing.
+- run() raises ExecutorTimeout after MATCHING_TIMEOUT_SECONDS. A running
+  call cannot be interrupted, so it keeps its slot until it finishes;
+  a call still waiting in the queue is cancelled.
+
+Routes go through app.api.deps.run_matching, which maps these errors to
+503 / 504 responses.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+
+class ExecutorSaturated(Exception):
+    """All workers are busy and the wait queue is full."""
+
+
+class ExecutorTimeout(Exception):
+    """The call did not finish within the per-request timeout."""
+
+
+class BoundedExecutor:
+    """
+    Thread pool with admission control.
+
+    Admitted calls = running + queued; a call is admitted only while that
+    count is below max_workers + max_queue.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, timeout: Optional[float] = None):
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="matching")
+        self._admitted = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """Calls currently running or queued."""
+        return self._admitted
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Admit and schedule fn, or raise ExecutorSaturated."""
+        with self._lock:
+            if self._admitted >= self.capacity:
+                raise ExecutorSaturated(
+                    f"{self._admitted} matching calls in flight (limit {self.capacity})"
+                )
+            self._admitted += 1
+
+        try:
+            future = self._pool.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) on the pool and await the result.
+
+        Args:
+            fn: Blocking callable
+            timeout: Seconds to wait (default: the executor's timeout)
+
+        Raises:
+            ExecutorSaturated: Queue full, fn was not scheduled
+            ExecutorTimeout: fn did not finish in time
+        """
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout if timeout is not None else self.timeout
+            )
+        except asyncio.TimeoutError:
+            raise ExecutorTimeout(f"Matching call exceeded {timeout or self.timeout}s")
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _future: Optional[Future] = None):
+        with self._lock:
+            self._admitted -= 1
+
+
+_executor: Optional[BoundedExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_matching_executor() -> BoundedExecutor:
+    """Shared executor, created on first use from settings."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = BoundedExecutor(
+                max_workers=settings.MATCHING_EXECUTOR_THREADS,
+                max_queue=settings.MATCHING_QUEUE_DEPTH,
+                timeout=settings.MATCHING_TIMEOUT_SECONDS or None
+            )
+        return _executor
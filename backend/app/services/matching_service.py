@@ -15,12 +15,16 @@ from typing import List, Dict, Optional, Tuple, Set
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_, func
 import pandas as pd
+import numpy as np
 from datetime import datetime, date
 import re
+import time
 
+from app.core.config import settings
 from app.models.cv import CV
 from app.models.corporate_job import CorporateJob
 from app.models.small_job import SmallJob
+from app.services.top_k import TopK, top_k_indices
 
 
 # ============================================================================
@@ -338,6 +342,32 @@ def calculate_skills_score(cv_technical: str, cv_soft: str,
     )
 
 
+def parse_experience_requirement(job_required_str: str) -> Optional[float]:
+    """
+    Minimum years from a requirement such as "3-5 years", "5+ years" or 3.0.
+    
+    Returns:
+        Minimum years, or None if no requirement is specified
+    
+    Raises:
+        ValueError: If the requirement cannot be parsed
+    """
+    if not job_required_str or pd.isna(job_required_str):
+        return None
+    
+    # Parse job requirement (e.g., "3-5 years", "5+ years")
+    job_req_str = str(job_required_str).lower()
+    
+    # Extract minimum years required
+    if '+' in job_req_str:
+        return float(job_req_str.split('+')[0].strip())
+    elif '-' in job_req_str:
+        return float(job_req_str.split('-')[0].strip())
+    else:
+        numbers = re.findall(r'\d+', job_req_str)
+        return float(numbers[0]) if numbers else 0
+
+
 def calculate_experience_score(cv_years: float, job_required_str: str) -> Tuple[float, str]:
     """
     Calculate experience match score (0.0 to 1.0) with explanation.
@@ -349,21 +379,10 @@ def calculate_experience_score(cv_years: float, job_required_str: str) -> Tuple[
         cv_years = float(cv_years) if cv_years else 0
         
         # No requirement specified
-        if not job_required_str or pd.isna(job_required_str):
+        min_required = parse_experience_requirement(job_required_str)
+        if min_required is None:
             return 0.8, "No specific experience requirement"
         
-        # Parse job requirement (e.g., "3-5 years", "5+ years")
-        job_req_str = str(job_required_str).lower()
-        
-        # Extract minimum years required
-        if '+' in job_req_str:
-            min_required = float(job_req_str.split('+')[0].strip())
-        elif '-' in job_req_str:
-            min_required = float(job_req_str.split('-')[0].strip())
-        else:
-            numbers = re.findall(r'\d+', job_req_str)
-            min_required = float(numbers[0]) if numbers else 0
-        
         # Calculate match
         if cv_years >= min_required:
             # Check for overqualification
@@ -420,44 +439,345 @@ def apply_context_boost(job_data: Dict, cv_data: Dict) -> Tuple[float, List[str]
 
 
 # ============================================================================
-# MAIN MATCHING SERVICE
+# JOB SNAPSHOT - Batch scoring of one CV against all jobs
 # ============================================================================
 
-class MatchingService:
-    """Core service for matching CVs to jobs."""
+# Projected columns per job type (scoring + response fields only)
+CORPORATE_JOB_COLUMNS = (
+    CorporateJob.job_id,
+    CorporateJob.title,
+    CorporateJob.company,
+    CorporateJob.category,
+    CorporateJob.location_city,
+    CorporateJob.location_province,
+    CorporateJob.salary_min_zmw,
+    CorporateJob.salary_max_zmw,
+    CorporateJob.required_skills,
+    CorporateJob.preferred_skills,
+    CorporateJob.required_experience_years,
+    CorporateJob.employment_type,
+)
+
+SMALL_JOB_COLUMNS = (
+    SmallJob.job_id,
+    SmallJob.title,
+    SmallJob.employer_name,
+    SmallJob.location_city,
+    SmallJob.salary_amount,
+    SmallJob.work_type,
+)
+
+# Experience requirement states (per job, parsed once)
+EXPERIENCE_PARSED = 0
+EXPERIENCE_NOT_REQUIRED = 1
+EXPERIENCE_INVALID = 2
+
+_MISSING = -1
+
+
+def _to_float(value, default: float) -> float:
+    """float(value) if value else default; NaN if unparseable (scores 0.5)."""
+    try:
+        return float(value) if value else default
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def _codes(keys: List[Optional[str]], index: Dict[str, int]) -> np.ndarray:
+    """Encode keys into int32 codes (None -> _MISSING), extending index."""
+    return np.array(
+        [_MISSING if key is None else index.setdefault(key, len(index)) for key in keys],
+        dtype=np.int32
+    )
+
+
+class JobSnapshot:
+    """
+    Pre-parsed view of one job table for batch scoring.
     
-    def __init__(self, db: Session):
-        self.db = db
+    Location keys, salary ceilings, experience requirements, skill sets and
+    context boosts are parsed once per snapshot; score() then evaluates one
+    CV against every job with NumPy. Reasons and skill lists are only built
+    (via calculate_match_score) for the jobs actually returned.
+    """
     
-    def get_cv(self, cv_id: str) -> Optional[CV]:
-        """Retrieve CV by ID."""
-        return self.db.query(CV).filter(CV.cv_id == cv_id).first()
+    def __init__(self, job_type: str, jobs: List[Dict], details: List[Dict]):
+        """
+        Args:
+            job_type: 'corp' or 'small'
+            jobs: Job dicts as consumed by calculate_match_score
+            details: Response fields per job (title, company, ...)
+        """
+        self.job_type = job_type
+        self.jobs = jobs
+        self.details = details
+        self.built_at = time.time()
+        n = len(jobs)
+        
+        # Location
+        self.remote = np.array(
+            ['remote' in str(job.get('location_city', '')).lower() for job in jobs], dtype=bool
+        )
+        self.city_index: Dict[str, int] = {}
+        self.city_id = _codes(
+            [str(job['location_city']).strip().lower() if job.get('location_city') else None for job in jobs],
+            self.city_index
+        )
+        province_keys = [
+            str(job['location_province']).strip().lower() if job.get('location_province') else ''
+            for job in jobs
+        ]
+        self.province_index: Dict[str, int] = {}
+        self.province_id = _codes([key or None for key in province_keys], self.province_index)
+        self.copperbelt = np.array(['copperbelt' in key for key in province_keys], dtype=bool)
+        
+        # Salary (scored on the job maximum)
+        max_key = 'salary_max_zmw' if job_type == 'corp' else 'budget'
+        self.salary_max = np.array([_to_float(job.get(max_key), 999999) for job in jobs], dtype=np.float64)
+        
+        # Experience requirement
+        self.experience_min = np.full(n, np.nan)
+        self.experience_state = np.full(n, EXPERIENCE_NOT_REQUIRED, dtype=np.int8)
+        if job_type == 'corp':
+            for i, job in enumerate(jobs):
+                try:
+                    min_required = parse_experience_requirement(job.get('required_experience_years'))
+                except (ValueError, TypeError):
+                    self.experience_state[i] = EXPERIENCE_INVALID
+                    continue
+                if min_required is not None:
+                    self.experience_min[i] = min_required
+                    self.experience_state[i] = EXPERIENCE_PARSED
+        
+        # Skills: CSR-packed required/preferred sets over a shared vocabulary
+        self.skill_index: Dict[str, int] = {}
+        self.required_indptr, self.required_ids = self._pack_skills(
+            [normalize_skills(job.get('required_skills', '')) for job in jobs]
+        )
+        self.preferred_indptr, self.preferred_ids = self._pack_skills(
+            [normalize_skills(job.get('preferred_skills', '')) for job in jobs]
+        )
+        self.skill_vocab = list(self.skill_index)
+        
+        # Context boost depends on the job only
+        self.context_boost = np.array([apply_context_boost(job, {})[0] for job in jobs], dtype=np.float64)
+    
+    def __len__(self) -> int:
+        return len(self.jobs)
+    
+    def _pack_skills(self, skill_sets: List[Set[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        indptr = np.zeros(len(skill_sets) + 1, dtype=np.int64)
+        np.cumsum([len(skills) for skills in skill_sets], out=indptr[1:])
+        ids = _codes([skill for skills in skill_sets for skill in skills], self.skill_index)
+        return indptr, ids
     
-    def get_corporate_jobs(self, filters: Dict = None) -> List[CorporateJob]:
-        """Retrieve corporate jobs with optional filters."""
-        query = self.db.query(CorporateJob)
+    def filter_mask(self, filters: Optional[Dict]) -> np.ndarray:
+        """
+        Rows passing the filters: location_city / category / min_salary
+        for corporate jobs, location (city) for small jobs.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if not filters:
+            return mask
         
-        if filters:
+        if self.job_type == 'corp':
             if 'location_city' in filters:
-                query = query.filter(CorporateJob.location_city == filters['location_city'])
+                mask &= np.array([job['location_city'] == filters['location_city'] for job in self.jobs], dtype=bool)
             if 'category' in filters:
-                query = query.filter(CorporateJob.category == filters['category'])
+                mask &= np.array([d['category'] == filters['category'] for d in self.details], dtype=bool)
             if 'min_salary' in filters:
-                query = query.filter(CorporateJob.salary_max_zmw >= filters['min_salary'])
+                mask &= np.array(
+                    [job['salary_max_zmw'] is not None and job['salary_max_zmw'] >= filters['min_salary']
+                     for job in self.jobs],
+                    dtype=bool
+                )
+        elif 'location' in filters:
+            mask &= np.array([job['location_city'] == filters['location'] for job in self.jobs], dtype=bool)
         
-        return query.all()
-    
-    def get_small_jobs(self, filters: Dict = None) -> List[SmallJob]:
-        """Retrieve small jobs with optional filters."""
-        query = self.db.query(SmallJob)
+        return mask
+    
+    # ------------------------------------------------------------------------
+    # Vectorized components (same rules as the calculate_* helpers)
+    # ------------------------------------------------------------------------
+    
+    def location_scores(self, cv_city: str, cv_province: str) -> np.ndarray:
+        scores = np.full(len(self), 0.3)
+        if cv_city:
+            cv_city = str(cv_city).strip().lower()
+            cv_province = str(cv_province).strip().lower() if cv_province else ""
+            if 'copperbelt' in cv_province:
+                scores[self.copperbelt] = 0.6
+            if cv_province:
+                scores[self.province_id == self.province_index.get(cv_province, -2)] = 0.7
+            scores[self.city_id == self.city_index.get(cv_city, -2)] = 1.0
+            scores[self.city_id == _MISSING] = 0.5
+        else:
+            scores[:] = 0.5
+        scores[self.remote] = 0.9
+        return scores
+    
+    def salary_scores(self, cv_min, cv_max) -> np.ndarray:
+        try:
+            cv_min = float(cv_min) if cv_min else 0
+            cv_max = float(cv_max) if cv_max else 999999
+        except (ValueError, TypeError):
+            return np.full(len(self), 0.5)
         
-        if filters:
-            if 'location' in filters:
-                query = query.filter(SmallJob.location == filters['location'])
-            if 'category' in filters:
-                query = query.filter(SmallJob.category == filters['category'])
+        job_max = self.salary_max
+        scores = np.full(len(self), 0.5)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shortfall = (cv_min - job_max) / cv_min
+            below = job_max < cv_min
+            scores[below] = np.select([shortfall < 0.2, shortfall < 0.4], [0.6, 0.3], default=0.1)[below]
+            scores[job_max > cv_max] = 0.95
+            scores[(cv_min <= job_max) & (job_max <= cv_max)] = 1.0
+        return scores
+    
+    def experience_scores(self, cv_years) -> np.ndarray:
+        try:
+            cv_years = float(cv_years) if cv_years else 0
+        except (ValueError, TypeError):
+            return np.full(len(self), 0.5)
+        
+        min_required = self.experience_min
+        with np.errstate(invalid='ignore'):
+            gap = min_required - cv_years
+            scores = np.select(
+                [cv_years > min_required + 5, cv_years >= min_required, gap <= 1, gap <= 2],
+                [0.7, 1.0, 0.7, 0.5],
+                default=0.3
+            )
+        scores[self.experience_state == EXPERIENCE_NOT_REQUIRED] = 0.8
+        scores[self.experience_state == EXPERIENCE_INVALID] = 0.5
+        return scores
+    
+    def skills_scores(self, cv_technical: str, cv_soft: str) -> np.ndarray:
+        # Fuzzy-match each distinct job skill once, not once per job
+        all_cv_skills = normalize_skills(cv_technical).union(normalize_skills(cv_soft))
+        vocab_matched = np.array(
+            [any(is_skill_match(cv_skill, job_skill) for cv_skill in all_cv_skills)
+             for job_skill in self.skill_vocab],
+            dtype=np.float64
+        )
+        
+        def match_rate(indptr, ids, empty_value):
+            lengths = np.diff(indptr)
+            rows = np.repeat(np.arange(len(self)), lengths)
+            matched = np.bincount(rows, weights=vocab_matched[ids], minlength=len(self)) if len(ids) else np.zeros(len(self))
+            return np.where(lengths > 0, matched / np.maximum(lengths, 1), empty_value), lengths
+        
+        required_match, required_len = match_rate(self.required_indptr, self.required_ids, 1.0)
+        preferred_match, preferred_len = match_rate(self.preferred_indptr, self.preferred_ids, 0.5)
         
-        return query.all()
+        scores = np.minimum(1.0, (required_match * 0.7) + (preferred_match * 0.3))
+        scores[(required_len == 0) & (preferred_len == 0)] = 0.5
+        return scores
+    
+    def score(self, cv: CV) -> np.ndarray:
+        """Rounded match_score of cv against every job (as calculate_match_score)."""
+        base_scores = (
+            self.location_scores(cv.city, cv.province) * MATCHING_WEIGHTS['location'] +
+            self.salary_scores(cv.salary_expectation_min, cv.salary_expectation_max) * MATCHING_WEIGHTS['salary'] +
+            self.skills_scores(cv.skills_technical, cv.skills_soft) * MATCHING_WEIGHTS['skills'] +
+            self.experience_scores(cv.total_years_experience) * MATCHING_WEIGHTS['experience']
+        )
+        final_scores = np.minimum(1.0, base_scores * self.context_boost)
+        # Python's round (correctly rounded), not np.round, so min_score
+        # cut-offs and ties match calculate_match_score exactly
+        return np.array([round(score, 3) for score in final_scores.tolist()])
+
+
+def build_job_snapshot(db: Session, job_type: str) -> JobSnapshot:
+    """Load one job table (projected columns) into a JobSnapshot."""
+    jobs, details = [], []
+    
+    if job_type == 'corp':
+        for job in db.query(*CORPORATE_JOB_COLUMNS):
+            jobs.append({
+                'job_id': job.job_id,
+                'location_city': job.location_city,
+                'location_province': job.location_province,
+                'salary_min_zmw': job.salary_min_zmw,
+                'salary_max_zmw': job.salary_max_zmw,
+                'required_skills': job.required_skills,
+                'preferred_skills': job.preferred_skills,
+                'required_experience_years': job.required_experience_years,
+                'company': job.company,
+            })
+            details.append({
+                'job_id': job.job_id,
+                'job_type': 'corp',
+                'title': job.title,
+                'company': job.company,
+                'location_city': job.location_city,
+                'salary_max_zmw': job.salary_max_zmw,
+                'employment_type': job.employment_type,
+                'category': job.category,
+            })
+    else:
+        for job in db.query(*SMALL_JOB_COLUMNS):
+            jobs.append({
+                'job_id': job.job_id,
+                'location_city': job.location_city,
+                'location_province': None,
+                'budget': job.salary_amount,
+                'required_skills': '',  # Small jobs don't have detailed skills
+                'preferred_skills': '',
+                'company': job.employer_name,
+            })
+            details.append({
+                'job_id': job.job_id,
+                'job_type': 'small',
+                'title': job.title,
+                'company': job.employer_name,
+                'location_city': job.location_city,
+                'budget': job.salary_amount,
+                'duration': job.work_type,  # One-time / Part-time / ...
+            })
+    
+    return JobSnapshot(job_type, jobs, details)
+
+
+_job_snapshots: Dict[str, JobSnapshot] = {}
+
+
+def get_job_snapshot(db: Session, job_type: str) -> JobSnapshot:
+    """
+    Cached JobSnapshot, rebuilt after invalidate_job_snapshot() or when
+    older than JOB_SNAPSHOT_MAX_AGE_SECONDS (writes that bypass the job
+    write paths, e.g. bulk imports).
+    """
+    snapshot = _job_snapshots.get(job_type)
+    if snapshot is None or time.time() - snapshot.built_at > settings.JOB_SNAPSHOT_MAX_AGE_SECONDS:
+        snapshot = build_job_snapshot(db, job_type)
+        _job_snapshots[job_type] = snapshot
+    return snapshot
+
+
+def invalidate_job_snapshot(job_type: Optional[str] = None):
+    """
+    Drop the cached snapshot of one job table ('corp' / 'small'), or of
+    both; call after a job write has committed.
+    """
+    if job_type is None:
+        _job_snapshots.clear()
+    else:
+        _job_snapshots.pop(job_type, None)
+
+
+# ============================================================================
+# MAIN MATCHING SERVICE
+# ============================================================================
+
+class MatchingService:
+    """Core service for matching CVs to jobs."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_cv(self, cv_id: str) -> Optional[CV]:
+        """Retrieve CV by ID."""
+        return self.db.query(CV).filter(CV.cv_id == cv_id).first()
     
     def calculate_match_score(self, cv: CV, job: Dict, job_type: str) -> Dict:
         """
@@ -577,79 +897,37 @@ class MatchingService:
                 'cv_id': cv_id
             }
         
-        all_matches = []
+        # Score the CV against every job at once, per job table
+        job_types = [t for t in ('corp', 'small') if job_type in (t, 'both')]
+        top = TopK(limit)
+        total_matches = 0
+        for snapshot_type in job_types:
+            snapshot = get_job_snapshot(self.db, snapshot_type)
+            if not len(snapshot):
+                continue
+            scores = snapshot.score(cv)
+            passed = snapshot.filter_mask(filters) & (scores >= min_score)
+            total_matches += int(passed.sum())
+            
+            # Per-table top-K, offered in row order so ties keep table order
+            rows = top_k_indices(np.where(passed, scores, -np.inf), min(limit, int(passed.sum())))
+            for i in np.sort(rows):
+                top.push(float(scores[i]), (snapshot, int(i)))
         
-        # Match corporate jobs
-        if job_type in ['corp', 'both']:
-            corp_jobs = self.get_corporate_jobs(filters)
-            for job in corp_jobs:
-                job_dict = {
-                    'job_id': job.job_id,
-                    'location_city': job.location_city,
-                    'location_province': job.location_province,
-                    'salary_min_zmw': job.salary_min_zmw,
-                    'salary_max_zmw': job.salary_max_zmw,
-                    'required_skills': job.required_skills,
-                    'preferred_skills': job.preferred_skills,
-                    'required_experience_years': job.required_experience_years,
-                    'company': job.company,
-                }
-                
-                match_result = self.calculate_match_score(cv, job_dict, 'corp')
-                
-                if match_result['match_score'] >= min_score:
-                    all_matches.append({
-                        'job_id': job.job_id,
-                        'job_type': 'corp',
-                        'title': job.title,
-                        'company': job.company,
-                        'location_city': job.location_city,
-                        'salary_max_zmw': job.salary_max_zmw,
-                        'employment_type': job.employment_type,
-                        **match_result
-                    })
-        
-        # Match small jobs
-        if job_type in ['small', 'both']:
-            small_jobs = self.get_small_jobs(filters)
-            for job in small_jobs:
-                job_dict = {
-                    'job_id': job.id,
-                    'location_city': job.location,
-                    'location_province': job.province,
-                    'budget': job.budget,
-                    'required_skills': '',  # Small jobs don't have detailed skills
-                    'preferred_skills': '',
-                    'company': job.posted_by,
-                }
-                
-                match_result = self.calculate_match_score(cv, job_dict, 'small')
-                
-                if match_result['match_score'] >= min_score:
-                    all_matches.append({
-                        'job_id': job.id,
-                        'job_type': 'small',
-                        'title': job.title,
-                        'company': job.posted_by,
-                        'location_city': job.location,
-                        'budget': job.budget,
-                        'duration': job.duration,
-                        **match_result
-                    })
-        
-        # Sort by match score (descending)
-        all_matches.sort(key=lambda x: x['match_score'], reverse=True)
-        
-        # Add rank
-        for i, match in enumerate(all_matches[:limit], 1):
-            match['rank'] = i
+        # Reasons and skill lists only for the matches returned
+        all_matches = []
+        for rank, (snapshot, i) in enumerate(top.results(), 1):
+            details = dict(snapshot.details[i])
+            details.pop('category', None)
+            match_result = self.calculate_match_score(cv, snapshot.jobs[i], snapshot.job_type)
+            all_matches.append({**details, **match_result, 'rank': rank})
         
         return {
             'cv_id': cv_id,
             'candidate_name': cv.full_name,
             'candidate_location': f"{cv.city}, {cv.province}",
-            'matches': all_matches[:limit],
-            'total_matches': len(all_matches),
+            'matches': all_matches,
+            'total_matches': total_matches,
             'filters_applied': filters or {},
             'generated_at': datetime.now().isoformat()
         }
@@ -26,6 +26,7 @@ import re
 from app.models.cv import CV
 from app.models.corporate_job import CorporateJob
 from app.models.small_job import SmallJob
+from app.services.top_k import TopK
 
 
 # ============================================================================
@@ -406,7 +407,7 @@ class AcademicMatchingService:
         if not cv:
             return {'error': 'CV not found', 'cv_id': cv_id}
         
-        all_matches = []
+        top = TopK(limit)
         
         # Match corporate jobs
         if job_type in ['corp', 'both']:
@@ -429,29 +430,29 @@ class AcademicMatchingService:
                 match_result = self.calculate_match_score(cv, job_dict, 'corp')
                 
                 if match_result['match_score'] >= min_score:
-                    all_matches.append({
-                        'job_id': job.job_id,
-                        'job_type': 'corp',
-                        'title': job.title,
-                        'company': job.company,
-                        'location_city': job.location_city,
-                        'salary_max_zmw': job.salary_max_zmw,
-                        'employment_type': job.employment_type,
-                        **match_result
-                    })
+                    top.push(match_result['match_score'], (job, match_result))
         
-        # Sort by match score
-        all_matches.sort(key=lambda x: x['match_score'], reverse=True)
-        
-        for i, match in enumerate(all_matches[:limit], 1):
-            match['rank'] = i
+        # Best `limit` by match score (bounded heap; ties keep job order)
+        matches = []
+        for i, (job, match_result) in enumerate(top.results(), 1):
+            matches.append({
+                'job_id': job.job_id,
+                'job_type': 'corp',
+                'title': job.title,
+                'company': job.company,
+                'location_city': job.location_city,
+                'salary_max_zmw': job.salary_max_zmw,
+                'employment_type': job.employment_type,
+                **match_result,
+                'rank': i
+            })
         
         return {
             'cv_id': cv_id,
             'candidate_name': cv.full_name,
             'candidate_category': categorize_cv(cv.current_job_title, cv.skills_technical),
-            'matches': all_matches[:limit],
-            'total_matches': len(all_matches),
+            'matches': matches,
+            'total_matches': top.seen,
             'matching_config': {
                 'weights': ACADEMIC_WEIGHTS,
                 'version': 'academic_thesis'
@@ -3,9 +3,9 @@ CAMSS 2.0 - ML Matching Service
 Machine learning inference service for job-candidate matching.
 
 This service:
-1. Loads trained ML model
+1. Loads trained ML model (flat NumPy predictor if exported, else pickled booster)
 2. Generates features for any CV-Job pair on-the-fly
-3. Predicts application probability
+3. Predicts application probability (one batched call per request)
 4. Re-ranks matches by ML score
 5. Provides hybrid scoring (rule-based + ML)
 
@@ -25,6 +25,8 @@ from datetime import datetime
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.services.matching_service import MatchingService
+from app.services.top_k import TopK
+from app.services.tree_predictor import FlatTreePredictor
 
 
 class MLMatchingService:
@@ -33,7 +35,13 @@ class MLMatchingService:
     with machine learning predictions.
     """
     
-    def __init__(self, model_path: str = None, feature_config_path: str = None, db = None):
+    def __init__(
+        self,
+        model_path: str = None,
+        feature_config_path: str = None,
+        db = None,
+        predictor_path: str = None
+    ):
         """
         Initialize ML matching service.
         
@@ -41,6 +49,8 @@ class MLMatchingService:
             model_path: Path to trained model (default: ml/models/ranking_model.pkl)
             feature_config_path: Path to feature config (default: ml/models/feature_config.json)
             db: Optional database session (for rule-based fallback)
+            predictor_path: Path to exported flat predictor (default: next to model_path,
+                ranking_model.npz). Preferred over the pickled booster when present.
         """
         # Set default paths (models are in backend/models/)
         if model_path is None:
@@ -55,9 +65,15 @@ class MLMatchingService:
             backend_dir = os.path.dirname(os.path.dirname(current_dir))
             feature_config_path = os.path.join(backend_dir, 'models', 'feature_config.json')
         
+        if predictor_path is None:
+            predictor_path = os.path.join(os.path.dirname(model_path), 'ranking_model.npz')
+        
         self.model_path = model_path
         self.feature_config_path = feature_config_path
+        self.predictor_path = predictor_path
         self.model = None
+        self.model_backend = None
+        self.model_objective = 'binary'
         self.feature_columns = None
         self.model_loaded = False
         self.db = db
@@ -74,17 +90,25 @@ class MLMatchingService:
         Handles missing model gracefully with fallback to rule-based.
         """
         try:
-            # Load model
-            with open(self.model_path, 'rb') as f:
-                self.model = pickle.load(f)
+            # Load model: flat predictor needs only NumPy, booster needs lightgbm
+            if os.path.exists(self.predictor_path):
+                self.model = FlatTreePredictor.load(self.predictor_path)
+                self.model_backend = 'flat'
+                loaded_from = self.predictor_path
+            else:
+                with open(self.model_path, 'rb') as f:
+                    self.model = pickle.load(f)
+                self.model_backend = 'booster'
+                loaded_from = self.model_path
             
             # Load feature config
             with open(self.feature_config_path, 'r') as f:
                 config = json.load(f)
                 self.feature_columns = config['features']
+                self.model_objective = config.get('objective', 'binary')
             
             self.model_loaded = True
-            print(f"✅ ML model loaded successfully from {self.model_path}")
+            print(f"✅ ML model loaded successfully from {loaded_from}")
             print(f"   → {len(self.feature_columns)} features configured")
             
         except FileNotFoundError:
@@ -254,32 +278,47 @@ class MLMatchingService:
         
         return features
     
-    def predict_application_probability(self, cv: Dict, job: Dict, match_result: Dict) -> float:
+    def _predict(self, X: np.ndarray) -> np.ndarray:
         """
-        Predict probability that user will apply to this job.
+        Run the loaded model on a feature matrix.
+        LambdaRank models output unbounded relevance scores; they are mapped
+        through a sigmoid so ml_score stays in (0, 1) and ranking order is kept.
+        """
+        if self.model_backend == 'flat':
+            scores = self.model.predict(X)
+        else:
+            scores = self.model.predict(X, num_iteration=self.model.best_iteration)
+        if self.model_objective == 'lambdarank':
+            scores = 1.0 / (1.0 + np.exp(-scores))
+        return scores
+    
+    def predict_application_probabilities(
+        self,
+        cv: Dict,
+        jobs: List[Dict],
+        match_results: List[Dict]
+    ) -> np.ndarray:
+        """
+        Predict application probabilities for one CV against many jobs.
+        Features for all pairs are stacked into one matrix and scored in a
+        single model call.
         
         Returns:
-            Probability between 0.0 and 1.0
+            Array of probabilities between 0.0 and 1.0 (one per job)
         """
-        if not self.model_loaded:
+        fallback = np.array([m.get('match_score', 0.0) for m in match_results], dtype=np.float64)
+        
+        if not self.model_loaded or not jobs:
             # Fallback: use rule-based match_score as probability
-            return match_result.get('match_score', 0.0)
+            return fallback
         
         try:
-            # Generate features
-            features = self.generate_features_for_pair(cv, job, match_result)
+            X = np.empty((len(jobs), len(self.feature_columns)), dtype=np.float64)
+            for i, (job, match_result) in enumerate(zip(jobs, match_results)):
+                features = self.generate_features_for_pair(cv, job, match_result)
+                X[i] = [features.get(col, 0.0) for col in self.feature_columns]
             
-            # Create feature vector in correct order
-            feature_vector = []
-            for col in self.feature_columns:
-                feature_vector.append(features.get(col, 0.0))
-            
-            # Predict
-            X = np.array([feature_vector])
-            probability = self.model.predict(X, num_iteration=self.model.best_iteration)[0]
-            
-            # Clip to [0, 1] range
-            return np.clip(probability, 0.0, 1.0)
+            return np.clip(self._predict(X), 0.0, 1.0)
             
         except Exception as e:
             import traceback
@@ -287,7 +326,47 @@ class MLMatchingService:
             print(f"   Full traceback:")
             traceback.print_exc()
             # Fallback to rule-based score
-            return match_result.get('match_score', 0.0)
+            return fallback
+    
+    def predict_application_probability(self, cv: Dict, job: Dict, match_result: Dict) -> float:
+        """
+        Predict probability that user will apply to this job.
+        
+        Returns:
+            Probability between 0.0 and 1.0
+        """
+        return float(self.predict_application_probabilities(cv, [job], [match_result])[0])
+    
+    def _job_from_match(self, match: Dict) -> Dict:
+        """Create job dict from rule-based match data."""
+        return {
+            'job_id': match.get('job_id'),
+            'location_city': match.get('location_city'),
+            'location_province': match.get('location_province'),
+            'salary_min_zmw': match.get('salary_min_zmw'),
+            'salary_max_zmw': match.get('salary_max_zmw'),
+            'budget': match.get('budget'),
+            'required_skills': match.get('required_skills', ''),
+            'preferred_skills': match.get('preferred_skills', ''),
+            'company': match.get('company'),
+            'title': match.get('title'),
+            'job_type': match.get('job_type')
+        }
+    
+    def _cv_to_dict(self, cv) -> Dict:
+        """Convert CV object to dict for feature generation."""
+        return {
+            'cv_id': cv.cv_id,
+            'skills_technical': cv.skills_technical,
+            'skills_soft': cv.skills_soft,
+            'city': cv.city,
+            'province': cv.province,
+            'salary_expectation_min': cv.salary_expectation_min,
+            'salary_expectation_max': cv.salary_expectation_max,
+            'total_years_experience': cv.total_years_experience,
+            'employment_status': cv.employment_status,
+            'availability': cv.availability
+        }
     
     def get_ml_ranked_matches(
         self, 
@@ -334,39 +413,13 @@ class MLMatchingService:
         if not cv:
             return []
         
-        # Add ML predictions to each match
-        for match in rule_matches:
-            # Create job dict from match data
-            job = {
-                'job_id': match.get('job_id'),
-                'location_city': match.get('location_city'),
-                'location_province': match.get('location_province'),
-                'salary_min_zmw': match.get('salary_min_zmw'),
-                'salary_max_zmw': match.get('salary_max_zmw'),
-                'budget': match.get('budget'),
-                'required_skills': match.get('required_skills', ''),
-                'preferred_skills': match.get('preferred_skills', ''),
-                'company': match.get('company'),
-                'title': match.get('title'),
-                'job_type': match.get('job_type')
-            }
-            
-            # Convert CV object to dict for feature generation
-            cv_dict = {
-                'cv_id': cv.cv_id,
-                'skills_technical': cv.skills_technical,
-                'skills_soft': cv.skills_soft,
-                'city': cv.city,
-                'province': cv.province,
-                'salary_expectation_min': cv.salary_expectation_min,
-                'salary_expectation_max': cv.salary_expectation_max,
-                'total_years_experience': cv.total_years_experience,
-                'employment_status': cv.employment_status,
-                'availability': cv.availability
-            }
-            
-            ml_probability = self.predict_application_probability(cv_dict, job, match)
-            
+        # Add ML predictions to each match (single batched model call)
+        cv_dict = self._cv_to_dict(cv)
+        jobs = [self._job_from_match(match) for match in rule_matches]
+        ml_probabilities = self.predict_application_probabilities(cv_dict, jobs, rule_matches)
+        
+        for match, job, ml_probability in zip(rule_matches, jobs, ml_probabilities):
+            ml_probability = float(ml_probability)
             match['ml_score'] = round(ml_probability, 4)
             match['rule_score'] = round(match['match_score'], 4)
             # Calculate hybrid score (40% rule + 60% ML) for completeness
@@ -375,10 +428,12 @@ class MLMatchingService:
             match['sub_scores'] = match.get('match_breakdown', {})
             match['reasons'] = match.get('match_reasons', [])
         
-        # Sort by ML score
-        ml_ranked = sorted(rule_matches, key=lambda x: x['ml_score'], reverse=True)
+        # Best top_n by ML score (bounded heap, ties keep rule order)
+        top = TopK(top_n)
+        for match in rule_matches:
+            top.push(match['ml_score'], match)
         
-        return ml_ranked[:top_n]
+        return top.results()
     
     def get_hybrid_ranked_matches(
         self,
@@ -429,39 +484,13 @@ class MLMatchingService:
         if not cv:
             return []
         
-        # Calculate hybrid scores
-        for match in rule_matches:
-            # Create job dict from match data
-            job = {
-                'job_id': match.get('job_id'),
-                'location_city': match.get('location_city'),
-                'location_province': match.get('location_province'),
-                'salary_min_zmw': match.get('salary_min_zmw'),
-                'salary_max_zmw': match.get('salary_max_zmw'),
-                'budget': match.get('budget'),
-                'required_skills': match.get('required_skills', ''),
-                'preferred_skills': match.get('preferred_skills', ''),
-                'company': match.get('company'),
-                'title': match.get('title'),
-                'job_type': match.get('job_type')
-            }
-            
-            # Convert CV object to dict
-            cv_dict = {
-                'cv_id': cv.cv_id,
-                'skills_technical': cv.skills_technical,
-                'skills_soft': cv.skills_soft,
-                'city': cv.city,
-                'province': cv.province,
-                'salary_expectation_min': cv.salary_expectation_min,
-                'salary_expectation_max': cv.salary_expectation_max,
-                'total_years_experience': cv.total_years_experience,
-                'employment_status': cv.employment_status,
-                'availability': cv.availability
-            }
-            
-            # Get ML prediction
-            ml_score = self.predict_application_probability(cv_dict, job, match)
+        # Calculate hybrid scores (single batched model call)
+        cv_dict = self._cv_to_dict(cv)
+        jobs = [self._job_from_match(match) for match in rule_matches]
+        ml_scores = self.predict_application_probabilities(cv_dict, jobs, rule_matches)
+        
+        for match, job, ml_score in zip(rule_matches, jobs, ml_scores):
+            ml_score = float(ml_score)
             rule_score = match['match_score']
             
             # Calculate hybrid score
@@ -474,10 +503,12 @@ class MLMatchingService:
             match['sub_scores'] = match.get('match_breakdown', {})
             match['reasons'] = match.get('match_reasons', [])
         
-        # Sort by hybrid score
-        hybrid_ranked = sorted(rule_matches, key=lambda x: x['hybrid_score'], reverse=True)
+        # Best top_n by hybrid score (bounded heap, ties keep rule order)
+        top = TopK(top_n)
+        for match in rule_matches:
+            top.push(match['hybrid_score'], match)
         
-        return hybrid_ranked[:top_n]
+        return top.results()
     
     def get_model_info(self) -> Dict:
         """
@@ -495,6 +526,8 @@ class MLMatchingService:
         if self.model_loaded:
             info['n_features'] = len(self.feature_columns)
             info['model_type'] = 'LightGBM'
+            info['model_backend'] = self.model_backend
+            info['objective'] = self.model_objective
             
             # Load training metadata if available
             metadata_path = os.path.join(
@@ -0,0 +1,351 @@
+"""
+Parallel Scoring - Shard a candidate pool across a process pool
+================================================================
+The matchers score candidates in pure Python, so one request uses one core.
+This executor splits the pool into contiguous shards, scores them in worker
+processes and merges the per-shard top-K:
+
+    results, stats = score_in_shards(
+        _score_rows,              # module-level task (picklable)
+        n_rows=len(snapshot),
+        payload={...},            # same for every shard (job skills, weights)
+        limit=limit,
+        snapshot=snapshot,        # CVSnapshot arrays go through shared memory
+        row_data=per_row_values,  # optional, sliced per shard
+        local_service=self,       # reused when running serially
+    )
+
+A task has the signature
+
+    task(snapshot, start, stop, rows, payload, limit, service=None)
+        -> (List[(score, row, item)], Dict[str, int])
+
+and returns its shard's top-K plus counters (summed on merge). Merging
+re-offers shard winners in row order, so ties break exactly as in a serial
+stable sort.
+
+Small pools (< MATCHING_PARALLEL_MIN_ROWS) and MATCHING_WORKERS=1 run the
+same task serially in-process; a broken pool also falls back to serial.
+
+Each published snapshot generation is pinned while shards read it, so a
+refresh never unlinks blocks that a running batch still uses.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.cv_snapshot import MISSING_CODE
+from app.services.top_k import TopK
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# CVSnapshot arrays exported to shared memory
+SHARED_ARRAYS = (
+    'experience',
+    'salary_min',
+    'salary_max',
+    'city_id',
+    'province_id',
+    'education_id',
+    'skill_indptr',
+    'skill_ids',
+    'skill_key_of_id',
+    'cluster_indptr',
+    'cluster_ids',
+    'title_id',
+)
+
+# Vocabularies shipped (pickled) with the handle
+SHARED_VOCABS = (
+    'city_vocab',
+    'province_vocab',
+    'education_vocab',
+    'skill_vocab',
+    'cluster_vocab',
+    'title_vocab',
+)
+
+# Snapshot generations kept published; older ones are unlinked once no
+# shard is reading them
+_KEEP_GENERATIONS = 2
+
+# Pool size cap when MATCHING_WORKERS=0 (per API worker process)
+MAX_AUTO_WORKERS = 4
+
+
+# ============================================================================
+# SHARED-MEMORY SNAPSHOT
+# ============================================================================
+
+class SharedCVSnapshot:
+    """
+    Read-only CVSnapshot view backed by shared memory (worker side).
+
+    Exposes the numeric/CSR arrays and vocabularies under the same names as
+    CVSnapshot, plus len(), skills(i), clusters(i) and title(i).
+    """
+
+    def __init__(self, handle: Dict):
+        self.token = handle['token']
+        self._blocks = []
+        for name, (shm_name, dtype, shape) in handle['arrays'].items():
+            block = shared_memory.SharedMemory(name=shm_name)
+            self._blocks.append(block)
+            setattr(self, name, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf))
+        for name, values in handle['vocabs'].items():
+            setattr(self, name, values)
+        self._n = handle['n']
+
+    def __len__(self) -> int:
+        return self._n
+
+    def skills(self, i: int) -> List[str]:
+        start, end = self.skill_indptr[i], self.skill_indptr[i + 1]
+        return [self.skill_vocab[code] for code in self.skill_ids[start:end]]
+
+    def clusters(self, i: int) -> List[str]:
+        start, end = self.cluster_indptr[i], self.cluster_indptr[i + 1]
+        return [self.cluster_vocab[code] for code in self.cluster_ids[start:end]]
+
+    def title(self, i: int) -> Optional[str]:
+        code = self.title_id[i]
+        return None if code == MISSING_CODE else self.title_vocab[code]
+
+    def close(self):
+        for name in self.__dict__.copy():
+            if name in SHARED_ARRAYS:
+                delattr(self, name)
+        for block in self._blocks:
+            block.close()
+        self._blocks = []
+
+
+class _Generation:
+    """Shared-memory copy of one snapshot and the number of shard batches reading it"""
+
+    def __init__(self, snapshot, handle: Dict, blocks: List[shared_memory.SharedMemory]):
+        self.snapshot = snapshot
+        self.handle = handle
+        self.blocks = blocks
+        self.in_flight = 0
+
+
+_published: List[_Generation] = []  # newest last
+_retired: List[_Generation] = []  # superseded, unlinked once in_flight drops to 0
+_publish_lock = threading.Lock()
+
+
+def _export(snapshot) -> _Generation:
+    """Copy snapshot arrays into new shared-memory blocks."""
+    arrays, blocks = {}, []
+    try:
+        for name in SHARED_ARRAYS:
+            array = np.ascontiguousarray(getattr(snapshot, name))
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            arrays[name] = (block.name, array.dtype.str, array.shape)
+    except Exception:
+        _unlink(blocks)
+        raise
+
+    handle = {
+        'token': uuid.uuid4().hex[:12],
+        'n': len(snapshot),
+        'arrays': arrays,
+        'vocabs': {name: list(getattr(snapshot, name)) for name in SHARED_VOCABS},
+    }
+    return _Generation(snapshot, handle, blocks)
+
+
+def _acquire(snapshot) -> _Generation:
+    """
+    Shared-memory generation for snapshot (published once per snapshot),
+    pinned until _release().
+    """
+    with _publish_lock:
+        generation = next((g for g in _published if g.snapshot is snapshot), None)
+        if generation is None:
+            generation = _export(snapshot)
+            _published.append(generation)
+            while len(_published) > _KEEP_GENERATIONS:
+                _retired.append(_published.pop(0))
+        generation.in_flight += 1
+        _collect()
+        return generation
+
+
+def _release(generation: _Generation):
+    with _publish_lock:
+        generation.in_flight -= 1
+        _collect()
+
+
+def _collect():
+    """Unlink retired generations no shard is reading (publish lock held)."""
+    for generation in [g for g in _retired if g.in_flight == 0]:
+        _retired.remove(generation)
+        _unlink(generation.blocks)
+
+
+def _unlink(blocks: List[shared_memory.SharedMemory]):
+    for block in blocks:
+        block.close()
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+@atexit.register
+def _release_all():
+    with _publish_lock:
+        for generation in _published + _retired:
+            _unlink(generation.blocks)
+        _published.clear()
+        _retired.clear()
+
+
+# ============================================================================
+# WORKER SIDE
+# ============================================================================
+
+_attached: Dict[str, SharedCVSnapshot] = {}
+
+
+def _attach(handle: Dict) -> SharedCVSnapshot:
+    view = _attached.get(handle['token'])
+    if view is None:
+        view = SharedCVSnapshot(handle)
+        _attached[handle['token']] = view
+        while len(_attached) > _KEEP_GENERATIONS:
+            _attached.pop(next(iter(_attached))).close()
+    return view
+
+
+def _run_shard(task: Callable, handle: Optional[Dict], start: int, stop: int,
+               rows: Optional[Sequence], payload: Any, limit: int):
+    snapshot = _attach(handle) if handle else None
+    return task(snapshot, start, stop, rows, payload, limit)
+
+
+# ============================================================================
+# EXECUTOR
+# ============================================================================
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def worker_count() -> int:
+    """
+    Worker processes per API worker: MATCHING_WORKERS, or for 0 this
+    process's share of the CPUs (cpu_count / WEB_CONCURRENCY, the uvicorn
+    worker count) capped at MAX_AUTO_WORKERS.
+    """
+    if settings.MATCHING_WORKERS > 0:
+        return settings.MATCHING_WORKERS
+    api_workers = max(int(os.environ.get('WEB_CONCURRENCY', 1)), 1)
+    return max(min((os.cpu_count() or 1) // api_workers, MAX_AUTO_WORKERS), 1)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: never fork a process that is running server threads
+            _pool = ProcessPoolExecutor(
+                max_workers=worker_count(),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _merge(shard_results: List[Tuple[List[Tuple[float, int, Any]], Dict[str, int]]],
+           limit: int) -> Tuple[List[Tuple[float, int, Any]], Dict[str, int]]:
+    """Merge per-shard top-K lists; re-offering in row order keeps tie order."""
+    top = TopK(limit)
+    stats: Dict[str, int] = {}
+    for scored, shard_stats in shard_results:
+        for key, value in shard_stats.items():
+            stats[key] = stats.get(key, 0) + value
+    candidates = [entry for scored, _ in shard_results for entry in scored]
+    for score, row, item in sorted(candidates, key=lambda entry: entry[1]):
+        top.push(score, (score, row, item))
+    return top.results(), stats
+
+
+def score_in_shards(
+    task: Callable,
+    n_rows: int,
+    payload: Any,
+    limit: int,
+    snapshot=None,
+    row_data: Optional[Sequence] = None,
+    local_service: Any = None
+) -> Tuple[List[Tuple[float, int, Any]], Dict[str, int]]:
+    """
+    Score rows [0, n_rows) with task, in parallel when the pool is large.
+
+    Args:
+        task: Module-level scoring function (see module docstring)
+        n_rows: Pool size
+        payload: Request-wide inputs, sent to every shard
+        limit: K for the per-shard and merged top-K
+        snapshot: Optional CVSnapshot, shared with workers via shared memory
+        row_data: Optional per-row inputs (list or array), sliced per shard
+        local_service: Service instance reused by the serial path
+
+    Returns:
+        ([(score, row, item), ...] best first, summed counters)
+    """
+    workers = worker_count()
+    if workers <= 1 or n_rows < settings.MATCHING_PARALLEL_MIN_ROWS:
+        return _merge([task(snapshot, 0, n_rows, row_data, payload, limit, service=local_service)], limit)
+
+    bounds = np.linspace(0, n_rows, workers + 1).astype(int)
+    generation = None
+    futures = []
+    try:
+        generation = _acquire(snapshot) if snapshot is not None else None
+        handle = generation.handle if generation is not None else None
+        pool = _get_pool()
+        futures = [
+            pool.submit(
+                _run_shard, task, handle, int(start), int(stop),
+                row_data[start:stop] if row_data is not None else None,
+                payload, limit
+            )
+            for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+        ]
+        return _merge([future.result() for future in futures], limit)
+    except (BrokenProcessPool, OSError) as e:
+        print(f"⚠️  Parallel scoring failed ({e}), falling back to serial")
+        _reset_pool()
+        return _merge([task(snapshot, 0, n_rows, row_data, payload, limit, service=local_service)], limit)
+    finally:
+        if generation is not None:
+            # Shards of a failed batch may still be reading the blocks
+            wait(futures)
+            _release(generation)
@@ -0,0 +1,269 @@
+"""
+Rollup Service - Incremental maintenance of job_stats_rollups
+=============================================================
+Dashboards read pre-aggregated counters from job_stats_rollups instead of
+counting corporate_jobs/applications on every load. Write paths keep the
+rollups current inside their own transaction:
+
+    RollupService.sync_job(db, job)                         # job created/updated
+    RollupService.apply_application_change(db, job_id,
+        old=(status, match_score), new=(status, match_score))  # application write
+
+Counter updates are single `INSERT ... ON CONFLICT DO UPDATE SET c = c + delta`
+statements, so concurrent writers never lose increments.
+
+`rebuild_rollups` recomputes every row from the source tables (one locked
+INSERT ... SELECT); run it after bulk imports or to reconcile drift:
+
+    python scripts/rebuild_dashboard_rollups.py
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.application import Application, ApplicationStatus
+from app.models.corporate_job import CorporateJob
+from app.models.job_stats_rollup import JobStatsRollup
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Rollup counter column per application status
+STATUS_COLUMNS = {
+    ApplicationStatus.NEW: 'new_count',
+    ApplicationStatus.SCREENING: 'screening_count',
+    ApplicationStatus.INTERVIEW: 'interview_count',
+    ApplicationStatus.OFFER: 'offer_count',
+    ApplicationStatus.HIRED: 'hired_count',
+    ApplicationStatus.REJECTED: 'rejected_count',
+}
+
+# (status, match_score) of an application before/after a write
+ApplicationState = Tuple[Optional[ApplicationStatus], Optional[float]]
+
+
+def category_label(category: Optional[str]) -> str:
+    return category or "Uncategorized"
+
+
+def location_label(city: Optional[str], province: Optional[str]) -> str:
+    return city or province or "Unknown"
+
+
+def _status_column(status) -> Optional[str]:
+    if status is None:
+        return None
+    return STATUS_COLUMNS.get(ApplicationStatus(status))
+
+
+def _job_attributes(job: CorporateJob) -> Dict:
+    return {
+        'company': job.company,
+        'job_status': job.status,
+        'category': category_label(job.category),
+        'location': location_label(job.location_city, job.location_province),
+    }
+
+
+class RollupService:
+    """Incremental and full maintenance of job_stats_rollups"""
+
+    # ========================================================================
+    # JOBS
+    # ========================================================================
+
+    @staticmethod
+    def sync_job(db: Session, job: CorporateJob):
+        """Copy a corporate job's dashboard attributes into its rollup row."""
+        db.flush()  # Column defaults (status) are applied on flush
+        attributes = _job_attributes(job)
+        statement = insert(JobStatsRollup).values(job_id=job.job_id, **attributes)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[JobStatsRollup.job_id],
+            set_={**attributes, 'updated_at': func.now()}
+        ))
+
+    @staticmethod
+    def detach_job(db: Session, job_id: str):
+        """Job deleted: keep its application counters, drop it from company dashboards."""
+        db.query(JobStatsRollup).filter(JobStatsRollup.job_id == job_id).update(
+            {'company': None, 'job_status': None, 'category': None, 'location': None},
+            synchronize_session=False
+        )
+
+    # ========================================================================
+    # APPLICATIONS
+    # ========================================================================
+
+    @staticmethod
+    def _increment(db: Session, job_id: str, deltas: Dict[str, float]):
+        deltas = {column: delta for column, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        table = JobStatsRollup.__table__
+        statement = insert(JobStatsRollup).values(job_id=job_id, **deltas)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[JobStatsRollup.job_id],
+            set_={
+                **{column: table.c[column] + statement.excluded[column] for column in deltas},
+                'updated_at': func.now()
+            }
+        ))
+
+    @staticmethod
+    def application_deltas(
+        old: Optional[ApplicationState],
+        new: Optional[ApplicationState],
+        count: int = 1
+    ) -> Dict[str, float]:
+        """
+        Counter deltas for `count` applications moving from old to new
+        (None = the application did not exist / no longer exists).
+        """
+        deltas: Dict[str, float] = {}
+
+        def add(state: Optional[ApplicationState], sign: int):
+            if state is None:
+                return
+            status, match_score = state
+            deltas['applications_total'] = deltas.get('applications_total', 0) + sign * count
+            column = _status_column(status)
+            if column:
+                deltas[column] = deltas.get(column, 0) + sign * count
+            if match_score is not None:
+                deltas['match_score_sum'] = deltas.get('match_score_sum', 0.0) + sign * count * match_score
+                deltas['match_score_count'] = deltas.get('match_score_count', 0) + sign * count
+
+        add(old, -1)
+        add(new, +1)
+        return deltas
+
+    @staticmethod
+    def apply_application_change(
+        db: Session,
+        job_id: str,
+        old: Optional[ApplicationState] = None,
+        new: Optional[ApplicationState] = None,
+        count: int = 1
+    ):
+        """Apply one application create/update/delete to its job's counters."""
+        RollupService._increment(db, job_id, RollupService.application_deltas(old, new, count))
+
+    @staticmethod
+    def apply_bulk_status_change(
+        db: Session,
+        moved: Iterable[Tuple[str, ApplicationStatus, int]],
+        new_status: ApplicationStatus
+    ):
+        """
+        Status change for many applications at once.
+
+        Args:
+            moved: (job_id, old_status, count) groups (count only, scores unchanged)
+            new_status: Status they all move to
+        """
+        per_job: Dict[str, Dict[str, float]] = {}
+        for job_id, old_status, count in moved:
+            deltas = per_job.setdefault(job_id, {})
+            for column, sign in ((_status_column(old_status), -1), (_status_column(new_status), +1)):
+                if column:
+                    deltas[column] = deltas.get(column, 0) + sign * count
+        for job_id, deltas in per_job.items():
+            RollupService._increment(db, job_id, deltas)
+
+    # ========================================================================
+    # LIST VERSIONS
+    # ========================================================================
+
+    @staticmethod
+    def jobs_version(db: Session, company: Optional[str] = None) -> Tuple[int, Optional[datetime]]:
+        """
+        Cheap change marker for corporate job lists that skip the total:
+        (rollup rows, newest corporate_jobs.updated_at) for the company, or
+        for all jobs. Creates and deletes change the rollup count, edits
+        (status included) change updated_at. It covers every job of the
+        company, so filtered lists may revalidate more often than needed.
+        """
+        rollups = select(func.count()).select_from(JobStatsRollup)
+        newest = select(func.max(CorporateJob.updated_at))
+        if company:
+            rollups = rollups.where(JobStatsRollup.company == company)
+            newest = newest.where(CorporateJob.company == company)
+        else:
+            rollups = rollups.where(JobStatsRollup.company.isnot(None))
+        return tuple(db.execute(select(rollups.scalar_subquery(), newest.scalar_subquery())).one())
+
+    # ========================================================================
+    # RECONCILIATION
+    # ========================================================================
+
+    @staticmethod
+    def rebuild_statement():
+        """
+        INSERT ... SELECT recomputing every rollup row: corporate jobs FULL
+        JOIN per-job application counters, so applications of deleted jobs
+        keep their (detached) row.
+        """
+        jobs = select(
+            CorporateJob.job_id,
+            CorporateJob.company,
+            CorporateJob.status.label('job_status'),
+            func.coalesce(func.nullif(CorporateJob.category, ''), 'Uncategorized').label('category'),
+            func.coalesce(
+                func.nullif(CorporateJob.location_city, ''),
+                func.nullif(CorporateJob.location_province, ''),
+                'Unknown'
+            ).label('location')
+        ).subquery('jobs')
+
+        status_counts = [
+            func.count().filter(Application.status == status).label(column)
+            for status, column in STATUS_COLUMNS.items()
+        ]
+        counts = select(
+            Application.job_id,
+            func.count().label('applications_total'),
+            *status_counts,
+            func.coalesce(func.sum(Application.match_score), 0.0).label('match_score_sum'),
+            func.count(Application.match_score).label('match_score_count')
+        ).group_by(Application.job_id).subquery('counts')
+
+        counters = ['applications_total', *STATUS_COLUMNS.values(), 'match_score_sum', 'match_score_count']
+        rows = select(
+            func.coalesce(jobs.c.job_id, counts.c.job_id),
+            jobs.c.company, jobs.c.job_status, jobs.c.category, jobs.c.location,
+            *[func.coalesce(counts.c[column], 0) for column in counters]
+        ).select_from(jobs.join(counts, jobs.c.job_id == counts.c.job_id, full=True))
+
+        columns = ['job_id', 'company', 'job_status', 'category', 'location', *counters]
+        return insert(JobStatsRollup).from_select(columns, rows)
+
+    @staticmethod
+    def rebuild_rollups(db: Session) -> int:
+        """
+        Recompute every rollup row from corporate_jobs and applications and
+        replace the table contents, in one transaction.
+
+        The source tables are locked in SHARE mode first: concurrent writers
+        wait until the rebuild commits, so no application write can land
+        between the recount and the replace and be lost (or counted twice
+        by its own incremental update).
+
+        Returns:
+            Number of rollup rows written
+        """
+        try:
+            db.execute(text("LOCK TABLE applications, corporate_jobs IN SHARE MODE"))
+            db.execute(delete(JobStatsRollup))
+            written = db.execute(RollupService.rebuild_statement()).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return written
@@ -11,6 +11,8 @@ from sentence_transformers import SentenceTransformer
 from typing import List, Dict, Optional, Tuple
 import numpy as np
 
+from app.services.top_k import TopK
+
 
 class SemanticCompanyMatcher:
     """
@@ -121,17 +123,15 @@ class SemanticCompanyMatcher:
         Returns:
             List of (company_name, similarity_score) tuples, sorted by score
         """
-        matches = []
+        top = TopK(top_k)
         
         for company in company_list:
             similarity = self.compute_similarity(target_company, company)
             if similarity >= self.similarity_threshold:
-                matches.append((company, similarity))
-        
-        # Sort by similarity (highest first)
-        matches.sort(key=lambda x: x[1], reverse=True)
+                top.push(similarity, (company, similarity))
         
-        return matches[:top_k]
+        # Highest similarity first
+        return top.results()
     
     def get_canonical_name(
         self,
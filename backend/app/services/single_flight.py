@@ -0,0 +1,125 @@
+"""
+Single Flight - Coalesce concurrent identical matching runs
+===========================================================
+When several recruiters open the same job at once, each request used to
+start its own full matching run; the TTL caches only help after the first
+run has finished. Single flight lets the first caller for a key compute
+and makes every concurrent caller with the same key wait for, and share,
+that result (or exception):
+
+    key = ('enhanced', job_id, EnhancedMatchingService.ENGINE_VERSION, limit)
+
+    # sync routes (threadpool)
+    matches = match_flights.do(key, service.match_job, job_id=job_id, ...)
+
+    # async routes: the shared run can outlive the request that started it,
+    # so it opens its own session (never pass the request's `db`)
+    matches = await match_flights.do_async(key, run_matching, with_session, match_job_with_gates, ...)
+
+Both share one in-flight table, so a sync and an async caller with the same
+key coalesce too. Nothing is kept after the run completes; callers arriving
+later start a new run. Shared results must be treated as read-only.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    In-flight table of key -> Future, shared by threads and event loops.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._tasks = set()  # Strong refs to running async leader tasks
+        self.leaders = 0  # Runs actually executed
+        self.coalesced = 0  # Callers that joined a running flight
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """(future, is_leader) for key; the leader must complete the future."""
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._flights[key] = future
+            self.leaders += 1
+            return future, True
+
+    def _land(self, key: Hashable, future: Future):
+        with self._lock:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Call fn(*args, **kwargs) unless a call with this key is already in
+        flight, in which case block until it finishes and return its result.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._land(key, future)
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Awaitable], *args, **kwargs) -> Any:
+        """
+        Async variant of do(): fn is a coroutine function.
+
+        The leader's run is shielded, so a disconnecting leader does not
+        cancel the computation the other callers are waiting for. It may
+        outlive the leader's request, so it must not use request-scoped
+        resources such as the request's session.
+        """
+        future, leader = self._join(key)
+        if leader:
+            try:
+                task = asyncio.ensure_future(fn(*args, **kwargs))
+            except BaseException as e:
+                # fn failed before returning an awaitable: fail the waiters too
+                future.set_exception(e)
+                self._land(key, future)
+                raise
+            self._tasks.add(task)
+            task.add_done_callback(lambda done: self._settle(key, future, done))
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def _settle(self, key: Hashable, future: Future, task: asyncio.Task):
+        """Copy a finished leader task's outcome into the shared future."""
+        self._tasks.discard(task)
+        try:
+            if task.cancelled():
+                future.set_exception(asyncio.CancelledError())
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+        finally:
+            self._land(key, future)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            in_flight = len(self._flights)
+        return {
+            "in_flight": in_flight,
+            "runs": self.leaders,
+            "coalesced_requests": self.coalesced
+        }
+
+
+# Shared by all matching routers
+match_flights = SingleFlight()
@@ -19,7 +19,7 @@ Example:
 Result: Rare skills get 34x more weight than common skills!
 """
 
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 from collections import Counter
 import math
 import json
@@ -35,21 +35,22 @@ class SkillRarityCalculator:
     for matching candidates to those specialized positions.
     """
     
-    def __init__(self, cache_file: str = "datasets/skill_rarity_cache.json"):
+    def __init__(self, cache_file: Optional[str] = "datasets/skill_rarity_cache.json"):
         """
         Initialize the calculator.
         
         Args:
-            cache_file: Path to cache computed weights (for performance)
+            cache_file: Path to cache computed weights (for performance),
+                None to keep weights in memory only
         """
-        self.cache_file = Path(cache_file)
+        self.cache_file = Path(cache_file) if cache_file else None
         self.skill_weights: Dict[str, float] = {}
         self.total_jobs: int = 0
         self.skill_document_frequency: Dict[str, int] = {}
         self.normalizer = SkillNormalizer()  # NEW: Integrate skill normalization
         
         # Load cached weights if available
-        if self.cache_file.exists():
+        if self.cache_file is not None and self.cache_file.exists():
             self._load_cache()
     
     def compute_weights_from_database(self, db_session) -> Dict[str, float]:
@@ -281,6 +282,9 @@ class SkillRarityCalculator:
     
     def _save_cache(self):
         """Save computed weights to cache file."""
+        if self.cache_file is None:
+            return
+        
         cache_data = {
             'total_jobs': self.total_jobs,
             'skill_weights': self.skill_weights,
@@ -0,0 +1,166 @@
+"""
+Stats Service - Single-query dashboard statistics
+=================================================
+Dashboard endpoints used to issue one COUNT per status (plus, for corporate
+jobs, a full table load to tally categories and locations in Python). Each
+dashboard here is one SQL statement:
+
+    COUNT(*) FILTER (WHERE status = ...)      per-status counts in one scan
+    GROUP BY GROUPING SETS ((), (a), (b))     total + per-a + per-b breakdowns
+
+Application and corporate job stats read job_stats_rollups (one small row
+per job, kept current by RollupService) rather than the source tables.
+
+Corporate stats are cached per company for STATS_CACHE_TTL_SECONDS; the
+corporate job routes call invalidate_company_stats() on every write.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.job_stats_rollup import JobStatsRollup
+from app.models.small_job import SmallJob
+from app.schemas.application import ApplicationStats
+from app.services.rollup_service import STATUS_COLUMNS
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+CORPORATE_STATUSES = ('draft', 'published', 'closed')
+
+EMPLOYER_STATUSES = {
+    'active_jobs': 'Open',
+    'in_progress_jobs': 'In Progress',
+    'completed_jobs': 'Completed',
+    'draft_jobs': 'Draft',
+}
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+_company_stats: Dict[str, Tuple[float, Dict]] = {}
+_company_stats_lock = threading.Lock()
+
+
+def invalidate_company_stats(company: Optional[str] = None):
+    """Drop cached corporate stats for a company (None = all companies)."""
+    with _company_stats_lock:
+        if company is None:
+            _company_stats.clear()
+        else:
+            _company_stats.pop(company, None)
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+class StatsService:
+    """Dashboard statistics, one grouped query per dashboard"""
+
+    @staticmethod
+    def application_stats(db: Session, job_id: Optional[str] = None) -> ApplicationStats:
+        """Application counts by status and average match score."""
+        status_sums = [
+            func.coalesce(func.sum(getattr(JobStatsRollup, column)), 0).label(application_status.value)
+            for application_status, column in STATUS_COLUMNS.items()
+        ]
+        query = select(
+            func.coalesce(func.sum(JobStatsRollup.applications_total), 0).label('total'),
+            *status_sums,
+            func.sum(JobStatsRollup.match_score_sum).label('match_score_sum'),
+            func.sum(JobStatsRollup.match_score_count).label('match_score_count')
+        )
+        if job_id:
+            query = query.where(JobStatsRollup.job_id == job_id)
+
+        row = db.execute(query).one()
+        return ApplicationStats(
+            total=row.total,
+            new=row.new,
+            screening=row.screening,
+            interview=row.interview,
+            offer=row.offer,
+            hired=row.hired,
+            rejected=row.rejected,
+            avg_match_score=(
+                float(row.match_score_sum) / row.match_score_count
+                if row.match_score_count else None
+            )
+        )
+
+    @staticmethod
+    def employer_job_stats(db: Session, employer_id: str) -> Dict[str, int]:
+        """Small-job counts for one employer, total and per status."""
+        counts = [
+            func.count().filter(SmallJob.status == job_status).label(key)
+            for key, job_status in EMPLOYER_STATUSES.items()
+        ]
+        row = db.execute(
+            select(func.count().label('total_jobs'), *counts).where(SmallJob.posted_by == employer_id)
+        ).one()
+        return dict(row._mapping)
+
+    @staticmethod
+    def corporate_job_stats(db: Session, company: str, use_cache: bool = True) -> Dict:
+        """
+        Non-archived corporate job counts for a company: total, by status,
+        by category and by location (city, else province).
+        """
+        if use_cache and settings.STATS_CACHE_TTL_SECONDS > 0:
+            with _company_stats_lock:
+                cached = _company_stats.get(company)
+            if cached and time.time() - cached[0] < settings.STATS_CACHE_TTL_SECONDS:
+                return cached[1]
+
+        status_counts = [
+            func.count().filter(JobStatsRollup.job_status == job_status).label(job_status)
+            for job_status in CORPORATE_STATUSES
+        ]
+        rows = db.execute(
+            select(
+                JobStatsRollup.category,
+                JobStatsRollup.location,
+                func.grouping(JobStatsRollup.category).label('by_category'),
+                func.grouping(JobStatsRollup.location).label('by_location'),
+                func.count().label('total'),
+                *status_counts
+            ).where(
+                JobStatsRollup.company == company,
+                JobStatsRollup.job_status != 'archived'
+            ).group_by(
+                func.grouping_sets(
+                    tuple_(),
+                    tuple_(JobStatsRollup.category),
+                    tuple_(JobStatsRollup.location)
+                )
+            )
+        ).all()
+
+        stats = {
+            'total_jobs': 0,
+            'by_status': {job_status: 0 for job_status in CORPORATE_STATUSES},
+            'by_category': {},
+            'by_location': {},
+        }
+        for row in rows:
+            if row.by_category == 0:
+                stats['by_category'][row.category] = row.total
+            elif row.by_location == 0:
+                stats['by_location'][row.location] = row.total
+            else:
+                stats['total_jobs'] = row.total
+                stats['by_status'] = {job_status: getattr(row, job_status) for job_status in CORPORATE_STATUSES}
+
+        with _company_stats_lock:
+            _company_stats[company] = (time.time(), stats)
+        return stats
@@ -0,0 +1,93 @@
+"""
+Top-K Selection - Bounded accumulators shared by the matchers
+=============================================================
+Matchers used to collect every scored candidate, sort the whole list and
+slice off the first K. These helpers keep only K items:
+
+    top = TopK(limit)
+    for cv in cvs:
+        top.push(score, result)      # O(log K), memory O(K)
+    matches = top.results()          # best first
+
+    rows = top_k_indices(scores, k)  # array scores: O(N) partition + O(K log K)
+
+Ties are broken by arrival order (earlier wins), so both return exactly
+what `sorted(..., key=score, reverse=True)[:k]` returned before.
+"""
+
+import heapq
+from typing import Any, List, Tuple
+
+import numpy as np
+
+
+class TopK:
+    """
+    Bounded min-heap of the K best (score, item) pairs seen so far.
+    """
+
+    def __init__(self, k: int):
+        self.k = max(int(k), 0)
+        self.seen = 0  # Items pushed (e.g. for "total matches" counts)
+        self._heap: List[Tuple[float, int, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def full(self) -> bool:
+        return len(self._heap) >= self.k
+
+    @property
+    def threshold(self) -> float:
+        """Score an item must beat to enter (-inf until K items are held)."""
+        return self._heap[0][0] if self.k and self.full else float('-inf')
+
+    def push(self, score: float, item: Any) -> bool:
+        """
+        Offer an item; returns True if it is (currently) in the top K.
+
+        Entries are (score, -arrival, item): among equal scores the later
+        arrival compares smaller and is evicted first.
+        """
+        entry = (score, -self.seen, item)
+        self.seen += 1
+
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if self.k and entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def results(self) -> List[Any]:
+        """Items best first (ties in arrival order)."""
+        return [item for _, _, item in sorted(self._heap, key=lambda e: (e[0], e[1]), reverse=True)]
+
+    def scored_results(self) -> List[Tuple[float, Any]]:
+        """(score, item) pairs best first."""
+        return [(score, item) for score, _, item in sorted(self._heap, key=lambda e: (e[0], e[1]), reverse=True)]
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k largest scores, best first, ties by lower index.
+
+    Uses np.partition to find the k-th largest value, then orders only the
+    candidates at or above it.
+    """
+    scores = np.asarray(scores)
+    n = len(scores)
+    k = min(int(k), n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    if k < n:
+        kth_value = np.partition(scores, n - k)[n - k]
+        candidates = np.flatnonzero(scores >= kth_value)
+    else:
+        candidates = np.arange(n)
+
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order[:k]]
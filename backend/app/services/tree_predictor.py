@@ -0,0 +1,248 @@
+"""
+Flat Tree Predictor - Dependency-light inference for the LightGBM ranking model
+
+The trained booster is exported as flat NumPy arrays (one row per node across
+all trees) and evaluated level by level for a whole batch at once. Serving only
+needs NumPy: no lightgbm install and no pickle of a native object.
+
+Export (training side):
+    predictor = FlatTreePredictor.from_model_dump(booster.dump_model(num_iteration=...))
+    predictor.save('models/ranking_model.npz')
+
+Inference (serving side):
+    predictor = FlatTreePredictor.load('models/ranking_model.npz')
+    probabilities = predictor.predict(X)   # X: (n_samples, n_features)
+"""
+
+import json
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+# LightGBM missing-value handling per split
+MISSING_NONE = 0
+MISSING_ZERO = 1
+MISSING_NAN = 2
+
+_MISSING_TYPES = {'None': MISSING_NONE, 'Zero': MISSING_ZERO, 'NaN': MISSING_NAN}
+
+# LightGBM treats |x| <= kZeroThreshold as zero
+_ZERO_THRESHOLD = 1e-35
+
+# Rows evaluated per block; bounds the (rows x trees) node-index matrix
+_BATCH_ROWS = 8192
+
+
+class FlatTreePredictor:
+    """
+    Gradient-boosted tree ensemble stored as flat node arrays.
+
+    Leaves are stored as nodes whose children point back to themselves, so a
+    fixed number of vectorized steps (the maximum tree depth) routes every
+    row through every tree.
+    """
+
+    def __init__(
+        self,
+        split_feature: np.ndarray,
+        threshold: np.ndarray,
+        left_child: np.ndarray,
+        right_child: np.ndarray,
+        default_left: np.ndarray,
+        missing_type: np.ndarray,
+        value: np.ndarray,
+        tree_roots: np.ndarray,
+        max_depth: int,
+        objective: str = 'binary',
+        sigmoid: float = 1.0,
+        feature_names: Optional[List[str]] = None
+    ):
+        self.split_feature = split_feature.astype(np.int32)
+        self.threshold = threshold.astype(np.float64)
+        self.left_child = left_child.astype(np.int32)
+        self.right_child = right_child.astype(np.int32)
+        self.default_left = default_left.astype(bool)
+        self.missing_type = missing_type.astype(np.int8)
+        self.value = value.astype(np.float64)
+        self.tree_roots = tree_roots.astype(np.int32)
+        self.max_depth = int(max_depth)
+        self.objective = objective
+        self.sigmoid = float(sigmoid)
+        self.feature_names = list(feature_names) if feature_names else []
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.tree_roots)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_names)
+
+    # ========================================================================
+    # EXPORT
+    # ========================================================================
+
+    @classmethod
+    def from_model_dump(cls, model_dump: Dict) -> 'FlatTreePredictor':
+        """
+        Build a predictor from LightGBM's Booster.dump_model() output.
+
+        Only numerical splits are supported (the ranking model has no
+        categorical features); a categorical split raises ValueError.
+        """
+        split_feature, threshold = [], []
+        left_child, right_child = [], []
+        default_left, missing_type, value = [], [], []
+        tree_roots = []
+        max_depth = 0
+
+        def add_node(node: Dict, depth: int) -> int:
+            nonlocal max_depth
+            index = len(split_feature)
+            split_feature.append(0)
+            threshold.append(0.0)
+            left_child.append(index)
+            right_child.append(index)
+            default_left.append(True)
+            missing_type.append(MISSING_NONE)
+            value.append(0.0)
+
+            if 'leaf_value' in node:
+                value[index] = node['leaf_value']
+                max_depth = max(max_depth, depth)
+                return index
+
+            if node.get('decision_type', '<=') != '<=':
+                raise ValueError(
+                    f"Unsupported split type {node.get('decision_type')!r}: "
+                    "only numerical splits can be exported"
+                )
+
+            split_feature[index] = node['split_feature']
+            threshold[index] = node['threshold']
+            default_left[index] = node.get('default_left', True)
+            missing_type[index] = _MISSING_TYPES.get(node.get('missing_type', 'None'), MISSING_NONE)
+            left_child[index] = add_node(node['left_child'], depth + 1)
+            right_child[index] = add_node(node['right_child'], depth + 1)
+            return index
+
+        for tree in model_dump['tree_info']:
+            tree_roots.append(add_node(tree['tree_structure'], 0))
+
+        objective_str = str(model_dump.get('objective', 'binary'))
+        objective = objective_str.split()[0]
+        sigmoid = 1.0
+        for token in objective_str.split()[1:]:
+            if token.startswith('sigmoid:'):
+                sigmoid = float(token.split(':', 1)[1])
+
+        return cls(
+            split_feature=np.array(split_feature),
+            threshold=np.array(threshold),
+            left_child=np.array(left_child),
+            right_child=np.array(right_child),
+            default_left=np.array(default_left),
+            missing_type=np.array(missing_type),
+            value=np.array(value),
+            tree_roots=np.array(tree_roots),
+            max_depth=max_depth,
+            objective=objective,
+            sigmoid=sigmoid,
+            feature_names=model_dump.get('feature_names')
+        )
+
+    def save(self, path: str):
+        """Save arrays and metadata to a single .npz file."""
+        meta = {
+            'objective': self.objective,
+            'sigmoid': self.sigmoid,
+            'max_depth': self.max_depth,
+            'feature_names': self.feature_names
+        }
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                split_feature=self.split_feature,
+                threshold=self.threshold,
+                left_child=self.left_child,
+                right_child=self.right_child,
+                default_left=self.default_left,
+                missing_type=self.missing_type,
+                value=self.value,
+                tree_roots=self.tree_roots,
+                meta=np.array(json.dumps(meta))
+            )
+
+    @classmethod
+    def load(cls, path: str) -> 'FlatTreePredictor':
+        """Load a predictor saved with save()."""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            return cls(
+                split_feature=data['split_feature'],
+                threshold=data['threshold'],
+                left_child=data['left_child'],
+                right_child=data['right_child'],
+                default_left=data['default_left'],
+                missing_type=data['missing_type'],
+                value=data['value'],
+                tree_roots=data['tree_roots'],
+                max_depth=meta['max_depth'],
+                objective=meta['objective'],
+                sigmoid=meta['sigmoid'],
+                feature_names=meta['feature_names']
+            )
+
+    # ========================================================================
+    # INFERENCE
+    # ========================================================================
+
+    def _raw_block(self, X: np.ndarray) -> np.ndarray:
+        """Sum of leaf values over all trees for one block of rows."""
+        n_rows = X.shape[0]
+        rows = np.arange(n_rows)[:, None]
+        node = np.broadcast_to(self.tree_roots, (n_rows, self.n_trees)).copy()
+
+        for _ in range(self.max_depth):
+            x = X[rows, self.split_feature[node]]
+            missing = self.missing_type[node]
+
+            # Mirrors LightGBM's NumericalDecision
+            is_nan = np.isnan(x)
+            x = np.where(is_nan & (missing != MISSING_NAN), 0.0, x)
+            use_default = (
+                ((missing == MISSING_ZERO) & (np.abs(x) <= _ZERO_THRESHOLD)) |
+                ((missing == MISSING_NAN) & is_nan)
+            )
+            go_left = np.where(use_default, self.default_left[node], x <= self.threshold[node])
+            node = np.where(go_left, self.left_child[node], self.right_child[node])
+
+        return self.value[node].sum(axis=1)
+
+    def predict_raw(self, X: np.ndarray) -> np.ndarray:
+        """Raw ensemble scores (log-odds for binary, relevance for lambdarank)."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        if self.feature_names and X.shape[1] != len(self.feature_names):
+            raise ValueError(
+                f"Expected {len(self.feature_names)} features, got {X.shape[1]}"
+            )
+
+        if X.shape[0] <= _BATCH_ROWS:
+            return self._raw_block(X)
+        return np.concatenate([
+            self._raw_block(X[start:start + _BATCH_ROWS])
+            for start in range(0, X.shape[0], _BATCH_ROWS)
+        ])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predictions matching Booster.predict: probabilities for binary
+        objectives, raw scores otherwise.
+        """
+        raw = self.predict_raw(X)
+        if self.objective in ('binary', 'cross_entropy', 'xentropy'):
+            return 1.0 / (1.0 + np.exp(-self.sigmoid * raw))
+        return raw
@@ -8,6 +8,10 @@ This script:
 3. Extracts 30+ features for each interaction
 4. Outputs ml_training_data.csv ready for model training
 
+For large interaction tables, --chunked streams rows through a server-side
+cursor and writes one Parquet part per chunk, so memory stays bounded and an
+interrupted run resumes from the last completed chunk.
+
 Author: CAMSS Development Team
 Version: 1.0.0
 """
@@ -16,7 +20,8 @@ import psycopg2
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+import argparse
 import json
 import sys
 import os
@@ -33,6 +38,64 @@ DB_CONFIG = {
 }
 
 OUTPUT_FILE = '../datasets/ml_training_data.csv'
+CHUNKED_OUTPUT_DIR = '../datasets/ml_training_data.parquet'
+CHUNK_SIZE = 50_000
+CHECKPOINT_FILE = '_checkpoint.json'
+
+# Keyset timestamp of an interaction (NULL -> '-infinity', written as such to the checkpoint)
+KEYSET_TIMESTAMP = "COALESCE(i.timestamp, '-infinity')"
+NULL_TIMESTAMP_KEY = '-infinity'
+
+# Fixed output dtypes so every chunk (and every Parquet part) shares one schema
+FEATURE_DTYPES = {
+    'applied': 'int8',
+    'helpful': 'int8',
+    'event_id': 'string',
+    'cv_id': 'string',
+    'job_id': 'string',
+    'session_id': 'string',
+    'match_score': 'float32',
+    'skills_score': 'float32',
+    'location_score': 'float32',
+    'salary_score': 'float32',
+    'experience_score': 'float32',
+    'user_skills_count': 'int16',
+    'user_technical_skills_count': 'int16',
+    'user_soft_skills_count': 'int16',
+    'user_salary_expectation_avg': 'float32',
+    'user_years_experience': 'float32',
+    'employment_status_encoded': 'int8',
+    'education_level_encoded': 'int8',
+    'user_available_immediately': 'int8',
+    'job_salary_avg': 'float32',
+    'job_salary_range': 'float32',
+    'job_required_skills_count': 'int16',
+    'job_preferred_skills_count': 'int16',
+    'job_total_skills_count': 'int16',
+    'is_corporate_job': 'int8',
+    'is_small_job': 'int8',
+    'job_type_encoded': 'int8',
+    'skills_matched_count': 'int16',
+    'skills_match_ratio': 'float32',
+    'skills_missing_count': 'int16',
+    'salary_ratio': 'float32',
+    'salary_exceeds_expectation': 'int8',
+    'salary_gap': 'float32',
+    'same_city': 'int8',
+    'same_province': 'int8',
+    'location_match_level': 'int8',
+    'experience_gap': 'float32',
+    'meets_experience_requirement': 'int8',
+    'interaction_type_encoded': 'int8',
+    'day_of_week': 'int8',
+    'hour_of_day': 'int8',
+    'is_weekend': 'int8',
+    'is_business_hours': 'int8',
+    'skills_salary_interaction': 'float32',
+    'location_salary_interaction': 'float32',
+    'match_score_squared': 'float32',
+    'skills_experience_interaction': 'float32',
+}
 
 
 class FeatureEngineer:
@@ -62,13 +125,13 @@ class FeatureEngineer:
             self.conn.close()
         print("✅ Database connection closed")
     
-    def fetch_interactions_data(self) -> pd.DataFrame:
+    def _interactions_query(self, after_key: bool = False) -> str:
         """
-        Fetch all interactions with CV and job details.
-        Joins: user_job_interactions + cvs + jobs + match_feedback
+        Build the interactions query.
+        Rows are ordered by (timestamp, event_id) descending so chunked reads
+        can resume after the last key of a completed chunk. NULL timestamps
+        sort as '-infinity' (last, by event_id), so every row has a usable key.
         """
-        print("\n📊 Fetching interaction data from database...")
-        
         query = """
         SELECT 
             -- Interaction metadata
@@ -80,6 +143,7 @@ class FeatureEngineer:
             i.match_score,
             i.sub_scores,
             i.timestamp as interaction_date,
+            i.session_id,
             
             -- Feedback data
             f.helpful,
@@ -138,17 +202,60 @@ class FeatureEngineer:
         LEFT JOIN public.small_jobs sj 
             ON i.job_id = sj.id AND i.job_type = 'small'
         WHERE f.helpful IS NOT NULL  -- Only interactions with feedback
-        ORDER BY i.timestamp DESC
         """
+        if after_key:
+            query += f"        AND ({KEYSET_TIMESTAMP}, i.event_id) < (%s, %s)\n"
+        query += f"        ORDER BY {KEYSET_TIMESTAMP} DESC, i.event_id DESC\n"
+        return query
+    
+    def fetch_interactions_data(self) -> pd.DataFrame:
+        """
+        Fetch all interactions with CV and job details.
+        Joins: user_job_interactions + cvs + jobs + match_feedback
+        """
+        print("\n📊 Fetching interaction data from database...")
         
         try:
-            df = pd.read_sql_query(query, self.conn)
+            df = pd.read_sql_query(self._interactions_query(), self.conn)
             print(f"✅ Fetched {len(df)} interactions with complete data")
             return df
         except Exception as e:
             print(f"❌ Error fetching data: {e}")
             raise
     
+    def stream_interactions_data(
+        self,
+        chunk_size: int = CHUNK_SIZE,
+        resume_key: Optional[Tuple] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream interactions in chunks through a server-side (named) cursor.
+        Only one chunk is held in memory at a time.
+        
+        Args:
+            chunk_size: Rows per chunk
+            resume_key: (interaction_date, event_id) of the last row already
+                processed; streaming continues strictly after it
+        """
+        cursor = self.conn.cursor(name='camss_feature_stream')
+        cursor.itersize = chunk_size
+        try:
+            if resume_key:
+                cursor.execute(self._interactions_query(after_key=True), tuple(resume_key))
+            else:
+                cursor.execute(self._interactions_query())
+            
+            columns = None
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                if columns is None:
+                    columns = [desc[0] for desc in cursor.description]
+                yield pd.DataFrame.from_records(rows, columns=columns)
+        finally:
+            cursor.close()
+    
     def parse_skills(self, skills_str: str) -> List[str]:
         """Parse comma-separated skills string into list."""
         if pd.isna(skills_str) or not skills_str:
@@ -187,18 +294,19 @@ class FeatureEngineer:
             'skills_missing_count': len(missing)
         }
     
-    def engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def engineer_features(self, df: pd.DataFrame, verbose: bool = True) -> pd.DataFrame:
         """
         Engineer all features for ML training.
         Creates 30+ features from raw interaction data.
         """
-        print("\n🔧 Engineering features...")
+        log = print if verbose else (lambda *args, **kwargs: None)
+        log("\n🔧 Engineering features...")
         
         # Create a copy to avoid SettingWithCopyWarning
         df = df.copy()
         
         # 1. MERGE CORPORATE AND SMALL JOB FIELDS
-        print("  → Merging job type fields...")
+        log("  → Merging job type fields...")
         df['job_title'] = df['corp_title'].fillna(df['small_title'])
         df['job_company'] = df['corp_company'].fillna(df['small_company'])
         df['job_city'] = df['corp_city'].fillna(df['small_city'])
@@ -212,7 +320,7 @@ class FeatureEngineer:
         df['actual_job_type'] = df['corp_job_type'].fillna(df['small_job_type'])
         
         # 2. USER FEATURES
-        print("  → Creating user features...")
+        log("  → Creating user features...")
         df['user_skills_count'] = df.apply(
             lambda row: len(self.parse_skills(row['skills_technical'])) + 
                        len(self.parse_skills(row['skills_soft'])), 
@@ -252,7 +360,7 @@ class FeatureEngineer:
         df['user_available_immediately'] = df['availability'].map({'Immediate': 1}).fillna(0)
         
         # 3. JOB FEATURES
-        print("  → Creating job features...")
+        log("  → Creating job features...")
         df['job_salary_avg'] = (df['job_salary_min'] + df['job_salary_max']) / 2
         df['job_salary_range'] = df['job_salary_max'] - df['job_salary_min']
         df['job_required_skills_count'] = df['job_required_skills'].apply(
@@ -280,7 +388,7 @@ class FeatureEngineer:
         df['job_type_encoded'] = df['actual_job_type'].map(job_type_mapping).fillna(1)
         
         # 4. MATCH FEATURES (Most Important!)
-        print("  → Creating match features...")
+        log("  → Creating match features...")
         
         # Parse sub_scores to extract individual components
         df['sub_scores_dict'] = df['sub_scores'].apply(self.parse_sub_scores)
@@ -303,7 +411,11 @@ class FeatureEngineer:
             overlap = self.calculate_skills_overlap(user_skills, job_skills)
             skills_overlap_data.append(overlap)
         
-        overlap_df = pd.DataFrame(skills_overlap_data)
+        overlap_df = pd.DataFrame(
+            skills_overlap_data,
+            index=df.index,
+            columns=['skills_matched_count', 'skills_match_ratio', 'skills_missing_count']
+        )
         df = pd.concat([df, overlap_df], axis=1)
         
         # Salary matching
@@ -329,7 +441,7 @@ class FeatureEngineer:
         ).astype(int)
         
         # 5. INTERACTION FEATURES
-        print("  → Creating interaction features...")
+        log("  → Creating interaction features...")
         df['interaction_type_encoded'] = df['interaction_type'].map({
             'viewed': 1,
             'saved': 2,
@@ -346,27 +458,28 @@ class FeatureEngineer:
         ).astype(int)
         
         # 6. TARGET VARIABLES
-        print("  → Creating target variables...")
+        log("  → Creating target variables...")
         df['applied'] = df['applied'].fillna(0).astype(int)
         df['helpful'] = df['helpful'].fillna(0).astype(int)
         
         # 7. COMPOSITE FEATURES
-        print("  → Creating composite features...")
+        log("  → Creating composite features...")
         df['skills_salary_interaction'] = df['skills_score'] * df['salary_score']
         df['location_salary_interaction'] = df['location_score'] * df['salary_score']
         df['match_score_squared'] = df['match_score'] ** 2
         df['skills_experience_interaction'] = df['skills_score'] * df['experience_score']
         
-        print(f"✅ Feature engineering complete: {len(df.columns)} total columns")
+        log(f"✅ Feature engineering complete: {len(df.columns)} total columns")
         
         return df
     
-    def select_final_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def select_final_features(self, df: pd.DataFrame, verbose: bool = True) -> pd.DataFrame:
         """
         Select final feature set for model training.
         Drops redundant and non-feature columns.
         """
-        print("\n🎯 Selecting final feature set...")
+        log = print if verbose else (lambda *args, **kwargs: None)
+        log("\n🎯 Selecting final feature set...")
         
         # Define features to keep
         feature_columns = [
@@ -378,6 +491,7 @@ class FeatureEngineer:
             'event_id',
             'cv_id',
             'job_id',
+            'session_id',  # Query group for learning-to-rank
             
             # Core match features (MOST IMPORTANT)
             'match_score',
@@ -438,14 +552,34 @@ class FeatureEngineer:
         
         df_final = df[available_features].copy()
         
-        print(f"✅ Selected {len(available_features)} features for training")
-        print(f"   → {available_features.count('applied')} target variable (applied)")
-        print(f"   → {len([c for c in available_features if 'score' in c])} score features")
-        print(f"   → {len([c for c in available_features if 'user_' in c])} user features")
-        print(f"   → {len([c for c in available_features if 'job_' in c])} job features")
+        log(f"✅ Selected {len(available_features)} features for training")
+        log(f"   → {available_features.count('applied')} target variable (applied)")
+        log(f"   → {len([c for c in available_features if 'score' in c])} score features")
+        log(f"   → {len([c for c in available_features if 'user_' in c])} user features")
+        log(f"   → {len([c for c in available_features if 'job_' in c])} job features")
         
         return df_final
     
+    def enforce_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cast the final feature frame to FEATURE_DTYPES.
+        Guarantees an identical schema across chunks regardless of which
+        values (or NaNs) a given chunk happens to contain.
+        """
+        df = df.copy()
+        for col, dtype in FEATURE_DTYPES.items():
+            if col not in df.columns:
+                continue
+            if dtype.startswith('int'):
+                values = pd.to_numeric(df[col], errors='coerce')
+                values = values.replace([np.inf, -np.inf], np.nan).fillna(0)
+                df[col] = values.astype(dtype)
+            elif dtype.startswith('float'):
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype(dtype)
+            else:
+                df[col] = df[col].astype(dtype)
+        return df
+    
     def generate_training_data(self, output_path: str):
         """
         Main pipeline: Extract, engineer, and save training data.
@@ -505,16 +639,155 @@ class FeatureEngineer:
         finally:
             self.disconnect()
 
+    def _load_checkpoint(self, output_dir: str) -> Dict:
+        """Load the chunk checkpoint for output_dir (empty dict if none)."""
+        path = os.path.join(output_dir, CHECKPOINT_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+    
+    def _save_checkpoint(self, output_dir: str, checkpoint: Dict):
+        """Atomically write the chunk checkpoint."""
+        path = os.path.join(output_dir, CHECKPOINT_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(tmp_path, path)
+    
+    def generate_training_data_chunked(
+        self,
+        output_dir: str,
+        chunk_size: int = CHUNK_SIZE,
+        resume: bool = True
+    ):
+        """
+        Chunked pipeline: stream, engineer and append each chunk as a Parquet part.
+        
+        Output is a Parquet dataset directory (part-00000.parquet, ...) readable
+        with pd.read_parquet(output_dir). After every part is written, a
+        checkpoint records the chunk index and the last (timestamp, event_id)
+        key, so a re-run with resume=True continues from the last completed chunk.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Chunked feature extraction requires pyarrow. "
+                "Install with: pip install pyarrow"
+            )
+        
+        print("\n" + "="*60)
+        print("🚀 CAMSS 2.0 - CHUNKED FEATURE ENGINEERING PIPELINE")
+        print("="*60)
+        
+        os.makedirs(output_dir, exist_ok=True)
+        checkpoint = self._load_checkpoint(output_dir) if resume else {}
+        
+        if checkpoint.get('completed'):
+            print(f"✅ Output already complete ({checkpoint['rows_written']} rows). Nothing to do.")
+            return
+        
+        next_chunk = checkpoint.get('chunks_written', 0)
+        rows_written = checkpoint.get('rows_written', 0)
+        resume_key = checkpoint.get('last_key')
+        
+        # Drop parts left behind by an interrupted run (written after the last
+        # checkpoint) and half-written part-*.parquet.tmp files
+        for name in os.listdir(output_dir):
+            if not name.startswith('part-'):
+                continue
+            if name.endswith('.parquet.tmp') or (name.endswith('.parquet') and int(name[5:10]) >= next_chunk):
+                os.remove(os.path.join(output_dir, name))
+        
+        if resume_key:
+            print(f"↩️  Resuming after chunk {next_chunk - 1} ({rows_written} rows already written)")
+        
+        schema = None
+        try:
+            self.connect()
+            
+            for chunk in self.stream_interactions_data(chunk_size, resume_key):
+                features = self.engineer_features(chunk, verbose=False)
+                final = self.enforce_dtypes(self.select_final_features(features, verbose=False))
+                
+                table = pa.Table.from_pandas(final, preserve_index=False)
+                if schema is None:
+                    schema = table.schema
+                else:
+                    table = table.cast(schema)
+                
+                part_path = os.path.join(output_dir, f"part-{next_chunk:05d}.parquet")
+                pq.write_table(table, part_path + '.tmp')
+                os.replace(part_path + '.tmp', part_path)
+                
+                last = chunk.iloc[-1]
+                last_date = last['interaction_date']
+                resume_key = [
+                    pd.Timestamp(last_date).isoformat() if pd.notna(last_date) else NULL_TIMESTAMP_KEY,
+                    last['event_id']
+                ]
+                next_chunk += 1
+                rows_written += len(final)
+                self._save_checkpoint(output_dir, {
+                    'chunks_written': next_chunk,
+                    'rows_written': rows_written,
+                    'last_key': resume_key,
+                    'chunk_size': chunk_size,
+                    'completed': False,
+                    'updated_at': datetime.now().isoformat()
+                })
+                print(f"  → Chunk {next_chunk - 1}: {len(final)} rows (total {rows_written})")
+                
+                del chunk, features, final, table
+            
+            checkpoint = self._load_checkpoint(output_dir)
+            checkpoint.update({
+                'chunks_written': next_chunk,
+                'rows_written': rows_written,
+                'completed': True,
+                'updated_at': datetime.now().isoformat()
+            })
+            self._save_checkpoint(output_dir, checkpoint)
+            
+            print("\n✅ Chunked feature engineering complete!")
+            print(f"📁 Output saved: {output_dir} ({next_chunk} parts, {rows_written} rows)")
+            print("="*60)
+            
+        except Exception as e:
+            print(f"\n❌ Chunked feature engineering failed: {e}")
+            print("   Re-run to resume from the last completed chunk.")
+            raise
+        finally:
+            self.disconnect()
+
 
 def main():
     """Run feature engineering pipeline."""
+    parser = argparse.ArgumentParser(description="CAMSS 2.0 feature engineering")
+    parser.add_argument('--chunked', action='store_true',
+                        help='Stream through a server-side cursor and write Parquet parts')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help=f'Rows per chunk in chunked mode (default: {CHUNK_SIZE})')
+    parser.add_argument('--no-resume', action='store_true',
+                        help='Ignore an existing checkpoint and start from the first chunk')
+    parser.add_argument('--output', default=None, help='Output path (file or Parquet directory)')
+    args = parser.parse_args()
+    
     engineer = FeatureEngineer(DB_CONFIG)
     
     # Get absolute path for output
     current_dir = os.path.dirname(os.path.abspath(__file__))
-    output_path = os.path.join(current_dir, OUTPUT_FILE)
     
-    engineer.generate_training_data(output_path)
+    if args.chunked:
+        output_dir = args.output or os.path.join(current_dir, CHUNKED_OUTPUT_DIR)
+        engineer.generate_training_data_chunked(
+            output_dir, chunk_size=args.chunk_size, resume=not args.no_resume
+        )
+    else:
+        output_path = args.output or os.path.join(current_dir, OUTPUT_FILE)
+        engineer.generate_training_data(output_path)
 
 
 if __name__ == "__main__":
@@ -4,10 +4,10 @@ Comprehensive evaluation of trained ML model.
 
 This script:
 1. Loads trained model and test data
-2. Generates detailed performance metrics
-3. Compares with rule-based baseline
+2. Scores the test set once per model (ML + rule-based baseline) and caches it
+3. Computes per-group ranking metrics, calibration and bootstrap CIs
 4. Analyzes errors and feature importance
-5. Creates performance report
+5. Creates plots and performance report from the same EvaluationResult
 
 Author: CAMSS Development Team
 Version: 1.0.0
@@ -18,6 +18,7 @@ import numpy as np
 import pickle
 import json
 import os
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Tuple
 import matplotlib.pyplot as plt
@@ -33,6 +34,179 @@ MODEL_FILE = 'ranking_model.pkl'
 TRAINING_DATA_FILE = '../datasets/ml_training_data.csv'
 REPORT_OUTPUT = '../datasets/model_performance_report.md'
 
+RANKING_K_VALUES = [5, 10, 20]
+CALIBRATION_BINS = 10
+BOOTSTRAP_SAMPLES = 1000
+BOOTSTRAP_SEED = 42
+BOOTSTRAP_CHUNK_SIZE = 50  # Replicates per weighted_auc call (bounds the (B, n_test) arrays)
+CONFIDENCE_LEVEL = 0.95
+
+# Metrics that get bootstrap confidence intervals (and ML-vs-baseline deltas)
+BOOTSTRAP_METRICS = ['auc_roc', 'precision_at_10', 'ndcg_at_10']
+
+
+def ranking_metrics_by_group(
+    y_true: np.ndarray,
+    scores: np.ndarray,
+    groups: np.ndarray,
+    k: int
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized per-query-group Precision@K and NDCG@K.
+    
+    Rows are ranked within their group (CV or session) by descending score;
+    each metric is reduced per group with np.bincount, with no Python loop
+    over groups.
+    
+    Precision@K divides by min(K, group size) so short sessions are not
+    penalised for having fewer than K shown jobs. NDCG@K is NaN for groups
+    without any relevant row (nothing to rank).
+    
+    Returns:
+        Dict with 'precision', 'ndcg' and 'n_relevant' arrays (one entry per group)
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    scores = np.asarray(scores, dtype=np.float64)
+    _, codes = np.unique(np.asarray(groups), return_inverse=True)
+    n_groups = codes.max() + 1 if len(codes) else 0
+    
+    sizes = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    
+    def discounted_gain(order: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        sorted_codes = codes[order]
+        rank = np.arange(len(order)) - starts[sorted_codes]
+        in_top_k = rank < k
+        rel = y_true[order] * in_top_k
+        gain = rel / np.log2(rank + 2)
+        return (
+            np.bincount(sorted_codes, weights=gain, minlength=n_groups),
+            np.bincount(sorted_codes, weights=rel, minlength=n_groups)
+        )
+    
+    # Predicted ranking: group ascending, score descending (stable on ties)
+    dcg, hits = discounted_gain(np.lexsort((-scores, codes)))
+    # Ideal ranking: group ascending, relevance descending
+    idcg, _ = discounted_gain(np.lexsort((-y_true, codes)))
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ndcg = np.where(idcg > 0, dcg / idcg, np.nan)
+    precision = hits / np.minimum(k, sizes)
+    
+    return {
+        'precision': precision,
+        'ndcg': ndcg,
+        'n_relevant': np.bincount(codes, weights=y_true, minlength=n_groups)
+    }
+
+
+def mean_ranking_metrics(
+    y_true: np.ndarray,
+    scores: np.ndarray,
+    groups: np.ndarray,
+    k_values: List[int] = RANKING_K_VALUES
+) -> Dict[str, float]:
+    """
+    Mean per-group Precision@K / NDCG@K for each K.
+    NDCG is averaged over groups that contain at least one relevant row.
+    """
+    results = {}
+    for k in k_values:
+        per_group = ranking_metrics_by_group(y_true, scores, groups, k)
+        results[f'group_precision_at_{k}'] = float(np.mean(per_group['precision']))
+        ndcg = per_group['ndcg'][~np.isnan(per_group['ndcg'])]
+        results[f'group_ndcg_at_{k}'] = float(ndcg.mean()) if len(ndcg) else 0.0
+    return results
+
+
+def weighted_auc(y_true: np.ndarray, scores: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Vectorized ROC AUC for many row-weightings at once (Mann-Whitney form).
+    
+    Args:
+        y_true: (n,) binary labels
+        scores: (n,) predicted scores
+        weights: (B, n) non-negative row weights, one row per replicate
+    
+    Returns:
+        (B,) AUC per replicate; ties between a positive and negative count 0.5
+    """
+    order = np.argsort(scores, kind='stable')
+    s = scores[order]
+    pos = y_true[order].astype(bool)
+    w = weights[:, order]
+    
+    # First/last index of each tie block of equal scores
+    new_block = np.concatenate(([True], s[1:] != s[:-1]))
+    block_id = np.cumsum(new_block) - 1
+    block_first = np.flatnonzero(new_block)
+    block_last = np.concatenate((block_first[1:], [len(s)])) - 1
+    
+    neg_cum = np.cumsum(w * ~pos, axis=1)
+    neg_before = neg_cum[:, block_first[block_id]] - (w * ~pos)[:, block_first[block_id]]
+    neg_tied = neg_cum[:, block_last[block_id]] - neg_before
+    
+    pos_w = w * pos
+    numerator = (pos_w * (neg_before + 0.5 * neg_tied)).sum(axis=1)
+    denominator = pos_w.sum(axis=1) * (w * ~pos).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def calibration_table(y_true: np.ndarray, scores: np.ndarray, n_bins: int = CALIBRATION_BINS) -> Dict:
+    """
+    Reliability table over equal-width probability bins, reduced with bincount.
+    
+    Returns:
+        Dict with per-bin 'count', 'mean_predicted', 'fraction_positive' lists,
+        plus expected calibration error ('ece') and Brier score.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    scores = np.clip(np.asarray(scores, dtype=np.float64), 0.0, 1.0)
+    bins = np.minimum((scores * n_bins).astype(int), n_bins - 1)
+    
+    count = np.bincount(bins, minlength=n_bins)
+    pred_sum = np.bincount(bins, weights=scores, minlength=n_bins)
+    pos_sum = np.bincount(bins, weights=y_true, minlength=n_bins)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_predicted = np.where(count > 0, pred_sum / count, np.nan)
+        fraction_positive = np.where(count > 0, pos_sum / count, np.nan)
+    
+    gap = np.abs(np.nan_to_num(mean_predicted - fraction_positive))
+    return {
+        'bin_edges': np.linspace(0.0, 1.0, n_bins + 1).tolist(),
+        'count': count.tolist(),
+        'mean_predicted': mean_predicted.tolist(),
+        'fraction_positive': fraction_positive.tolist(),
+        'ece': float((gap * count).sum() / max(count.sum(), 1)),
+        'brier': float(np.mean((scores - y_true) ** 2)) if len(y_true) else 0.0
+    }
+
+
+@dataclass
+class EvaluationResult:
+    """
+    Everything computed for one evaluation run.
+    Scores are computed once per model; metrics, curves, calibration and
+    bootstrap intervals are derived from them, and plots/report only read
+    from this object.
+    """
+    y_true: np.ndarray
+    groups: np.ndarray
+    scores: Dict[str, np.ndarray]
+    metrics: Dict[str, Dict] = field(default_factory=dict)
+    group_metrics: Dict[str, Dict[str, np.ndarray]] = field(default_factory=dict)
+    curves: Dict[str, Dict] = field(default_factory=dict)
+    calibration: Dict[str, Dict] = field(default_factory=dict)
+    confidence_intervals: Dict[str, Dict] = field(default_factory=dict)
+    errors: Dict[str, Dict] = field(default_factory=dict)
+    
+    @property
+    def n_groups(self) -> int:
+        return len(np.unique(self.groups))
+
+
 # Set plotting style
 sns.set_style('whitegrid')
 plt.rcParams['figure.figsize'] = (10, 6)
@@ -41,6 +215,8 @@ plt.rcParams['figure.figsize'] = (10, 6)
 class ModelEvaluator:
     """Comprehensive model evaluation and analysis."""
     
+    MODELS = ('ml_model', 'baseline')
+    
     def __init__(self, model_path: str, data_path: str, model_dir: str):
         """Initialize with model and data paths."""
         self.model_path = model_path
@@ -49,8 +225,12 @@ class ModelEvaluator:
         self.model = None
         self.df = None
         self.feature_columns = None
+        self.objective = 'binary'
+        self.test_groups = None
         self.evaluation_results = {}
-        
+        self.result = None
+        self._score_cache = {}
+    
     def load_artifacts(self):
         """Load model and training data."""
         print("\n📂 Loading model and data...")
@@ -69,120 +249,231 @@ class ModelEvaluator:
         with open(config_path, 'r') as f:
             config = json.load(f)
             self.feature_columns = config['features']
+            self.objective = config.get('objective', 'binary')
         print(f"✅ Features loaded: {len(self.feature_columns)} features")
     
+    def _query_groups(self, df: pd.DataFrame) -> pd.Series:
+        """Query group per row: session_id, falling back to cv_id."""
+        if 'session_id' in df.columns:
+            return df['session_id'].astype('object').fillna('cv:' + df['cv_id'].astype(str)).astype(str)
+        return df['cv_id'].astype(str)
+    
     def prepare_test_data(self) -> Tuple[pd.DataFrame, pd.Series]:
-        """Prepare test data (last 15% of dataset)."""
+        """
+        Prepare test data (last 15% of dataset).
+        The cut is widened so that no query group is split across it.
+        """
         # Use last 15% as test set (same as training script)
         test_size = int(len(self.df) * 0.15)
-        df_test = self.df.tail(test_size).copy()
+        groups = self._query_groups(self.df)
+        tail_groups = set(groups.iloc[len(self.df) - test_size:])
+        df_test = self.df[groups.isin(tail_groups).values]
         
         X_test = df_test[self.feature_columns].fillna(0)
         y_test = df_test['applied']
+        self.test_groups = groups.loc[df_test.index].to_numpy()
+        self._score_cache = {}
         
-        print(f"\n🧪 Test set: {len(X_test)} samples ({y_test.mean()*100:.1f}% applied)")
+        print(f"\n🧪 Test set: {len(X_test)} samples in {len(tail_groups)} groups "
+              f"({y_test.mean()*100:.1f}% applied)")
         
         return X_test, y_test
     
-    def evaluate_ml_model(self, X_test: pd.DataFrame, y_test: pd.Series) -> Dict:
+    # ========================================================================
+    # SCORING (computed once, cached)
+    # ========================================================================
+    
+    def predict_scores(self, X: pd.DataFrame) -> np.ndarray:
+        """Model scores in (0, 1); ranker outputs go through a sigmoid as in serving."""
+        scores = self.model.predict(X, num_iteration=self.model.best_iteration)
+        if self.objective == 'lambdarank':
+            scores = 1.0 / (1.0 + np.exp(-scores))
+        return scores
+    
+    def get_scores(self, X_test: pd.DataFrame) -> Dict[str, np.ndarray]:
         """
-        Comprehensive ML model evaluation.
+        Scores for every evaluated model on the test set.
+        The model is run once; later calls return the cached arrays.
         """
-        print("\n📊 Evaluating ML Model...")
-        print("="*60)
-        
-        # Get predictions
-        y_pred_proba = self.model.predict(X_test, num_iteration=self.model.best_iteration)
-        y_pred = (y_pred_proba >= 0.5).astype(int)
-        
-        # Basic metrics
-        results = {
-            'auc_roc': roc_auc_score(y_test, y_pred_proba),
-            'avg_precision': average_precision_score(y_test, y_pred_proba)
+        if not self._score_cache:
+            self._score_cache = {
+                'ml_model': np.asarray(self.predict_scores(X_test), dtype=np.float64),
+                'baseline': X_test['match_score'].to_numpy(dtype=np.float64)
+            }
+        return self._score_cache
+    
+    # ========================================================================
+    # METRICS
+    # ========================================================================
+    
+    def _compute_metrics(self, result: EvaluationResult, name: str) -> Dict:
+        """Global and per-group metrics for one model's cached scores."""
+        y_true = result.y_true
+        scores = result.scores[name]
+        y_pred = (scores >= 0.5).astype(int)
+        
+        metrics = {
+            'auc_roc': roc_auc_score(y_true, scores),
+            'avg_precision': average_precision_score(y_true, scores)
         }
         
-        # Precision@K metrics
+        # Per-group Precision@K / NDCG@K
+        result.group_metrics[name] = {}
         for k in [5, 10, 20, 50]:
-            results[f'precision_at_{k}'] = self.precision_at_k(y_test, y_pred_proba, k)
-        
-        # NDCG (Normalized Discounted Cumulative Gain)
-        results['ndcg_at_10'] = self.ndcg_at_k(y_test, y_pred_proba, k=10)
-        results['ndcg_at_20'] = self.ndcg_at_k(y_test, y_pred_proba, k=20)
-        
-        # Confusion matrix
-        cm = confusion_matrix(y_test, y_pred)
-        results['confusion_matrix'] = cm.tolist()
-        
-        # Classification report
-        results['classification_report'] = classification_report(
-            y_test, y_pred, output_dict=True
+            per_group = ranking_metrics_by_group(y_true, scores, result.groups, k)
+            result.group_metrics[name][k] = per_group
+            ndcg = per_group['ndcg'][~np.isnan(per_group['ndcg'])]
+            metrics[f'precision_at_{k}'] = float(per_group['precision'].mean())
+            metrics[f'ndcg_at_{k}'] = float(ndcg.mean()) if len(ndcg) else 0.0
+        
+        cm = confusion_matrix(y_true, y_pred, labels=[0, 1])
+        metrics['confusion_matrix'] = cm.tolist()
+        metrics['classification_report'] = classification_report(
+            y_true, y_pred, output_dict=True, zero_division=0
         )
         
-        # Print results
-        print(f"\n🎯 ML Model Performance:")
-        print(f"  AUC-ROC:          {results['auc_roc']:.4f}")
-        print(f"  Avg Precision:    {results['avg_precision']:.4f}")
-        print(f"  Precision@5:      {results['precision_at_5']:.4f}")
-        print(f"  Precision@10:     {results['precision_at_10']:.4f}")
-        print(f"  Precision@20:     {results['precision_at_20']:.4f}")
-        print(f"  NDCG@10:          {results['ndcg_at_10']:.4f}")
-        print(f"  NDCG@20:          {results['ndcg_at_20']:.4f}")
-        
-        print(f"\n📈 Confusion Matrix:")
-        print(f"  True Negatives:  {cm[0, 0]}")
-        print(f"  False Positives: {cm[0, 1]}")
-        print(f"  False Negatives: {cm[1, 0]}")
-        print(f"  True Positives:  {cm[1, 1]}")
-        
-        self.evaluation_results['ml_model'] = results
-        return results
-    
-    def evaluate_baseline(self, X_test: pd.DataFrame, y_test: pd.Series) -> Dict:
+        # Curves and calibration are stored once for plots/report
+        fpr, tpr, _ = roc_curve(y_true, scores)
+        precision, recall, _ = precision_recall_curve(y_true, scores)
+        result.curves[name] = {'fpr': fpr, 'tpr': tpr, 'precision': precision, 'recall': recall}
+        result.calibration[name] = calibration_table(y_true, scores)
+        metrics['ece'] = result.calibration[name]['ece']
+        metrics['brier'] = result.calibration[name]['brier']
+        
+        return metrics
+    
+    def _bootstrap(self, result: EvaluationResult):
         """
-        Evaluate rule-based baseline (using match_score).
+        Group bootstrap (resampling sessions/CVs) for BOOTSTRAP_METRICS.
+        Replicate b weights every row by how often its group was drawn, and
+        ML/baseline share the same draws so the deltas are paired. AUCs are
+        computed BOOTSTRAP_CHUNK_SIZE replicates at a time, so the per-row
+        weight arrays stay (chunk, n_test) instead of (B, n_test).
         """
-        print("\n📊 Evaluating Rule-Based Baseline...")
-        print("="*60)
-        
-        # Use match_score as baseline predictions
-        y_baseline_proba = X_test['match_score'].values
-        y_baseline = (y_baseline_proba >= 0.5).astype(int)
-        
-        # Basic metrics
-        results = {
-            'auc_roc': roc_auc_score(y_test, y_baseline_proba),
-            'avg_precision': average_precision_score(y_test, y_baseline_proba)
+        _, codes = np.unique(result.groups, return_inverse=True)
+        n_groups = codes.max() + 1
+        rng = np.random.default_rng(BOOTSTRAP_SEED)
+        group_counts = rng.multinomial(
+            n_groups, np.full(n_groups, 1.0 / n_groups), size=BOOTSTRAP_SAMPLES
+        ).astype(np.float64)
+        
+        def chunked_auc(scores: np.ndarray) -> np.ndarray:
+            return np.concatenate([
+                weighted_auc(result.y_true, scores, group_counts[start:start + BOOTSTRAP_CHUNK_SIZE, codes])
+                for start in range(0, BOOTSTRAP_SAMPLES, BOOTSTRAP_CHUNK_SIZE)
+            ])
+        
+        alpha = (1.0 - CONFIDENCE_LEVEL) / 2
+        replicates = {}
+        
+        for name in self.MODELS:
+            per_group_10 = result.group_metrics[name][10]
+            has_relevant = ~np.isnan(per_group_10['ndcg'])
+            ndcg_counts = group_counts[:, has_relevant]
+            
+            with np.errstate(invalid='ignore', divide='ignore'):
+                replicates[name] = {
+                    'auc_roc': chunked_auc(result.scores[name]),
+                    'precision_at_10': group_counts @ per_group_10['precision'] / group_counts.sum(axis=1),
+                    'ndcg_at_10': ndcg_counts @ per_group_10['ndcg'][has_relevant] / ndcg_counts.sum(axis=1)
+                }
+        
+        def interval(values: np.ndarray) -> Dict:
+            values = values[~np.isnan(values)]
+            if not len(values):
+                return {'lower': None, 'upper': None}
+            lower, upper = np.quantile(values, [alpha, 1.0 - alpha])
+            return {'lower': float(lower), 'upper': float(upper)}
+        
+        for name in self.MODELS:
+            result.confidence_intervals[name] = {
+                metric: interval(replicates[name][metric]) for metric in BOOTSTRAP_METRICS
+            }
+        result.confidence_intervals['delta'] = {
+            metric: interval(replicates['ml_model'][metric] - replicates['baseline'][metric])
+            for metric in BOOTSTRAP_METRICS
         }
+    
+    def _error_profile(self, result: EvaluationResult, X_test: pd.DataFrame):
+        """False positive / false negative counts and feature means."""
+        y_true = result.y_true.astype(bool)
+        y_pred = result.scores['ml_model'] >= 0.5
+        columns = ['match_score', 'skills_score', 'salary_score']
+        values = X_test[columns].to_numpy(dtype=np.float64)
+        
+        for label, mask in [('false_positives', y_pred & ~y_true), ('false_negatives', ~y_pred & y_true)]:
+            count = int(mask.sum())
+            result.errors[label] = {
+                'count': count,
+                'rate': float(mask.mean()) if len(mask) else 0.0,
+                'feature_means': dict(zip(columns, values[mask].mean(axis=0).tolist())) if count else {}
+            }
+    
+    def evaluate(self, X_test: pd.DataFrame, y_test: pd.Series) -> EvaluationResult:
+        """
+        Build the EvaluationResult: score once, then derive every metric,
+        curve, calibration table, bootstrap interval and error profile.
+        """
+        print("\n📊 Computing evaluation results...")
+        print("="*60)
         
-        # Precision@K metrics
-        for k in [5, 10, 20, 50]:
-            results[f'precision_at_{k}'] = self.precision_at_k(y_test, y_baseline_proba, k)
+        result = EvaluationResult(
+            y_true=y_test.to_numpy(dtype=np.float64),
+            groups=self.test_groups,
+            scores=self.get_scores(X_test)
+        )
         
-        # NDCG
-        results['ndcg_at_10'] = self.ndcg_at_k(y_test, y_baseline_proba, k=10)
-        results['ndcg_at_20'] = self.ndcg_at_k(y_test, y_baseline_proba, k=20)
+        for name in self.MODELS:
+            result.metrics[name] = self._compute_metrics(result, name)
         
-        print(f"\n🎯 Baseline Performance:")
-        print(f"  AUC-ROC:          {results['auc_roc']:.4f}")
-        print(f"  Avg Precision:    {results['avg_precision']:.4f}")
-        print(f"  Precision@5:      {results['precision_at_5']:.4f}")
-        print(f"  Precision@10:     {results['precision_at_10']:.4f}")
-        print(f"  Precision@20:     {results['precision_at_20']:.4f}")
-        print(f"  NDCG@10:          {results['ndcg_at_10']:.4f}")
-        print(f"  NDCG@20:          {results['ndcg_at_20']:.4f}")
+        self._bootstrap(result)
+        self._error_profile(result, X_test)
         
-        self.evaluation_results['baseline'] = results
-        return results
+        self.result = result
+        self.evaluation_results = result.metrics
+        print(f"✅ Scored {len(result.y_true)} samples in {result.n_groups} groups "
+              f"({BOOTSTRAP_SAMPLES} bootstrap replicates)")
+        return result
+    
+    def print_metrics(self, result: EvaluationResult, name: str):
+        """Print one model's metrics from the result."""
+        metrics = result.metrics[name]
+        ci = result.confidence_intervals[name]
+        title = "ML Model Performance" if name == 'ml_model' else "Baseline Performance"
+        
+        def with_ci(metric: str) -> str:
+            bounds = ci.get(metric)
+            if bounds and bounds['lower'] is not None:
+                return f"{metrics[metric]:.4f}  [{bounds['lower']:.4f}, {bounds['upper']:.4f}]"
+            return f"{metrics[metric]:.4f}"
+        
+        print(f"\n🎯 {title}:")
+        print(f"  AUC-ROC:          {with_ci('auc_roc')}")
+        print(f"  Avg Precision:    {metrics['avg_precision']:.4f}")
+        print(f"  Precision@5:      {metrics['precision_at_5']:.4f}")
+        print(f"  Precision@10:     {with_ci('precision_at_10')}")
+        print(f"  Precision@20:     {metrics['precision_at_20']:.4f}")
+        print(f"  NDCG@10:          {with_ci('ndcg_at_10')}")
+        print(f"  NDCG@20:          {metrics['ndcg_at_20']:.4f}")
+        print(f"  ECE / Brier:      {metrics['ece']:.4f} / {metrics['brier']:.4f}")
+        
+        if name == 'ml_model':
+            cm = np.array(metrics['confusion_matrix'])
+            print(f"\n📈 Confusion Matrix:")
+            print(f"  True Negatives:  {cm[0, 0]}")
+            print(f"  False Positives: {cm[0, 1]}")
+            print(f"  False Negatives: {cm[1, 0]}")
+            print(f"  True Positives:  {cm[1, 1]}")
     
-    def compare_models(self):
+    def compare_models(self, result: EvaluationResult):
         """
         Compare ML model with baseline.
         """
         print("\n⚖️ Model Comparison:")
         print("="*60)
         
-        ml_results = self.evaluation_results['ml_model']
-        baseline_results = self.evaluation_results['baseline']
+        ml_results = result.metrics['ml_model']
+        baseline_results = result.metrics['baseline']
         
         metrics = ['auc_roc', 'precision_at_10', 'precision_at_20', 'ndcg_at_10']
         
@@ -198,88 +489,55 @@ class ModelEvaluator:
             status = "✅" if improvement > 0 else "❌"
             
             print(f"{metric:<20} {baseline_val:<12.4f} {ml_val:<12.4f} {improvement_str:<10} {status}")
-    
-    def precision_at_k(self, y_true: pd.Series, y_pred_proba: np.ndarray, k: int) -> float:
-        """Calculate Precision@K."""
-        top_k_indices = np.argsort(y_pred_proba)[-k:]
-        top_k_true = y_true.iloc[top_k_indices] if hasattr(y_true, 'iloc') else y_true[top_k_indices]
-        return top_k_true.sum() / k
-    
-    def ndcg_at_k(self, y_true: pd.Series, y_pred_proba: np.ndarray, k: int) -> float:
-        """
-        Calculate Normalized Discounted Cumulative Gain at K.
-        Measures ranking quality.
-        """
-        # Get top K predictions
-        top_k_indices = np.argsort(y_pred_proba)[-k:][::-1]
-        top_k_true = y_true.iloc[top_k_indices] if hasattr(y_true, 'iloc') else y_true[top_k_indices]
-        
-        # DCG (Discounted Cumulative Gain)
-        dcg = np.sum(top_k_true / np.log2(np.arange(2, k + 2)))
         
-        # IDCG (Ideal DCG) - if all top K were relevant
-        ideal_relevance = np.sort(y_true)[-k:][::-1]
-        idcg = np.sum(ideal_relevance / np.log2(np.arange(2, k + 2)))
-        
-        return dcg / idcg if idcg > 0 else 0.0
+        print(f"\n{CONFIDENCE_LEVEL*100:.0f}% CI of ML - baseline (paired group bootstrap):")
+        for metric, bounds in result.confidence_intervals['delta'].items():
+            if bounds['lower'] is not None:
+                print(f"  {metric:<18} [{bounds['lower']:+.4f}, {bounds['upper']:+.4f}]")
     
-    def analyze_errors(self, X_test: pd.DataFrame, y_test: pd.Series):
+    def analyze_errors(self, result: EvaluationResult):
         """
         Analyze false positives and false negatives.
         """
         print("\n🔍 Error Analysis...")
         print("="*60)
         
-        # Get predictions
-        y_pred_proba = self.model.predict(X_test, num_iteration=self.model.best_iteration)
-        y_pred = (y_pred_proba >= 0.5).astype(int)
-        
-        # Identify errors
-        false_positives = (y_pred == 1) & (y_test == 0)
-        false_negatives = (y_pred == 0) & (y_test == 1)
-        
-        print(f"\n❌ False Positives: {false_positives.sum()} "
-              f"({false_positives.mean()*100:.1f}% of predictions)")
-        print(f"❌ False Negatives: {false_negatives.sum()} "
-              f"({false_negatives.mean()*100:.1f}% of predictions)")
-        
-        # Analyze false positives
-        if false_positives.sum() > 0:
-            fp_data = X_test[false_positives]
-            print(f"\n🔍 False Positive Characteristics:")
-            print(f"  Avg match_score:     {fp_data['match_score'].mean():.3f}")
-            print(f"  Avg skills_score:    {fp_data['skills_score'].mean():.3f}")
-            print(f"  Avg salary_score:    {fp_data['salary_score'].mean():.3f}")
-        
-        # Analyze false negatives
-        if false_negatives.sum() > 0:
-            fn_data = X_test[false_negatives]
-            print(f"\n🔍 False Negative Characteristics:")
-            print(f"  Avg match_score:     {fn_data['match_score'].mean():.3f}")
-            print(f"  Avg skills_score:    {fn_data['skills_score'].mean():.3f}")
-            print(f"  Avg salary_score:    {fn_data['salary_score'].mean():.3f}")
-    
-    def plot_roc_curves(self, X_test: pd.DataFrame, y_test: pd.Series):
+        fp = result.errors['false_positives']
+        fn = result.errors['false_negatives']
+        
+        print(f"\n❌ False Positives: {fp['count']} "
+              f"({fp['rate']*100:.1f}% of predictions)")
+        print(f"❌ False Negatives: {fn['count']} "
+              f"({fn['rate']*100:.1f}% of predictions)")
+        
+        for title, data in [("False Positive", fp), ("False Negative", fn)]:
+            if data['count'] > 0:
+                means = data['feature_means']
+                print(f"\n🔍 {title} Characteristics:")
+                print(f"  Avg match_score:     {means['match_score']:.3f}")
+                print(f"  Avg skills_score:    {means['skills_score']:.3f}")
+                print(f"  Avg salary_score:    {means['salary_score']:.3f}")
+    
+    # ========================================================================
+    # PLOTS (read from EvaluationResult)
+    # ========================================================================
+    
+    def plot_roc_curves(self, result: EvaluationResult):
         """
         Plot ROC curves for ML model and baseline.
         """
         print("\n📈 Creating ROC curve plot...")
         
-        # ML model predictions
-        y_ml_proba = self.model.predict(X_test, num_iteration=self.model.best_iteration)
-        fpr_ml, tpr_ml, _ = roc_curve(y_test, y_ml_proba)
-        auc_ml = roc_auc_score(y_test, y_ml_proba)
-        
-        # Baseline predictions
-        y_baseline_proba = X_test['match_score'].values
-        fpr_baseline, tpr_baseline, _ = roc_curve(y_test, y_baseline_proba)
-        auc_baseline = roc_auc_score(y_test, y_baseline_proba)
+        ml_curve = result.curves['ml_model']
+        baseline_curve = result.curves['baseline']
+        auc_ml = result.metrics['ml_model']['auc_roc']
+        auc_baseline = result.metrics['baseline']['auc_roc']
         
         # Plot
         plt.figure(figsize=(10, 8))
-        plt.plot(fpr_ml, tpr_ml, 'b-', linewidth=2, 
+        plt.plot(ml_curve['fpr'], ml_curve['tpr'], 'b-', linewidth=2,
                 label=f'ML Model (AUC = {auc_ml:.3f})')
-        plt.plot(fpr_baseline, tpr_baseline, 'r--', linewidth=2,
+        plt.plot(baseline_curve['fpr'], baseline_curve['tpr'], 'r--', linewidth=2,
                 label=f'Baseline (AUC = {auc_baseline:.3f})')
         plt.plot([0, 1], [0, 1], 'k--', alpha=0.3, label='Random')
         
@@ -296,27 +554,22 @@ class ModelEvaluator:
         
         print(f"✅ ROC curve saved: {plot_path}")
     
-    def plot_precision_recall_curves(self, X_test: pd.DataFrame, y_test: pd.Series):
+    def plot_precision_recall_curves(self, result: EvaluationResult):
         """
         Plot precision-recall curves.
         """
         print("\n📈 Creating precision-recall curve plot...")
         
-        # ML model predictions
-        y_ml_proba = self.model.predict(X_test, num_iteration=self.model.best_iteration)
-        precision_ml, recall_ml, _ = precision_recall_curve(y_test, y_ml_proba)
-        ap_ml = average_precision_score(y_test, y_ml_proba)
-        
-        # Baseline predictions
-        y_baseline_proba = X_test['match_score'].values
-        precision_baseline, recall_baseline, _ = precision_recall_curve(y_test, y_baseline_proba)
-        ap_baseline = average_precision_score(y_test, y_baseline_proba)
+        ml_curve = result.curves['ml_model']
+        baseline_curve = result.curves['baseline']
+        ap_ml = result.metrics['ml_model']['avg_precision']
+        ap_baseline = result.metrics['baseline']['avg_precision']
         
         # Plot
         plt.figure(figsize=(10, 8))
-        plt.plot(recall_ml, precision_ml, 'b-', linewidth=2,
+        plt.plot(ml_curve['recall'], ml_curve['precision'], 'b-', linewidth=2,
                 label=f'ML Model (AP = {ap_ml:.3f})')
-        plt.plot(recall_baseline, precision_baseline, 'r--', linewidth=2,
+        plt.plot(baseline_curve['recall'], baseline_curve['precision'], 'r--', linewidth=2,
                 label=f'Baseline (AP = {ap_baseline:.3f})')
         
         plt.xlabel('Recall', fontsize=12)
@@ -332,14 +585,60 @@ class ModelEvaluator:
         
         print(f"✅ Precision-recall curve saved: {plot_path}")
     
-    def generate_report(self):
+    def plot_calibration(self, result: EvaluationResult):
+        """
+        Plot reliability diagram (predicted vs observed application rate).
+        """
+        print("\n📈 Creating calibration plot...")
+        
+        plt.figure(figsize=(10, 8))
+        for name, style, label in [('ml_model', 'bo-', 'ML Model'), ('baseline', 'rs--', 'Baseline')]:
+            table = result.calibration[name]
+            plt.plot(table['mean_predicted'], table['fraction_positive'], style, linewidth=2,
+                    label=f"{label} (ECE = {table['ece']:.3f})")
+        plt.plot([0, 1], [0, 1], 'k--', alpha=0.3, label='Perfectly calibrated')
+        
+        plt.xlabel('Mean Predicted Probability', fontsize=12)
+        plt.ylabel('Observed Application Rate', fontsize=12)
+        plt.title('Calibration: ML Model vs Baseline', fontsize=14, fontweight='bold')
+        plt.legend(loc='upper left', fontsize=11)
+        plt.grid(alpha=0.3)
+        plt.tight_layout()
+        
+        plot_path = os.path.join(self.model_dir, 'calibration_curve.png')
+        plt.savefig(plot_path, dpi=300, bbox_inches='tight')
+        plt.close()
+        
+        print(f"✅ Calibration curve saved: {plot_path}")
+
+    def generate_report(self, result: EvaluationResult):
         """
         Generate comprehensive markdown report.
         """
         print("\n📝 Generating performance report...")
         
-        ml_results = self.evaluation_results['ml_model']
-        baseline_results = self.evaluation_results['baseline']
+        ml_results = result.metrics['ml_model']
+        baseline_results = result.metrics['baseline']
+        intervals = result.confidence_intervals
+        
+        def ci(name: str, metric: str) -> str:
+            bounds = intervals[name][metric]
+            if bounds['lower'] is None:
+                return 'n/a'
+            return f"[{bounds['lower']:+.4f}, {bounds['upper']:+.4f}]" if name == 'delta' \
+                else f"[{bounds['lower']:.4f}, {bounds['upper']:.4f}]"
+        
+        calibration_rows = "\n".join(
+            f"| {lo:.1f}-{hi:.1f} | {n} | "
+            f"{'-' if n == 0 else format(mp, '.3f')} | {'-' if n == 0 else format(fp, '.3f')} |"
+            for lo, hi, n, mp, fp in zip(
+                result.calibration['ml_model']['bin_edges'][:-1],
+                result.calibration['ml_model']['bin_edges'][1:],
+                result.calibration['ml_model']['count'],
+                result.calibration['ml_model']['mean_predicted'],
+                result.calibration['ml_model']['fraction_positive']
+            )
+        )
         
         # Calculate improvements
         auc_improvement = ((ml_results['auc_roc'] - baseline_results['auc_roc']) / 
@@ -350,7 +649,7 @@ class ModelEvaluator:
         report = f"""# CAMSS 2.0 - ML Model Performance Report
 
 **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
-**Model Type:** LightGBM Binary Classifier  
+**Model Type:** LightGBM {'LambdaRank Ranker' if self.objective == 'lambdarank' else 'Binary Classifier'}  
 **Task:** Predict job application probability
 
 ---
@@ -370,6 +669,9 @@ The machine learning model has been successfully trained and evaluated on {len(s
 
 ## 🎯 Performance Metrics
 
+Precision@K and NDCG@K are computed per query group (session, or CV when no
+session is recorded) and averaged across {result.n_groups} test groups.
+
 ### ML Model Performance
 
 | Metric | Value |
@@ -406,6 +708,25 @@ The machine learning model has been successfully trained and evaluated on {len(s
 | Precision@10 | {baseline_results['precision_at_10']:.4f} | {ml_results['precision_at_10']:.4f} | {p10_improvement:+.1f}% |
 | NDCG@10 | {baseline_results['ndcg_at_10']:.4f} | {ml_results['ndcg_at_10']:.4f} | {((ml_results['ndcg_at_10']-baseline_results['ndcg_at_10'])/baseline_results['ndcg_at_10']*100):+.1f}% |
 
+### Confidence Intervals ({CONFIDENCE_LEVEL*100:.0f}%, group bootstrap, {BOOTSTRAP_SAMPLES} replicates)
+
+| Metric | Baseline | ML Model | ML - Baseline |
+|--------|----------|----------|---------------|
+| AUC-ROC | {ci('baseline', 'auc_roc')} | {ci('ml_model', 'auc_roc')} | {ci('delta', 'auc_roc')} |
+| Precision@10 | {ci('baseline', 'precision_at_10')} | {ci('ml_model', 'precision_at_10')} | {ci('delta', 'precision_at_10')} |
+| NDCG@10 | {ci('baseline', 'ndcg_at_10')} | {ci('ml_model', 'ndcg_at_10')} | {ci('delta', 'ndcg_at_10')} |
+
+---
+
+## 🎚️ Calibration
+
+ML model ECE: {ml_results['ece']:.4f} (baseline {baseline_results['ece']:.4f}) · 
+Brier score: {ml_results['brier']:.4f} (baseline {baseline_results['brier']:.4f})
+
+| Predicted | Samples | Mean Predicted | Observed Rate |
+|-----------|---------|----------------|---------------|
+{calibration_rows}
+
 ---
 
 ## ✅ Success Criteria
@@ -434,7 +755,8 @@ Top features driving predictions (see `feature_importance.png`):
 
 1. **ROC Curve:** `models/roc_curve_comparison.png`
 2. **Precision-Recall Curve:** `models/precision_recall_curve.png`
-3. **Feature Importance:** `models/feature_importance.png`
+3. **Calibration Curve:** `models/calibration_curve.png`
+4. **Feature Importance:** `models/feature_importance.png`
 
 ---
 
@@ -478,24 +800,24 @@ The model {'meets' if ml_results['auc_roc'] > 0.75 and ml_results['precision_at_
             # Prepare test data
             X_test, y_test = self.prepare_test_data()
             
-            # Evaluate ML model
-            self.evaluate_ml_model(X_test, y_test)
-            
-            # Evaluate baseline
-            self.evaluate_baseline(X_test, y_test)
+            # Score once and derive all results
+            result = self.evaluate(X_test, y_test)
+            self.print_metrics(result, 'ml_model')
+            self.print_metrics(result, 'baseline')
             
             # Compare models
-            self.compare_models()
+            self.compare_models(result)
             
             # Error analysis
-            self.analyze_errors(X_test, y_test)
+            self.analyze_errors(result)
             
             # Create visualizations
-            self.plot_roc_curves(X_test, y_test)
-            self.plot_precision_recall_curves(X_test, y_test)
+            self.plot_roc_curves(result)
+            self.plot_precision_recall_curves(result)
+            self.plot_calibration(result)
             
             # Generate report
-            self.generate_report()
+            self.generate_report(result)
             
             print("\n" + "="*60)
             print("✅ EVALUATION COMPLETE!")
@@ -3,36 +3,49 @@ CAMSS 2.0 - ML Model Training Pipeline
 Trains a LightGBM ranking model to predict job applications.
 
 This script:
-1. Loads ml_training_data.csv
+1. Loads ml_training_data.csv (or the Parquet/Arrow output of feature_engineering)
 2. Splits data (70% train, 15% val, 15% test)
-3. Trains LightGBM binary classifier
+3. Trains LightGBM binary classifier (or a LambdaRank ranker with --mode lambdarank,
+   grouped by session/CV and split by group)
 4. Handles class imbalance
 5. Saves trained model and feature config
+6. Exports a NumPy-only tree predictor for serving (parity-checked on the test split)
 
 """
 
 import pandas as pd
 import numpy as np
 import lightgbm as lgb
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import GroupShuffleSplit, train_test_split
 from sklearn.metrics import (
     roc_auc_score, precision_score, recall_score, 
     f1_score, precision_recall_curve, average_precision_score
 )
+import argparse
 import json
 import pickle
 import os
+import sys
+import time
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Add backend to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.services.tree_predictor import FlatTreePredictor
+from model_evaluation import RANKING_K_VALUES, mean_ranking_metrics
+
 # Configuration
 DATA_FILE = '../datasets/ml_training_data.csv'
 MODEL_OUTPUT_DIR = 'models'
 MODEL_FILE = 'ranking_model.pkl'
 FEATURE_CONFIG_FILE = 'feature_config.json'
 TRAINING_METADATA_FILE = 'training_metadata.json'
+PREDICTOR_FILE = 'ranking_model.npz'
+PREDICTOR_PARITY_TOLERANCE = 1e-6
+COLUMNAR_EXTENSIONS = ('.parquet', '.arrow', '.feather', '.ipc')
 
 # Model hyperparameters
 LGBM_PARAMS = {
@@ -50,6 +63,30 @@ LGBM_PARAMS = {
     'seed': 42
 }
 
+# Learning-to-rank hyperparameters (--mode lambdarank)
+LAMBDARANK_PARAMS = {
+    'objective': 'lambdarank',
+    'metric': 'ndcg',
+    'ndcg_eval_at': [5, 10],
+    'lambdarank_truncation_level': 20,
+    'boosting_type': 'gbdt',
+    'num_leaves': 31,
+    'learning_rate': 0.05,
+    'feature_fraction': 0.8,
+    'bagging_fraction': 0.8,
+    'bagging_freq': 5,
+    'max_depth': 6,
+    'min_child_samples': 20,
+    'verbose': -1,
+    'seed': 42
+}
+
+TRAINING_MODES = ('binary', 'lambdarank')
+
+# Query group column for ranking; rows without a session fall back to cv_id
+GROUP_COLUMN = 'session_id'
+FALLBACK_GROUP_COLUMN = 'cv_id'
+
 # Training configuration
 TRAIN_SIZE = 0.70
 VAL_SIZE = 0.15
@@ -57,24 +94,109 @@ TEST_SIZE = 0.15
 RANDOM_STATE = 42
 
 
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB (None if unavailable)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes on Linux
+        divisor = 1024 ** 2 if sys.platform == 'darwin' else 1024
+        return round(peak / divisor, 1)
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        peak = getattr(info, 'peak_wset', info.rss)  # peak_wset is Windows-only
+        return round(peak / 1024 ** 2, 1)
+    except ImportError:
+        return None
+
+
 class ModelTrainer:
     """Trains and evaluates LightGBM ranking model."""
     
-    def __init__(self, data_path: str):
-        """Initialize with path to training data."""
+    def __init__(self, data_path: str, mode: str = 'binary'):
+        """
+        Initialize with path to training data.
+        
+        Args:
+            data_path: Training data file or Parquet directory
+            mode: 'binary' (application classifier) or 'lambdarank' (per-group ranker)
+        """
+        if mode not in TRAINING_MODES:
+            raise ValueError(f"Unknown training mode '{mode}'. Use one of {TRAINING_MODES}")
         self.data_path = data_path
+        self.mode = mode
         self.df = None
+        self.groups = None
         self.feature_columns = None
         self.model = None
+        self.predictor = None
         self.training_metadata = {}
         
+    def _read_columnar(self, path: str) -> pd.DataFrame:
+        """
+        Read a Parquet file/dataset directory or an Arrow IPC (Feather) file.
+        Arrow buffers are released column by column while converting, so the
+        table and the DataFrame are not both held in memory in full.
+        """
+        try:
+            import pyarrow.feather as feather
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Reading Parquet/Arrow training data requires pyarrow. "
+                "Install with: pip install pyarrow"
+            )
+        
+        if os.path.isdir(path) or path.endswith('.parquet'):
+            table = pq.read_table(path)
+        else:
+            table = feather.read_table(path, memory_map=True)
+        
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+    
+    def downcast_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Downcast numeric columns in place: floats to float32, integers and
+        booleans to the smallest integer type that holds them (int8 for flags).
+        LightGBM bins features as float32 anyway, so no precision is lost.
+        """
+        for col in df.columns:
+            dtype = df[col].dtype
+            if pd.api.types.is_bool_dtype(dtype):
+                df[col] = df[col].astype('int8')
+            elif pd.api.types.is_float_dtype(dtype):
+                if dtype != np.float32:
+                    df[col] = df[col].astype('float32')
+            elif pd.api.types.is_integer_dtype(dtype):
+                df[col] = pd.to_numeric(df[col], downcast='integer')
+        return df
+    
     def load_data(self) -> pd.DataFrame:
-        """Load training data from CSV."""
+        """
+        Load training data.
+        Accepts CSV, Parquet (file or dataset directory) or Arrow IPC/Feather,
+        and downcasts numeric columns to float32/int8.
+        """
         print("\n📂 Loading training data...")
         
         try:
-            self.df = pd.read_csv(self.data_path)
-            print(f"Loaded {len(self.df)} samples with {len(self.df.columns)} columns")
+            if os.path.isdir(self.data_path) or self.data_path.endswith(COLUMNAR_EXTENSIONS):
+                self.df = self._read_columnar(self.data_path)
+            else:
+                self.df = pd.read_csv(self.data_path)
+            self.downcast_dtypes(self.df)
+            
+            memory_mb = self.df.memory_usage(deep=True).sum() / 1024 ** 2
+            self.training_metadata['data'] = {
+                'source': os.path.basename(os.path.normpath(self.data_path)),
+                'n_samples': len(self.df),
+                'n_columns': len(self.df.columns),
+                'memory_mb': round(float(memory_mb), 2)
+            }
+            print(f"Loaded {len(self.df)} samples with {len(self.df.columns)} columns ({memory_mb:.1f} MB)")
             
             # Verify required columns exist
             required_cols = ['applied', 'match_score']
@@ -101,6 +223,7 @@ class ModelTrainer:
             'event_id',  # IDs
             'cv_id',
             'job_id',
+            'session_id',  # Query group, not a feature
             'interaction_type_encoded',  # Data leakage - encodes the target!
         ]
         
@@ -110,13 +233,30 @@ class ModelTrainer:
             if col not in exclude_cols
         ]
         
-        X = self.df[self.feature_columns].copy()
-        y = self.df['applied'].copy()
+        # Column selection already yields a new frame; fill NaNs in place on it
+        X = self.df[self.feature_columns]
+        y = self.df['applied']
         
         # Handle any remaining missing values
-        X = X.fillna(0)
+        if X.isna().values.any():
+            X = X.fillna(0)
+        
+        # Query groups (session, else CV) for ranking training and per-group metrics
+        if GROUP_COLUMN in self.df.columns:
+            groups = self.df[GROUP_COLUMN].astype('object')
+            if FALLBACK_GROUP_COLUMN in self.df.columns:
+                groups = groups.fillna('cv:' + self.df[FALLBACK_GROUP_COLUMN].astype(str))
+            self.groups = groups.astype(str)
+        elif FALLBACK_GROUP_COLUMN in self.df.columns:
+            self.groups = self.df[FALLBACK_GROUP_COLUMN].astype(str)
+        elif self.mode == 'lambdarank':
+            raise ValueError(
+                f"LambdaRank mode needs a '{GROUP_COLUMN}' or '{FALLBACK_GROUP_COLUMN}' column"
+            )
         
         print(f"Prepared {len(self.feature_columns)} features")
+        if self.groups is not None:
+            print(f"   → Query groups: {self.groups.nunique()}")
         print(f"   → Target distribution: {y.sum()} applied ({y.mean()*100:.1f}%)")
         
         # Emphasize match_score as requested
@@ -130,6 +270,9 @@ class ModelTrainer:
         Split data into train/validation/test sets.
         Returns dictionary with splits.
         """
+        if self.mode == 'lambdarank':
+            return self.split_data_by_group(X, y)
+        
         print(f"\n✂️ Splitting data (Train: {TRAIN_SIZE*100:.0f}%, Val: {VAL_SIZE*100:.0f}%, Test: {TEST_SIZE*100:.0f}%)...")
         
         # First split: separate out test set
@@ -164,6 +307,36 @@ class ModelTrainer:
         
         return splits
     
+    def split_data_by_group(self, X: pd.DataFrame, y: pd.Series) -> Dict:
+        """
+        Split by query group so no session/CV appears in more than one split.
+        Rows are then ordered by group, as LightGBM ranking expects contiguous
+        groups, and per-split group sizes are returned alongside the data.
+        """
+        print(f"\n✂️ Splitting by query group (Train: {TRAIN_SIZE*100:.0f}%, "
+              f"Val: {VAL_SIZE*100:.0f}%, Test: {TEST_SIZE*100:.0f}% of groups)...")
+        
+        groups = self.groups.loc[X.index].to_numpy()
+        
+        test_split = GroupShuffleSplit(n_splits=1, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+        temp_idx, test_idx = next(test_split.split(X, y, groups))
+        
+        val_ratio = VAL_SIZE / (TRAIN_SIZE + VAL_SIZE)
+        val_split = GroupShuffleSplit(n_splits=1, test_size=val_ratio, random_state=RANDOM_STATE)
+        train_rel, val_rel = next(val_split.split(temp_idx, groups=groups[temp_idx]))
+        
+        splits = {}
+        for name, idx in [('train', temp_idx[train_rel]), ('val', temp_idx[val_rel]), ('test', test_idx)]:
+            idx = idx[np.argsort(groups[idx], kind='stable')]
+            _, sizes = np.unique(groups[idx], return_counts=True)
+            splits[f'X_{name}'] = X.iloc[idx]
+            splits[f'y_{name}'] = y.iloc[idx]
+            splits[f'group_sizes_{name}'] = sizes
+            print(f"✅ {name.capitalize():<6} set: {len(idx)} samples in {len(sizes)} groups "
+                  f"({y.iloc[idx].mean()*100:.1f}% applied)")
+        
+        return splits
+    
     def calculate_class_weights(self, y_train: pd.Series) -> float:
         """
         Calculate scale_pos_weight for handling class imbalance.
@@ -184,25 +357,33 @@ class ModelTrainer:
         """
         Train LightGBM model with early stopping.
         """
-        print("\n🚀 Training LightGBM model...")
+        print(f"\n🚀 Training LightGBM model ({self.mode})...")
         print("="*60)
         
-        # Calculate class weights
-        scale_pos_weight = self.calculate_class_weights(splits['y_train'])
-        
-        # Update params with class weight
-        params = LGBM_PARAMS.copy()
-        params['scale_pos_weight'] = scale_pos_weight
+        if self.mode == 'lambdarank':
+            # Ranking optimises order within each group; no class reweighting
+            params = LAMBDARANK_PARAMS.copy()
+            best_metric = 'ndcg@10'
+        else:
+            # Calculate class weights
+            scale_pos_weight = self.calculate_class_weights(splits['y_train'])
+            
+            # Update params with class weight
+            params = LGBM_PARAMS.copy()
+            params['scale_pos_weight'] = scale_pos_weight
+            best_metric = 'auc'
         
-        # Create LightGBM datasets
+        # Create LightGBM datasets (group sizes are None in binary mode)
         train_data = lgb.Dataset(
             splits['X_train'], 
             label=splits['y_train'],
+            group=splits.get('group_sizes_train'),
             feature_name=self.feature_columns
         )
         val_data = lgb.Dataset(
             splits['X_val'],
             label=splits['y_val'],
+            group=splits.get('group_sizes_val'),
             reference=train_data,
             feature_name=self.feature_columns
         )
@@ -225,7 +406,7 @@ class ModelTrainer:
         
         print("\n Model training complete!")
         print(f"   → Best iteration: {self.model.best_iteration}")
-        print(f"   → Best score: {self.model.best_score['val']['auc']:.4f}")
+        print(f"   → Best score ({best_metric}): {self.model.best_score['val'][best_metric]:.4f}")
         
         return self.model
     
@@ -242,8 +423,10 @@ class ModelTrainer:
             X = splits[f'X_{split_name}']
             y_true = splits[f'y_{split_name}']
             
-            # Get predictions
+            # Get predictions (ranker scores are mapped to (0, 1) as in serving)
             y_pred_proba = self.model.predict(X, num_iteration=self.model.best_iteration)
+            if self.mode == 'lambdarank':
+                y_pred_proba = 1.0 / (1.0 + np.exp(-y_pred_proba))
             y_pred = (y_pred_proba >= 0.5).astype(int)
             
             # Calculate metrics
@@ -259,6 +442,13 @@ class ModelTrainer:
             metrics['precision_at_10'] = self.precision_at_k(y_true, y_pred_proba, k=10)
             metrics['precision_at_20'] = self.precision_at_k(y_true, y_pred_proba, k=20)
             
+            # Per-query-group ranking metrics
+            if self.groups is not None:
+                metrics.update(mean_ranking_metrics(
+                    y_true.to_numpy(), y_pred_proba, self.groups.loc[X.index].to_numpy(),
+                    RANKING_K_VALUES
+                ))
+            
             results[split_name] = metrics
             
             # Print results
@@ -270,6 +460,9 @@ class ModelTrainer:
             print(f"  Avg Precision:    {metrics['avg_precision']:.4f}")
             print(f"  Precision@10:     {metrics['precision_at_10']:.4f}")
             print(f"  Precision@20:     {metrics['precision_at_20']:.4f}")
+            if 'group_ndcg_at_10' in metrics:
+                print(f"  Group P@10:       {metrics['group_precision_at_10']:.4f}")
+                print(f"  Group NDCG@10:    {metrics['group_ndcg_at_10']:.4f}")
         
         # Store in metadata
         self.training_metadata['evaluation'] = results
@@ -342,6 +535,41 @@ class ModelTrainer:
         
         print(f"Plot saved: {plot_path}")
     
+    def export_predictor(self, splits: Dict) -> FlatTreePredictor:
+        """
+        Export the booster as a flat-array predictor and verify it reproduces
+        booster predictions on the test split.
+        """
+        print("\n📦 Exporting flat tree predictor...")
+        
+        predictor = FlatTreePredictor.from_model_dump(
+            self.model.dump_model(num_iteration=self.model.best_iteration)
+        )
+        
+        X_test = splits['X_test'].to_numpy(dtype=np.float64)
+        booster_pred = self.model.predict(X_test, num_iteration=self.model.best_iteration)
+        predictor_pred = predictor.predict(X_test)
+        max_abs_diff = float(np.max(np.abs(booster_pred - predictor_pred))) if len(X_test) else 0.0
+        
+        self.training_metadata['predictor_parity'] = {
+            'n_samples': len(X_test),
+            'max_abs_diff': max_abs_diff,
+            'tolerance': PREDICTOR_PARITY_TOLERANCE,
+            'n_trees': predictor.n_trees
+        }
+        
+        if max_abs_diff > PREDICTOR_PARITY_TOLERANCE:
+            raise ValueError(
+                f"Flat predictor diverges from booster on test split "
+                f"(max abs diff {max_abs_diff:.2e} > {PREDICTOR_PARITY_TOLERANCE:.0e})"
+            )
+        
+        print(f"✅ {predictor.n_trees} trees exported, parity on {len(X_test)} test samples "
+              f"(max abs diff {max_abs_diff:.2e})")
+        
+        self.predictor = predictor
+        return predictor
+    
     def save_model(self):
         """
         Save trained model, feature config, and metadata.
@@ -362,6 +590,7 @@ class ModelTrainer:
             'features': self.feature_columns,
             'n_features': len(self.feature_columns),
             'model_type': 'LightGBM',
+            'objective': self.mode,
             'created_at': datetime.now().isoformat()
         }
         
@@ -370,12 +599,22 @@ class ModelTrainer:
             json.dump(feature_config, f, indent=2)
         print(f"✅ Feature config saved: {config_path}")
         
+        # Flat predictor used by the serving path (NumPy only)
+        if self.predictor is not None:
+            predictor_path = os.path.join(MODEL_OUTPUT_DIR, PREDICTOR_FILE)
+            self.predictor.save(predictor_path)
+            print(f"✅ Flat predictor saved: {predictor_path}")
+        
         # 3. Save training metadata
-        self.training_metadata['model_params'] = LGBM_PARAMS
+        self.training_metadata['mode'] = self.mode
+        self.training_metadata['model_params'] = (
+            LAMBDARANK_PARAMS if self.mode == 'lambdarank' else LGBM_PARAMS
+        )
         self.training_metadata['data_split'] = {
             'train_size': TRAIN_SIZE,
             'val_size': VAL_SIZE,
-            'test_size': TEST_SIZE
+            'test_size': TEST_SIZE,
+            'split_by': 'group' if self.mode == 'lambdarank' else 'row'
         }
         self.training_metadata['trained_at'] = datetime.now().isoformat()
         self.training_metadata['best_iteration'] = self.model.best_iteration
@@ -393,26 +632,46 @@ class ModelTrainer:
         print("🚀 CAMSS 2.0 - ML MODEL TRAINING PIPELINE")
         print("="*60)
         
+        timings = {}
+        pipeline_start = time.perf_counter()
+        
+        def timed(stage: str, func, *args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            timings[stage] = round(time.perf_counter() - start, 3)
+            return result
+        
         try:
             # Load data
-            self.load_data()
+            timed('load_data', self.load_data)
             
             # Prepare features
-            X, y = self.prepare_features()
+            X, y = timed('prepare_features', self.prepare_features)
             
             # Split data
-            splits = self.split_data(X, y)
+            splits = timed('split_data', self.split_data, X, y)
+            del X, y
             
             # Train model
-            self.train_model(splits)
+            timed('train_model', self.train_model, splits)
             
             # Evaluate model
-            results = self.evaluate_model(splits)
+            results = timed('evaluate_model', self.evaluate_model, splits)
+            
+            # Serving predictor
+            timed('export_predictor', self.export_predictor, splits)
             
             # Feature importance
             importance_df = self.get_feature_importance(top_n=20)
             self.plot_feature_importance(importance_df, top_n=20)
             
+            # Resource usage (recorded before saving so it lands in training_metadata.json)
+            timings['total'] = round(time.perf_counter() - pipeline_start, 3)
+            self.training_metadata['resources'] = {
+                'wall_time_seconds': timings,
+                'peak_memory_mb': peak_memory_mb()
+            }
+            
             # Save everything
             self.save_model()
             
@@ -424,6 +683,8 @@ class ModelTrainer:
             print(f"   → Test AUC-ROC: {results['test']['auc_roc']:.4f}")
             print(f"   → Test Precision@10: {results['test']['precision_at_10']:.4f}")
             print(f"   → Best iteration: {self.model.best_iteration}")
+            print(f"   → Wall time: {timings['total']:.1f}s "
+                  f"(peak memory: {self.training_metadata['resources']['peak_memory_mb']} MB)")
             
             # Check if we beat targets
             print(f"\n🎯 Target Achievement:")
@@ -446,11 +707,18 @@ class ModelTrainer:
 
 def main():
     """Run model training pipeline."""
+    parser = argparse.ArgumentParser(description="CAMSS 2.0 model training")
+    parser.add_argument('--data', default=None,
+                        help='Training data: CSV, Parquet file/directory or Arrow IPC file')
+    parser.add_argument('--mode', choices=TRAINING_MODES, default='binary',
+                        help='binary classifier or lambdarank ranker grouped by session/CV')
+    args = parser.parse_args()
+    
     # Get absolute path for data
     current_dir = os.path.dirname(os.path.abspath(__file__))
-    data_path = os.path.join(current_dir, DATA_FILE)
+    data_path = args.data or os.path.join(current_dir, DATA_FILE)
     
-    trainer = ModelTrainer(data_path)
+    trainer = ModelTrainer(data_path, mode=args.mode)
     trainer.train_pipeline()
 
 
@@ -0,0 +1,84 @@
+"""
+Benchmark job search: ILIKE substring matching vs ranked full-text search
+
+Runs the same queries through JobService.search_all_jobs in both modes
+against the configured database and prints median latency and match
+counts. Pass --explain to also print the plan of each full-text query.
+
+    python scripts/benchmark_job_search.py [--runs 20] [--explain] [query ...]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.db.session import SessionLocal
+from app.schemas.job import JobSearchRequest
+from app.services.job_service import JobService
+
+
+DEFAULT_QUERIES = ["accountant", "software developer", "driver", "sales marketing", "nurse"]
+
+
+def time_search(db, request: JobSearchRequest, runs: int):
+    """Median seconds per search_all_jobs call and the last result"""
+    timings = []
+    results = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        results = JobService.search_all_jobs(db, request)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), results
+
+
+def explain(db, request: JobSearchRequest):
+    statement = JobService.ranked_search_statement(request)
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    for row in db.execute(text(f"EXPLAIN ANALYZE {sql}")):
+        print(f"      {row[0]}")
+
+
+def benchmark_job_search(queries, runs: int, show_plans: bool):
+    db = SessionLocal()
+    
+    try:
+        print(f"🔍 Job search benchmark ({runs} runs per query, median)")
+        print(f"   {'query':<22} {'ilike ms':>10} {'fts ms':>10} {'speedup':>8} {'ilike n':>8} {'fts n':>8}")
+        
+        for query in queries:
+            ilike_time, ilike = time_search(db, JobSearchRequest(query=query, search_mode="ilike"), runs)
+            fts_request = JobSearchRequest(query=query, search_mode="fulltext")
+            fts_time, fts = time_search(db, fts_request, runs)
+            
+            speedup = ilike_time / fts_time if fts_time else float("inf")
+            print(
+                f"   {query:<22} {ilike_time * 1000:>10.2f} {fts_time * 1000:>10.2f} {speedup:>7.1f}x "
+                f"{ilike['total_count']:>8} {fts['total_count']:>8}"
+            )
+            if show_plans:
+                explain(db, fts_request)
+        
+        print("✅ Done")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("queries", nargs="*", default=DEFAULT_QUERIES)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--explain", action="store_true", help="Print EXPLAIN ANALYZE for full-text queries")
+    args = parser.parse_args()
+    
+    benchmark_job_search(args.queries, args.runs, args.explain)
@@ -0,0 +1,37 @@
+"""
+Rebuild job_stats_rollups from corporate_jobs and applications
+
+Run after bulk imports or direct SQL edits, or whenever dashboard
+numbers look out of line with the source tables.
+"""
+import sys
+from pathlib import Path
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.db.session import SessionLocal
+from app.services.rollup_service import RollupService
+from app.services.stats_service import invalidate_company_stats
+
+
+def rebuild_dashboard_rollups():
+    """Recompute every rollup row from scratch"""
+    db = SessionLocal()
+    
+    try:
+        print("🔄 Rebuilding dashboard rollups...")
+        rows = RollupService.rebuild_rollups(db)
+        invalidate_company_stats()
+        print(f"✅ Rebuilt {rows} rollup rows")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_dashboard_rollups()
@@ -0,0 +1,57 @@
+"""
+Unit Tests for Applicant Hydration
+==================================
+"""
+
+from collections import namedtuple
+from unittest.mock import Mock
+
+from app.services.applicant_hydration import ApplicantHydrationService
+
+
+Application = namedtuple('Application', ['event_id', 'user_id', 'job_id'])
+CVRow = namedtuple('CVRow', ['applicant_id', 'cv_id', 'full_name'])
+JobRow = namedtuple('JobRow', ['job_id', 'title'])
+
+
+class TestApplicantHydration:
+    """Test suite for batched CV/job lookups"""
+
+    def test_two_queries_for_a_page(self):
+        """CVs and jobs are loaded once each and joined in order"""
+        applications = [
+            Application('e1', '11', 'JOB1'),
+            Application('e2', '12', 'JOB2'),
+            Application('e3', '11', 'JOB1'),
+            Application('e4', '19', 'JOB9'),
+        ]
+        db = Mock()
+        db.execute.side_effect = [
+            [CVRow(12, 'cv_2', 'Banda'), CVRow(11, 'cv_1', 'Mwale')],
+            [JobRow('JOB1', 'Plumber'), JobRow('JOB2', 'Driver')],
+        ]
+
+        hydrated = ApplicantHydrationService.hydrate(db, applications, include_jobs=True)
+
+        assert db.execute.call_count == 2
+        assert db.execute.call_args_list[0][0][1] == {'user_ids': [11, 12, 19]}
+        assert [h.application.event_id for h in hydrated] == ['e1', 'e2', 'e3', 'e4']
+        assert [h.cv.full_name if h.cv else None for h in hydrated] == ['Mwale', 'Banda', 'Mwale', None]
+        assert [h.job.title if h.job else None for h in hydrated] == ['Plumber', 'Driver', 'Plumber', None]
+
+    def test_jobs_skipped_unless_requested(self):
+        db = Mock()
+        db.execute.return_value = []
+        hydrated = ApplicantHydrationService.hydrate(db, [Application('e1', '11', 'JOB1')])
+        assert db.execute.call_count == 1
+        assert hydrated[0].cv is None and hydrated[0].job is None
+
+    def test_applicants_resolved_through_account_email(self):
+        """user_id is a users.id; CVs are joined on the account email"""
+        db = Mock()
+        db.execute.return_value = []
+        ApplicantHydrationService.hydrate(db, [Application('e1', '11', 'JOB1'), Application('e2', 'legacy', 'JOB1')])
+
+        statement, params = db.execute.call_args[0]
+        assert 'JOIN cvs ON cvs.email = users.email' in str(statement)
+        assert params == {'user_ids': [11]}
@@ -0,0 +1,99 @@
+"""
+Unit Tests for Conditional Responses
+====================================
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException, Request, Response
+
+from app.api.conditional import Conditional, etag_matches, make_etag, not_modified_since
+from app.api.responses import FastJSONResponse
+
+
+LAST_CHANGE = datetime(2026, 10, 19, 9, 30, 15, 250000)
+
+
+def conditional_for(query: str = '', **headers) -> Conditional:
+    request = Request({
+        'type': 'http',
+        'method': 'GET',
+        'path': '/jobs',
+        'query_string': query.encode(),
+        'headers': [(name.replace('_', '-').encode(), value.encode()) for name, value in headers.items()],
+    })
+    return Conditional(request, Response())
+
+
+class TestValidators:
+    """Test suite for ETag / date comparison"""
+
+    def test_etag_is_weak_and_version_specific(self):
+        etag = make_etag('/jobs', '', 3, LAST_CHANGE)
+
+        assert etag.startswith('W/"')
+        assert etag == make_etag('/jobs', '', 3, LAST_CHANGE)
+        assert etag != make_etag('/jobs', '', 4, LAST_CHANGE)
+        assert etag != make_etag('/jobs', 'limit=10', 3, LAST_CHANGE)
+
+    def test_if_none_match_uses_weak_comparison(self):
+        etag = make_etag(1)
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(etag.removeprefix('W/'), etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches('*', etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+
+    def test_if_modified_since_has_second_precision(self):
+        assert not_modified_since('Mon, 19 Oct 2026 09:30:15 GMT', LAST_CHANGE)
+        assert not not_modified_since('Mon, 19 Oct 2026 09:30:14 GMT', LAST_CHANGE)
+        assert not not_modified_since('not a date', LAST_CHANGE)
+        assert not not_modified_since('Mon, 19 Oct 2026 09:30:15 GMT', None)
+
+
+class TestConditional:
+    """Test suite for 304 short-circuiting"""
+
+    def test_sets_validators_on_fresh_request(self):
+        conditional = conditional_for()
+        conditional.check(1, last_modified=LAST_CHANGE)
+
+        headers = conditional.response.headers
+        assert headers['etag'].startswith('W/"')
+        assert headers['last-modified'] == 'Mon, 19 Oct 2026 09:30:15 GMT'
+        assert headers['cache-control'] == 'private, no-cache'
+
+    def test_matching_etag_raises_304_with_validators(self):
+        first = conditional_for()
+        first.check(1)
+
+        with pytest.raises(HTTPException) as raised:
+            conditional_for(if_none_match=first.headers['ETag']).check(1)
+        assert raised.value.status_code == 304
+        assert raised.value.headers['ETag'] == first.headers['ETag']
+
+    def test_changed_version_or_query_is_fresh(self):
+        first = conditional_for()
+        first.check(1)
+        etag = first.headers['ETag']
+
+        conditional_for('limit=10', if_none_match=etag).check(1)
+        conditional_for(if_none_match=etag).check(2)
+
+    def test_if_none_match_takes_precedence_over_if_modified_since(self):
+        since = 'Mon, 19 Oct 2026 09:30:15 GMT'
+        conditional_for(if_none_match='"stale"', if_modified_since=since).check(1, last_modified=LAST_CHANGE)
+
+        with pytest.raises(HTTPException):
+            conditional_for(if_modified_since=since).check(1, last_modified=LAST_CHANGE)
+
+    def test_apply_copies_validators_onto_returned_response(self):
+        conditional = conditional_for()
+        conditional.check(1)
+        response = conditional.apply(FastJSONResponse({'version': 1}))
+
+        assert response.headers['etag'] == conditional.headers['ETag']
+        assert response.headers['server-timing'].startswith('serialize;dur=')
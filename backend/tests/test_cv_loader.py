@@ -0,0 +1,40 @@
+"""
+Unit Tests for the Bulk CV Detail Loader
+========================================
+"""
+
+from collections import namedtuple
+from unittest.mock import Mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.cv_loader import DETAIL_COLUMNS, _by_ids_statement, load_cvs_by_ids
+
+
+Row = namedtuple('Row', ['cv_id', 'full_name'])
+
+
+class TestLoadCVsByIds:
+    """Test suite for load_cvs_by_ids"""
+
+    def test_one_bound_query_in_request_order(self):
+        """Ids are bound as one array; rows come back in request order"""
+        db = Mock()
+        db.execute.return_value = [Row('cv_2', 'B'), Row('cv_1', 'A')]
+
+        rows = load_cvs_by_ids(db, ['cv_1', 'cv_3', 'cv_2', 'cv_1'])
+
+        assert list(rows) == ['cv_1', 'cv_2']
+        assert rows['cv_2'].full_name == 'B'
+        statement, params = db.execute.call_args[0]
+        assert params == {'cv_ids': ['cv_1', 'cv_3', 'cv_2']}
+        assert 'ANY' in str(statement.compile(dialect=postgresql.dialect()))
+
+    def test_statement_is_reused(self):
+        """Same column set -> same statement object (stable SQL text)"""
+        assert _by_ids_statement(DETAIL_COLUMNS) is _by_ids_statement(DETAIL_COLUMNS)
+
+    def test_empty_list_skips_query(self):
+        db = Mock()
+        assert load_cvs_by_ids(db, []) == {}
+        db.execute.assert_not_called()
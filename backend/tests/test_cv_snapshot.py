@@ -0,0 +1,175 @@
+"""
+Unit Tests for CVSnapshot
+=========================
+Checks the struct-of-arrays encoding and that the vectorized scorers agree
+with the per-CV scorers they replace.
+"""
+
+from collections import namedtuple
+from datetime import datetime
+from unittest.mock import MagicMock, Mock
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services import cv_snapshot
+from app.services.cv_snapshot import CVSnapshot, MISSING_CODE
+from app.services.enhanced_matching_service import EnhancedMatchingService
+from app.services.fast_gated_matching_service import FastGatedMatchingService
+
+
+CVRow = namedtuple('CVRow', [
+    'cv_id', 'full_name', 'email', 'phone', 'city', 'province', 'education_level',
+    'total_years_experience', 'current_job_title', 'salary_expectation_min',
+    'salary_expectation_max', 'skills_technical', 'skills_soft',
+])
+
+
+def _row(cv_id, city, education, years, salary_min=None):
+    return CVRow(cv_id, cv_id.upper(), f'{cv_id}@example.com', None, city, None,
+                 education, years, 'Accountant', salary_min, None, None, None)
+
+
+class TestCVSnapshot:
+    """Test suite for the in-memory CV snapshot"""
+
+    def setup_method(self):
+        """Five CVs covering missing values and mixed-case categories"""
+        self.rows = [
+            _row('cv_1', 'Lusaka', 'Bachelor', 5.0, 4000.0),
+            _row('cv_2', 'kitwe ', 'Diploma', None),
+            _row('cv_3', None, None, 1.5),
+            _row('cv_4', 'Ndola', 'masters', 12.0),
+            _row('cv_5', 'LUSAKA', 'Grade 12', 0.0),
+        ]
+        skills = [('Python', 'SQL'), ('Excel',), (), ('python', 'Excel', 'Python'), ('SQL',)]
+        clusters = [('programming', 'data'), ('office',), (), ('programming', 'office'), ('data',)]
+        self.snapshot = CVSnapshot({
+            row.cv_id: (row, s, c) for row, s, c in zip(self.rows, skills, clusters)
+        })
+
+    def test_columns_are_encoded(self):
+        """Numeric NULLs and categorical keys follow the scorers' rules"""
+        snap = self.snapshot
+        assert snap.experience.tolist() == [5.0, 0.0, 1.5, 12.0, 0.0]
+        assert np.isnan(snap.salary_min[1]) and snap.salary_min[0] == 4000.0
+        assert snap.city_id[0] == snap.city_id[4]
+        assert snap.city_vocab[snap.city_id[1]] == 'kitwe'
+        assert snap.city_id[2] == MISSING_CODE
+        assert snap.row_of['cv_4'] == 3
+
+    def test_skills_are_csr_packed(self):
+        """Row skills round-trip through indptr/ids"""
+        snap = self.snapshot
+        assert snap.skill_indptr.tolist() == [0, 2, 3, 3, 6, 7]
+        assert snap.skills(0) == ['Python', 'SQL']
+        assert snap.skills(2) == []
+
+    def test_clusters_and_titles_are_encoded(self):
+        """Cluster names and job titles round-trip through their codes"""
+        snap = self.snapshot
+        assert snap.clusters(3) == ['programming', 'office']
+        assert snap.clusters(2) == []
+        assert snap.title(0) == 'Accountant'
+        assert snap.title_vocab == ['Accountant']
+
+    def test_match_rows_is_case_insensitive_substring(self):
+        """Location filter mirrors ilike('%...%')"""
+        assert self.snapshot.match_rows('city', 'lusa').tolist() == [True, False, False, False, True]
+
+    @pytest.mark.parametrize('required', [0, 2, 6])
+    def test_fast_gated_vector_scores_match_scalar(self, required):
+        """Vectorized experience/location equal the per-CV versions"""
+        service = FastGatedMatchingService(Mock())
+        for job_city in ['Lusaka', '', 'Kitwe']:
+            scores = service._compute_location_scores(self.snapshot, job_city)
+            expected = [service._compute_location_score(row.city or '', job_city) for row in self.rows]
+            assert scores.tolist() == expected
+
+        scores = service._compute_experience_scores(self.snapshot.experience, required)
+        expected = [service._compute_experience_score(row.total_years_experience or 0, required) for row in self.rows]
+        assert scores.tolist() == expected
+
+    def test_fast_gated_skill_counts_are_distinct_and_case_insensitive(self):
+        """Duplicate CV skills count once"""
+        service = FastGatedMatchingService(Mock())
+        counts = service._count_matched_skills(self.snapshot, {'python', 'excel'})
+        assert counts.tolist() == [1, 1, 0, 2, 0]
+
+    @pytest.mark.parametrize('required', [0, 3, 10])
+    def test_enhanced_vector_scores_match_scalar(self, required):
+        """Vectorized experience/location/education equal the per-CV versions"""
+        service = EnhancedMatchingService.__new__(EnhancedMatchingService)
+        for job_city in ['Kitwe', 'lusaka', None]:
+            scores = service._compute_location_scores(self.snapshot, job_city)
+            expected = [service._compute_location_score(row.city, job_city) for row in self.rows]
+            assert scores.tolist() == expected
+
+        for education in [None, 'Diploma', 'masters']:
+            scores = service._compute_education_scores(self.snapshot, education)
+            expected = [service._compute_education_score(row.education_level, education) for row in self.rows]
+            assert scores.tolist() == expected
+
+        scores = service._compute_experience_scores(self.snapshot.experience, required)
+        expected = [service._compute_experience_score(row.total_years_experience or 0, required) for row in self.rows]
+        assert scores.tolist() == expected
+
+
+class TestSnapshotRefresh:
+    """Test suite for copy-on-write refresh bookkeeping"""
+
+    def setup_method(self):
+        self.snapshot = CVSnapshot({'cv_1': (_row('cv_1', 'Lusaka', None, 2.0), ('Python',), ())})
+        monkeypatch = pytest.MonkeyPatch()
+        monkeypatch.setattr(cv_snapshot, '_snapshot', self.snapshot)
+        monkeypatch.setattr(cv_snapshot, '_checked_at', self.snapshot.built_at)
+        monkeypatch.setattr(cv_snapshot, '_changed_through', None)
+        monkeypatch.setattr(cv_snapshot, '_dirty_cv_ids', set())
+        self.monkeypatch = monkeypatch
+
+    def teardown_method(self):
+        self.monkeypatch.undo()
+
+    def test_dirty_ids_survive_a_failed_reload(self):
+        """Marks are only cleared once the reloaded snapshot is published"""
+        def fail(db, criteria=None):
+            raise RuntimeError('connection lost')
+
+        self.monkeypatch.setattr(cv_snapshot, '_load_records', fail)
+        cv_snapshot.mark_cvs_changed('cv_1')
+        with pytest.raises(RuntimeError):
+            cv_snapshot.refresh_cv_snapshot(Mock(), cv_ids=())
+        assert cv_snapshot._dirty_cv_ids == {'cv_1'}
+
+        edited = _row('cv_1', 'Kitwe', None, 2.0)
+        self.monkeypatch.setattr(cv_snapshot, '_load_records', lambda db, criteria=None: {'cv_1': (edited, (), ())})
+        refreshed = cv_snapshot.refresh_cv_snapshot(Mock(), cv_ids=())
+        assert refreshed.city[0] == 'Kitwe'
+        assert cv_snapshot._dirty_cv_ids == set()
+
+    def test_requests_never_refresh_inline(self):
+        """Stale or marked snapshots are served as-is while a refresh is scheduled"""
+        scheduled = []
+        self.monkeypatch.setattr(cv_snapshot, '_schedule_refresh', lambda full: scheduled.append(full))
+
+        assert cv_snapshot.get_cv_snapshot(Mock()) is self.snapshot
+        cv_snapshot.mark_cvs_changed('cv_1')
+        assert cv_snapshot.get_cv_snapshot(Mock()) is self.snapshot
+        cv_snapshot._checked_at -= settings.CV_SNAPSHOT_MAX_AGE_SECONDS + 1
+        assert cv_snapshot.get_cv_snapshot(Mock()) is self.snapshot
+        assert scheduled == [False, True]
+
+    def test_unchanged_refresh_leaves_published_snapshot_untouched(self):
+        """Nothing moved: same object, bookkeeping advances beside it"""
+        latest = datetime(2026, 10, 1, 12, 0)
+        db = MagicMock()
+        db.query.return_value.scalar.side_effect = [latest, 1]  # max(updated_at), count
+        before = dict(vars(self.snapshot))
+        self.monkeypatch.setattr(cv_snapshot, '_checked_at', 0.0)
+
+        assert cv_snapshot.refresh_cv_snapshot(db) is self.snapshot
+        assert vars(self.snapshot).keys() == before.keys()
+        assert all(vars(self.snapshot)[name] is value for name, value in before.items())
+        assert cv_snapshot._changed_through == latest
+        assert cv_snapshot._checked_at > 0.0
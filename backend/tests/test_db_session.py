@@ -0,0 +1,24 @@
+"""
+Unit Tests for the Database Session Module
+==========================================
+"""
+
+import pytest
+
+from app.db.session import async_database_url
+
+
+class TestAsyncDatabaseUrl:
+    """Test suite for deriving the async driver URL"""
+
+    @pytest.mark.parametrize('url', [
+        'postgresql://user:secret@db:5432/job_match_db',
+        'postgresql+psycopg2://user:secret@db:5432/job_match_db',
+    ])
+    def test_postgres_urls_use_asyncpg(self, url):
+        """Sync Postgres drivers map to asyncpg, credentials kept"""
+        assert async_database_url(url) == 'postgresql+asyncpg://user:secret@db:5432/job_match_db'
+
+    def test_other_backends_are_unchanged(self):
+        """Non-Postgres URLs pass through"""
+        assert async_database_url('sqlite+aiosqlite:///test.db') == 'sqlite+aiosqlite:///test.db'
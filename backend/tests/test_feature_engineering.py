@@ -0,0 +1,123 @@
+"""
+Unit Tests for the Chunked Feature Pipeline
+===========================================
+Streams fake chunks (no database) through generate_training_data_chunked
+to check checkpoint resume, part cleanup and the keyset cursor.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from ml.feature_engineering import CHECKPOINT_FILE, FEATURE_DTYPES, FeatureEngineer
+
+
+def _chunk(event_ids, dates):
+    return pd.DataFrame({
+        'event_id': event_ids,
+        'interaction_date': pd.to_datetime(dates),
+        'match_score': np.linspace(0.1, 0.9, len(event_ids)),
+        'applied': [1, 0, 1, 0][:len(event_ids)],
+    })
+
+
+class FakeStreamEngineer(FeatureEngineer):
+    """FeatureEngineer whose stream yields fixed chunks after the resume key"""
+
+    def __init__(self, chunks):
+        super().__init__({})
+        self.chunks = chunks
+        self.resume_keys = []
+
+    def connect(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def stream_interactions_data(self, chunk_size=None, resume_key=None):
+        self.resume_keys.append(resume_key)
+        yield from self.chunks
+
+    def engineer_features(self, df, verbose=True):
+        return df
+
+    def select_final_features(self, df, verbose=True):
+        return df.drop(columns=['interaction_date'])
+
+
+def _checkpoint(output_dir):
+    with open(os.path.join(output_dir, CHECKPOINT_FILE)) as f:
+        return json.load(f)
+
+
+class TestChunkedPipeline:
+    """Test suite for checkpointed Parquet output"""
+
+    def test_resume_skips_finished_parts(self, tmp_path):
+        first = FakeStreamEngineer([
+            _chunk(['e4', 'e3'], ['2026-10-04', '2026-10-03']),
+            _chunk(['e2', 'e1'], ['2026-10-02', '2026-10-01']),
+        ])
+        first.generate_training_data_chunked(str(tmp_path), chunk_size=2)
+        finished = (tmp_path / 'part-00000.parquet').read_bytes()
+
+        # Pretend the run stopped after chunk 0: checkpoint says 1 part written
+        checkpoint = _checkpoint(tmp_path)
+        checkpoint.update({'chunks_written': 1, 'rows_written': 2, 'completed': False,
+                           'last_key': ['2026-10-03T00:00:00', 'e3']})
+        (tmp_path / CHECKPOINT_FILE).write_text(json.dumps(checkpoint))
+
+        resumed = FakeStreamEngineer([_chunk(['e2', 'e1'], ['2026-10-02', '2026-10-01'])])
+        resumed.generate_training_data_chunked(str(tmp_path), chunk_size=2)
+
+        assert resumed.resume_keys == [['2026-10-03T00:00:00', 'e3']]
+        assert (tmp_path / 'part-00000.parquet').read_bytes() == finished
+        assert sorted(p.name for p in tmp_path.glob('part-*')) == ['part-00000.parquet', 'part-00001.parquet']
+        assert _checkpoint(tmp_path)['completed'] and _checkpoint(tmp_path)['rows_written'] == 4
+        assert pd.read_parquet(tmp_path)['event_id'].tolist() == ['e4', 'e3', 'e2', 'e1']
+
+    def test_stale_parts_and_tmp_files_are_removed(self, tmp_path):
+        (tmp_path / 'part-00000.parquet.tmp').write_bytes(b'half written')
+        (tmp_path / 'part-00003.parquet').write_bytes(b'after the checkpoint')
+
+        FakeStreamEngineer([_chunk(['e1'], ['2026-10-01'])]).generate_training_data_chunked(str(tmp_path))
+
+        assert sorted(p.name for p in tmp_path.glob('part-*')) == ['part-00000.parquet']
+
+    def test_null_timestamp_gives_a_valid_cursor_key(self, tmp_path):
+        engineer = FakeStreamEngineer([_chunk(['e2', 'e1'], ['2026-10-02', None])])
+        engineer.generate_training_data_chunked(str(tmp_path))
+
+        assert _checkpoint(tmp_path)['last_key'] == ['-infinity', 'e1']
+        query = engineer._interactions_query(after_key=True)
+        assert "(COALESCE(i.timestamp, '-infinity'), i.event_id) < (%s, %s)" in query
+        assert "ORDER BY COALESCE(i.timestamp, '-infinity') DESC, i.event_id DESC" in query
+
+
+class TestEnforceDtypes:
+    """Test suite for the fixed output schema"""
+
+    def test_declared_dtypes(self):
+        df = pd.DataFrame({
+            'applied': [1.0, np.nan],
+            'event_id': ['e1', 'e2'],
+            'match_score': ['0.5', 'bad'],
+            'user_skills_count': [3, np.inf],
+            'same_city': [True, False],
+            'extra': ['kept', 'as-is'],
+        })
+
+        result = FeatureEngineer({}).enforce_dtypes(df)
+
+        for col in ['applied', 'event_id', 'match_score', 'user_skills_count', 'same_city']:
+            assert str(result[col].dtype) == FEATURE_DTYPES[col]
+        assert result['applied'].tolist() == [1, 0]
+        assert result['user_skills_count'].tolist() == [3, 0]
+        assert result['match_score'].iloc[0] == np.float32(0.5) and np.isnan(result['match_score'].iloc[1])
+        assert result['extra'].tolist() == ['kept', 'as-is']
@@ -0,0 +1,95 @@
+"""
+Unit Tests for Full-Text Job Search
+===================================
+"""
+
+from collections import namedtuple
+from unittest.mock import Mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.job import JobSearchRequest
+from app.services.job_service import JobService
+
+
+RankedRow = namedtuple('RankedRow', ['job_type', 'job_id', 'rank', 'total', 'corporate_total'])
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestRankedSearchStatement:
+    """Test suite for the combined ranked query"""
+
+    def test_both_job_types_ranked_together(self):
+        sql = _sql(JobService.ranked_search_statement(JobSearchRequest(query="python developer")))
+
+        assert 'corporate_jobs.search_vector @@ websearch_to_tsquery' in sql
+        assert 'small_jobs.search_vector @@ websearch_to_tsquery' in sql
+        assert 'UNION ALL' in sql and 'ILIKE' not in sql
+        assert 'ORDER BY matches.rank DESC' in sql
+        assert 'count(*) OVER ()' in sql
+
+    def test_corporate_only_filters_exclude_small_jobs(self):
+        request = JobSearchRequest(query="nurse", categories=["Healthcare"], min_salary=5000)
+        sql = _sql(JobService.ranked_search_statement(request))
+
+        assert 'small_jobs' not in sql
+        assert 'corporate_jobs.category IN' in sql
+
+    def test_count_statement_has_no_page(self):
+        statement = JobService.ranked_count_statement(JobSearchRequest(query="driver", page=3, page_size=10))
+        sql = _sql(statement)
+
+        assert statement._offset is None and statement._limit is None
+        assert 'OVER' not in sql and 'ORDER BY' not in sql
+        assert 'count(*) FILTER (WHERE matches.job_type' in sql
+
+    def test_page_offset(self):
+        statement = JobService.ranked_search_statement(JobSearchRequest(query="driver", page=3, page_size=10))
+        assert statement._offset == 20 and statement._limit == 10
+
+
+class TestFulltextSearch:
+    """Test suite for search_all_jobs in fulltext mode"""
+
+    def test_results_follow_rank_order(self):
+        db = Mock()
+        db.execute.return_value.all.return_value = [
+            RankedRow('small', 's1', 0.9, 3, 2),
+            RankedRow('corporate', 'c2', 0.5, 3, 2),
+            RankedRow('corporate', 'c1', 0.1, 3, 2),
+        ]
+        corporate = {job_id: Mock(job_id=job_id) for job_id in ('c1', 'c2')}
+        small = {'s1': Mock(job_id='s1')}
+        db.query.return_value.filter.side_effect = [list(corporate.values()), list(small.values())]
+
+        results = JobService.search_all_jobs(db, JobSearchRequest(query="driver"))
+
+        assert [row['job_id'] for row in results['ranked']] == ['s1', 'c2', 'c1']
+        assert [job.job_id for job in results['corporate_jobs']] == ['c2', 'c1']
+        assert results['total_count'] == 3
+        assert results['corporate_count'] == 2 and results['small_count'] == 1
+
+    def test_page_past_the_end_keeps_totals(self):
+        db = Mock()
+        db.execute.return_value.all.return_value = []
+        db.execute.return_value.one.return_value = (3, 2)
+
+        results = JobService.search_all_jobs(db, JobSearchRequest(query="driver", page=5, page_size=10))
+
+        assert results['corporate_jobs'] == [] and results['small_jobs'] == [] and results['ranked'] == []
+        assert results['total_count'] == 3
+        assert results['corporate_count'] == 2 and results['small_count'] == 1
+        assert db.execute.call_count == 2
+        db.query.assert_not_called()
+
+    def test_empty_first_page_skips_count(self):
+        db = Mock()
+        db.execute.return_value.all.return_value = []
+
+        results = JobService.search_all_jobs(db, JobSearchRequest(query="driver"))
+
+        assert results['total_count'] == 0 and results['small_count'] == 0
+        assert db.execute.call_count == 1
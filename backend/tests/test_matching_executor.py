@@ -0,0 +1,91 @@
+"""
+Unit Tests for the Bounded Matching Executor
+============================================
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.api import deps
+from app.services.matching_executor import BoundedExecutor, ExecutorSaturated, ExecutorTimeout
+
+
+class TestBoundedExecutor:
+    """Test suite for admission control and timeouts"""
+
+    def test_runs_call_off_the_event_loop(self):
+        """Result is returned and the slot is released"""
+        executor = BoundedExecutor(max_workers=1, max_queue=0)
+        loop_thread = threading.get_ident()
+
+        result = asyncio.run(executor.run(lambda x: (x * 2, threading.get_ident()), 21))
+
+        assert result[0] == 42 and result[1] != loop_thread
+        assert executor.in_flight == 0
+        executor.shutdown()
+
+    def test_rejects_when_queue_is_full(self):
+        """Calls beyond workers + queue are refused, not queued"""
+        executor = BoundedExecutor(max_workers=1, max_queue=1)
+        release = threading.Event()
+        running = executor.submit(release.wait)
+        queued = executor.submit(release.wait)
+
+        with pytest.raises(ExecutorSaturated):
+            executor.submit(release.wait)
+
+        release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        assert executor.in_flight == 0
+        executor.shutdown()
+
+    def test_times_out_slow_calls(self):
+        """A call exceeding the timeout raises ExecutorTimeout"""
+        executor = BoundedExecutor(max_workers=1, max_queue=0, timeout=0.05)
+        release = threading.Event()
+
+        with pytest.raises(ExecutorTimeout):
+            asyncio.run(executor.run(release.wait))
+
+        release.set()
+        executor.shutdown()
+
+
+class TestWithSession:
+    """Test suite for per-call sessions of executor work"""
+
+    def test_timed_out_call_keeps_its_own_session(self, monkeypatch):
+        """After a 504 the still-running call owns an open session, closed when it finishes"""
+        sessions = []
+
+        class FakeSession:
+            def __init__(self):
+                self.closed = False
+                sessions.append(self)
+
+            def close(self):
+                self.closed = True
+
+        monkeypatch.setattr(deps, 'SessionLocal', FakeSession)
+        executor = BoundedExecutor(max_workers=1, max_queue=0, timeout=0.05)
+        release = threading.Event()
+
+        with pytest.raises(ExecutorTimeout):
+            asyncio.run(executor.run(deps.with_session, lambda db: release.wait()))
+        assert len(sessions) == 1 and not sessions[0].closed
+
+        release.set()
+        executor._pool.shutdown(wait=True)
+        assert sessions[0].closed
+
+    def test_session_closed_when_call_raises(self, monkeypatch):
+        """Errors still close the session"""
+        closed = []
+        monkeypatch.setattr(deps, 'SessionLocal', lambda: type('S', (), {'close': lambda self: closed.append(True)})())
+
+        with pytest.raises(ValueError):
+            deps.with_session(lambda db: (_ for _ in ()).throw(ValueError('boom')))
+        assert closed == [True]
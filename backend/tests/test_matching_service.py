@@ -11,8 +11,13 @@ from app.services.matching_service import (
     calculate_salary_score,
     calculate_skills_score,
     calculate_experience_score,
-    apply_context_boost
+    apply_context_boost,
+    JobSnapshot,
+    MatchingService,
+    invalidate_job_snapshot
 )
+from app.services import matching_service
+from types import SimpleNamespace
 
 
 class TestSkillNormalization:
@@ -263,6 +268,66 @@ class TestContextBoosts:
         assert len(reasons) == 0
 
 
+class TestJobSnapshotScoring:
+    """Batch scorer must agree with calculate_match_score job by job."""
+    
+    JOBS = [
+        {'job_id': 'j1', 'location_city': 'Lusaka', 'location_province': 'Lusaka Province',
+         'salary_min_zmw': 5000, 'salary_max_zmw': 8000, 'required_skills': 'Python, SQL',
+         'preferred_skills': 'Docker', 'required_experience_years': 3.0, 'company': 'Zanaco'},
+        {'job_id': 'j2', 'location_city': 'Kitwe', 'location_province': 'Copperbelt Province',
+         'salary_min_zmw': None, 'salary_max_zmw': 3000, 'required_skills': 'Mining, Geology',
+         'preferred_skills': None, 'required_experience_years': None, 'company': 'Ministry of Mines'},
+        {'job_id': 'j3', 'location_city': 'Remote', 'location_province': None,
+         'salary_min_zmw': None, 'salary_max_zmw': None, 'required_skills': '',
+         'preferred_skills': 'Customer Service', 'required_experience_years': 10.0, 'company': 'ABC'},
+        {'job_id': 'j4', 'location_city': None, 'location_province': 'Copperbelt Province',
+         'salary_min_zmw': 1000, 'salary_max_zmw': 4500, 'required_skills': 'Accounting',
+         'preferred_skills': 'Budgeting', 'required_experience_years': 1.0, 'company': 'ABC'},
+    ]
+    
+    CVS = [
+        SimpleNamespace(city='Lusaka', province='Lusaka Province', salary_expectation_min=6000,
+                        salary_expectation_max=9000, skills_technical='Python, Docker', skills_soft='',
+                        total_years_experience=4, employment_status=None),
+        SimpleNamespace(city='Ndola', province='Copperbelt Province', salary_expectation_min=5000,
+                        salary_expectation_max=None, skills_technical='Geology, Bookkeeping',
+                        skills_soft='Client Relations', total_years_experience=None, employment_status=None),
+        SimpleNamespace(city=None, province=None, salary_expectation_min=None,
+                        salary_expectation_max=None, skills_technical=None, skills_soft=None,
+                        total_years_experience=12, employment_status=None),
+    ]
+    
+    def test_scores_match_per_job_scoring(self):
+        snapshot = JobSnapshot('corp', self.JOBS, [{} for _ in self.JOBS])
+        service = MatchingService(db=None)
+        
+        for cv in self.CVS:
+            expected = [service.calculate_match_score(cv, job, 'corp')['match_score'] for job in self.JOBS]
+            assert snapshot.score(cv).tolist() == expected
+    
+    def test_filter_mask(self):
+        details = [{'category': c} for c in ['IT', 'Mining', 'IT', 'Finance']]
+        snapshot = JobSnapshot('corp', self.JOBS, details)
+        
+        assert snapshot.filter_mask({'category': 'IT'}).tolist() == [True, False, True, False]
+        assert snapshot.filter_mask({'min_salary': 4000}).tolist() == [True, False, False, True]
+    
+    def test_job_writes_invalidate_cached_snapshot(self, monkeypatch):
+        builds = []
+        monkeypatch.setattr(matching_service, '_job_snapshots', {})
+        monkeypatch.setattr(matching_service, 'build_job_snapshot',
+                            lambda db, job_type: builds.append(job_type) or JobSnapshot(job_type, [], []))
+        
+        first = matching_service.get_job_snapshot(None, 'corp')
+        assert matching_service.get_job_snapshot(None, 'corp') is first
+        invalidate_job_snapshot('small')
+        assert matching_service.get_job_snapshot(None, 'corp') is first
+        invalidate_job_snapshot('corp')
+        assert matching_service.get_job_snapshot(None, 'corp') is not first
+        assert builds == ['corp', 'corp']
+
+
 # ============================================================================
 # RUN TESTS
 # ============================================================================
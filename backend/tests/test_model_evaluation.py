@@ -0,0 +1,129 @@
+"""
+Unit Tests for Model Evaluation Metrics
+=======================================
+Vectorized metrics of ml/model_evaluation.py checked against scikit-learn,
+and the chunked group bootstrap.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip('matplotlib')
+pytest.importorskip('seaborn')
+from sklearn.metrics import ndcg_score, roc_auc_score
+
+# The evaluation script imports its sibling modules by bare name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ml'))
+
+import model_evaluation
+from model_evaluation import (
+    EvaluationResult, ModelEvaluator, calibration_table, mean_ranking_metrics,
+    ranking_metrics_by_group, weighted_auc
+)
+
+
+# Three query groups of different sizes; g3 has no relevant row. Scores are
+# distinct so the tie handling of sklearn and the stable sort cannot differ.
+GROUPS = np.array(['g1'] * 5 + ['g2'] * 3 + ['g3'] * 4)
+Y_TRUE = np.array([1, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0])
+SCORES = np.array([0.9, 0.8, 0.3, 0.6, 0.1, 0.7, 0.2, 0.4, 0.5, 0.35, 0.15, 0.05])
+
+
+def _reference(k):
+    """Per-group (precision, ndcg) computed group by group with sklearn"""
+    precision, ndcg = {}, {}
+    for group in np.unique(GROUPS):
+        mask = GROUPS == group
+        y, s = Y_TRUE[mask], SCORES[mask]
+        top = np.argsort(-s)[:k]
+        precision[group] = y[top].sum() / min(k, mask.sum())
+        ndcg[group] = ndcg_score([y], [s], k=k) if y.any() else np.nan
+    return precision, ndcg
+
+
+class TestRankingMetrics:
+    """Test suite for per-group Precision@K / NDCG@K"""
+
+    @pytest.mark.parametrize('k', [1, 2, 3, 5, 10])
+    def test_per_group_metrics_match_sklearn(self, k):
+        per_group = ranking_metrics_by_group(Y_TRUE, SCORES, GROUPS, k)
+        precision, ndcg = _reference(k)
+
+        np.testing.assert_allclose(per_group['precision'], [precision[g] for g in ['g1', 'g2', 'g3']])
+        np.testing.assert_allclose(per_group['ndcg'], [ndcg[g] for g in ['g1', 'g2', 'g3']])
+        assert per_group['n_relevant'].tolist() == [2, 1, 0]
+
+    def test_row_order_does_not_matter(self):
+        shuffled = np.random.default_rng(0).permutation(len(GROUPS))
+        expected = ranking_metrics_by_group(Y_TRUE, SCORES, GROUPS, 3)
+        result = ranking_metrics_by_group(Y_TRUE[shuffled], SCORES[shuffled], GROUPS[shuffled], 3)
+
+        np.testing.assert_allclose(result['ndcg'], expected['ndcg'])
+        np.testing.assert_allclose(result['precision'], expected['precision'])
+
+    def test_means_skip_groups_without_relevant_rows(self):
+        means = mean_ranking_metrics(Y_TRUE, SCORES, GROUPS, k_values=[3])
+        precision, ndcg = _reference(3)
+
+        assert means['group_precision_at_3'] == pytest.approx(np.mean(list(precision.values())))
+        assert means['group_ndcg_at_3'] == pytest.approx(np.mean([ndcg['g1'], ndcg['g2']]))
+
+
+class TestAUCAndCalibration:
+    """Test suite for weighted AUC and the reliability table"""
+
+    def setup_method(self):
+        rng = np.random.default_rng(11)
+        self.y = rng.integers(0, 2, 200)
+        self.scores = np.round(rng.random(200), 1)  # Many ties
+
+    def test_weighted_auc_matches_sklearn(self):
+        weights = np.random.default_rng(5).integers(0, 4, (6, 200)).astype(np.float64)
+        weights[0] = 1.0
+
+        aucs = weighted_auc(self.y, self.scores, weights)
+
+        expected = [roc_auc_score(self.y, self.scores, sample_weight=w) for w in weights]
+        np.testing.assert_allclose(aucs, expected)
+
+    def test_single_class_replicate_is_nan(self):
+        weights = (self.y == 1).astype(np.float64)[None, :]
+        assert np.isnan(weighted_auc(self.y, self.scores, weights)[0])
+
+    def test_calibration_bin_counts_add_up(self):
+        scores = np.concatenate([self.scores, [0.0, 1.0, 1.2, -0.1]])
+        y = np.concatenate([self.y, [0, 1, 1, 0]])
+
+        table = calibration_table(y, scores, n_bins=10)
+
+        assert sum(table['count']) == len(y)
+        assert len(table['count']) == 10 and len(table['bin_edges']) == 11
+
+
+class TestBootstrap:
+    """Test suite for the chunked group bootstrap"""
+
+    def _intervals(self, monkeypatch, chunk_size):
+        monkeypatch.setattr(model_evaluation, 'BOOTSTRAP_SAMPLES', 120)
+        monkeypatch.setattr(model_evaluation, 'BOOTSTRAP_CHUNK_SIZE', chunk_size)
+        rng = np.random.default_rng(2)
+        groups = np.repeat([f'cv_{i}' for i in range(30)], 6)
+        y = rng.integers(0, 2, len(groups))
+        scores = {'ml_model': rng.random(len(groups)), 'baseline': rng.random(len(groups))}
+
+        result = EvaluationResult(y_true=y, groups=groups, scores=scores)
+        for name, model_scores in scores.items():
+            result.group_metrics[name] = {10: ranking_metrics_by_group(y, model_scores, groups, 10)}
+        ModelEvaluator.__new__(ModelEvaluator)._bootstrap(result)
+        return result.confidence_intervals
+
+    def test_chunk_size_does_not_change_intervals(self, monkeypatch):
+        unchunked = self._intervals(monkeypatch, 120)
+
+        for chunk_size in (1, 7, 50):
+            assert self._intervals(monkeypatch, chunk_size) == unchunked
+        assert set(unchunked) == {'ml_model', 'baseline', 'delta'}
+        assert unchunked['delta']['auc_roc']['lower'] < unchunked['delta']['auc_roc']['upper']
@@ -0,0 +1,82 @@
+"""
+Unit Tests for Keyset Pagination
+================================
+"""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.db.pagination import (
+    decode_cursor, encode_cursor, estimated_count, keyset_after, keyset_page, page_with_cursor
+)
+from app.models.saved_candidate import SavedCandidate
+
+
+def _sql(clause):
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+class TestKeysetPagination:
+    """Test suite for cursors and keyset clauses"""
+
+    def test_cursor_round_trip_keeps_types(self):
+        """Datetimes survive encoding; cursors are URL-safe"""
+        values = [datetime(2026, 10, 19, 9, 30, 15, 123), 42]
+        cursor = encode_cursor(values)
+        assert decode_cursor(cursor) == values
+        assert set(cursor) <= set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_')
+
+    def test_malformed_cursor_is_400(self):
+        with pytest.raises(HTTPException) as e:
+            decode_cursor('not-a-cursor!')
+        assert e.value.status_code == 400
+
+    def test_keyset_clause_uses_row_comparison(self):
+        """Descending pages continue below the (sort key, id) of the last row"""
+        cursor = encode_cursor([datetime(2026, 1, 1), 7])
+        clause = keyset_after(cursor, SavedCandidate.saved_date, SavedCandidate.id)
+        assert '(saved_candidates.saved_date, saved_candidates.id) <' in _sql(clause)
+        assert keyset_after(None, SavedCandidate.saved_date, SavedCandidate.id) is None
+
+    def test_page_with_cursor_trims_extra_row(self):
+        """limit + 1 rows -> one page plus a cursor for its last row"""
+        rows = [(datetime(2026, 1, d), d) for d in (5, 4, 3)]
+        page, next_cursor = page_with_cursor(rows, 2, lambda r: r)
+        assert page == rows[:2]
+        assert decode_cursor(next_cursor) == [datetime(2026, 1, 4), 4]
+
+        page, next_cursor = page_with_cursor(rows, 3, lambda r: r)
+        assert page == rows and next_cursor is None
+
+    def test_keyset_page_cursor_replaces_offset(self):
+        """Offset paging still works; a cursor switches to the keyset clause"""
+        query = select(SavedCandidate)
+        columns = (SavedCandidate.saved_date, SavedCandidate.id)
+
+        offset_page = _sql(keyset_page(query, 20, *columns, skip=40))
+        assert 'OFFSET' in offset_page and 'LIMIT %(param_1)s' in offset_page
+        assert 'ORDER BY saved_candidates.saved_date DESC, saved_candidates.id DESC' in offset_page
+
+        cursor = encode_cursor([datetime(2026, 1, 1), 7])
+        cursor_page = _sql(keyset_page(query, 20, *columns, skip=40, cursor=cursor))
+        assert 'OFFSET' not in cursor_page
+        assert '(saved_candidates.saved_date, saved_candidates.id) <' in cursor_page
+
+    def test_estimated_count_reads_plan_rows(self):
+        """The estimate comes from EXPLAIN, not from running the query"""
+        db = Mock()
+        connection = db.connection.return_value
+        connection.dialect = postgresql.dialect()
+        connection.exec_driver_sql.return_value.scalar.return_value = [{"Plan": {"Plan Rows": 1234}}]
+
+        statement = select(SavedCandidate).where(SavedCandidate.recruiter_id.in_([1, 2]))
+        assert estimated_count(db, statement) == 1234
+
+        sql, params = connection.exec_driver_sql.call_args[0]
+        assert sql.startswith('EXPLAIN (FORMAT JSON) SELECT')
+        assert 'POSTCOMPILE' not in sql
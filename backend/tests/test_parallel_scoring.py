@@ -0,0 +1,135 @@
+"""
+Unit Tests for Parallel Scoring
+===============================
+Sharded scoring must return the same top-K, in the same order, as scoring
+the whole pool serially.
+"""
+
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services import parallel_scoring
+from app.services.cv_snapshot import CVSnapshot
+from app.services.enhanced_matching_service import EnhancedMatchingService, _score_enhanced_rows
+from app.services.parallel_scoring import score_in_shards
+from app.services.top_k import TopK
+
+
+CVRow = namedtuple('CVRow', [
+    'cv_id', 'full_name', 'email', 'phone', 'city', 'province', 'education_level',
+    'total_years_experience', 'current_job_title', 'salary_expectation_min',
+    'salary_expectation_max', 'skills_technical', 'skills_soft',
+])
+
+SKILL_SETS = [('Python', 'SQL'), ('Excel',), (), ('Python',), ('SQL', 'Excel')]
+TITLES = ['Data Analyst', 'Accountant', None, 'Software Developer', 'Clerk']
+
+
+def _snapshot(n: int) -> CVSnapshot:
+    """n CVs cycling through a few skill sets and titles"""
+    return CVSnapshot({
+        f'cv_{i}': (
+            CVRow(f'cv_{i}', f'CV {i}', None, None, 'Lusaka', None, None, float(i % 7),
+                  TITLES[i % len(TITLES)], None, None, None, None),
+            SKILL_SETS[i % len(SKILL_SETS)],
+            ('programming',) if 'Python' in SKILL_SETS[i % len(SKILL_SETS)] else (),
+        )
+        for i in range(n)
+    })
+
+
+def _score_values(snapshot, start, stop, rows, payload, limit, service=None):
+    """Scores are row values rounded to create ties; keeps rows >= min_score"""
+    top = TopK(limit)
+    kept = 0
+    for position, value in enumerate(rows, start):
+        score = round(float(value), 1)
+        if score >= payload['min_score']:
+            kept += 1
+            top.push(score, (score, position, f'cv_{position}'))
+    return top.results(), {'kept': kept}
+
+
+class TestParallelScoring:
+    """Test suite for score_in_shards"""
+
+    def setup_method(self):
+        self.values = np.random.default_rng(7).random(500)
+        self.payload = {'min_score': 0.3}
+
+    def test_serial_for_small_pools(self, monkeypatch):
+        """Below the row threshold the task runs once over the whole pool"""
+        monkeypatch.setattr(settings, 'MATCHING_PARALLEL_MIN_ROWS', 10_000)
+        scored, stats = score_in_shards(_score_values, len(self.values), self.payload, 10, row_data=self.values)
+
+        expected = sorted(
+            [(round(v, 1), i) for i, v in enumerate(self.values) if round(v, 1) >= 0.3],
+            key=lambda x: x[0], reverse=True
+        )[:10]
+        assert [(score, row) for score, row, _ in scored] == expected
+        assert stats['kept'] == sum(round(v, 1) >= 0.3 for v in self.values)
+
+    def test_process_pool_matches_serial(self, monkeypatch):
+        """Sharded merge keeps serial tie order and sums counters"""
+        monkeypatch.setattr(settings, 'MATCHING_PARALLEL_MIN_ROWS', 10_000)
+        serial = score_in_shards(_score_values, len(self.values), self.payload, 25, row_data=self.values)
+
+        monkeypatch.setattr(settings, 'MATCHING_PARALLEL_MIN_ROWS', 0)
+        monkeypatch.setattr(settings, 'MATCHING_WORKERS', 3)
+        parallel = score_in_shards(_score_values, len(self.values), self.payload, 25, row_data=self.values)
+
+        assert parallel == serial
+
+    def test_worker_count_defaults_to_bounded_share(self, monkeypatch):
+        """MATCHING_WORKERS=0 splits the CPUs across API workers, capped"""
+        monkeypatch.setattr(settings, 'MATCHING_WORKERS', 0)
+        monkeypatch.setattr(parallel_scoring.os, 'cpu_count', lambda: 32)
+        monkeypatch.setenv('WEB_CONCURRENCY', '16')
+        assert parallel_scoring.worker_count() == 2
+
+        monkeypatch.delenv('WEB_CONCURRENCY')
+        assert parallel_scoring.worker_count() == parallel_scoring.MAX_AUTO_WORKERS
+
+    def test_retired_generation_survives_until_released(self):
+        """Shared-memory blocks of a superseded snapshot stay until its shards finish"""
+        pinned = parallel_scoring._acquire(_snapshot(3))
+        names = [name for name, _, _ in pinned.handle['arrays'].values()]
+        for _ in range(parallel_scoring._KEEP_GENERATIONS + 1):
+            parallel_scoring._release(parallel_scoring._acquire(_snapshot(2)))
+
+        assert pinned in parallel_scoring._retired
+        shared_memory.SharedMemory(name=names[0]).close()
+
+        parallel_scoring._release(pinned)
+        assert pinned not in parallel_scoring._retired
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=names[0])
+
+    def test_enhanced_shards_match_serial(self, monkeypatch):
+        """Enhanced workers score from the shared snapshot without a DB"""
+        snapshot = _snapshot(40)
+        service = EnhancedMatchingService(db=None, skill_weights={'python': 3.0, 'sql': 1.0})
+        job_features = {
+            'job_id': 'job_1',
+            'normalized_skills': ['Python', 'SQL', 'Excel'],
+            'category_confidence': {'Technology': 1.0},
+        }
+        rows = np.column_stack([np.arange(len(snapshot)), np.ones((len(snapshot), 3))])
+        payload = {'job_features': job_features, 'skill_weights': service.skill_rarity.skill_weights}
+
+        def run():
+            scored, _ = score_in_shards(
+                _score_enhanced_rows, len(rows), payload, 10,
+                snapshot=snapshot, row_data=rows, local_service=service
+            )
+            return [(score, row, i, result['matched_skills']) for score, row, (i, _, result) in scored]
+
+        monkeypatch.setattr(settings, 'MATCHING_PARALLEL_MIN_ROWS', 10_000)
+        serial = run()
+        monkeypatch.setattr(settings, 'MATCHING_PARALLEL_MIN_ROWS', 0)
+        monkeypatch.setattr(settings, 'MATCHING_WORKERS', 2)
+        assert run() == serial
@@ -0,0 +1,130 @@
+"""
+Unit Tests for the Principal Cache
+==================================
+"""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import CompanyUser, get_current_user
+from app.core.config import settings
+from app.core.principal_cache import (
+    PrincipalCache, attach_user, invalidate_principal, principal_cache, snapshot_user
+)
+from app.core.security import create_access_token
+from app.models.corp_user import CorpUser
+from app.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(monkeypatch):
+    monkeypatch.setattr(settings, 'AUTH_CACHE_TTL_SECONDS', 60)
+    invalidate_principal()
+    yield
+    invalidate_principal()
+
+
+class TestPrincipalCache:
+    """Test suite for expiry, eviction and invalidation"""
+
+    def test_entry_never_outlives_token(self):
+        cache = PrincipalCache()
+        cache.put('t1', '1', time.time() - 1, 'expired')
+        cache.put('t2', '1', time.time() + 3600, 'valid')
+        assert cache.get('t1') is None
+        assert cache.get('t2') == 'valid'
+
+    def test_invalidate_drops_every_token_of_subject(self):
+        cache = PrincipalCache()
+        cache.put('t1', '1', None, 'a')
+        cache.put('t2', '1', None, 'b')
+        cache.put('t3', '2', None, 'c')
+        cache.invalidate('1')
+        assert cache.get('t1') is None and cache.get('t2') is None
+        assert cache.get('t3') == 'c'
+
+    def test_least_recently_used_evicted(self, monkeypatch):
+        monkeypatch.setattr(settings, 'AUTH_CACHE_MAX_ENTRIES', 2)
+        cache = PrincipalCache()
+        cache.put('t1', '1', None, 'a')
+        cache.put('t2', '2', None, 'b')
+        cache.get('t1')
+        cache.put('t3', '3', None, 'c')
+        assert len(cache) == 2 and cache.get('t2') is None
+
+
+class TestGetCurrentUser:
+    """Test suite for the cached auth dependency"""
+
+    def test_company_user_loaded_once_per_token(self):
+        token = create_access_token({'sub': '7'})
+        db = Mock()
+        db.execute.return_value.fetchone.return_value = (7, 'hr@acme.zm', 'Acme', 'Acme Ltd', True)
+
+        first = get_current_user(db=db, token=token)
+        second = get_current_user(db=db, token=token)
+
+        assert isinstance(second, CompanyUser) and second == first
+        assert second is not first  # Callers get their own copy
+        assert db.execute.call_count == 1
+
+        invalidate_principal(7)
+        get_current_user(db=db, token=token)
+        assert db.execute.call_count == 2
+
+    def test_deactivating_recruiter_invalidates_cached_principal(self):
+        engine = create_engine('sqlite://')
+        CorpUser.__table__.create(engine)
+        Session = sessionmaker(bind=engine)
+        token = create_access_token({'sub': '7'})
+
+        with Session() as db:
+            db.add(CorpUser(id=7, email='hr@acme.zm', hashed_password='x',
+                            company_name='Acme', company_display_name='Acme Ltd', is_active=True))
+            db.commit()
+            assert get_current_user(db=db, token=token).company_name == 'Acme'
+            assert principal_cache.get(token) is not None
+
+            db.get(CorpUser, 7).is_active = False
+            db.commit()
+
+            assert principal_cache.get(token) is None
+            with pytest.raises(HTTPException) as raised:
+                get_current_user(db=db, token=token)
+            assert raised.value.detail == 'Account is inactive'
+
+
+class TestUserSnapshot:
+    """Test suite for re-attaching cached users to a session"""
+
+    def test_attach_user_needs_no_query_and_tracks_edits(self):
+        engine = create_engine('sqlite://')
+        User.__table__.create(engine)
+        Session = sessionmaker(bind=engine)
+
+        with Session() as db:
+            db.add(User(id=1, email='a@b.zm', hashed_password='x', full_name='Old'))
+            db.commit()
+            snapshot = snapshot_user(db.get(User, 1))
+        principal_cache.put('token', '1', None, snapshot)
+
+        statements = []
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        with Session() as db:
+            user = attach_user(db, snapshot)
+            assert user.full_name == 'Old' and statements == []
+
+            user.full_name = 'New'
+            db.commit()
+
+        assert any(sql.startswith('UPDATE users') for sql in statements)
+        assert principal_cache.get('token') is None  # ORM update invalidated it
@@ -0,0 +1,122 @@
+"""
+Unit Tests for Ranking Model Training Helpers
+=============================================
+Data loading/downcasting, group-aware splitting and feature selection of
+ml/train_ranking_model.py (no model is trained).
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('lightgbm')
+pytest.importorskip('matplotlib')
+pytest.importorskip('seaborn')
+
+# The training script imports its sibling modules by bare name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ml'))
+
+from train_ranking_model import ModelTrainer
+
+
+def _training_frame(n: int = 12) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        'event_id': [f'e{i}' for i in range(n)],
+        'cv_id': [f'cv_{i % 4}' for i in range(n)],
+        'session_id': [f's{i // 3}' for i in range(n)],
+        'applied': rng.integers(0, 2, n),
+        'match_score': rng.random(n),
+        'user_skills_count': rng.integers(0, 300, n),
+        'salary_gap': rng.normal(0, 5000, n),
+        'same_city': rng.random(n) > 0.5,
+    })
+
+
+class TestLoading:
+    """Test suite for downcasting and the columnar loader"""
+
+    def test_downcast_keeps_values(self):
+        df = pd.DataFrame({
+            'flag': [True, False, True],
+            'small': np.array([0, 1, 127], dtype=np.int64),
+            'wide': np.array([-40000, 0, 40000], dtype=np.int64),
+            'score': np.array([0.125, 0.5, 1e6], dtype=np.float64),
+            'level': pd.Categorical(['junior', 'senior', 'junior']),
+        })
+        original = df.copy()
+
+        ModelTrainer('unused.csv').downcast_dtypes(df)
+
+        assert df['flag'].dtype == np.int8 and df['flag'].tolist() == [1, 0, 1]
+        assert df['small'].dtype == np.int8 and df['small'].tolist() == original['small'].tolist()
+        assert df['wide'].dtype == np.int32 and df['wide'].tolist() == original['wide'].tolist()
+        assert df['score'].dtype == np.float32
+        np.testing.assert_array_equal(df['score'].to_numpy(), original['score'].to_numpy())
+        assert isinstance(df['level'].dtype, pd.CategoricalDtype)
+        assert df['level'].tolist() == original['level'].tolist()
+
+    @pytest.mark.parametrize('extension', ['.parquet', '.feather'])
+    def test_columnar_loader_matches_csv_path(self, tmp_path, extension):
+        pytest.importorskip('pyarrow')
+        csv_path = tmp_path / 'training.csv'
+        _training_frame().to_csv(csv_path, index=False)
+
+        # Columnar copy of what the CSV path reads
+        columnar_path = tmp_path / f'training{extension}'
+        frame = pd.read_csv(csv_path)
+        if extension == '.parquet':
+            frame.to_parquet(columnar_path, index=False)
+        else:
+            frame.to_feather(columnar_path)
+
+        from_csv = ModelTrainer(str(csv_path)).load_data()
+        from_columnar = ModelTrainer(str(columnar_path)).load_data()
+
+        pd.testing.assert_frame_equal(from_columnar, from_csv)
+
+
+class TestGroupSplit:
+    """Test suite for query-group aware splitting"""
+
+    def setup_method(self):
+        n = 120
+        rng = np.random.default_rng(3)
+        self.trainer = ModelTrainer('unused.csv', mode='lambdarank')
+        self.trainer.df = pd.DataFrame({
+            'event_id': [f'e{i}' for i in range(n)],
+            'cv_id': [f'cv_{i % 10}' for i in range(n)],
+            'session_id': [f's{i // 4}' if i % 6 else None for i in range(n)],
+            'applied': rng.integers(0, 2, n),
+            'helpful': rng.integers(0, 2, n),
+            'interaction_type_encoded': rng.integers(0, 3, n),
+            'match_score': rng.random(n),
+            'skills_score': rng.random(n),
+        })
+
+    def test_session_id_is_not_a_feature(self):
+        X, _ = self.trainer.prepare_features()
+
+        assert self.trainer.feature_columns == ['match_score', 'skills_score']
+        assert 'session_id' not in X.columns
+
+    def test_no_group_crosses_splits(self):
+        X, y = self.trainer.prepare_features()
+        splits = self.trainer.split_data_by_group(X, y)
+
+        groups = self.trainer.groups
+        members = {name: set(groups.loc[splits[f'X_{name}'].index]) for name in ('train', 'val', 'test')}
+        assert not members['train'] & members['val']
+        assert not members['train'] & members['test']
+        assert not members['val'] & members['test']
+        assert sum(len(splits[f'X_{name}']) for name in members) == len(X)
+
+        # Contiguous groups with matching sizes, as LightGBM ranking expects
+        for name in members:
+            split_groups = groups.loc[splits[f'X_{name}'].index].to_numpy()
+            _, sizes = np.unique(split_groups, return_counts=True)
+            assert (split_groups[:-1] <= split_groups[1:]).all()
+            assert splits[f'group_sizes_{name}'].tolist() == sizes.tolist()
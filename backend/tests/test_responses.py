@@ -0,0 +1,49 @@
+"""
+Unit Tests for Fast JSON Responses
+==================================
+"""
+
+import json
+from decimal import Decimal
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.api.responses import FastJSONResponse, compact_rows, serialization_stats
+
+
+class Skill(BaseModel):
+    name: str
+
+
+class TestFastJSONResponse:
+    """Test suite for orjson rendering"""
+
+    def test_renders_service_output_types(self):
+        response = FastJSONResponse({
+            'score': np.float32(0.5),
+            'vector': np.array([1, 2]),
+            'salary': Decimal('1500.5'),
+            'skill': Skill(name='python'),
+            'tags': {'a'},
+        })
+        assert json.loads(response.body) == {
+            'score': 0.5, 'vector': [1, 2], 'salary': 1500.5, 'skill': {'name': 'python'}, 'tags': ['a'],
+        }
+
+    def test_reports_serialization_time(self):
+        before = serialization_stats()['responses']
+        response = FastJSONResponse({'matches': [{'cv_id': str(i)} for i in range(100)]})
+
+        assert response.headers['server-timing'].startswith('serialize;dur=')
+        assert response.headers['content-type'] == 'application/json'
+        assert serialization_stats()['responses'] == before + 1
+
+
+class TestCompactRows:
+    """Test suite for compact mode"""
+
+    def test_drops_breakdowns_without_touching_source(self):
+        rows = [{'cv_id': '1', 'match_score': 0.9, 'matched_skills': ['sql'], 'breakdown': {'weights_used': {}}}]
+        assert compact_rows(rows) == [{'cv_id': '1', 'match_score': 0.9, 'matched_skills': ['sql']}]
+        assert 'breakdown' in rows[0]
@@ -0,0 +1,95 @@
+"""
+Unit Tests for Dashboard Rollup Maintenance
+===========================================
+"""
+
+from unittest.mock import Mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.application import ApplicationStatus
+from app.services.rollup_service import RollupService
+
+
+class TestApplicationDeltas:
+    """Test suite for counter deltas of application writes"""
+
+    def test_create(self):
+        deltas = RollupService.application_deltas(None, (ApplicationStatus.NEW, 0.8))
+        assert deltas == {
+            'applications_total': 1, 'new_count': 1,
+            'match_score_sum': 0.8, 'match_score_count': 1,
+        }
+
+    def test_status_change_moves_one_count(self):
+        deltas = RollupService.application_deltas(
+            (ApplicationStatus.NEW, 0.8), (ApplicationStatus.INTERVIEW, 0.8)
+        )
+        assert deltas['new_count'] == -1 and deltas['interview_count'] == 1
+        assert deltas['applications_total'] == 0 and deltas['match_score_count'] == 0
+
+    def test_delete_without_score(self):
+        deltas = RollupService.application_deltas((ApplicationStatus.HIRED, None), None)
+        assert deltas == {'applications_total': -1, 'hired_count': -1}
+
+
+class TestIncrementalUpsert:
+    """Test suite for the rollup upsert statements"""
+
+    def test_counters_added_in_sql(self):
+        db = Mock()
+        RollupService.apply_application_change(db, 'job_1', new=(ApplicationStatus.NEW, None))
+
+        sql = str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert 'ON CONFLICT (job_id) DO UPDATE' in sql
+        assert 'new_count = (job_stats_rollups.new_count + excluded.new_count)' in sql
+
+    def test_no_op_change_skips_write(self):
+        db = Mock()
+        RollupService.apply_application_change(
+            db, 'job_1', old=(ApplicationStatus.NEW, 0.5), new=(ApplicationStatus.NEW, 0.5)
+        )
+        db.execute.assert_not_called()
+
+    def test_bulk_status_change_groups_per_job(self):
+        db = Mock()
+        RollupService.apply_bulk_status_change(
+            db,
+            [('job_1', ApplicationStatus.NEW, 2), ('job_1', ApplicationStatus.SCREENING, 1),
+             ('job_2', ApplicationStatus.NEW, 3)],
+            ApplicationStatus.REJECTED
+        )
+        assert db.execute.call_count == 2
+
+
+class TestRebuild:
+    """Test suite for the full rollup rebuild"""
+
+    def test_rebuild_locks_sources_before_recounting(self):
+        db = Mock()
+        RollupService.rebuild_rollups(db)
+
+        statements = [str(call[0][0]) for call in db.execute.call_args_list]
+        assert statements[0] == 'LOCK TABLE applications, corporate_jobs IN SHARE MODE'
+        assert statements[1].startswith('DELETE FROM job_stats_rollups')
+        db.commit.assert_called_once()
+
+    def test_rebuild_is_one_insert_select(self):
+        sql = str(RollupService.rebuild_statement().compile(dialect=postgresql.dialect()))
+        assert sql.startswith('INSERT INTO job_stats_rollups')
+        assert 'FULL OUTER JOIN' in sql
+        assert 'GROUP BY applications.job_id' in sql
+
+
+class TestJobsVersion:
+    """Test suite for the COUNT-free job list version"""
+
+    def test_one_round_trip_without_counting_jobs(self):
+        db = Mock()
+        db.execute.return_value.one.return_value = (3, None)
+        assert RollupService.jobs_version(db, 'Zanaco') == (3, None)
+
+        sql = str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert db.execute.call_count == 1
+        assert 'FROM job_stats_rollups' in sql and 'max(corporate_jobs.updated_at)' in sql
+        assert 'count(corporate_jobs' not in sql
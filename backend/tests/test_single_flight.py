@@ -0,0 +1,94 @@
+"""
+Unit Tests for Single-Flight Request Coalescing
+===============================================
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test suite for sync and async coalescing"""
+
+    def test_concurrent_sync_callers_share_one_run(self):
+        """Threads with the same key get the leader's result"""
+        flights = SingleFlight()
+        calls = []
+
+        def compute(job_id):
+            calls.append(job_id)
+            time.sleep(0.1)
+            return [job_id]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flights.do(('enhanced', 'JOB1'), compute, 'JOB1')))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert calls == ['JOB1']
+        assert results == [['JOB1']] * 5
+        assert flights.stats() == {'in_flight': 0, 'runs': 1, 'coalesced_requests': 4}
+
+    def test_async_callers_share_result_and_errors(self):
+        """Coroutines coalesce; a leader failure reaches every waiter"""
+        flights = SingleFlight()
+        calls = []
+
+        async def compute(job_id):
+            calls.append(job_id)
+            await asyncio.sleep(0.05)
+            if job_id == 'BAD':
+                raise ValueError(job_id)
+            return job_id.lower()
+
+        async def main():
+            good = await asyncio.gather(*[flights.do_async(('gated', 'JOB1'), compute, 'JOB1') for _ in range(3)])
+            bad = await asyncio.gather(
+                *[flights.do_async(('gated', 'BAD'), compute, 'BAD') for _ in range(2)],
+                return_exceptions=True
+            )
+            return good, bad
+
+        good, bad = asyncio.run(main())
+
+        assert good == ['job1'] * 3
+        assert all(isinstance(e, ValueError) for e in bad)
+        assert calls == ['JOB1', 'BAD']
+
+    def test_sequential_calls_are_not_cached(self):
+        """A finished flight is forgotten"""
+        flights = SingleFlight()
+        assert flights.do('k', lambda: 1) == 1
+        assert flights.do('k', lambda: 2) == 2
+
+        with pytest.raises(KeyError):
+            flights.do('k', lambda: {}['missing'])
+        assert flights.stats()['in_flight'] == 0
+
+    def test_synchronous_failure_lands_the_flight(self):
+        """fn raising before it returns an awaitable fails waiters and frees the key"""
+        flights = SingleFlight()
+
+        def broken(job_id):
+            raise RuntimeError(job_id)
+
+        async def compute(job_id):
+            return job_id
+
+        async def main():
+            with pytest.raises(RuntimeError):
+                await flights.do_async(('gated', 'JOB1'), broken, 'JOB1')
+            return await asyncio.wait_for(flights.do_async(('gated', 'JOB1'), compute, 'JOB1'), timeout=1)
+
+        assert asyncio.run(main()) == 'JOB1'
+        assert flights.stats()['in_flight'] == 0
@@ -0,0 +1,61 @@
+"""
+Unit Tests for Dashboard Statistics
+===================================
+"""
+
+from collections import namedtuple
+from unittest.mock import Mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.services.stats_service import StatsService, invalidate_company_stats
+
+
+StatsRow = namedtuple('StatsRow', [
+    'category', 'location', 'by_category', 'by_location',
+    'total', 'draft', 'published', 'closed',
+])
+
+
+def _sql(db):
+    return str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+
+
+class TestCorporateJobStats:
+    """Test suite for the grouped corporate dashboard query"""
+
+    def setup_method(self):
+        invalidate_company_stats()
+        self.db = Mock()
+        self.db.execute.return_value.all.return_value = [
+            StatsRow(None, None, 1, 1, 5, 2, 2, 1),
+            StatsRow('IT', None, 0, 1, 3, 1, 1, 1),
+            StatsRow('Uncategorized', None, 0, 1, 2, 1, 1, 0),
+            StatsRow(None, 'Lusaka', 1, 0, 4, 2, 1, 1),
+            StatsRow(None, 'Copperbelt', 1, 0, 1, 0, 1, 0),
+        ]
+
+    def test_one_query_folds_grouping_sets(self):
+        """Total, status, category and location come from one statement"""
+        stats = StatsService.corporate_job_stats(self.db, 'Acme', use_cache=False)
+
+        assert self.db.execute.call_count == 1
+        assert 'GROUPING SETS' in _sql(self.db) and 'FILTER (WHERE' in _sql(self.db)
+        assert 'FROM job_stats_rollups' in _sql(self.db)
+        assert stats == {
+            'total_jobs': 5,
+            'by_status': {'draft': 2, 'published': 2, 'closed': 1},
+            'by_category': {'IT': 3, 'Uncategorized': 2},
+            'by_location': {'Lusaka': 4, 'Copperbelt': 1},
+        }
+
+    def test_cached_per_company_until_invalidated(self, monkeypatch):
+        monkeypatch.setattr(settings, 'STATS_CACHE_TTL_SECONDS', 60)
+        StatsService.corporate_job_stats(self.db, 'Acme')
+        StatsService.corporate_job_stats(self.db, 'Acme')
+        assert self.db.execute.call_count == 1
+
+        invalidate_company_stats('Acme')
+        StatsService.corporate_job_stats(self.db, 'Acme')
+        assert self.db.execute.call_count == 2
@@ -0,0 +1,46 @@
+"""
+Unit Tests for Top-K Selection
+==============================
+The bounded accumulators must return exactly what a stable sort + slice did.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.services.top_k import TopK, top_k_indices
+
+
+class TestTopK:
+    """Test suite for TopK and top_k_indices"""
+
+    @pytest.mark.parametrize('k', [0, 1, 5, 50, 500])
+    def test_matches_stable_sort(self, k):
+        """Many ties: earlier items win, order is best first"""
+        rng = random.Random(k)
+        items = [(round(rng.random(), 1), i) for i in range(200)]
+
+        top = TopK(k)
+        for score, i in items:
+            top.push(score, i)
+
+        expected = [i for _, i in sorted(items, key=lambda x: x[0], reverse=True)[:k]]
+        assert top.results() == expected
+        assert top.seen == len(items)
+
+    def test_threshold_tracks_weakest_kept(self):
+        """Threshold is -inf until full, then the K-th best score"""
+        top = TopK(2)
+        assert top.threshold == float('-inf')
+        for score in [0.3, 0.9, 0.5]:
+            top.push(score, score)
+        assert top.threshold == 0.5
+        assert top.scored_results() == [(0.9, 0.9), (0.5, 0.5)]
+
+    @pytest.mark.parametrize('k', [0, 3, 40, 100, 1000])
+    def test_indices_match_stable_sort(self, k):
+        """Array version agrees with a stable argsort"""
+        scores = np.round(np.random.default_rng(k).random(100), 1)
+        expected = np.argsort(-scores, kind='stable')[:k]
+        assert top_k_indices(scores, k).tolist() == expected.tolist()
@@ -0,0 +1,91 @@
+"""
+Unit Tests for FlatTreePredictor
+================================
+Checks the NumPy tree evaluator against hand-built trees and, when lightgbm
+is installed, against Booster.predict.
+"""
+
+import numpy as np
+import pytest
+
+from app.services.tree_predictor import FlatTreePredictor
+
+
+def _stump(feature, threshold, left, right, missing_type='None', default_left=True):
+    return {
+        'split_feature': feature,
+        'threshold': threshold,
+        'decision_type': '<=',
+        'default_left': default_left,
+        'missing_type': missing_type,
+        'left_child': {'leaf_index': 0, 'leaf_value': left},
+        'right_child': {'leaf_index': 1, 'leaf_value': right},
+    }
+
+
+class TestFlatTreePredictor:
+    """Test suite for the exported tree predictor"""
+
+    def setup_method(self):
+        """Two-tree ensemble: one stump on each feature plus a constant tree"""
+        self.dump = {
+            'objective': 'binary sigmoid:1',
+            'feature_names': ['match_score', 'skills_score'],
+            'tree_info': [
+                {'tree_structure': _stump(0, 0.5, -1.0, 1.0)},
+                {'tree_structure': _stump(1, 0.2, 0.5, -0.5, missing_type='NaN', default_left=False)},
+                {'tree_structure': {'leaf_value': 0.25}},
+            ],
+        }
+        self.predictor = FlatTreePredictor.from_model_dump(self.dump)
+
+    def test_raw_scores_follow_splits(self):
+        """Each row sums the leaf it lands in for every tree"""
+        X = np.array([[0.4, 0.1], [0.9, 0.3]])
+        raw = self.predictor.predict_raw(X)
+        assert raw.tolist() == pytest.approx([-1.0 + 0.5 + 0.25, 1.0 - 0.5 + 0.25])
+
+    def test_missing_values_use_default_direction(self):
+        """NaN goes to default child for NaN splits, is treated as 0 otherwise"""
+        X = np.array([[np.nan, np.nan]])
+        raw = self.predictor.predict_raw(X)
+        # Tree 1: NaN -> 0.0 <= 0.5 -> left; tree 2: NaN split, default right
+        assert raw.tolist() == pytest.approx([-1.0 - 0.5 + 0.25])
+
+    def test_binary_objective_applies_sigmoid(self):
+        """Binary models return probabilities"""
+        X = np.array([[0.9, 0.1]])
+        raw = self.predictor.predict_raw(X)
+        assert self.predictor.predict(X) == pytest.approx(1.0 / (1.0 + np.exp(-raw)))
+
+    def test_save_load_roundtrip(self, tmp_path):
+        """Saved predictor reproduces the same predictions"""
+        path = str(tmp_path / 'ranking_model.npz')
+        self.predictor.save(path)
+        loaded = FlatTreePredictor.load(path)
+
+        X = np.random.default_rng(0).random((50, 2))
+        assert np.array_equal(loaded.predict(X), self.predictor.predict(X))
+        assert loaded.feature_names == ['match_score', 'skills_score']
+
+    def test_wrong_feature_count_rejected(self):
+        """Feature matrix must match the exported feature list"""
+        with pytest.raises(ValueError):
+            self.predictor.predict(np.zeros((1, 3)))
+
+    def test_parity_with_lightgbm(self):
+        """Predictions match Booster.predict on a trained model"""
+        lgb = pytest.importorskip('lightgbm')
+        rng = np.random.default_rng(42)
+        X = rng.normal(size=(500, 5))
+        X[rng.random(X.shape) < 0.1] = np.nan
+        y = (np.nan_to_num(X[:, 0]) + rng.normal(scale=0.5, size=500) > 0).astype(int)
+
+        booster = lgb.train(
+            {'objective': 'binary', 'verbose': -1, 'num_leaves': 15},
+            lgb.Dataset(X, label=y),
+            num_boost_round=30
+        )
+        predictor = FlatTreePredictor.from_model_dump(booster.dump_model())
+
+        assert np.max(np.abs(predictor.predict(X) - booster.predict(X))) < 1e-9